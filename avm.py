@@ -0,0 +1,1760 @@
+"""
+Local AVM interpreter
+
+Runs the TEAL that build_contracts.py produces (the assembly text, not
+bytecode) in process, so contracts can be exercised and measured
+without a node. Every evaluation reports its opcode cost, peak stack
+depth and each global / local / box state read and write.
+
+Covers the opcodes PyTeal emits for application programs (v6-v8):
+arithmetic and byte ops, flow control and subroutines, scratch space,
+txn / gtxn / global fields, app state, boxes, balances and inner
+transactions. Opcode costs follow the TEAL language spec.
+
+Ledger.send executes whole atomic groups the way a node would: ALGO
+payments and asset transfers move balances, app calls run the approval
+(or clear) program, inner transactions are applied, opcode budget and
+fees are pooled, and a failure anywhere rolls the whole group back. The
+clock is whatever the test sets it to.
+
+Usage:
+    from avm import Ledger, assemble, app_create, app_call
+    ledger = Ledger(timestamp=1_700_000_000)
+    ledger.fund(student, 10_000_000)
+    created = ledger.send([app_create(student, assemble(approval_teal), assemble(clear_teal))])
+    app_id = created.results[0].app_id
+    ledger.advance(60)    # a minute later, instantly
+    result = ledger.send([app_call(student, app_id, "withdraw")])
+    result.approved, result.cost
+"""
+
+import base64
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from algosdk import abi, encoding
+
+MAX_UINT64 = 2**64 - 1
+MAX_STACK = 1000
+MAX_BYTES = 4096
+BUDGET_PER_APP_CALL = 700
+MIN_TXN_FEE = 1000
+MIN_BALANCE = 100_000
+ZERO_ADDRESS = bytes(32)
+ABI_RETURN_PREFIX = bytes.fromhex("151f7c75")  # ARC-4: log line carrying a method's return
+
+# Opcodes that cost more than 1 (everything else costs 1)
+OPCODE_COSTS = {
+    "sha256": 35,
+    "keccak256": 130,
+    "sha512_256": 45,
+    "ed25519verify": 1900,
+    "ecdsa_verify": 1700,
+    "ecdsa_pk_decompress": 650,
+    "ecdsa_pk_recover": 2000,
+    "divmodw": 20,
+    "sqrt": 4,
+    "expw": 10,
+    "bsqrt": 40,
+}
+
+# Named integer constants accepted by "int"
+NAMED_INTS = {
+    "unknown": 0, "pay": 1, "keyreg": 2, "acfg": 3, "axfer": 4, "afrz": 5, "appl": 6,
+    "NoOp": 0, "OptIn": 1, "CloseOut": 2, "ClearState": 3,
+    "UpdateApplication": 4, "DeleteApplication": 5,
+}
+
+TYPE_NAMES = {1: b"pay", 2: b"keyreg", 3: b"acfg", 4: b"axfer", 5: b"afrz", 6: b"appl"}
+
+# Array fields and the "Num..." field holding their length
+ARRAY_FIELDS = {
+    "ApplicationArgs": "NumAppArgs",
+    "Accounts": "NumAccounts",
+    "Assets": "NumAssets",
+    "Applications": "NumApplications",
+    "Logs": "NumLogs",
+}
+
+
+class AVMError(Exception):
+    """Program rejected: failed assert, err, type error, budget..."""
+
+
+def application_address(app_id: int) -> bytes:
+    """32-byte escrow address of an app"""
+    return hashlib.new("sha512_256", b"appID" + app_id.to_bytes(8, "big")).digest()
+
+
+def to_address(value) -> bytes:
+    """32-byte address from a base32 string or raw bytes"""
+    if isinstance(value, str):
+        return encoding.decode_address(value)
+    return bytes(value)
+
+
+# ==========================================
+# TRANSACTIONS
+# ==========================================
+
+def transaction(sender, type_enum, **fields) -> Dict[str, Any]:
+    """
+    Transaction as a dict of TEAL field names (Sender, Amount, ...)
+    
+    Addresses may be base32 strings or 32 raw bytes.
+    """
+    txn = {
+        "Sender": to_address(sender),
+        "TypeEnum": type_enum,
+        "Fee": MIN_TXN_FEE,
+        "FirstValid": 0,
+        "LastValid": 1000,
+        "Note": b"",
+        "Lease": bytes(32),
+        "RekeyTo": ZERO_ADDRESS,
+        "Receiver": ZERO_ADDRESS,
+        "Amount": 0,
+        "CloseRemainderTo": ZERO_ADDRESS,
+        "XferAsset": 0,
+        "AssetAmount": 0,
+        "AssetSender": ZERO_ADDRESS,
+        "AssetReceiver": ZERO_ADDRESS,
+        "AssetCloseTo": ZERO_ADDRESS,
+        "ApplicationID": 0,
+        "OnCompletion": 0,
+        "ApplicationArgs": [],
+        "Accounts": [],
+        "Assets": [],
+        "Applications": [],
+        "GlobalNumUint": 0,
+        "GlobalNumByteSlice": 0,
+        "LocalNumUint": 0,
+        "LocalNumByteSlice": 0,
+        "ExtraProgramPages": 0,
+        "ApprovalProgram": b"",
+        "ClearStateProgram": b"",
+        "ConfigAsset": 0,
+        "FreezeAsset": 0,
+    }
+    
+    for name, value in fields.items():
+        if name in ("Sender", "Receiver", "CloseRemainderTo", "AssetSender",
+                    "AssetReceiver", "AssetCloseTo", "RekeyTo"):
+            value = to_address(value)
+        elif name == "Accounts":
+            value = [to_address(a) for a in value]
+        elif name == "ApplicationArgs":
+            value = [encode_arg(a) for a in value]
+        txn[name] = value
+    
+    return txn
+
+
+def encode_arg(value) -> bytes:
+    """App argument the way the deploy scripts pack them"""
+    if isinstance(value, int):
+        return value.to_bytes(8, "big")
+    if isinstance(value, str):
+        return value.encode()
+    return bytes(value)
+
+
+def app_call(sender, app_id, *args, on_complete=0, **fields) -> Dict[str, Any]:
+    """Application call with its arguments (ints packed as 8 bytes)"""
+    return transaction(sender, 6, ApplicationID=app_id, OnCompletion=on_complete,
+                       ApplicationArgs=list(args), **fields)
+
+
+def method_call(sender, app_id, signature, *args, on_complete=0, **fields) -> Dict[str, Any]:
+    """ARC-4 method call: the method selector, then each argument ABI-encoded"""
+    method = abi.Method.from_signature(signature)
+    encoded = [arg.type.encode(value) for arg, value in zip(method.args, args)]
+    return app_call(sender, app_id, method.get_selector(), *encoded,
+                    on_complete=on_complete, **fields)
+
+
+def method_return(signature, logs: List[bytes]):
+    """Decoded return value of an ARC-4 call from its logs (None for void)"""
+    method = abi.Method.from_signature(signature)
+    if method.returns.type == abi.Returns.VOID:
+        return None
+    if not logs or logs[-1][:4] != ABI_RETURN_PREFIX:
+        raise AVMError(f"{method.name}: no ABI return logged")
+    return method.returns.type.decode(logs[-1][4:])
+
+
+def app_create(sender, approval, clear, global_schema=(0, 0), local_schema=(0, 0),
+               args=(), **fields) -> Dict[str, Any]:
+    """Application create call; approval / clear are assembled Programs"""
+    return transaction(
+        sender, 6,
+        ApprovalProgram=approval,
+        ClearStateProgram=clear,
+        GlobalNumUint=global_schema[0],
+        GlobalNumByteSlice=global_schema[1],
+        LocalNumUint=local_schema[0],
+        LocalNumByteSlice=local_schema[1],
+        ApplicationArgs=list(args),
+        **fields
+    )
+
+
+def payment(sender, receiver, amount, **fields) -> Dict[str, Any]:
+    return transaction(sender, 1, Receiver=receiver, Amount=amount, **fields)
+
+
+def asset_transfer(sender, receiver, asset_id, amount, **fields) -> Dict[str, Any]:
+    return transaction(sender, 4, AssetReceiver=receiver, XferAsset=asset_id,
+                       AssetAmount=amount, **fields)
+
+
+# ==========================================
+# LEDGER
+# ==========================================
+
+_MISSING = object()
+MAX_GROUP_SIZE = 16
+
+
+@dataclass
+class App:
+    creator: bytes
+    global_state: Dict[bytes, Any] = field(default_factory=dict)
+    local_state: Dict[bytes, Dict[bytes, Any]] = field(default_factory=dict)
+    boxes: Dict[bytes, bytes] = field(default_factory=dict)
+    approval: Optional["Program"] = None
+    clear: Optional["Program"] = None
+    global_schema: Optional[Tuple[int, int]] = None    # (uints, byte slices); None = unchecked
+    local_schema: Optional[Tuple[int, int]] = None
+
+
+@dataclass
+class GroupResult:
+    """Outcome of an atomic group sent with Ledger.send"""
+    approved: bool
+    error: Optional[str] = None
+    failed_index: Optional[int] = None
+    results: List[Optional["Result"]] = field(default_factory=list)    # None for non app calls
+    
+    @property
+    def cost(self) -> int:
+        return sum(r.cost for r in self.results if r)
+    
+    @property
+    def inner_txns(self) -> List[Dict[str, Any]]:
+        return [t for r in self.results if r for t in r.inner_txns]
+
+
+def schema_usage(state: Dict[bytes, Any]) -> Tuple[int, int]:
+    uints = sum(1 for v in state.values() if isinstance(v, int))
+    return uints, len(state) - uints
+
+
+class Ledger:
+    """
+    The chain state a program can see: apps and their state, ALGO
+    balances, asset holdings and the latest block's round and timestamp
+    
+    Every change goes through a journal, so a rejected program or group
+    leaves the ledger as it was. The clock only moves when told to
+    (advance / set_time), so time locks are tested without waiting.
+    """
+    
+    def __init__(self, timestamp: int = 0, round: int = 1):
+        self.timestamp = timestamp
+        self.round = round
+        self.apps: Dict[int, App] = {}
+        self.balances: Dict[bytes, int] = {}
+        self.holdings: Dict[Tuple[bytes, int], int] = {}
+        self.next_id = 1001
+        
+        self.journal: List[Tuple[dict, Any, Any]] = []
+        self.in_group = False
+        self.fee_credit = 0
+    
+    # -------- journal --------
+    
+    def put(self, store: dict, key, value):
+        """Set (or delete, with _MISSING) a key, remembering the old value"""
+        self.journal.append((store, key, store.get(key, _MISSING)))
+        if value is _MISSING:
+            store.pop(key, None)
+        else:
+            store[key] = value
+    
+    def rollback(self, mark: int):
+        """Undo every change made since the journal was mark entries long"""
+        while len(self.journal) > mark:
+            store, key, old = self.journal.pop()
+            if old is _MISSING:
+                store.pop(key, None)
+            else:
+                store[key] = old
+    
+    # -------- clock --------
+    
+    def advance(self, seconds: int, rounds: int = 1):
+        """Move the latest block forward"""
+        self.timestamp += seconds
+        self.round += rounds
+    
+    def set_time(self, timestamp: int):
+        if timestamp < self.timestamp:
+            raise ValueError("the clock cannot go backwards")
+        self.advance(timestamp - self.timestamp)
+    
+    # -------- setup (applied directly, not as transactions) --------
+    
+    def create_app(self, creator, global_state=None, app_id=None, approval=None, clear=None,
+                   global_schema=None, local_schema=None) -> int:
+        app_id = app_id or self.next_id
+        self.next_id = max(self.next_id, app_id) + 1
+        self.apps[app_id] = App(to_address(creator), dict(global_state or {}), approval=approval,
+                                clear=clear, global_schema=global_schema, local_schema=local_schema)
+        return app_id
+    
+    def opt_in(self, account, app_id, local_state=None):
+        self.apps[app_id].local_state[to_address(account)] = dict(local_state or {})
+    
+    def fund(self, account, amount: int):
+        address = to_address(account)
+        self.balances[address] = self.balances.get(address, 0) + amount
+    
+    def create_asset(self, creator, total: int) -> int:
+        asset_id = self.next_id
+        self.next_id += 1
+        self.holdings[(to_address(creator), asset_id)] = total
+        return asset_id
+    
+    def opt_in_asset(self, account, asset_id: int):
+        self.holdings.setdefault((to_address(account), asset_id), 0)
+    
+    def balance(self, account) -> int:
+        return self.balances.get(to_address(account), 0)
+    
+    def asset_balance(self, account, asset_id) -> Optional[int]:
+        """None when the account is not opted in to the asset"""
+        return self.holdings.get((to_address(account), asset_id))
+    
+    # -------- transactions --------
+    
+    def send(self, group: List[Dict[str, Any]]) -> GroupResult:
+        """
+        Execute an atomic group: every transaction applies, or none does
+        
+        App calls share the group's pooled opcode budget and fees are
+        pooled too (an overpaying outer transaction covers zero-fee
+        inner ones).
+        """
+        mark = len(self.journal)
+        results = []
+        budget = BUDGET_PER_APP_CALL * sum(1 for t in group if t["TypeEnum"] == 6)
+        
+        self.in_group = True
+        try:
+            if not 1 <= len(group) <= MAX_GROUP_SIZE:
+                raise AVMError(f"group size {len(group)} out of range")
+            
+            self.fee_credit = sum(t["Fee"] for t in group) - MIN_TXN_FEE * len(group)
+            if self.fee_credit < 0:
+                raise AVMError("fee too small for the group")
+            
+            for index, txn in enumerate(group):
+                result = self._apply(group, index, budget)
+                results.append(result)
+                
+                if result is not None:
+                    budget -= result.cost
+                    if not result.approved and txn["OnCompletion"] != 3:
+                        raise AVMError(result.error)
+        
+        except AVMError as e:
+            self.rollback(mark)
+            return GroupResult(False, str(e), len(results), results)
+        
+        finally:
+            self.in_group = False
+        
+        if mark == 0:
+            self.journal.clear()
+        
+        return GroupResult(True, results=results)
+    
+    def submit_inner(self, ev: "Evaluator", txns: List[Dict[str, Any]]) -> Optional[str]:
+        """Apply an app's inner transactions (called by itxn_submit)"""
+        try:
+            for txn in txns:
+                shortfall = MIN_TXN_FEE - txn["Fee"]
+                if shortfall > 0:
+                    if self.fee_credit < shortfall:
+                        raise AVMError("inner transaction fee too small")
+                    self.fee_credit -= shortfall
+                
+                if txn["TypeEnum"] == 6:
+                    raise AVMError("inner app calls are not supported")
+                self._transfer(txn)
+        except AVMError as e:
+            return str(e)
+        return None
+    
+    def _debit(self, account: bytes, amount: int):
+        balance = self.balances.get(account, 0)
+        if amount > balance:
+            raise AVMError(f"overspend: {encoding.encode_address(account)} has {balance}, needs {amount}")
+        self.put(self.balances, account, balance - amount)
+    
+    def _credit(self, account: bytes, amount: int):
+        self.put(self.balances, account, self.balances.get(account, 0) + amount)
+    
+    def _transfer(self, txn: Dict[str, Any]):
+        """Fee and value movement of a pay or axfer transaction"""
+        sender = txn["Sender"]
+        self._debit(sender, txn["Fee"])
+        
+        if txn["TypeEnum"] == 1:
+            self._debit(sender, txn["Amount"])
+            self._credit(txn["Receiver"], txn["Amount"])
+            
+            if txn["CloseRemainderTo"] != ZERO_ADDRESS:
+                remainder = self.balances.get(sender, 0)
+                self._debit(sender, remainder)
+                self._credit(txn["CloseRemainderTo"], remainder)
+        
+        elif txn["TypeEnum"] == 4:
+            asset_id = txn["XferAsset"]
+            receiver = txn["AssetReceiver"]
+            amount = txn["AssetAmount"]
+            
+            # A 0-amount transfer to yourself is the asset opt-in
+            if sender == receiver and amount == 0:
+                if (sender, asset_id) not in self.holdings:
+                    self.put(self.holdings, (sender, asset_id), 0)
+                return
+            
+            held = self.holdings.get((sender, asset_id))
+            if held is None or held < amount:
+                raise AVMError(f"asset {asset_id}: sender holds {held or 0}, needs {amount}")
+            if (receiver, asset_id) not in self.holdings:
+                raise AVMError(f"asset {asset_id}: receiver not opted in")
+            
+            self.put(self.holdings, (sender, asset_id), held - amount)
+            self.put(self.holdings, (receiver, asset_id), self.holdings[(receiver, asset_id)] + amount)
+            
+            # Closing out: the rest goes to AssetCloseTo and the holding is removed
+            close_to = txn["AssetCloseTo"]
+            if close_to != ZERO_ADDRESS:
+                if (close_to, asset_id) not in self.holdings:
+                    raise AVMError(f"asset {asset_id}: close-to account not opted in")
+                remainder = self.holdings[(sender, asset_id)]
+                self.put(self.holdings, (close_to, asset_id), self.holdings[(close_to, asset_id)] + remainder)
+                self.put(self.holdings, (sender, asset_id), _MISSING)
+        
+        else:
+            raise AVMError(f"unsupported transaction type {txn['TypeEnum']}")
+    
+    def _apply(self, group, index, budget) -> Optional["Result"]:
+        txn = group[index]
+        if txn["TypeEnum"] != 6:
+            self._transfer(txn)
+            return None
+        
+        self._debit(txn["Sender"], txn["Fee"])
+        sender = txn["Sender"]
+        on_complete = txn["OnCompletion"]
+        
+        if txn["ApplicationID"] == 0:
+            app_id = self.next_id
+            self.next_id += 1
+            self.put(self.apps, app_id, App(
+                sender,
+                approval=txn["ApprovalProgram"],
+                clear=txn["ClearStateProgram"],
+                global_schema=(txn["GlobalNumUint"], txn["GlobalNumByteSlice"]),
+                local_schema=(txn["LocalNumUint"], txn["LocalNumByteSlice"])
+            ))
+        else:
+            app_id = txn["ApplicationID"]
+            if app_id not in self.apps:
+                raise AVMError(f"app {app_id} does not exist")
+        
+        app = self.apps[app_id]
+        opted_in = sender in app.local_state
+        
+        if on_complete == 1:
+            if opted_in:
+                raise AVMError("account already opted in")
+            self.put(app.local_state, sender, {})
+        elif on_complete in (2, 3) and not opted_in:
+            raise AVMError("account not opted in")
+        
+        program = app.clear if on_complete == 3 else app.approval
+        result = evaluate(program, group, index, self, budget=budget, app_id=app_id)
+        
+        if result.approved or on_complete == 3:
+            if on_complete in (2, 3):
+                self.put(app.local_state, sender, _MISSING)
+            elif on_complete == 4:
+                self.put(vars(app), "approval", txn["ApprovalProgram"])
+                self.put(vars(app), "clear", txn["ClearStateProgram"])
+            elif on_complete == 5:
+                self.put(self.apps, app_id, _MISSING)
+        
+        if result.approved and on_complete != 5:
+            self._check_schema(app, [sender] + txn["Accounts"])
+        
+        return result
+    
+    def _check_schema(self, app: App, accounts: List[bytes]):
+        if app.global_schema is not None:
+            uints, byte_slices = schema_usage(app.global_state)
+            if uints > app.global_schema[0] or byte_slices > app.global_schema[1]:
+                raise AVMError(f"global state {uints} uints / {byte_slices} bytes exceeds schema {app.global_schema}")
+        
+        if app.local_schema is not None:
+            for account in accounts:
+                if account in app.local_state:
+                    uints, byte_slices = schema_usage(app.local_state[account])
+                    if uints > app.local_schema[0] or byte_slices > app.local_schema[1]:
+                        raise AVMError(f"local state {uints} uints / {byte_slices} bytes exceeds schema {app.local_schema}")
+
+
+# ==========================================
+# ASSEMBLY
+# ==========================================
+
+@dataclass
+class Instruction:
+    op: str
+    args: tuple
+    line: int
+
+
+@dataclass
+class Program:
+    instructions: List[Instruction]
+    labels: Dict[str, int]
+    version: int
+    source: str
+    code: Optional[list] = None    # (handler, args, cost) per instruction, resolved on first run
+    
+    def resolve(self) -> list:
+        if self.code is None:
+            self.code = [
+                (OPS.get(ins.op), ins.args, OPCODE_COSTS.get(ins.op, 1))
+                for ins in self.instructions
+            ]
+        return self.code
+
+
+def tokenize(line: str) -> List[str]:
+    """Split a TEAL line, keeping "quoted strings" whole and dropping // comments"""
+    tokens = []
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if c.isspace():
+            i += 1
+        elif line.startswith("//", i):
+            break
+        elif c == '"':
+            j = i + 1
+            while j < len(line) and line[j] != '"':
+                j += 2 if line[j] == "\\" else 1
+            tokens.append(line[i:j + 1])
+            i = j + 1
+        else:
+            j = i
+            while j < len(line) and not line[j].isspace():
+                j += 1
+            tokens.append(line[i:j])
+            i = j
+    return tokens
+
+
+def parse_int(token: str) -> int:
+    if token in NAMED_INTS:
+        return NAMED_INTS[token]
+    return int(token, 0)
+
+
+def parse_string(token: str) -> bytes:
+    body = token[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if c != "\\":
+            out += c.encode()
+            i += 1
+            continue
+        nxt = body[i + 1]
+        if nxt == "x":
+            out.append(int(body[i + 2:i + 4], 16))
+            i += 4
+        else:
+            out += {"n": b"\n", "r": b"\r", "t": b"\t", '"': b'"', "\\": b"\\"}[nxt]
+            i += 2
+    return bytes(out)
+
+
+def parse_bytes(tokens: List[str]) -> bytes:
+    first = tokens[0]
+    if first.startswith('"'):
+        return parse_string(first)
+    if first.startswith("0x"):
+        return bytes.fromhex(first[2:])
+    if first in ("base64", "b64"):
+        return base64.b64decode(tokens[1])
+    if first.startswith(("base64(", "b64(")):
+        return base64.b64decode(first[first.index("(") + 1:-1])
+    if first in ("base32", "b32"):
+        return base64.b32decode(tokens[1] + "=" * (-len(tokens[1]) % 8))
+    raise AVMError(f"bad byte constant: {' '.join(tokens)}")
+
+
+def assemble(teal: str) -> Program:
+    """Parse TEAL assembly into a Program"""
+    instructions = []
+    labels = {}
+    version = 1
+    
+    for number, raw in enumerate(teal.splitlines(), 1):
+        line = raw.strip()
+        if line.startswith("#pragma version"):
+            version = int(line.split()[2])
+            continue
+        
+        tokens = tokenize(line)
+        if not tokens:
+            continue
+        
+        if tokens[0].endswith(":") and len(tokens) == 1:
+            labels[tokens[0][:-1]] = len(instructions)
+            continue
+        
+        op, rest = tokens[0], tokens[1:]
+        
+        if op in ("int", "pushint"):
+            args = (parse_int(rest[0]),)
+        elif op in ("byte", "pushbytes"):
+            args = (parse_bytes(rest),)
+        elif op == "pushints":
+            args = tuple(parse_int(t) for t in rest)
+        elif op == "pushbytess":
+            args = tuple(parse_bytes([t]) for t in rest)
+        elif op == "addr":
+            args = (encoding.decode_address(rest[0]),)
+        elif op == "method":
+            args = (hashlib.new("sha512_256", parse_string(rest[0])).digest()[:4],)
+        elif op in ("txn", "txna", "gtxn", "gtxna", "gtxns", "gtxnsa", "txnas",
+                    "gtxnas", "gtxnsas", "itxn", "itxna", "gitxn", "gitxna"):
+            args = tuple(t if not t.lstrip("-").isdigit() else int(t) for t in rest)
+        else:
+            args = tuple(int(t) if t.lstrip("-").isdigit() else t for t in rest)
+        
+        instructions.append(Instruction(op, args, number))
+    
+    for ins in instructions:
+        if ins.op in ("b", "bz", "bnz", "callsub", "switch", "match"):
+            for target in ins.args:
+                if target not in labels:
+                    raise AVMError(f"line {ins.line}: unknown label {target}")
+    
+    return Program(instructions, labels, version, teal)
+
+
+# ==========================================
+# EVALUATION
+# ==========================================
+
+@dataclass
+class Result:
+    """Outcome and measurements of one program evaluation"""
+    approved: bool
+    app_id: int = 0
+    error: Optional[str] = None
+    line: Optional[int] = None
+    cost: int = 0
+    max_stack: int = 0
+    state_reads: List[Tuple[str, bytes]] = field(default_factory=list)
+    state_writes: List[Tuple[str, bytes]] = field(default_factory=list)
+    inner_txns: List[Dict[str, Any]] = field(default_factory=list)
+    logs: List[bytes] = field(default_factory=list)
+    
+    def count(self, scope: str, writes: bool = False) -> int:
+        """Number of reads (or writes) of global / local / box state"""
+        accesses = self.state_writes if writes else self.state_reads
+        return sum(1 for s, _ in accesses if s == scope)
+
+
+@dataclass
+class Frame:
+    """Subroutine call; args / returns are set by proto"""
+    return_pc: int
+    base: int
+    args: int = 0
+    returns: Optional[int] = None
+
+
+class Evaluator:
+    """One approval or clear program run against a ledger"""
+    
+    def __init__(self, program: Program, group: List[Dict[str, Any]], index: int,
+                 ledger: Ledger, budget: int, app_id: Optional[int] = None):
+        self.program = program
+        self.group = group
+        self.index = index
+        self.txn = group[index]
+        self.ledger = ledger
+        self.budget = budget
+        
+        # A create call has ApplicationID 0; the caller picks the new ID
+        self.app_id = app_id or self.txn["ApplicationID"]
+        self.app = ledger.apps[self.app_id]
+        self.app_address = application_address(self.app_id)
+        
+        self.stack: List[Any] = []
+        self.scratch: List[Any] = [0] * 256
+        self.frames: List[Frame] = []
+        self.pc = 0
+        self.mark = len(ledger.journal)
+        
+        self.pending_inner: Optional[List[Dict[str, Any]]] = None
+        self.last_inner: List[Dict[str, Any]] = []
+        self.result = Result(approved=False, app_id=self.app_id)
+    
+    # -------- stack helpers --------
+    
+    def push(self, value):
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) > MAX_BYTES:
+                raise AVMError("byte value exceeds 4096 bytes")
+            value = bytes(value)
+        elif not 0 <= value <= MAX_UINT64:
+            raise AVMError("integer overflow")
+        self.stack.append(value)
+        if len(self.stack) > self.result.max_stack:
+            self.result.max_stack = len(self.stack)
+            if self.result.max_stack > MAX_STACK:
+                raise AVMError("stack overflow")
+    
+    def pop(self):
+        if not self.stack:
+            raise AVMError("stack underflow")
+        return self.stack.pop()
+    
+    def pop_int(self) -> int:
+        value = self.pop()
+        if not isinstance(value, int):
+            raise AVMError("expected uint64, got bytes")
+        return value
+    
+    def pop_bytes(self) -> bytes:
+        value = self.pop()
+        if not isinstance(value, bytes):
+            raise AVMError("expected bytes, got uint64")
+        return value
+    
+    # -------- state helpers --------
+    
+    def set_key(self, store: dict, key, value):
+        """Write through the ledger's journal so a rejected run is undone"""
+        self.ledger.put(store, key, value)
+    
+    def account(self, ref) -> bytes:
+        """Account from a 32-byte address or an index into Txn.Accounts"""
+        if isinstance(ref, int):
+            if ref == 0:
+                return self.txn["Sender"]
+            accounts = self.txn["Accounts"]
+            if ref > len(accounts):
+                raise AVMError(f"invalid account index {ref}")
+            return accounts[ref - 1]
+        if len(ref) != 32:
+            raise AVMError("invalid account")
+        return ref
+    
+    def app_ref(self, ref: int) -> int:
+        """App ID from an ID or an index into Txn.Applications"""
+        apps = self.txn["Applications"]
+        if ref == 0:
+            return self.app_id
+        if ref in apps or ref == self.app_id:
+            return ref
+        if ref <= len(apps):
+            return apps[ref - 1]
+        return ref
+    
+    def asset_ref(self, ref: int) -> int:
+        """Asset ID from an ID or an index into Txn.Assets"""
+        assets = self.txn["Assets"]
+        if ref not in assets and ref < len(assets):
+            return assets[ref]
+        return ref
+    
+    def local_store(self, app: App, account: bytes) -> dict:
+        if account not in app.local_state:
+            raise AVMError("account not opted in to app")
+        return app.local_state[account]
+    
+    def read(self, scope, key):
+        self.result.state_reads.append((scope, key))
+    
+    def write(self, scope, key):
+        self.result.state_writes.append((scope, key))
+    
+    # -------- fields --------
+    
+    def txn_field(self, txn, name, index=None):
+        if name == "Type":
+            return TYPE_NAMES.get(txn["TypeEnum"], b"")
+        if name == "GroupIndex":
+            return next((i for i, t in enumerate(self.group) if t is txn), 0)
+        if name == "TxID":
+            return hashlib.sha256(repr(sorted(txn.items())).encode()).digest()
+        if name in ARRAY_FIELDS.values():
+            array = next(a for a, n in ARRAY_FIELDS.items() if n == name)
+            return len(txn.get(array, []))
+        if name in ARRAY_FIELDS:
+            values = txn.get(name, [])
+            if name == "Accounts":
+                values = [txn["Sender"]] + values
+            if index is None or index >= len(values):
+                raise AVMError(f"{name} index {index} out of range")
+            return values[index]
+        if name not in txn:
+            raise AVMError(f"unsupported txn field {name}")
+        return txn[name]
+    
+    def global_field(self, name):
+        if name == "MinTxnFee":
+            return MIN_TXN_FEE
+        if name == "MinBalance":
+            return MIN_BALANCE
+        if name == "MaxTxnLife":
+            return 1000
+        if name == "ZeroAddress":
+            return ZERO_ADDRESS
+        if name == "GroupSize":
+            return len(self.group)
+        if name == "LogicSigVersion":
+            return 8
+        if name == "Round":
+            return self.ledger.round
+        if name == "LatestTimestamp":
+            return self.ledger.timestamp
+        if name == "CurrentApplicationID":
+            return self.app_id
+        if name == "CurrentApplicationAddress":
+            return self.app_address
+        if name == "CreatorAddress":
+            return self.app.creator
+        if name == "GroupID":
+            return bytes(32)
+        if name == "OpcodeBudget":
+            return self.budget - self.result.cost
+        if name == "CallerApplicationID":
+            return 0
+        if name == "CallerApplicationAddress":
+            return ZERO_ADDRESS
+        raise AVMError(f"unsupported global field {name}")
+    
+    # -------- run --------
+    
+    def run(self) -> Result:
+        instructions = self.program.instructions
+        code = self.program.resolve()
+        result = self.result
+        try:
+            while self.pc < len(code):
+                handler, args, cost = code[self.pc]
+                self.pc += 1
+                result.cost += cost
+                if result.cost > self.budget:
+                    raise AVMError(f"dynamic cost budget exceeded ({self.budget})")
+                
+                if handler is None:
+                    raise AVMError(f"unsupported opcode {instructions[self.pc - 1].op}")
+                if handler(self, *args) is _RETURN:
+                    break
+            
+            if len(self.stack) != 1:
+                raise AVMError(f"stack has {len(self.stack)} values at the end")
+            final = self.stack[-1]
+            if not isinstance(final, int):
+                raise AVMError("program ended with bytes on the stack")
+            if final == 0:
+                raise AVMError("program rejected")
+            
+            self.result.approved = True
+        
+        except AVMError as e:
+            self.ledger.rollback(self.mark)
+            self.result.approved = False
+            self.result.error = str(e)
+            self.result.line = instructions[self.pc - 1].line if self.pc else None
+        
+        return self.result
+
+
+_RETURN = object()
+
+
+def evaluate(program: Program, group: List[Dict[str, Any]], index: int,
+             ledger: Ledger, budget: Optional[int] = None, app_id: Optional[int] = None) -> Result:
+    """
+    Run program for the app call at group[index]
+    
+    State changes are applied to the ledger only if the program approves.
+    The opcode budget defaults to 700 per app call in the group (pooled).
+    For a create call pass the app_id the ledger gave the new app.
+    """
+    if budget is None:
+        budget = BUDGET_PER_APP_CALL * sum(1 for t in group if t["TypeEnum"] == 6)
+    if not ledger.in_group:
+        ledger.fee_credit = max(0, sum(t["Fee"] for t in group) - MIN_TXN_FEE * len(group))
+    
+    result = Evaluator(program, group, index, ledger, budget, app_id).run()
+    
+    # Outside of Ledger.send nothing can roll this run back any more
+    if not ledger.in_group:
+        ledger.journal.clear()
+    
+    return result
+
+
+# ==========================================
+# OPCODES
+# ==========================================
+
+OPS = {}
+
+
+def op(*names):
+    def register(fn):
+        for name in names:
+            OPS[name] = fn
+        return fn
+    return register
+
+
+def binary_int(fn):
+    def handler(ev):
+        b = ev.pop_int()
+        a = ev.pop_int()
+        ev.push(fn(a, b))
+    return handler
+
+
+def _div(a, b):
+    if b == 0:
+        raise AVMError("division by zero")
+    return a // b
+
+
+def _mod(a, b):
+    if b == 0:
+        raise AVMError("modulo by zero")
+    return a % b
+
+
+def _sub(a, b):
+    if b > a:
+        raise AVMError("integer underflow")
+    return a - b
+
+
+for _name, _fn in {
+    "+": lambda a, b: a + b,
+    "-": _sub,
+    "*": lambda a, b: a * b,
+    "/": _div,
+    "%": _mod,
+    "<": lambda a, b: int(a < b),
+    ">": lambda a, b: int(a > b),
+    "<=": lambda a, b: int(a <= b),
+    ">=": lambda a, b: int(a >= b),
+    "&&": lambda a, b: int(bool(a) and bool(b)),
+    "||": lambda a, b: int(bool(a) or bool(b)),
+    "&": lambda a, b: a & b,
+    "|": lambda a, b: a | b,
+    "^": lambda a, b: a ^ b,
+    "shl": lambda a, b: (a << b) & MAX_UINT64,
+    "shr": lambda a, b: a >> b,
+}.items():
+    OPS[_name] = binary_int(_fn)
+
+
+def _equal(ev):
+    b = ev.pop()
+    a = ev.pop()
+    if type(a) is not type(b):
+        raise AVMError("cannot compare uint64 to bytes")
+    return a == b
+
+
+@op("==")
+def _eq(ev):
+    ev.push(int(_equal(ev)))
+
+
+@op("!=")
+def _ne(ev):
+    ev.push(int(not _equal(ev)))
+
+
+@op("!")
+def _not(ev):
+    ev.push(int(ev.pop_int() == 0))
+
+
+@op("~")
+def _bitnot(ev):
+    ev.push(MAX_UINT64 ^ ev.pop_int())
+
+
+@op("exp")
+def _exp(ev):
+    b = ev.pop_int()
+    a = ev.pop_int()
+    if a == 0 and b == 0:
+        raise AVMError("0^0 is undefined")
+    if a > 1 and b >= 64:
+        raise AVMError("integer overflow")
+    ev.push(a ** b)
+
+
+@op("sqrt")
+def _sqrt(ev):
+    ev.push(math.isqrt(ev.pop_int()))
+
+
+@op("bitlen")
+def _bitlen(ev):
+    value = ev.pop()
+    ev.push(value.bit_length() if isinstance(value, int) else int.from_bytes(value, "big").bit_length())
+
+
+@op("mulw")
+def _mulw(ev):
+    b = ev.pop_int()
+    a = ev.pop_int()
+    product = a * b
+    ev.push(product >> 64)
+    ev.push(product & MAX_UINT64)
+
+
+@op("addw")
+def _addw(ev):
+    b = ev.pop_int()
+    a = ev.pop_int()
+    total = a + b
+    ev.push(total >> 64)
+    ev.push(total & MAX_UINT64)
+
+
+@op("divmodw")
+def _divmodw(ev):
+    d_low = ev.pop_int()
+    d = (ev.pop_int() << 64) | d_low
+    n_low = ev.pop_int()
+    n = (ev.pop_int() << 64) | n_low
+    if d == 0:
+        raise AVMError("division by zero")
+    q, r = divmod(n, d)
+    for value in (q >> 64, q & MAX_UINT64, r >> 64, r & MAX_UINT64):
+        ev.push(value)
+
+
+# -------- constants --------
+
+@op("int", "pushint", "byte", "pushbytes", "addr", "method")
+def _const(ev, value):
+    ev.push(value)
+
+
+@op("pushints", "pushbytess")
+def _consts(ev, *values):
+    for value in values:
+        ev.push(value)
+
+
+# -------- bytes --------
+
+@op("itob")
+def _itob(ev):
+    ev.push(ev.pop_int().to_bytes(8, "big"))
+
+
+@op("btoi")
+def _btoi(ev):
+    value = ev.pop_bytes()
+    if len(value) > 8:
+        raise AVMError("btoi arg longer than 8 bytes")
+    ev.push(int.from_bytes(value, "big"))
+
+
+@op("len")
+def _len(ev):
+    ev.push(len(ev.pop_bytes()))
+
+
+@op("concat")
+def _concat(ev):
+    b = ev.pop_bytes()
+    a = ev.pop_bytes()
+    ev.push(a + b)
+
+
+def _slice(ev, value, start, end):
+    if start > end or end > len(value):
+        raise AVMError("substring out of range")
+    ev.push(value[start:end])
+
+
+@op("substring")
+def _substring(ev, start, end):
+    _slice(ev, ev.pop_bytes(), start, end)
+
+
+@op("substring3")
+def _substring3(ev):
+    end = ev.pop_int()
+    start = ev.pop_int()
+    _slice(ev, ev.pop_bytes(), start, end)
+
+
+@op("extract")
+def _extract(ev, start, length):
+    value = ev.pop_bytes()
+    _slice(ev, value, start, len(value) if length == 0 else start + length)
+
+
+@op("extract3")
+def _extract3(ev):
+    length = ev.pop_int()
+    start = ev.pop_int()
+    _slice(ev, ev.pop_bytes(), start, start + length)
+
+
+def _extract_uint(size):
+    def handler(ev):
+        start = ev.pop_int()
+        value = ev.pop_bytes()
+        if start + size > len(value):
+            raise AVMError("extract out of range")
+        ev.push(int.from_bytes(value[start:start + size], "big"))
+    return handler
+
+
+OPS["extract_uint16"] = _extract_uint(2)
+OPS["extract_uint32"] = _extract_uint(4)
+OPS["extract_uint64"] = _extract_uint(8)
+
+
+@op("replace2")
+def _replace2(ev, start):
+    new = ev.pop_bytes()
+    value = ev.pop_bytes()
+    if start + len(new) > len(value):
+        raise AVMError("replace out of range")
+    ev.push(value[:start] + new + value[start + len(new):])
+
+
+@op("replace3")
+def _replace3(ev):
+    new = ev.pop_bytes()
+    start = ev.pop_int()
+    value = ev.pop_bytes()
+    if start + len(new) > len(value):
+        raise AVMError("replace out of range")
+    ev.push(value[:start] + new + value[start + len(new):])
+
+
+@op("getbyte")
+def _getbyte(ev):
+    index = ev.pop_int()
+    value = ev.pop_bytes()
+    if index >= len(value):
+        raise AVMError("getbyte out of range")
+    ev.push(value[index])
+
+
+@op("setbyte")
+def _setbyte(ev):
+    byte = ev.pop_int()
+    index = ev.pop_int()
+    value = bytearray(ev.pop_bytes())
+    if index >= len(value) or byte > 255:
+        raise AVMError("setbyte out of range")
+    value[index] = byte
+    ev.push(bytes(value))
+
+
+@op("bzero")
+def _bzero(ev):
+    ev.push(bytes(ev.pop_int()))
+
+
+def _keccak256(value):
+    from Cryptodome.Hash import keccak
+    return keccak.new(digest_bits=256, data=value).digest()
+
+
+def hash_op(fn):
+    def handler(ev):
+        ev.push(fn(ev.pop_bytes()))
+    return handler
+
+
+OPS["sha256"] = hash_op(lambda v: hashlib.sha256(v).digest())
+OPS["sha512_256"] = hash_op(lambda v: hashlib.new("sha512_256", v).digest())
+OPS["keccak256"] = hash_op(_keccak256)
+
+
+# -------- flow --------
+
+@op("err")
+def _err(ev):
+    raise AVMError("err opcode executed")
+
+
+@op("assert")
+def _assert(ev):
+    if ev.pop_int() == 0:
+        raise AVMError("assert failed")
+
+
+@op("return")
+def _return(ev):
+    value = ev.pop()
+    ev.stack = [value]
+    return _RETURN
+
+
+@op("b")
+def _b(ev, label):
+    ev.pc = ev.program.labels[label]
+
+
+@op("bz")
+def _bz(ev, label):
+    if ev.pop_int() == 0:
+        ev.pc = ev.program.labels[label]
+
+
+@op("bnz")
+def _bnz(ev, label):
+    if ev.pop_int() != 0:
+        ev.pc = ev.program.labels[label]
+
+
+@op("switch")
+def _switch(ev, *labels):
+    index = ev.pop_int()
+    if index < len(labels):
+        ev.pc = ev.program.labels[labels[index]]
+
+
+@op("match")
+def _match(ev, *labels):
+    target = ev.pop()
+    candidates = [ev.pop() for _ in labels][::-1]
+    for label, candidate in zip(labels, candidates):
+        if candidate == target:
+            ev.pc = ev.program.labels[label]
+            return
+
+
+@op("callsub")
+def _callsub(ev, label):
+    if len(ev.frames) >= 2048:
+        raise AVMError("call stack too deep")
+    ev.frames.append(Frame(ev.pc, len(ev.stack)))
+    ev.pc = ev.program.labels[label]
+
+
+def _frame(ev):
+    if not ev.frames or ev.frames[-1].returns is None:
+        raise AVMError("frame access without proto")
+    return ev.frames[-1]
+
+
+@op("proto")
+def _proto(ev, args, returns):
+    if not ev.frames:
+        raise AVMError("proto outside of a subroutine")
+    if len(ev.stack) < args:
+        raise AVMError("proto: not enough arguments")
+    frame = ev.frames[-1]
+    frame.base, frame.args, frame.returns = len(ev.stack), args, returns
+
+
+@op("retsub")
+def _retsub(ev):
+    if not ev.frames:
+        raise AVMError("retsub outside of a subroutine")
+    frame = ev.frames.pop()
+    if frame.returns is not None:
+        # The return values are the first R slots of the frame (PyTeal
+        # buries them at frame index 0); locals above them are dropped
+        if len(ev.stack) < frame.base + frame.returns:
+            raise AVMError(f"retsub: proto declared {frame.returns} return value(s)")
+        results = ev.stack[frame.base:frame.base + frame.returns]
+        del ev.stack[frame.base - frame.args:]
+        ev.stack.extend(results)
+    ev.pc = frame.return_pc
+
+
+@op("frame_dig")
+def _frame_dig(ev, offset):
+    frame = _frame(ev)
+    ev.push(ev.stack[frame.base + offset])
+
+
+@op("frame_bury")
+def _frame_bury(ev, offset):
+    frame = _frame(ev)
+    ev.stack[frame.base + offset] = ev.pop()
+
+
+# -------- stack --------
+
+@op("pop")
+def _pop(ev):
+    ev.pop()
+
+
+@op("popn")
+def _popn(ev, n):
+    for _ in range(n):
+        ev.pop()
+
+
+@op("dup")
+def _dup(ev):
+    value = ev.pop()
+    ev.push(value)
+    ev.push(value)
+
+
+@op("dup2")
+def _dup2(ev):
+    b = ev.pop()
+    a = ev.pop()
+    for value in (a, b, a, b):
+        ev.push(value)
+
+
+@op("dupn")
+def _dupn(ev, n):
+    value = ev.pop()
+    for _ in range(n + 1):
+        ev.push(value)
+
+
+@op("swap")
+def _swap(ev):
+    b = ev.pop()
+    a = ev.pop()
+    ev.push(b)
+    ev.push(a)
+
+
+@op("select")
+def _select(ev):
+    cond = ev.pop_int()
+    b = ev.pop()
+    a = ev.pop()
+    ev.push(b if cond else a)
+
+
+@op("dig")
+def _dig(ev, n):
+    if n >= len(ev.stack):
+        raise AVMError("dig past the bottom of the stack")
+    ev.push(ev.stack[-1 - n])
+
+
+@op("bury")
+def _bury(ev, n):
+    value = ev.pop()
+    if n == 0 or n > len(ev.stack):
+        raise AVMError("bury out of range")
+    ev.stack[-n] = value
+
+
+@op("cover")
+def _cover(ev, n):
+    value = ev.pop()
+    if n > len(ev.stack):
+        raise AVMError("cover out of range")
+    ev.stack.insert(len(ev.stack) - n, value)
+    ev.result.max_stack = max(ev.result.max_stack, len(ev.stack))
+
+
+@op("uncover")
+def _uncover(ev, n):
+    if n >= len(ev.stack):
+        raise AVMError("uncover out of range")
+    ev.stack.append(ev.stack.pop(-1 - n))
+
+
+# -------- scratch --------
+
+@op("load")
+def _load(ev, slot):
+    ev.push(ev.scratch[slot])
+
+
+@op("store")
+def _store(ev, slot):
+    ev.scratch[slot] = ev.pop()
+
+
+@op("loads")
+def _loads(ev):
+    ev.push(ev.scratch[ev.pop_int()])
+
+
+@op("stores")
+def _stores(ev):
+    value = ev.pop()
+    ev.scratch[ev.pop_int()] = value
+
+
+# -------- transaction fields --------
+
+@op("txn")
+def _txn(ev, name, index=None):
+    ev.push(ev.txn_field(ev.txn, name, index))
+
+
+@op("txna")
+def _txna(ev, name, index):
+    ev.push(ev.txn_field(ev.txn, name, index))
+
+
+@op("txnas")
+def _txnas(ev, name):
+    ev.push(ev.txn_field(ev.txn, name, ev.pop_int()))
+
+
+def _group_txn(ev, position):
+    if position >= len(ev.group):
+        raise AVMError(f"gtxn {position} out of group of {len(ev.group)}")
+    return ev.group[position]
+
+
+@op("gtxn", "gtxna")
+def _gtxn(ev, position, name, index=None):
+    ev.push(ev.txn_field(_group_txn(ev, position), name, index))
+
+
+@op("gtxnas")
+def _gtxnas(ev, position, name):
+    index = ev.pop_int()
+    ev.push(ev.txn_field(_group_txn(ev, position), name, index))
+
+
+@op("gtxns", "gtxnsa")
+def _gtxns(ev, name, index=None):
+    ev.push(ev.txn_field(_group_txn(ev, ev.pop_int()), name, index))
+
+
+@op("gtxnsas")
+def _gtxnsas(ev, name):
+    index = ev.pop_int()
+    ev.push(ev.txn_field(_group_txn(ev, ev.pop_int()), name, index))
+
+
+@op("global")
+def _global(ev, name):
+    ev.push(ev.global_field(name))
+
+
+# -------- app state --------
+
+def _check_key(key):
+    if not isinstance(key, bytes) or len(key) > 64:
+        raise AVMError("state key must be bytes of at most 64")
+
+
+@op("app_global_get")
+def _app_global_get(ev):
+    key = ev.pop_bytes()
+    ev.read("global", key)
+    ev.push(ev.app.global_state.get(key, 0))
+
+
+@op("app_global_get_ex")
+def _app_global_get_ex(ev):
+    key = ev.pop_bytes()
+    app = ev.ledger.apps.get(ev.app_ref(ev.pop_int()))
+    ev.read("global", key)
+    value = app.global_state.get(key, _MISSING) if app else _MISSING
+    ev.push(0 if value is _MISSING else value)
+    ev.push(0 if value is _MISSING else 1)
+
+
+@op("app_global_put")
+def _app_global_put(ev):
+    value = ev.pop()
+    key = ev.pop_bytes()
+    _check_key(key)
+    ev.write("global", key)
+    ev.set_key(ev.app.global_state, key, value)
+
+
+@op("app_global_del")
+def _app_global_del(ev):
+    key = ev.pop_bytes()
+    ev.write("global", key)
+    ev.set_key(ev.app.global_state, key, _MISSING)
+
+
+@op("app_local_get")
+def _app_local_get(ev):
+    key = ev.pop_bytes()
+    account = ev.account(ev.pop())
+    ev.read("local", key)
+    ev.push(ev.local_store(ev.app, account).get(key, 0))
+
+
+@op("app_local_get_ex")
+def _app_local_get_ex(ev):
+    key = ev.pop_bytes()
+    app = ev.ledger.apps.get(ev.app_ref(ev.pop_int()))
+    account = ev.account(ev.pop())
+    ev.read("local", key)
+    store = app.local_state.get(account, {}) if app else {}
+    value = store.get(key, _MISSING)
+    ev.push(0 if value is _MISSING else value)
+    ev.push(0 if value is _MISSING else 1)
+
+
+@op("app_local_put")
+def _app_local_put(ev):
+    value = ev.pop()
+    key = ev.pop_bytes()
+    account = ev.account(ev.pop())
+    _check_key(key)
+    ev.write("local", key)
+    ev.set_key(ev.local_store(ev.app, account), key, value)
+
+
+@op("app_local_del")
+def _app_local_del(ev):
+    key = ev.pop_bytes()
+    account = ev.account(ev.pop())
+    ev.write("local", key)
+    ev.set_key(ev.local_store(ev.app, account), key, _MISSING)
+
+
+@op("app_opted_in")
+def _app_opted_in(ev):
+    app = ev.ledger.apps.get(ev.app_ref(ev.pop_int()))
+    account = ev.account(ev.pop())
+    ev.push(int(app is not None and account in app.local_state))
+
+
+# -------- boxes --------
+
+def _box(ev, name, required=True):
+    if not isinstance(name, bytes) or not 1 <= len(name) <= 64:
+        raise AVMError("box name must be 1-64 bytes")
+    box = ev.app.boxes.get(name)
+    if box is None and required:
+        raise AVMError(f"box {name!r} does not exist")
+    return box
+
+
+@op("box_create")
+def _box_create(ev):
+    size = ev.pop_int()
+    name = ev.pop_bytes()
+    if size > 32768:
+        raise AVMError("box size exceeds 32768")
+    exists = _box(ev, name, required=False) is not None
+    if exists and len(ev.app.boxes[name]) != size:
+        raise AVMError("box exists with a different size")
+    if not exists:
+        ev.write("box", name)
+        ev.set_key(ev.app.boxes, name, bytes(size))
+    ev.push(int(not exists))
+
+
+@op("box_len")
+def _box_len(ev):
+    name = ev.pop_bytes()
+    box = _box(ev, name, required=False)
+    ev.read("box", name)
+    ev.push(0 if box is None else len(box))
+    ev.push(int(box is not None))
+
+
+@op("box_get")
+def _box_get(ev):
+    name = ev.pop_bytes()
+    box = _box(ev, name, required=False)
+    ev.read("box", name)
+    ev.push(b"" if box is None else bytes(box))
+    ev.push(int(box is not None))
+
+
+@op("box_extract")
+def _box_extract(ev):
+    length = ev.pop_int()
+    start = ev.pop_int()
+    name = ev.pop_bytes()
+    box = _box(ev, name)
+    ev.read("box", name)
+    if start + length > len(box):
+        raise AVMError("box_extract out of range")
+    ev.push(bytes(box[start:start + length]))
+
+
+@op("box_replace")
+def _box_replace(ev):
+    value = ev.pop_bytes()
+    start = ev.pop_int()
+    name = ev.pop_bytes()
+    box = _box(ev, name)
+    if start + len(value) > len(box):
+        raise AVMError("box_replace out of range")
+    ev.write("box", name)
+    ev.set_key(ev.app.boxes, name, bytes(box[:start]) + value + bytes(box[start + len(value):]))
+
+
+@op("box_put")
+def _box_put(ev):
+    value = ev.pop_bytes()
+    name = ev.pop_bytes()
+    box = _box(ev, name, required=False)
+    if box is not None and len(box) != len(value):
+        raise AVMError("box_put with a different size")
+    ev.write("box", name)
+    ev.set_key(ev.app.boxes, name, value)
+
+
+@op("box_del")
+def _box_del(ev):
+    name = ev.pop_bytes()
+    exists = _box(ev, name, required=False) is not None
+    if exists:
+        ev.write("box", name)
+        ev.set_key(ev.app.boxes, name, _MISSING)
+    ev.push(int(exists))
+
+
+# -------- balances and assets --------
+
+@op("balance")
+def _balance(ev):
+    ev.push(ev.ledger.balances.get(ev.account(ev.pop()), 0))
+
+
+@op("min_balance")
+def _min_balance(ev):
+    ev.account(ev.pop())
+    ev.push(MIN_BALANCE)
+
+
+@op("asset_holding_get")
+def _asset_holding_get(ev, name):
+    asset_id = ev.asset_ref(ev.pop_int())
+    account = ev.account(ev.pop())
+    amount = ev.ledger.holdings.get((account, asset_id))
+    if amount is None:
+        ev.push(0)
+        ev.push(0)
+    else:
+        ev.push(amount if name == "AssetBalance" else 0)
+        ev.push(1)
+
+
+@op("log")
+def _log(ev):
+    value = ev.pop_bytes()
+    if len(ev.result.logs) >= 32:
+        raise AVMError("too many log calls")
+    ev.result.logs.append(value)
+
+
+# -------- inner transactions --------
+
+INNER_ADDRESS_FIELDS = ("Receiver", "CloseRemainderTo", "AssetSender", "AssetReceiver",
+                        "AssetCloseTo", "RekeyTo", "Sender")
+
+
+@op("itxn_begin")
+def _itxn_begin(ev):
+    if ev.pending_inner is not None:
+        raise AVMError("itxn_begin without itxn_submit")
+    ev.pending_inner = [transaction(ev.app_address, 0, Fee=MIN_TXN_FEE)]
+
+
+@op("itxn_next")
+def _itxn_next(ev):
+    if ev.pending_inner is None:
+        raise AVMError("itxn_next without itxn_begin")
+    ev.pending_inner.append(transaction(ev.app_address, 0, Fee=MIN_TXN_FEE))
+
+
+@op("itxn_field")
+def _itxn_field(ev, name):
+    if ev.pending_inner is None:
+        raise AVMError("itxn_field without itxn_begin")
+    value = ev.pop()
+    txn = ev.pending_inner[-1]
+    
+    if name in INNER_ADDRESS_FIELDS:
+        value = ev.account(value)
+    elif name == "Type":
+        value = {v: k for k, v in TYPE_NAMES.items()}.get(value, 0)
+        name = "TypeEnum"
+    elif name in ("XferAsset", "ConfigAsset", "FreezeAsset"):
+        value = ev.asset_ref(value)
+    
+    if name in ARRAY_FIELDS:
+        txn[name] = txn[name] + [value]
+    else:
+        txn[name] = value
+
+
+@op("itxn_submit")
+def _itxn_submit(ev):
+    if not ev.pending_inner:
+        raise AVMError("itxn_submit without itxn_begin")
+    group, ev.pending_inner = ev.pending_inner, None
+    
+    for txn in group:
+        if txn["TypeEnum"] == 0:
+            raise AVMError("inner transaction without a type")
+        if txn["Sender"] != ev.app_address:
+            raise AVMError("inner transaction sender is not the app")
+    
+    submit = getattr(ev.ledger, "submit_inner", None)
+    if submit is not None:
+        error = submit(ev, group)
+        if error:
+            raise AVMError(error)
+    
+    ev.result.inner_txns.extend(group)
+    ev.last_inner = group
+
+
+@op("itxn", "itxna")
+def _itxn(ev, name, index=None):
+    if not ev.last_inner:
+        raise AVMError("no inner transaction submitted")
+    ev.push(ev.txn_field(ev.last_inner[-1], name, index))
+
+
+@op("gitxn", "gitxna")
+def _gitxn(ev, position, name, index=None):
+    if position >= len(ev.last_inner):
+        raise AVMError("gitxn out of range")
+    ev.push(ev.txn_field(ev.last_inner[position], name, index))
@@ -0,0 +1 @@
+"""CampusMint App Package"""
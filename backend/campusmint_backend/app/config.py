@@ -0,0 +1,81 @@
+"""
+Configuration management using Pydantic Settings
+"""
+
+from pydantic_settings import BaseSettings
+from typing import List
+import os
+
+
+class Settings(BaseSettings):
+    # Algorand
+    algod_address: str = "https://testnet-api.algonode.cloud"
+    indexer_address: str = "https://testnet-idx.algonode.cloud"
+    algod_token: str = ""
+    
+    # Assets
+    cinr_asset_id: int = 755378709
+    cinr_decimals: int = 2
+    
+    # Smart Contracts
+    vault_app_id: int = 755379222
+    event_app_id: int = 0
+    treasury_app_id: int = 0
+    nft_ticket_app_id: int = 0
+    vault_factory_app_id: int = 0
+    
+    # Admin
+    admin_address: str = ""
+    admin_mnemonic: str = ""
+    
+    # Treasury multisig (comma separated signer addresses, in multisig order)
+    treasury_multisig_signers: str = ""
+    treasury_multisig_threshold: int = 2
+    
+    # Multisig signers who approve as club lead (comma separated);
+    # admin_address approves as admin. A release needs both.
+    treasury_club_lead_addresses: str = ""
+    
+    # Treasury releases left "releasing" (timeouts, crashes) are checked
+    # against the chain this often
+    release_reconcile_seconds: int = 30
+    
+    # Crowdfunding donor aggregation
+    donor_sync_seconds: int = 30
+    
+    # Vault factory index
+    vault_factory_sync_seconds: int = 30
+    
+    # Ticket pool (pre-minted ticket ASAs)
+    ticket_pool_low_watermark: int = 50
+    ticket_pool_refill_size: int = 200
+    mint_checkpoint_dir: str = "."
+    
+    # Seat reservations
+    seat_hold_seconds: int = 300
+    seat_hold_sweep_seconds: int = 5
+    
+    # Checkout waiting room
+    waiting_room_admit_rate: float = 5.0     # checkouts admitted per second per event
+    waiting_room_max_in_flight: int = 20     # concurrent checkouts per event
+    waiting_room_admit_ttl: int = 60         # seconds an admitted buyer has to pay
+    
+    # Database
+    database_url: str = "sqlite:///./campusmint.db"
+    
+    # API
+    api_host: str = "0.0.0.0"
+    api_port: int = 8000
+    debug: bool = True
+    
+    # Security
+    secret_key: str = "your-secret-key-change-in-production"
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = False
+
+
+settings = Settings()
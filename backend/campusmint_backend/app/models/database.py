@@ -0,0 +1,273 @@
+"""
+SQLAlchemy database models
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Index
+from sqlalchemy.ext.declarative import declarative_base
+from datetime import datetime
+
+Base = declarative_base()
+
+
+class Event(Base):
+    """Event model"""
+    __tablename__ = "events"
+    __table_args__ = (
+        # Range scans for /event/upcoming, in cursor order
+        Index("ix_events_starts_at", "starts_at", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    app_id = Column(Integer, unique=True, index=True)
+    name = Column(String, index=True)
+    description = Column(Text)
+    location = Column(String)
+    date = Column(String)
+    starts_at = Column(DateTime, nullable=True)
+    ends_at = Column(DateTime, nullable=True)
+    ticket_price = Column(Float)
+    max_tickets = Column(Integer)
+    tickets_sold = Column(Integer, default=0)
+    seats_held = Column(Integer, default=0, server_default="0")
+    organizer_address = Column(String, index=True)
+    nft_asset_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Ticket(Base):
+    """NFT Ticket model"""
+    __tablename__ = "tickets"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, index=True)  # Event app_id
+    ticket_asset_id = Column(Integer, unique=True, index=True)
+    buyer_address = Column(String, index=True)
+    event_name = Column(String)
+    price_paid = Column(Float)
+    purchased_at = Column(DateTime, default=datetime.utcnow)
+    verified_at = Column(DateTime, nullable=True)
+    entry_count = Column(Integer, default=0)
+    is_used = Column(Boolean, default=False)
+    delivery_status = Column(String, nullable=True)  # pool tickets: pending, sent, delivered
+    delivery_txid = Column(String, nullable=True)
+    delivery_last_valid = Column(Integer, nullable=True)
+
+
+class SeatHold(Base):
+    """Time-limited seat reservation (or waitlist entry) for an event"""
+    __tablename__ = "seat_holds"
+    __table_args__ = (
+        Index("ix_seat_holds_event_status", "event_id", "status", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    token = Column(String, unique=True, index=True)
+    event_id = Column(Integer)  # Event app_id
+    buyer_address = Column(String, index=True)
+    status = Column(String, default="held")  # held, waiting, paying, confirmed, released, expired
+    txn_id = Column(String, nullable=True)  # payment submitted while "paying"
+    last_valid = Column(Integer, nullable=True)  # last round the payment can land in
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True, index=True)
+
+
+class EventMetricBucket(Base):
+    """Per-minute sales and check-in rollup for an event"""
+    __tablename__ = "event_metric_buckets"
+    __table_args__ = (
+        Index("ix_event_metric_buckets_event_minute", "event_id", "minute", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer)  # Event app_id
+    minute = Column(DateTime)  # bucket start (UTC, seconds truncated)
+    sales = Column(Integer, default=0, server_default="0")
+    revenue = Column(Float, default=0, server_default="0")
+    checkins = Column(Integer, default=0, server_default="0")
+
+
+class VaultEntry(Base):
+    """Savings vault entry"""
+    __tablename__ = "vault_entries"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    address = Column(String, unique=True, index=True)
+    total_deposited = Column(Float, default=0)
+    goal_amount = Column(Float, nullable=True)
+    lock_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    emergency_withdrawals = Column(Integer, default=0)
+
+
+class VaultFactory(Base):
+    """Vault factory app (one box per vault) indexed from chain history"""
+    __tablename__ = "vault_factories"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    app_id = Column(Integer, unique=True, index=True)
+    vault_count = Column(Integer, default=0)  # vaults created so far
+    last_round = Column(Integer, default=0)  # checkpoint: history synced up to here
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class FactoryVault(Base):
+    """One vault of a vault factory app (mirror of its box)"""
+    __tablename__ = "factory_vaults"
+    __table_args__ = (
+        Index("ix_factory_vaults_app_vault", "app_id", "vault_id", unique=True),
+        Index("ix_factory_vaults_owner", "owner", "status", "vault_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    app_id = Column(Integer)
+    vault_id = Column(Integer)
+    owner = Column(String)
+    beneficiary = Column(String, index=True)
+    asset_id = Column(Integer, default=0)  # 0 = ALGO
+    unlock_time = Column(Integer)  # unix seconds
+    amount = Column(Integer, default=0)  # base units
+    status = Column(String, default="active")  # active, withdrawn
+    created_round = Column(Integer)
+    updated_round = Column(Integer)
+
+
+class TreasuryAllocation(Base):
+    """Treasury allocation record"""
+    __tablename__ = "treasury_allocations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    club_id = Column(String, index=True)
+    amount = Column(Float)
+    purpose = Column(String)
+    status = Column(String, default="pending")  # pending, approved, releasing, released, netted
+    admin_approval = Column(Boolean, default=False)
+    club_lead_approval = Column(Boolean, default=False)
+    approved_by = Column(String, nullable=True)
+    txn_id = Column(String, nullable=True)
+    last_valid = Column(Integer, nullable=True)  # last round the release txn can confirm in
+    settlement_id = Column(Integer, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    released_at = Column(DateTime, nullable=True)
+
+
+class ClubTransfer(Base):
+    """Amount one club (or the treasury) owes another"""
+    __tablename__ = "club_transfers"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    from_club = Column(String, index=True)  # club_id or "treasury"
+    to_club = Column(String, index=True)
+    amount = Column(Float)
+    purpose = Column(String)
+    status = Column(String, default="pending")  # pending, netted, settled
+    settlement_id = Column(Integer, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ClubLedgerEntry(Base):
+    """Append-only club ledger line with the running balance after it"""
+    __tablename__ = "club_ledger"
+    __table_args__ = (
+        Index("ix_club_ledger_club_seq", "club_id", "seq", unique=True),
+        Index("ix_club_ledger_club_time", "club_id", "created_at", "seq"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    club_id = Column(String)
+    seq = Column(Integer)  # 1, 2, 3... per club
+    entry_type = Column(String)  # release, settlement
+    amount = Column(Float)  # signed: credit > 0, debit < 0
+    balance = Column(Float)  # running balance including this entry
+    ref = Column(String, nullable=True)  # e.g. allocation:12, settlement:3
+    txn_id = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ReleaseProposal(Base):
+    """Treasury release group collecting multisig signatures"""
+    __tablename__ = "release_proposals"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    allocation_ids = Column(Text)  # JSON list, in group order
+    recipients = Column(Text)  # JSON {allocation_id: address}
+    txns = Column(Text)  # JSON list of msgpack multisig txns (merged so far)
+    signers = Column(Text, default="[]")  # JSON list of addresses that signed
+    threshold = Column(Integer)
+    last_valid = Column(Integer)
+    status = Column(String, default="collecting")  # collecting, submitting, submitted, released, failed, expired
+    version = Column(Integer, default=0)  # bumped on every signature merge
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class DonationCampaign(Base):
+    """Crowdfunding app (NGO contract) aggregated from chain history"""
+    __tablename__ = "donation_campaigns"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    app_id = Column(Integer, unique=True, index=True)
+    asset_id = Column(Integer)
+    total = Column(Integer, default=0)  # base units
+    donor_count = Column(Integer, default=0)
+    donation_count = Column(Integer, default=0)
+    last_round = Column(Integer, default=0)  # checkpoint: history synced up to here
+    refunded = Column(Integer, default=0, server_default="0")  # base units paid back
+    refund_cursor = Column(Integer, default=0, server_default="0")  # last campaign_donors.id refunded
+    refund_status = Column(String, nullable=True)  # refunding, completed
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class CampaignDonor(Base):
+    """Per-donor total for a campaign"""
+    __tablename__ = "campaign_donors"
+    __table_args__ = (
+        Index("ix_campaign_donors_app_donor", "app_id", "donor", unique=True),
+        Index("ix_campaign_donors_leaderboard", "app_id", "total", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    app_id = Column(Integer)
+    donor = Column(String)
+    total = Column(Integer, default=0)  # base units
+    donations = Column(Integer, default=0)
+    first_round = Column(Integer)
+    last_round = Column(Integer)
+    refund_skipped = Column(Boolean, default=False, server_default="0")  # no CINR holding when refunded
+
+
+class Settlement(Base):
+    """Net transfers computed for one settlement window"""
+    __tablename__ = "settlements"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    window_end = Column(DateTime)
+    gross_flows = Column(Integer)
+    net_transfers = Column(Integer)
+    transfers = Column(Text)  # JSON list of {from, to, amount}
+    addresses = Column(Text, nullable=True)  # JSON {party: address} for the prepared group
+    txns = Column(Text, nullable=True)  # JSON list of msgpack unsigned txns, in group order
+    txn_ids = Column(Text, nullable=True)  # JSON list, set once the group is submitted
+    last_valid = Column(Integer, nullable=True)  # last round the group can confirm in
+    status = Column(String, default="open")  # open, signing, submitted, settled
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    settled_at = Column(DateTime, nullable=True)
+
+
+class TransactionLog(Base):
+    """Transaction history log"""
+    __tablename__ = "transaction_logs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    txn_id = Column(String, unique=True, index=True)
+    type = Column(String)  # deposit, withdraw, payment, allocation
+    address = Column(String, index=True)
+    amount = Column(Float)
+    status = Column(String)  # pending, confirmed, failed
+    confirmed_round = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    confirmed_at = Column(DateTime, nullable=True)
+    note = Column(Text, nullable=True)
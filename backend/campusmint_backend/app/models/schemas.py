@@ -0,0 +1,333 @@
+"""
+Pydantic models for request/response validation
+"""
+
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
+from datetime import datetime
+
+
+# ============================================================================
+# VAULT MODELS
+# ============================================================================
+
+class VaultDepositRequest(BaseModel):
+    """Student vault deposit request"""
+    signed_txn: str = Field(..., description="Base64 encoded signed transaction")
+    amount: float = Field(..., gt=0, description="Amount in rupees")
+    lock_days: int = Field(..., gt=0, description="Days to lock funds")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "signed_txn": "base64_encoded_txn_string",
+                "amount": 5000.00,
+                "lock_days": 30
+            }
+        }
+
+
+class VaultWithdrawRequest(BaseModel):
+    """Student vault withdrawal request"""
+    signed_txn: str = Field(..., description="Base64 encoded signed transaction")
+    reason: str = Field(..., description="Reason for withdrawal (emergency, goal_reached)")
+    emergency_password: Optional[str] = Field(None, description="Password for emergency withdrawal")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "signed_txn": "base64_encoded_txn_string",
+                "reason": "emergency",
+                "emergency_password": "secure_password_123"
+            }
+        }
+
+
+class VaultStatus(BaseModel):
+    """Vault status response"""
+    address: str
+    total_saved: float
+    goal_amount: float
+    progress_percent: float
+    unlock_timestamp: int
+    locked: bool
+    days_remaining: int
+    emergency_available: bool
+    
+
+class VaultBalanceResponse(BaseModel):
+    """Vault balance response"""
+    address: str
+    balance_cinr: float
+    balance_usd: Optional[float] = None
+    account_age_days: int
+    can_withdraw: bool
+
+
+# ============================================================================
+# EVENT MODELS
+# ============================================================================
+
+class EventCreateRequest(BaseModel):
+    """Create new event"""
+    name: str = Field(..., description="Event name")
+    description: str = Field(..., description="Event description")
+    location: str = Field(..., description="Event location")
+    date: str = Field(..., description="Event date (YYYY-MM-DD)")
+    starts_at: Optional[datetime] = Field(None, description="Start time (default: start of date)")
+    ends_at: Optional[datetime] = Field(None, description="End time (default: end of date)")
+    ticket_price: float = Field(..., gt=0, description="Ticket price in CINR")
+    max_tickets: int = Field(..., gt=0, description="Maximum tickets")
+    organizer_address: str = Field(..., description="Organizer wallet address")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Freshers Party 2024",
+                "description": "Welcome to campus!",
+                "location": "Main Auditorium",
+                "date": "2024-03-15",
+                "starts_at": "2024-03-15T18:00:00Z",
+                "ends_at": "2024-03-15T23:00:00Z",
+                "ticket_price": 500.0,
+                "max_tickets": 1000,
+                "organizer_address": "ALGOACCOUNT..."
+            }
+        }
+
+
+class EventPaymentRequest(BaseModel):
+    """Payment for event ticket"""
+    signed_txn: str = Field(..., description="Base64 encoded signed transaction")
+    event_id: int = Field(..., description="Event ID (Algorand app ID)")
+    hold_token: Optional[str] = Field(None, description="Seat hold token from /event/{id}/hold")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "signed_txn": "base64_encoded_txn",
+                "event_id": 755379222,
+                "hold_token": "q0Z6b1n2..."
+            }
+        }
+
+
+class SeatHoldRequest(BaseModel):
+    """Reserve a seat before paying"""
+    buyer_address: str = Field(..., description="Buyer wallet address")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "buyer_address": "ALGOACCOUNT..."
+            }
+        }
+
+
+class QueueJoinRequest(BaseModel):
+    """Join the checkout waiting room"""
+    buyer_address: str = Field(..., description="Buyer wallet address (one queue entry each)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "buyer_address": "ALGOACCOUNT..."
+            }
+        }
+
+
+class EventResponse(BaseModel):
+    """Event details response"""
+    id: int
+    name: str
+    description: str
+    location: str
+    date: str
+    ticket_price: float
+    max_tickets: int
+    tickets_sold: int
+    organizer_address: str
+    nft_asset_id: int
+    created_at: datetime
+
+
+# ============================================================================
+# TICKET MODELS
+# ============================================================================
+
+class TicketVerifyRequest(BaseModel):
+    """QR code ticket verification"""
+    event_id: int = Field(..., description="Event app ID")
+    wallet: str = Field(..., description="Attendee wallet address")
+    ticket_asset_id: int = Field(..., description="Ticket NFT asset ID")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "event_id": 755379222,
+                "wallet": "ALGOACCOUNT...",
+                "ticket_asset_id": 123456
+            }
+        }
+
+
+class TicketVerifyResponse(BaseModel):
+    """Ticket verification response"""
+    valid: bool
+    message: str
+    event_name: str
+    attendee: str
+    timestamp: datetime
+    entry_count: int
+
+
+class TicketQRPayload(BaseModel):
+    """QR code payload structure"""
+    event_id: int
+    wallet: str
+    ticket_id: int
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "event_id": 755379222,
+                "wallet": "ALGOACCOUNT...",
+                "ticket_id": 123456
+            }
+        }
+
+
+# ============================================================================
+# TREASURY MODELS
+# ============================================================================
+
+class TreasuryAllocateRequest(BaseModel):
+    """Treasury fund allocation"""
+    signed_txn: str = Field(..., description="Base64 encoded signed transaction")
+    amount: float = Field(..., gt=0, description="Amount in CINR")
+    club_id: str = Field(..., description="Club identifier")
+    purpose: str = Field(..., description="Purpose of allocation")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "signed_txn": "base64_encoded_txn",
+                "amount": 10000.0,
+                "club_id": "sports_club_001",
+                "purpose": "Sports day prizes"
+            }
+        }
+
+
+class TreasuryBatchApproveRequest(BaseModel):
+    """Approve many allocations at once"""
+    allocation_ids: List[int] = Field(..., min_length=1, max_length=1000, description="Allocation IDs")
+    approved_by: str = Field(..., description="Approver address")
+    by_admin: bool = Field(False, description="True if admin approval")
+
+
+class TreasuryReleaseItem(BaseModel):
+    """One allocation in a batch release"""
+    allocation_id: int = Field(..., description="Approved allocation ID")
+    recipient: str = Field(..., description="Club wallet address")
+
+
+class TreasuryBatchReleaseRequest(BaseModel):
+    """Release several approved allocations in one atomic group"""
+    releases: List[TreasuryReleaseItem] = Field(
+        ...,
+        min_length=1,
+        max_length=16,
+        description="Up to 16 allocations (atomic group limit)"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "releases": [
+                    {"allocation_id": 12, "recipient": "CLUBWALLET1..."},
+                    {"allocation_id": 15, "recipient": "CLUBWALLET2..."}
+                ]
+            }
+        }
+
+
+class ProposalSignatureRequest(BaseModel):
+    """One signer's signatures for a release proposal"""
+    signer: str = Field(..., description="Signer address (treasury multisig member)")
+    signed_txns: List[str] = Field(
+        ...,
+        description="Base64 msgpack multisig transactions signed by the signer, in group order"
+    )
+
+
+class ClubTransferRequest(BaseModel):
+    """Amount one club owes another (settled by netting)"""
+    from_club: str = Field(..., description="Paying club ID (or 'treasury')")
+    to_club: str = Field(..., description="Receiving club ID (or 'treasury')")
+    amount: float = Field(..., gt=0, description="Amount in CINR")
+    purpose: str = Field(..., description="Purpose of transfer")
+
+
+class SettlementPrepareRequest(BaseModel):
+    """Club wallets for the settlement's net transfers"""
+    addresses: Dict[str, str] = Field(..., description="Wallet address per club ID")
+
+
+class SettlementExecuteRequest(BaseModel):
+    """Paying clubs' signed legs of the settlement group"""
+    signed_txns: List[str] = Field(
+        ...,
+        description="Base64 msgpack signed transactions, one per club-paid transfer"
+    )
+
+
+class TreasuryStatus(BaseModel):
+    """Treasury status"""
+    total_funds: float
+    available: float
+    allocated: float
+    pending_approval: float
+    clubs: List[str]
+
+
+# ============================================================================
+# TRANSACTION MODELS
+# ============================================================================
+
+class SignedTxnSubmission(BaseModel):
+    """Generic signed transaction submission"""
+    signed_txn: str = Field(..., description="Base64 encoded signed transaction")
+    note: Optional[str] = Field(None, description="Optional note")
+
+
+class TxnConfirmation(BaseModel):
+    """Transaction confirmation response"""
+    success: bool
+    txid: str
+    explorer_url: str
+    message: str
+    confirmed_round: Optional[int] = None
+
+
+# ============================================================================
+# WALLET MODELS
+# ============================================================================
+
+class WalletInfo(BaseModel):
+    """Wallet information"""
+    address: str
+    algo_balance: float
+    cinr_balance: float
+    is_opted_in_cinr: bool
+
+
+# ============================================================================
+# ERROR MODELS
+# ============================================================================
+
+class ErrorResponse(BaseModel):
+    """Error response"""
+    error: str
+    detail: str
+    timestamp: datetime
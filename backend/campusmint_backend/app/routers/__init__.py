@@ -0,0 +1 @@
+"""Routers package"""
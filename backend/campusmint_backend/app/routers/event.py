@@ -0,0 +1,485 @@
+"""
+Event API routes - event management and ticket sales
+"""
+
+from algosdk import encoding
+from algosdk.transaction import wait_for_confirmation
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.models.schemas import (
+    EventCreateRequest,
+    EventPaymentRequest,
+    EventResponse,
+    QueueJoinRequest,
+    SeatHoldRequest,
+    TxnConfirmation
+)
+from app.services.database import get_db
+from app.services.event_catalog import catalog
+from app.services.event_service import EventService, ticket_payment_error
+from app.services.metrics_service import MetricsService
+from app.services.reservation_service import ReservationService
+from app.services.ticket_pool import TicketPool
+from app.services.treasury_service import is_rejection
+from app.services.algo_client import AlgorandClient
+from app.services.waiting_room import WaitingRoom
+
+router = APIRouter()
+
+
+def get_event_service(
+    db: Session = Depends(get_db),
+) -> EventService:
+    """Dependency to get event service"""
+    from main import app
+    algo_client = app.state.algo_client
+    return EventService(algo_client, db)
+
+
+def get_waiting_room() -> WaitingRoom:
+    """Dependency to get the checkout waiting room"""
+    from main import app
+    return app.state.waiting_room
+
+
+@router.post("/create")
+async def create_event(
+    request: EventCreateRequest,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Create new event (admin only)
+    
+    Request body:
+    - name: Event name
+    - description: Event description
+    - location: Location
+    - date: Event date (YYYY-MM-DD)
+    - starts_at: Start time (optional, default: start of date)
+    - ends_at: End time (optional, default: end of date)
+    - ticket_price: Ticket price in CINR
+    - max_tickets: Maximum tickets
+    - organizer_address: Organizer wallet address
+    """
+    result = service.create_event(
+        app_id=0,  # Will be set from contract deployment
+        name=request.name,
+        description=request.description,
+        location=request.location,
+        date=request.date,
+        ticket_price=request.ticket_price,
+        max_tickets=request.max_tickets,
+        organizer_address=request.organizer_address,
+        starts_at=request.starts_at,
+        ends_at=request.ends_at
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.get("/list")
+async def list_events(
+    limit: int = 20,
+    if_none_match: Optional[str] = Header(None),
+    service: EventService = Depends(get_event_service)
+):
+    """
+    List all active events
+    
+    Query parameters:
+    - limit: Maximum events to return (default: 20)
+    
+    Served from the event catalog with an ETag; send it back in
+    If-None-Match to get 304 while nothing has changed.
+    """
+    etag, events = catalog.listing(service.db, limit)
+    
+    return _cached(etag, if_none_match, {"events": events, "count": len(events)})
+
+
+@router.get("/upcoming")
+async def upcoming_events(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Events starting within a time window, soonest first
+    
+    Query parameters:
+    - start: Window start (default: now)
+    - end: Window end (optional)
+    - limit: Page size (default: 20, max 100)
+    - cursor: next_cursor from the previous page
+    """
+    if start and start.tzinfo:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and end.tzinfo:
+        end = end.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    result = service.upcoming_events(start=start, end=end, limit=limit, cursor=cursor)
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.get("/{event_id}")
+async def get_event(
+    event_id: int,
+    if_none_match: Optional[str] = Header(None),
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Get event details
+    
+    Path parameters:
+    - event_id: Event app ID
+    
+    Served from the event catalog with an ETag (see /list).
+    """
+    cached = catalog.event(service.db, event_id)
+    
+    if not cached:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    etag, event = cached
+    return _cached(etag, if_none_match, event)
+
+
+def _cached(etag: str, if_none_match: Optional[str], body) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(content=body, headers=headers)
+
+
+@router.get("/{event_id}/metrics")
+async def get_event_metrics(
+    event_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Per-minute sales and check-in curves
+    
+    Path parameters:
+    - event_id: Event app ID
+    
+    Query parameters:
+    - start: First minute to include (optional)
+    - end: Stop before this time (optional)
+    """
+    if not service.get_event(event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    if start and start.tzinfo:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and end.tzinfo:
+        end = end.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return MetricsService(service.db).get_metrics(event_id, start=start, end=end)
+
+
+@router.get("/{event_id}/pool")
+async def get_ticket_pool(
+    event_id: int,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Pre-minted ticket pool status
+    
+    Path parameters:
+    - event_id: Event app ID
+    """
+    pool = TicketPool(service.algo_client, service.db)
+    return pool.status(event_id)
+
+
+@router.post("/{event_id}/pool/refill")
+async def refill_ticket_pool(
+    event_id: int,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Mint a batch of tickets into the pool in the background
+    (e.g. before sales open)
+    
+    Path parameters:
+    - event_id: Event app ID
+    """
+    if not service.get_event(event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    pool = TicketPool(service.algo_client, service.db)
+    started = pool.ensure_stock(event_id, force=True)
+    
+    return {"refill_started": started, **pool.status(event_id)}
+
+
+@router.post("/{event_id}/hold")
+async def hold_seat(
+    event_id: int,
+    request: SeatHoldRequest,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Reserve a seat for a few minutes before paying
+    
+    If the event is full the buyer joins the waitlist (status "waiting")
+    and is promoted in order as holds expire.
+    
+    Path parameters:
+    - event_id: Event app ID
+    
+    Request body:
+    - buyer_address: Buyer wallet address
+    """
+    result = ReservationService(service.db).hold_seat(event_id, request.buyer_address)
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.get("/{event_id}/hold/{hold_token}")
+async def get_hold(
+    event_id: int,
+    hold_token: str,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Seat hold status and waitlist position
+    
+    Path parameters:
+    - event_id: Event app ID
+    - hold_token: Token returned by /hold
+    """
+    hold = ReservationService(service.db).get_hold(event_id, hold_token)
+    
+    if not hold:
+        raise HTTPException(status_code=404, detail="Hold not found")
+    
+    return hold
+
+
+@router.delete("/{event_id}/hold/{hold_token}")
+async def release_hold(
+    event_id: int,
+    hold_token: str,
+    service: EventService = Depends(get_event_service)
+):
+    """
+    Release a seat hold (or leave the waitlist)
+    
+    Path parameters:
+    - event_id: Event app ID
+    - hold_token: Token returned by /hold
+    """
+    result = ReservationService(service.db).release_hold(event_id, hold_token)
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/{event_id}/queue")
+async def join_queue(
+    event_id: int,
+    request: QueueJoinRequest,
+    service: EventService = Depends(get_event_service),
+    room: WaitingRoom = Depends(get_waiting_room)
+):
+    """
+    Join the checkout waiting room
+    
+    Path parameters:
+    - event_id: Event app ID
+    
+    Request body:
+    - buyer_address: Buyer wallet address
+    
+    A wallet already in line gets its existing token back.
+    """
+    if not service.get_event(event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    if not service.algo_client.is_address_valid(request.buyer_address):
+        raise HTTPException(status_code=400, detail="Invalid buyer address")
+    
+    return room.join(event_id, request.buyer_address)
+
+
+@router.get("/{event_id}/queue/{queue_token}")
+async def get_queue_position(
+    event_id: int,
+    queue_token: str,
+    room: WaitingRoom = Depends(get_waiting_room)
+):
+    """
+    Poll queue position
+    
+    Path parameters:
+    - event_id: Event app ID
+    - queue_token: Token from /queue or a 429 response
+    """
+    status = room.status(event_id, queue_token)
+    
+    if not status:
+        raise HTTPException(status_code=404, detail="Queue token expired or unknown")
+    
+    return status
+
+
+@router.get("/{event_id}/queue/{queue_token}/events")
+async def stream_queue_position(
+    event_id: int,
+    queue_token: str,
+    room: WaitingRoom = Depends(get_waiting_room)
+):
+    """
+    Queue position as server-sent events (closes once admitted)
+    
+    Path parameters:
+    - event_id: Event app ID
+    - queue_token: Token from /queue or a 429 response
+    """
+    return StreamingResponse(
+        room.stream(event_id, queue_token),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.post("/{event_id}/pay", response_model=TxnConfirmation)
+async def pay_for_ticket(
+    event_id: int,
+    request: EventPaymentRequest,
+    queue_token: Optional[str] = Header(None, alias="X-Queue-Token"),
+    service: EventService = Depends(get_event_service),
+    room: WaitingRoom = Depends(get_waiting_room)
+):
+    """
+    Purchase event ticket
+    
+    Path parameters:
+    - event_id: Event app ID
+    
+    Headers:
+    - X-Queue-Token: Admitted waiting room token (when the sale is busy)
+    
+    Request body:
+    - signed_txn: Base64 encoded signed transaction
+    - hold_token: Seat hold token (optional)
+    
+    When checkout is at capacity the response is 429 with a queue
+    token, position and Retry-After instead of a slow timeout.
+    """
+    # Verify event exists
+    event = service.get_event(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    try:
+        signed = encoding.msgpack_decode(request.signed_txn)
+        buyer = signed.transaction.sender
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid signed transaction")
+    
+    payment_error = ticket_payment_error(event, signed.transaction)
+    if payment_error:
+        raise HTTPException(status_code=400, detail=payment_error)
+    
+    admission = room.enter(event_id, buyer, queue_token)
+    
+    if not admission.get("admitted"):
+        raise HTTPException(
+            status_code=429,
+            detail=admission,
+            headers={"Retry-After": str(max(1, int(admission["estimated_wait_seconds"])))}
+        )
+    
+    try:
+        return await _checkout(event_id, event, signed, request, service)
+    finally:
+        room.leave(event_id)
+
+
+async def _checkout(
+    event_id: int,
+    event: dict,
+    signed,
+    request: EventPaymentRequest,
+    service: EventService
+) -> TxnConfirmation:
+    """Secure a seat, then submit the payment and record the purchase (admitted buyers only)"""
+    buyer = signed.transaction.sender
+    txid = signed.get_txid()
+    
+    # The seat is claimed, with the payment's txid, before any money
+    # moves: a sold-out event or a lapsed hold is refused without taking
+    # the buyer's payment, and a payment whose outcome is not seen here
+    # keeps its seat until the hold sweeper settles it against the chain
+    reservations = ReservationService(service.db)
+    seat = await run_in_threadpool(
+        reservations.claim_for_payment,
+        event_id,
+        buyer,
+        request.hold_token,
+        txid,
+        signed.transaction.last_valid_round
+    )
+    
+    if not seat.get("success"):
+        raise HTTPException(status_code=409, detail=seat.get("error"))
+    
+    algod = service.algo_client.algod_client
+    
+    # algod calls run off the event loop so queued buyers stay responsive
+    try:
+        await run_in_threadpool(algod.send_transaction, signed)
+    except Exception as e:
+        if not is_rejection(e):
+            raise HTTPException(status_code=504, detail="Payment submitted; the seat is kept until it confirms")
+        
+        await run_in_threadpool(reservations.release_payment, event_id, seat["hold_token"])
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        confirmation = await run_in_threadpool(wait_for_confirmation, algod, txid, 10)
+    except Exception:
+        raise HTTPException(status_code=504, detail="Payment not confirmed yet; the seat is kept until it confirms")
+    
+    result = await service.process_ticket_purchase(
+        app_id=event_id,
+        buyer_address=buyer,
+        txid=txid,
+        hold_token=seat["hold_token"]
+    )
+    
+    if result.get("success"):
+        return TxnConfirmation(
+            success=True,
+            txid=txid,
+            explorer_url=f"https://testnet.algoexplorer.io/tx/{txid}",
+            message=f"Ticket purchased for {event.get('name', 'Event')}",
+            confirmed_round=confirmation.get("confirmed-round")
+        )
+    
+    raise HTTPException(status_code=500, detail="Payment processing failed")
@@ -0,0 +1,27 @@
+"""
+Health check endpoints
+"""
+
+from fastapi import APIRouter, Depends
+from datetime import datetime
+
+router = APIRouter()
+
+
+@router.get("/")
+async def health_check():
+    """Basic health check"""
+    return {
+        "status": "healthy",
+        "service": "CampusMint API",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness check (can accept requests)"""
+    return {
+        "ready": True,
+        "timestamp": datetime.utcnow().isoformat()
+    }
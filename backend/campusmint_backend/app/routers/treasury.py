@@ -0,0 +1,628 @@
+"""
+Treasury API routes - fund allocation and management
+"""
+
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+
+from app.models.schemas import (
+    ClubTransferRequest,
+    ProposalSignatureRequest,
+    SettlementExecuteRequest,
+    SettlementPrepareRequest,
+    TreasuryAllocateRequest,
+    TreasuryBatchApproveRequest,
+    TreasuryBatchReleaseRequest,
+    TreasuryStatus,
+    TxnConfirmation
+)
+from app.services.database import get_db
+from app.services.approval_service import ApprovalService
+from app.services.donor_service import DonorService
+from app.services.ledger_service import LedgerService
+from app.services.refund_service import RefundService
+from app.services.settlement_service import SettlementService
+from app.services.treasury_service import TreasuryService
+from app.services.algo_client import AlgorandClient
+
+router = APIRouter()
+
+
+def get_treasury_service(
+    db: Session = Depends(get_db),
+) -> TreasuryService:
+    """Dependency to get treasury service"""
+    from main import app
+    algo_client = app.state.algo_client
+    return TreasuryService(algo_client, db)
+
+
+@router.post("/allocate", response_model=TxnConfirmation)
+async def allocate_funds(
+    request: TreasuryAllocateRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Allocate treasury funds to a club
+    
+    Request body:
+    - signed_txn: Base64 encoded signed transaction
+    - amount: Amount in CINR
+    - club_id: Club identifier
+    - purpose: Purpose of allocation
+    """
+    # Submit transaction
+    submit_result = service.algo_client.submit_transaction(request.signed_txn)
+    
+    if not submit_result.get("success"):
+        raise HTTPException(status_code=400, detail=submit_result.get("error"))
+    
+    txid = submit_result["txid"]
+    
+    # Wait for confirmation
+    confirmation = service.algo_client.wait_for_confirmation(txid)
+    
+    if not confirmation:
+        raise HTTPException(status_code=504, detail="Transaction confirmation timeout")
+    
+    # Process allocation
+    result = service.allocate_funds(
+        club_id=request.club_id,
+        amount=request.amount,
+        purpose=request.purpose,
+        txid=txid
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return TxnConfirmation(
+        success=True,
+        txid=txid,
+        explorer_url=submit_result["explorer_url"],
+        message="Funds allocated successfully",
+        confirmed_round=confirmation.get("confirmed-round")
+    )
+
+
+@router.post("/approve/batch")
+async def approve_batch(
+    request: TreasuryBatchApproveRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Approve many allocations in one statement
+    
+    Request body:
+    - allocation_ids: Allocation IDs
+    - approved_by: Approver address
+    - by_admin: True if admin approval
+    """
+    result = service.approve_batch(
+        allocation_ids=request.allocation_ids,
+        approved_by=request.approved_by,
+        by_admin=request.by_admin
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/approve/{allocation_id}")
+async def approve_allocation(
+    allocation_id: int,
+    approved_by: str,
+    by_admin: bool = False,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Approve fund allocation
+    
+    Path parameters:
+    - allocation_id: Allocation ID
+    
+    Query parameters:
+    - approved_by: Approver address
+    - by_admin: True if admin approval
+    """
+    result = service.approve_allocation(
+        allocation_id=allocation_id,
+        approved_by=approved_by,
+        by_admin=by_admin
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/release/batch")
+async def release_batch(
+    request: TreasuryBatchReleaseRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Release up to 16 approved allocations in one atomic group
+    
+    Request body:
+    - releases: List of {allocation_id, recipient}
+    
+    Allocations that are not approved are reported in results and left
+    out of the group; the rest are paid and marked released together.
+    """
+    result = await service.release_batch(
+        [item.model_dump() for item in request.releases]
+    )
+    
+    if not result.get("success") and "results" not in result:
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/release/reconcile")
+async def reconcile_releases(
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Settle allocations left "releasing" against the chain
+    
+    Confirmed transfers are recorded as released; transfers that can no
+    longer land hand their allocations back. Also runs in the background.
+    """
+    result = await run_in_threadpool(service.reconcile_releases)
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=502, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/release/proposals")
+async def propose_release(
+    request: TreasuryBatchReleaseRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Propose a release group paid from the treasury multisig
+    
+    Request body:
+    - releases: List of {allocation_id, recipient} (up to 16)
+    
+    Returns the transactions for the admin and club lead to sign; the
+    group is submitted as soon as enough signatures have arrived.
+    """
+    result = await ApprovalService(service.algo_client, service.db).propose(
+        [item.model_dump() for item in request.releases]
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.get("/release/proposals/{proposal_id}")
+async def get_release_proposal(
+    proposal_id: int,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Release proposal status
+    
+    Path parameters:
+    - proposal_id: Proposal ID
+    """
+    proposal = ApprovalService(service.algo_client, service.db).get_proposal(proposal_id)
+    
+    if not proposal:
+        raise HTTPException(status_code=404, detail="Proposal not found")
+    
+    return proposal
+
+
+@router.post("/release/proposals/{proposal_id}/sign")
+async def sign_release_proposal(
+    proposal_id: int,
+    request: ProposalSignatureRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Add a signer's signatures to a release proposal
+    
+    Path parameters:
+    - proposal_id: Proposal ID
+    
+    Request body:
+    - signer: Signer address
+    - signed_txns: Signed multisig transactions, in group order
+    """
+    result = await ApprovalService(service.algo_client, service.db).add_signatures(
+        proposal_id,
+        request.signer,
+        request.signed_txns
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/release/{allocation_id}")
+async def release_funds(
+    allocation_id: int,
+    txid: str,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Release funds for approved allocation
+    
+    Path parameters:
+    - allocation_id: Allocation ID
+    
+    Query parameters:
+    - txid: Release transaction ID
+    """
+    result = await service.release_funds(
+        allocation_id=allocation_id,
+        txid=txid
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/transfers")
+async def record_transfer(
+    request: ClubTransferRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Record an inter-club (or club to treasury) transfer for netting
+    
+    Request body:
+    - from_club: Paying club ID
+    - to_club: Receiving club ID
+    - amount: Amount in CINR
+    - purpose: Purpose of transfer
+    """
+    result = SettlementService(service.db).record_transfer(
+        from_club=request.from_club,
+        to_club=request.to_club,
+        amount=request.amount,
+        purpose=request.purpose
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/settlements")
+async def create_settlement(
+    window_end: Optional[datetime] = None,
+    dry_run: bool = False,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Net approved allocations and pending transfers into minimal transfers
+    
+    Query parameters:
+    - window_end: Settle flows created before this time (default: now)
+    - dry_run: Preview the net transfers without recording them
+    """
+    if window_end and window_end.tzinfo:
+        window_end = window_end.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    result = SettlementService(service.db).settle(window_end=window_end, dry_run=dry_run)
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=409, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/settlements/reconcile")
+async def reconcile_settlements(
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Settle submitted settlements against the chain
+    
+    Confirmed groups are posted to the club ledgers; groups that can no
+    longer land reopen the settlement. Also runs in the background.
+    """
+    result = await run_in_threadpool(SettlementService(service.db, service.algo_client).reconcile)
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=502, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/settlements/{settlement_id}/prepare")
+async def prepare_settlement(
+    settlement_id: int,
+    request: SettlementPrepareRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Build a settlement's net transfers as one atomic group
+    
+    Path parameters:
+    - settlement_id: Settlement ID
+    
+    Request body:
+    - addresses: Wallet address per club in the settlement
+    
+    Returns the legs each paying club must sign.
+    """
+    result = await run_in_threadpool(
+        SettlementService(service.db, service.algo_client).prepare,
+        settlement_id,
+        request.addresses
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/settlements/{settlement_id}/execute")
+async def execute_settlement(
+    settlement_id: int,
+    request: SettlementExecuteRequest,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Submit a prepared settlement and post it to the club ledgers
+    
+    Path parameters:
+    - settlement_id: Settlement ID
+    
+    Request body:
+    - signed_txns: The paying clubs' signed legs
+    """
+    result = await SettlementService(service.db, service.algo_client).execute(
+        settlement_id,
+        request.signed_txns
+    )
+    
+    if not result.get("success") and result.get("status") != "submitted":
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.get("/settlements/{settlement_id}")
+async def get_settlement(
+    settlement_id: int,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Get settlement details
+    
+    Path parameters:
+    - settlement_id: Settlement ID
+    """
+    settlement = SettlementService(service.db).get_settlement(settlement_id)
+    
+    if not settlement:
+        raise HTTPException(status_code=404, detail="Settlement not found")
+    
+    return settlement
+
+
+@router.get("/status", response_model=TreasuryStatus)
+async def get_treasury_status(
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Get treasury status
+    """
+    status = service.get_treasury_status()
+    
+    if "error" in status:
+        raise HTTPException(status_code=500, detail=status.get("error"))
+    
+    return TreasuryStatus(**status)
+
+
+@router.get("/club/{club_id}")
+async def get_club_allocations(
+    club_id: str,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Get allocations for a specific club
+    
+    Path parameters:
+    - club_id: Club identifier
+    """
+    allocations = service.get_club_allocations(club_id)
+    
+    return {
+        "club_id": club_id,
+        "allocations": allocations,
+        "count": len(allocations)
+    }
+
+
+@router.get("/club/{club_id}/balance")
+async def get_club_balance(
+    club_id: str,
+    at: Optional[datetime] = None,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Club balance from the ledger
+    
+    Path parameters:
+    - club_id: Club identifier
+    
+    Query parameters:
+    - at: Point in time (default: now)
+    """
+    if at and at.tzinfo:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return LedgerService(service.db).get_balance(club_id, at=at)
+
+
+@router.get("/club/{club_id}/ledger")
+async def get_club_ledger(
+    club_id: str,
+    limit: int = 50,
+    before_seq: Optional[int] = None,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Club ledger entries, newest first
+    
+    Path parameters:
+    - club_id: Club identifier
+    
+    Query parameters:
+    - limit: Maximum entries to return (default: 50)
+    - before_seq: Return entries before this sequence number
+    """
+    entries = LedgerService(service.db).get_entries(
+        club_id,
+        limit=min(limit, 500),
+        before_seq=before_seq
+    )
+    
+    return {"club_id": club_id, "entries": entries, "count": len(entries)}
+
+
+@router.post("/campaigns/{app_id}/sync")
+async def sync_campaign(
+    app_id: int,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Fold new on-chain donations into a campaign's totals
+    
+    Path parameters:
+    - app_id: NGO crowdfunding app ID
+    
+    The first call registers the campaign; afterwards it is kept current
+    in the background.
+    """
+    result = await run_in_threadpool(
+        DonorService(service.algo_client, service.db).sync,
+        app_id
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.post("/campaigns/{app_id}/refund")
+async def refund_campaign(
+    app_id: int,
+    max_groups: Optional[int] = None,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Refund every donor of a failed campaign
+    
+    Path parameters:
+    - app_id: NGO crowdfunding app ID
+    
+    Query parameters:
+    - max_groups: Stop after this many atomic groups of 64 donors
+      (default: run to the end)
+    
+    Only allowed once the deadline has passed without reaching the goal.
+    Progress is saved after every group; calling again resumes.
+    """
+    result = await run_in_threadpool(
+        RefundService(service.algo_client, service.db).refund,
+        app_id,
+        max_groups
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    
+    return result
+
+
+@router.get("/campaigns/{app_id}/refund")
+async def get_campaign_refund(
+    app_id: int,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Refund progress for a campaign
+    
+    Path parameters:
+    - app_id: NGO crowdfunding app ID
+    """
+    status = RefundService(service.algo_client, service.db).get_status(app_id)
+    
+    if not status:
+        raise HTTPException(status_code=404, detail="Campaign not synced yet")
+    
+    return status
+
+
+@router.get("/campaigns/{app_id}")
+async def get_campaign(
+    app_id: int,
+    top: int = 10,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    Campaign totals and donor leaderboard
+    
+    Path parameters:
+    - app_id: NGO crowdfunding app ID
+    
+    Query parameters:
+    - top: Leaderboard size (default: 10)
+    """
+    campaign = DonorService(service.algo_client, service.db).get_campaign(
+        app_id,
+        top=min(top, 100)
+    )
+    
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not synced yet")
+    
+    return campaign
+
+
+@router.get("/campaigns/{app_id}/donors/{donor}")
+async def get_campaign_donor(
+    app_id: int,
+    donor: str,
+    service: TreasuryService = Depends(get_treasury_service)
+):
+    """
+    One donor's total for a campaign
+    
+    Path parameters:
+    - app_id: NGO crowdfunding app ID
+    - donor: Donor address
+    """
+    result = DonorService(service.algo_client, service.db).get_donor(app_id, donor)
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Donor not found")
+    
+    return result
@@ -0,0 +1,532 @@
+"""
+Approval service - asynchronous multisig approval of treasury releases
+"""
+
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List
+
+from algosdk import encoding
+from algosdk.transaction import (
+    AssetTransferTxn,
+    Multisig,
+    MultisigTransaction,
+    assign_group_id,
+    wait_for_confirmation
+)
+
+from app.config import settings
+from app.models.database import ReleaseProposal, TreasuryAllocation
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+from app.services.treasury_service import (
+    MAX_GROUP_SIZE,
+    TreasuryService,
+    is_rejection,
+    restore_status
+)
+
+logger = logging.getLogger(__name__)
+
+VALIDITY_ROUNDS = 1000   # protocol maximum: how long signers have
+
+# Every release needs one signature from each role
+ROLES = ("admin", "club_lead")
+
+# Submissions started by the last signature (kept referenced until done)
+_submissions = set()
+
+
+def treasury_multisig() -> Multisig:
+    """Treasury multisig account from settings"""
+    signers = [
+        address.strip()
+        for address in settings.treasury_multisig_signers.split(",")
+        if address.strip()
+    ]
+    return Multisig(1, settings.treasury_multisig_threshold, signers)
+
+
+def signer_role(address: str) -> Optional[str]:
+    """Approval role of a multisig signer ("admin", "club_lead" or None)"""
+    if address and address == settings.admin_address:
+        return "admin"
+    
+    club_leads = {a.strip() for a in settings.treasury_club_lead_addresses.split(",") if a.strip()}
+    return "club_lead" if address in club_leads else None
+
+
+def missing_roles(signers: List[str]) -> List[str]:
+    """Roles none of the signers hold yet"""
+    held = {signer_role(signer) for signer in signers}
+    return [role for role in ROLES if role not in held]
+
+
+class ApprovalService:
+    """
+    A release proposal is an unsigned group paid from the treasury
+    multisig. Admin and club lead sign it from their own wallets in any
+    order; each signature is verified and merged as it arrives, and the
+    request that brings the group to threshold - with both the admin and
+    a club lead among the signers - kicks off submission.
+    """
+    
+    def __init__(
+        self,
+        algo_client: AlgorandClient,
+        db: Session,
+        session_factory=SessionLocal
+    ):
+        self.algo_client = algo_client
+        self.db = db
+        self.session_factory = session_factory
+    
+    async def propose(self, releases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create a release group for up to 16 allocations
+        
+        Args:
+            releases: [{"allocation_id": ..., "recipient": ...}, ...]
+        
+        Returns:
+            Proposal with the unsigned transactions to sign
+        """
+        if not 0 < len(releases) <= MAX_GROUP_SIZE:
+            return {"success": False, "error": f"1 to {MAX_GROUP_SIZE} allocations per proposal"}
+        
+        recipients = {item["allocation_id"]: item["recipient"] for item in releases}
+        
+        if len(recipients) != len(releases):
+            return {"success": False, "error": "Duplicate allocation in proposal"}
+        
+        for allocation_id, recipient in recipients.items():
+            if not self.algo_client.is_address_valid(recipient):
+                return {"success": False, "error": f"Invalid recipient for allocation {allocation_id}"}
+        
+        try:
+            msig = treasury_multisig()
+            msig.validate()
+            
+            roles = {signer_role(encoding.encode_address(s.public_key)) for s in msig.subsigs}
+            if any(role not in roles for role in ROLES):
+                return {"success": False, "error": "Treasury multisig needs the admin and a club lead as signers"}
+            
+            # algod round trip: keep it off the event loop
+            params = await asyncio.to_thread(self.algo_client.algod_client.suggested_params)
+            params.last = params.first + VALIDITY_ROUNDS
+            
+            # Allocations under signature cannot be proposed or released twice
+            claimed = self.db.execute(
+                update(TreasuryAllocation)
+                .where(
+                    TreasuryAllocation.id.in_(list(recipients)),
+                    TreasuryAllocation.status.in_(["pending", "approved"])
+                )
+                .values(status="signing")
+                .returning(TreasuryAllocation.id, TreasuryAllocation.amount)
+                .execution_options(synchronize_session=False)
+            ).all()
+            
+            if len(claimed) != len(recipients):
+                self.db.rollback()
+                missing = sorted(set(recipients) - {row.id for row in claimed})
+                return {"success": False, "error": f"Allocations not releasable: {missing}"}
+            
+            scale = 10 ** settings.cinr_decimals
+            
+            txns = assign_group_id([
+                AssetTransferTxn(
+                    sender=msig.address(),
+                    sp=params,
+                    receiver=recipients[row.id],
+                    amt=int(round(row.amount * scale)),
+                    index=settings.cinr_asset_id,
+                    note=f"allocation:{row.id}".encode()
+                )
+                for row in claimed
+            ])
+            
+            proposal = ReleaseProposal(
+                allocation_ids=json.dumps([row.id for row in claimed]),
+                recipients=json.dumps({str(k): v for k, v in recipients.items()}),
+                txns=json.dumps([
+                    encoding.msgpack_encode(MultisigTransaction(t, msig)) for t in txns
+                ]),
+                signers="[]",
+                threshold=msig.threshold,
+                last_valid=params.last
+            )
+            
+            self.db.add(proposal)
+            self.db.commit()
+            
+            logger.info(f"📝 Release proposal {proposal.id}: {len(claimed)} allocations")
+            
+            return self._describe(proposal)
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Release proposal failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_proposal(self, proposal_id: int) -> Optional[Dict[str, Any]]:
+        """Proposal status and the transactions still to sign"""
+        proposal = self.db.get(ReleaseProposal, proposal_id)
+        return self._describe(proposal) if proposal else None
+    
+    async def add_signatures(
+        self,
+        proposal_id: int,
+        signer: str,
+        signed_txns: List[str],
+        attempts: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Merge one signer's signatures into a proposal
+        
+        Args:
+            proposal_id: Proposal ID
+            signer: Signer address (one of the multisig addresses)
+            signed_txns: Base64 msgpack multisig txns signed by signer, in group order
+        
+        Returns:
+            Proposal status (submission starts once the threshold is met)
+        """
+        try:
+            for _ in range(attempts):
+                proposal = self.db.query(ReleaseProposal).filter(
+                    ReleaseProposal.id == proposal_id
+                ).populate_existing().first()
+                
+                if not proposal:
+                    return {"success": False, "error": "Proposal not found"}
+                
+                if proposal.status != "collecting":
+                    return {"success": False, "error": f"Proposal is {proposal.status}"}
+                
+                if self.algo_client.algod_client.status()["last-round"] > proposal.last_valid:
+                    self._abandon(self.db, proposal, "expired", "Validity window passed before threshold")
+                    return {"success": False, "error": "Proposal expired"}
+                
+                signers = json.loads(proposal.signers)
+                
+                if signer in signers:
+                    return {"success": False, "error": "Already signed"}
+                
+                role = signer_role(signer)
+                
+                if not role:
+                    return {"success": False, "error": "Signer has no treasury approval role"}
+                
+                merged = self._merge(json.loads(proposal.txns), signer, signed_txns)
+                
+                if isinstance(merged, str):
+                    return {"success": False, "error": merged}
+                
+                # Threshold alone is not enough: two club leads cannot
+                # release without the admin
+                ready = not missing_roles(signers + [signer]) and all(
+                    sum(1 for s in m.multisig.subsigs if s.signature) >= proposal.threshold
+                    for m in merged
+                )
+                
+                # Optimistic lock: a concurrent signer bumps the version first
+                result = self.db.execute(
+                    update(ReleaseProposal)
+                    .where(
+                        ReleaseProposal.id == proposal_id,
+                        ReleaseProposal.version == proposal.version,
+                        ReleaseProposal.status == "collecting"
+                    )
+                    .values(
+                        txns=json.dumps([encoding.msgpack_encode(m) for m in merged]),
+                        signers=json.dumps(signers + [signer]),
+                        version=ReleaseProposal.version + 1,
+                        status="submitting" if ready else "collecting"
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                
+                if result.rowcount != 1:
+                    self.db.rollback()
+                    continue
+                
+                # A signature is that party's approval
+                self.db.execute(
+                    update(TreasuryAllocation)
+                    .where(TreasuryAllocation.id.in_(json.loads(proposal.allocation_ids)))
+                    .values({f"{role}_approval": True})
+                    .execution_options(synchronize_session=False)
+                )
+                
+                self.db.commit()
+                
+                logger.info(f"✍️ Proposal {proposal_id} signed by {signer}")
+                
+                if ready:
+                    task = asyncio.get_running_loop().create_task(self.submit(proposal_id))
+                    _submissions.add(task)
+                    task.add_done_callback(_submissions.discard)
+                
+                return self.get_proposal(proposal_id)
+            
+            return {"success": False, "error": "Proposal is busy, retry"}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Signature merge failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def submit(self, proposal_id: int):
+        """Send a fully signed proposal and record the release"""
+        db = self.session_factory()
+        try:
+            proposal = db.get(ReleaseProposal, proposal_id)
+            allocation_ids = json.loads(proposal.allocation_ids)
+            
+            missing = missing_roles(json.loads(proposal.signers))
+            if missing:
+                self._abandon(db, proposal, "failed", f"Missing approval: {', '.join(missing)}")
+                logger.error(f"❌ Proposal {proposal_id} not approved by {missing}")
+                return
+            
+            merged = [encoding.msgpack_decode(t) for t in json.loads(proposal.txns)]
+            txids = [m.get_txid() for m in merged]
+            
+            rows = db.query(
+                TreasuryAllocation.id,
+                TreasuryAllocation.amount,
+                TreasuryAllocation.club_id
+            ).filter(TreasuryAllocation.id.in_(allocation_ids)).all()
+            rows.sort(key=lambda row: allocation_ids.index(row.id))
+            
+            for row, txid in zip(rows, txids):
+                db.execute(
+                    update(TreasuryAllocation)
+                    .where(TreasuryAllocation.id == row.id)
+                    .values(status="releasing", txn_id=txid, last_valid=proposal.last_valid)
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+            
+            algod = self.algo_client.algod_client
+            
+            try:
+                await asyncio.to_thread(algod.send_transactions, merged)
+            except Exception as e:
+                if is_rejection(e):
+                    self._abandon(db, proposal, "failed", str(e))
+                    logger.error(f"❌ Proposal {proposal_id} rejected: {e}")
+                    return
+                
+                # A timeout may still have delivered the group: the allocations
+                # stay "releasing" with their txids until reconcile_releases
+                # finds the outcome
+                proposal.status = "submitted"
+                proposal.error = f"Submission outcome unknown: {e}"
+                db.commit()
+                logger.warning(f"⚠️ Proposal {proposal_id} submission outcome unknown: {e}")
+                return
+            
+            proposal.status = "submitted"
+            db.commit()
+            
+            try:
+                confirmation = await asyncio.to_thread(
+                    wait_for_confirmation, algod, txids[0], 10
+                )
+            except Exception as e:
+                # May still land: allocations stay "releasing" with their txids
+                proposal.error = f"Not confirmed yet: {e}"
+                db.commit()
+                logger.warning(f"⚠️ Proposal {proposal_id} not confirmed yet: {e}")
+                return
+            
+            released_at = datetime.utcnow()
+            recipients = {int(k): v for k, v in json.loads(proposal.recipients).items()}
+            
+            TreasuryService(self.algo_client, db).record_release(
+                rows,
+                recipients,
+                txids,
+                confirmation.get("confirmed-round"),
+                released_at
+            )
+            
+            proposal.status = "released"
+            proposal.completed_at = released_at
+            db.commit()
+            
+            logger.info(f"✅ Proposal {proposal_id} released {len(rows)} allocations")
+        
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Proposal {proposal_id} submission failed: {e}")
+        
+        finally:
+            db.close()
+    
+    def sweep(self) -> Dict[str, Any]:
+        """
+        Close proposals that can no longer complete, and settle the ones
+        whose release has been decided
+        
+        - collecting, or submitting but never sent: past last_valid the
+          group can never confirm, so its allocations are handed back
+        - submitted: once reconcile_releases has settled every allocation,
+          the proposal is released (all paid) or failed (handed back)
+        
+        Returns:
+            Count of proposals closed per outcome
+        """
+        counts = {"expired": 0, "released": 0, "failed": 0}
+        
+        try:
+            last_round = self.algo_client.algod_client.status()["last-round"]
+            
+            proposals = self.db.query(ReleaseProposal).filter(
+                ReleaseProposal.status.in_(["collecting", "submitting", "submitted"])
+            ).all()
+            
+            for proposal in proposals:
+                statuses = {
+                    status for (status,) in self.db.query(TreasuryAllocation.status).filter(
+                        TreasuryAllocation.id.in_(json.loads(proposal.allocation_ids))
+                    )
+                }
+                
+                if proposal.status != "submitted":
+                    if "releasing" not in statuses and last_round > proposal.last_valid:
+                        self._abandon(self.db, proposal, "expired", "Validity window passed before submission")
+                        counts["expired"] += 1
+                    continue
+                
+                # Handed-back allocations may already sit in a newer proposal,
+                # so only "releasing" means this one is still undecided
+                if "releasing" in statuses:
+                    continue
+                
+                if statuses == {"released"}:
+                    proposal.status = "released"
+                    counts["released"] += 1
+                else:
+                    proposal.status = "failed"
+                    counts["failed"] += 1
+                
+                proposal.completed_at = datetime.utcnow()
+                self.db.commit()
+            
+            if any(counts.values()):
+                logger.info(f"🧹 Release proposals closed: {counts}")
+            
+            return {"success": True, **counts}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Proposal sweep failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _merge(
+        self,
+        stored: List[str],
+        signer: str,
+        signed_txns: List[str]
+    ):
+        """Stored txns plus the signer's verified signatures (or an error message)"""
+        if len(signed_txns) != len(stored):
+            return f"Expected {len(stored)} signed transactions"
+        
+        public_key = encoding.decode_address(signer)
+        merged = []
+        
+        for mine, theirs in zip(stored, signed_txns):
+            mine = encoding.msgpack_decode(mine)
+            
+            try:
+                theirs = encoding.msgpack_decode(theirs)
+            except Exception:
+                return "Undecodable signed transaction"
+            
+            if not isinstance(theirs, MultisigTransaction) or theirs.get_txid() != mine.get_txid():
+                return "Signed transaction does not match the proposal"
+            
+            slot = next(
+                (i for i, s in enumerate(mine.multisig.subsigs) if s.public_key == public_key),
+                None
+            )
+            
+            if slot is None:
+                return "Signer is not part of the treasury multisig"
+            
+            signature = theirs.multisig.subsigs[slot].signature
+            message = b"TX" + base64.b64decode(encoding.msgpack_encode(mine.transaction))
+            
+            try:
+                VerifyKey(public_key).verify(message, signature)
+            except (BadSignatureError, ValueError, TypeError):
+                return "Missing or invalid signature"
+            
+            # Only the signer's own, verified signature is taken
+            mine.multisig.subsigs[slot].signature = signature
+            merged.append(mine)
+        
+        return merged
+    
+    def _abandon(self, db: Session, proposal: ReleaseProposal, status: str, error: str):
+        """Close a proposal and give its allocations back"""
+        db.execute(
+            update(TreasuryAllocation)
+            .where(
+                TreasuryAllocation.id.in_(json.loads(proposal.allocation_ids)),
+                TreasuryAllocation.status.in_(["signing", "releasing"])
+            )
+            .values(status=restore_status(), txn_id=None, last_valid=None)
+            .execution_options(synchronize_session=False)
+        )
+        
+        proposal.status = status
+        proposal.error = error
+        proposal.completed_at = datetime.utcnow()
+        db.commit()
+    
+    def _describe(self, proposal: ReleaseProposal) -> Dict[str, Any]:
+        msig_txns = [encoding.msgpack_decode(t) for t in json.loads(proposal.txns)]
+        signers = json.loads(proposal.signers)
+        
+        return {
+            "success": True,
+            "proposal_id": proposal.id,
+            "status": proposal.status,
+            "multisig_address": msig_txns[0].multisig.address(),
+            "allocation_ids": json.loads(proposal.allocation_ids),
+            "threshold": proposal.threshold,
+            "signers": signers,
+            "signatures_needed": max(0, proposal.threshold - len(signers)),
+            "roles_needed": missing_roles(signers),
+            "last_valid": proposal.last_valid,
+            "txids": [m.get_txid() for m in msig_txns],
+            "to_sign": [encoding.msgpack_encode(m) for m in msig_txns],
+            "error": proposal.error
+        }
+
+
+async def run_proposal_sweeper(algo_client: AlgorandClient):
+    """Background timer: expire and settle release proposals"""
+    while True:
+        await asyncio.sleep(settings.release_reconcile_seconds)
+        await asyncio.to_thread(_sweep, algo_client)
+
+
+def _sweep(algo_client: AlgorandClient):
+    db = SessionLocal()
+    try:
+        ApprovalService(algo_client, db).sweep()
+    finally:
+        db.close()
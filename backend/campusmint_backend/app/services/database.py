@@ -0,0 +1,106 @@
+"""
+Database management - initialization and session handling
+"""
+
+import logging
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import aiosqlite
+
+from app.config import settings
+from app.models.database import Base, Event
+
+logger = logging.getLogger(__name__)
+
+# Create engine
+if "sqlite" in settings.database_url:
+    engine = create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_engine(settings.database_url)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def init_db():
+    """Initialize database tables"""
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _backfill_event_times()
+    _backfill_club_ledger()
+    logger.info("✅ Database tables created/verified")
+
+
+def _add_missing_columns():
+    """
+    Bring tables created by an older version up to date: add new
+    columns (with their server default) and any missing indexes
+    """
+    inspector = inspect(engine)
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                
+                conn.execute(text(ddl))
+                logger.info(f"🛠 Added column {table.name}.{column.name}")
+            
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def _backfill_event_times():
+    """Derive starts_at/ends_at for events created before they existed"""
+    from app.services.event_service import event_window
+    
+    db = SessionLocal()
+    try:
+        events = db.query(Event).filter(Event.starts_at.is_(None)).all()
+        
+        for event in events:
+            window = event_window(event.date)
+            if window:
+                event.starts_at, event.ends_at = window
+        
+        if events:
+            db.commit()
+            logger.info(f"🛠 Backfilled start/end times for {len(events)} events")
+    finally:
+        db.close()
+
+
+def _backfill_club_ledger():
+    from app.services.ledger_service import backfill_ledger
+    
+    db = SessionLocal()
+    try:
+        backfill_ledger(db)
+    finally:
+        db.close()
+
+
+def get_db():
+    """Dependency for getting database session"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Async database session (for future migration to async ORM)"""
+    async with aiosqlite.connect(settings.database_url) as db:
+        yield db
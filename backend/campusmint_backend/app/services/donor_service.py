@@ -0,0 +1,299 @@
+"""
+Donor service - campaign donor totals and leaderboards from chain history
+"""
+
+import asyncio
+import base64
+import logging
+from collections import defaultdict
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List
+
+from app.config import settings
+from app.models.database import CampaignDonor, DonationCampaign
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SYNC_WINDOW = 50_000     # rounds fetched and committed per step
+
+_REFUND_ARG = base64.b64encode(b"refund").decode()
+
+_donors = CampaignDonor.__table__
+
+
+class DonorService:
+    """
+    Donations to the NGO app are a NoOp app call grouped with a CINR
+    transfer. Sync reads both from the indexer round window by round
+    window (up to the last round the indexer has ingested), folds them
+    into per-donor totals and advances the campaign's last_round
+    checkpoint in the same commit, so it can stop and resume anywhere.
+    Campaign pages only read the aggregate rows.
+    """
+    
+    def __init__(self, algo_client: AlgorandClient, db: Session):
+        self.algo_client = algo_client
+        self.db = db
+    
+    def sync(self, app_id: int) -> Dict[str, Any]:
+        """
+        Fold new donations for a campaign into its totals
+        
+        Args:
+            app_id: NGO app ID
+        
+        Returns:
+            Sync result with the new checkpoint
+        """
+        try:
+            campaign = self._campaign(app_id)
+            
+            # Rounds the indexer has not ingested yet would read as empty
+            # and the checkpoint would skip their donations for good
+            current = min(
+                self.algo_client.algod_client.status()["last-round"],
+                self.algo_client.indexer_client.health()["round"]
+            )
+            synced = 0
+            
+            while campaign.last_round < current:
+                low = campaign.last_round + 1
+                high = min(current, low + SYNC_WINDOW - 1)
+                
+                synced += self._sync_window(campaign, low, high)
+            
+            return {
+                "success": True,
+                "app_id": app_id,
+                "donations_added": synced,
+                "last_round": campaign.last_round
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Donor sync failed for app {app_id}: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_campaign(self, app_id: int, top: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        Campaign totals and top donors (reads aggregates only)
+        
+        Args:
+            app_id: NGO app ID
+            top: Leaderboard size
+        
+        Returns:
+            Campaign summary or None if it was never synced
+        """
+        campaign = self.db.query(DonationCampaign).filter(
+            DonationCampaign.app_id == app_id
+        ).first()
+        
+        if not campaign:
+            return None
+        
+        leaders = self.db.query(CampaignDonor).filter(
+            CampaignDonor.app_id == app_id
+        ).order_by(
+            CampaignDonor.total.desc(),
+            CampaignDonor.id.desc()
+        ).limit(top).all()
+        
+        return {
+            "app_id": app_id,
+            "asset_id": campaign.asset_id,
+            "total": campaign.total,
+            "donors": campaign.donor_count,
+            "donations": campaign.donation_count,
+            "last_round": campaign.last_round,
+            "refunded": campaign.refunded,
+            "refund_status": campaign.refund_status,
+            "leaderboard": [
+                {
+                    "rank": rank,
+                    "donor": d.donor,
+                    "total": d.total,
+                    "donations": d.donations,
+                    "last_round": d.last_round
+                }
+                for rank, d in enumerate(leaders, start=1)
+            ]
+        }
+    
+    def get_donor(self, app_id: int, donor: str) -> Optional[Dict[str, Any]]:
+        """One donor's total for a campaign"""
+        d = self.db.query(CampaignDonor).filter(
+            CampaignDonor.app_id == app_id,
+            CampaignDonor.donor == donor
+        ).first()
+        
+        if not d:
+            return None
+        
+        return {
+            "app_id": app_id,
+            "donor": donor,
+            "total": d.total,
+            "donations": d.donations,
+            "first_round": d.first_round,
+            "last_round": d.last_round
+        }
+    
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    
+    def _campaign(self, app_id: int) -> DonationCampaign:
+        campaign = self.db.query(DonationCampaign).filter(
+            DonationCampaign.app_id == app_id
+        ).first()
+        
+        if campaign:
+            return campaign
+        
+        state = self.algo_client.get_app_state(app_id)
+        if state is None:
+            raise ValueError(f"App {app_id} not found")
+        
+        asset_id = next(
+            (
+                kv["value"]["uint"] for kv in state
+                if base64.b64decode(kv["key"]) == b"asset"
+            ),
+            settings.cinr_asset_id
+        )
+        
+        # Nothing to read before the app existed
+        try:
+            app = self.algo_client.indexer_client.applications(app_id)
+            created = app["application"].get("created-at-round", 1)
+        except Exception:
+            created = 1
+        
+        campaign = DonationCampaign(
+            app_id=app_id,
+            asset_id=asset_id,
+            total=0,
+            donor_count=0,
+            donation_count=0,
+            last_round=created - 1
+        )
+        self.db.add(campaign)
+        self.db.commit()
+        
+        return campaign
+    
+    def _search(self, **filters) -> List[Dict[str, Any]]:
+        """All indexer transactions matching the filters (follows next tokens)"""
+        indexer = self.algo_client.indexer_client
+        txns = []
+        next_page = None
+        
+        while True:
+            page = indexer.search_transactions(limit=1000, next_page=next_page, **filters)
+            txns.extend(page.get("transactions", []))
+            next_page = page.get("next-token")
+            
+            if not next_page or not page.get("transactions"):
+                return txns
+    
+    def _sync_window(self, campaign: DonationCampaign, low: int, high: int) -> int:
+        calls = [
+            t for t in self._search(
+                application_id=campaign.app_id,
+                txn_type="appl",
+                min_round=low,
+                max_round=high
+            )
+            if t.get("group")
+            and t["application-transaction"].get("application-id") == campaign.app_id
+            and t["application-transaction"].get("on-completion") == "noop"
+            and t["application-transaction"].get("application-args", [])[:1] != [_REFUND_ARG]
+        ]
+        
+        per_donor = defaultdict(lambda: {"total": 0, "donations": 0, "first": None, "last": None})
+        
+        if calls:
+            transfers = {}
+            for t in self._search(
+                asset_id=campaign.asset_id,
+                txn_type="axfer",
+                min_round=min(c["confirmed-round"] for c in calls),
+                max_round=max(c["confirmed-round"] for c in calls)
+            ):
+                # Refund calls match too (through their inner transfers)
+                if t.get("group") and t["tx-type"] == "axfer":
+                    transfers.setdefault(t["group"], t)
+            
+            for call in calls:
+                transfer = transfers.get(call["group"])
+                if not transfer:
+                    continue
+                
+                entry = per_donor[call["sender"]]
+                entry["total"] += transfer["asset-transfer-transaction"]["amount"]
+                entry["donations"] += 1
+                entry["first"] = entry["first"] or call["confirmed-round"]
+                entry["last"] = call["confirmed-round"]
+        
+        self._apply(campaign, per_donor, high)
+        
+        return sum(e["donations"] for e in per_donor.values())
+    
+    def _apply(self, campaign: DonationCampaign, per_donor: Dict[str, Dict], last_round: int):
+        """Upsert donor totals and move the checkpoint in one commit"""
+        if per_donor:
+            existing = {
+                row.donor for row in self.db.query(CampaignDonor.donor).filter(
+                    CampaignDonor.app_id == campaign.app_id,
+                    CampaignDonor.donor.in_(list(per_donor))
+                )
+            }
+            
+            dialect = postgresql if self.db.bind.dialect.name == "postgresql" else sqlite
+            
+            for donor, entry in per_donor.items():
+                upsert = dialect.insert(_donors).values(
+                    app_id=campaign.app_id,
+                    donor=donor,
+                    total=entry["total"],
+                    donations=entry["donations"],
+                    first_round=entry["first"],
+                    last_round=entry["last"]
+                )
+                upsert = upsert.on_conflict_do_update(
+                    index_elements=["app_id", "donor"],
+                    set_={
+                        "total": _donors.c.total + upsert.excluded.total,
+                        "donations": _donors.c.donations + upsert.excluded.donations,
+                        "last_round": upsert.excluded.last_round
+                    }
+                )
+                self.db.execute(upsert)
+            
+            campaign.total += sum(e["total"] for e in per_donor.values())
+            campaign.donation_count += sum(e["donations"] for e in per_donor.values())
+            campaign.donor_count += len(set(per_donor) - existing)
+        
+        campaign.last_round = last_round
+        self.db.commit()
+
+
+async def run_donor_sync(algo_client: AlgorandClient):
+    """Background timer: keep every known campaign's totals current"""
+    while True:
+        await asyncio.sleep(settings.donor_sync_seconds)
+        await asyncio.to_thread(_sync_all, algo_client)
+
+
+def _sync_all(algo_client: AlgorandClient):
+    db = SessionLocal()
+    try:
+        service = DonorService(algo_client, db)
+        for (app_id,) in db.query(DonationCampaign.app_id).all():
+            service.sync(app_id)
+    finally:
+        db.close()
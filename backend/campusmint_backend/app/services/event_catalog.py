@@ -0,0 +1,147 @@
+"""
+Event catalog - in-process cache of event listings with versioned ETags
+"""
+
+import logging
+import threading
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any, List, Tuple
+
+from app.models.database import Event
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_event(event: Event) -> Dict[str, Any]:
+    """Event details as served by /event/{id}"""
+    seats_held = event.seats_held or 0
+    
+    return {
+        "id": event.app_id,
+        "name": event.name,
+        "description": event.description,
+        "location": event.location,
+        "date": event.date,
+        "starts_at": event.starts_at.isoformat() if event.starts_at else None,
+        "ends_at": event.ends_at.isoformat() if event.ends_at else None,
+        "ticket_price": event.ticket_price,
+        "max_tickets": event.max_tickets,
+        "tickets_sold": event.tickets_sold,
+        "seats_held": seats_held,
+        "available_tickets": max(0, event.max_tickets - event.tickets_sold - seats_held),
+        "organizer": event.organizer_address,
+        "nft_asset_id": event.nft_asset_id,
+        "created_at": event.created_at.isoformat()
+    }
+
+
+def summarize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """List entry for serialized event details"""
+    return {
+        "id": event["id"],
+        "name": event["name"],
+        "date": event["date"],
+        "starts_at": event["starts_at"],
+        "ends_at": event["ends_at"],
+        "location": event["location"],
+        "tickets_sold": event["tickets_sold"],
+        "available": event["available_tickets"],
+        "organizer": event["organizer"]
+    }
+
+
+class EventCatalog:
+    """
+    All events are loaded once and served from memory. Writers call
+    invalidate(app_id) after committing; only those rows are re-read, on
+    the next access. Every invalidation bumps the catalog version, which
+    is what the ETags are built from.
+    
+    The cache is per process, like the check-in index: writes made by
+    another process (e.g. the mint CLI) show up after a restart or an
+    invalidate().
+    """
+    
+    def __init__(self):
+        self.version = 0
+        self._events: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        self._order: List[int] = []
+        self._loaded = False
+        self._dirty = set()
+        self._lock = threading.Lock()
+    
+    def invalidate(self, app_id: Optional[int] = None):
+        """Mark one event (or the whole catalog) stale"""
+        with self._lock:
+            self.version += 1
+            if app_id is None:
+                self._loaded = False
+            else:
+                self._dirty.add(app_id)
+    
+    def event(self, db: Session, app_id: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Cached event details
+        
+        Returns:
+            (etag, event) or None if the event does not exist
+        """
+        with self._lock:
+            self._refresh(db)
+            cached = self._events.get(app_id)
+        
+        if not cached:
+            return None
+        
+        version, event = cached
+        return f'W/"event-{app_id}-{version}"', event
+    
+    def listing(self, db: Session, limit: int = 20) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Cached event summaries, newest first
+        
+        Returns:
+            (etag, events)
+        """
+        with self._lock:
+            self._refresh(db)
+            events = [summarize_event(self._events[i][1]) for i in self._order[:limit]]
+            version = self.version
+        
+        return f'W/"events-{version}-{limit}"', events
+    
+    def _refresh(self, db: Session):
+        """Load the catalog or re-read stale rows (lock held)"""
+        if not self._loaded:
+            rows = db.query(Event).all()
+            self._events = {e.app_id: (self.version, serialize_event(e)) for e in rows}
+            self._dirty.clear()
+            self._loaded = True
+            self._sort()
+            logger.info(f"📚 Event catalog loaded: {len(rows)} events")
+            return
+        
+        if not self._dirty:
+            return
+        
+        stale = list(self._dirty)
+        rows = db.query(Event).filter(Event.app_id.in_(stale)).all()
+        
+        for app_id in stale:
+            self._events.pop(app_id, None)
+        for e in rows:
+            self._events[e.app_id] = (self.version, serialize_event(e))
+        
+        self._dirty.clear()
+        self._sort()
+    
+    def _sort(self):
+        self._order = sorted(
+            self._events,
+            key=lambda i: self._events[i][1]["created_at"],
+            reverse=True
+        )
+
+
+# Shared by every request in this process
+catalog = EventCatalog()
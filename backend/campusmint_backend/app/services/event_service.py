@@ -0,0 +1,397 @@
+"""
+Event service - manages events and ticket sales
+"""
+
+import asyncio
+import base64
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any, Tuple
+
+from algosdk.transaction import AssetTransferTxn, Transaction
+
+from app.config import settings
+from app.models.database import Event, TransactionLog
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+from app.services.event_catalog import catalog, serialize_event, summarize_event
+from app.services.metrics_service import MetricsService
+from app.services.reservation_service import ReservationService
+from app.services.ticket_pool import TicketPool
+from app.services.treasury_service import txn_outcome
+
+logger = logging.getLogger(__name__)
+
+
+def event_window(date: str) -> Optional[Tuple[datetime, datetime]]:
+    """Start/end of a legacy YYYY-MM-DD event date (the whole day)"""
+    try:
+        day = datetime.fromisoformat(date.strip()).replace(
+            hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+        )
+    except (AttributeError, ValueError):
+        return None
+    
+    return day, day + timedelta(days=1)
+
+
+def ticket_payment_error(event: Dict[str, Any], txn: Transaction) -> Optional[str]:
+    """Why a ticket payment does not pay for the event (None if it does)"""
+    if not isinstance(txn, AssetTransferTxn) or txn.index != settings.cinr_asset_id:
+        return "Ticket payment must be a CINR transfer"
+    
+    if txn.receiver != event["organizer"]:
+        return "Ticket payment must go to the event organizer"
+    
+    if txn.amount != int(round(event["ticket_price"] * 10 ** settings.cinr_decimals)):
+        return f"Ticket payment must be {event['ticket_price']} CINR"
+    
+    return None
+
+
+def _encode_cursor(event: Event) -> str:
+    raw = f"{event.starts_at.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    starts_at, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(starts_at), int(event_id)
+
+
+class EventService:
+    """Event management operations"""
+    
+    def __init__(self, algo_client: AlgorandClient, db: Session):
+        self.algo_client = algo_client
+        self.db = db
+    
+    def create_event(
+        self,
+        app_id: int,
+        name: str,
+        description: str,
+        location: str,
+        date: str,
+        ticket_price: float,
+        max_tickets: int,
+        organizer_address: str,
+        nft_asset_id: Optional[int] = None,
+        starts_at: Optional[datetime] = None,
+        ends_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Create new event
+        
+        Args:
+            app_id: Algorand app ID for event contract
+            name: Event name
+            description: Event description
+            location: Location
+            date: Event date (YYYY-MM-DD)
+            ticket_price: Ticket price in CINR
+            max_tickets: Maximum tickets available
+            organizer_address: Organizer wallet
+            nft_asset_id: NFT asset ID for tickets
+            starts_at: Start time, UTC (default: start of date)
+            ends_at: End time, UTC (default: end of date)
+        
+        Returns:
+            Created event details
+        """
+        try:
+            if starts_at is None:
+                window = event_window(date)
+                if not window:
+                    return {"success": False, "error": "Invalid event date"}
+                starts_at = window[0]
+                ends_at = ends_at or window[1]
+            
+            # Stored as naive UTC like every other timestamp
+            if starts_at.tzinfo:
+                starts_at = starts_at.astimezone(timezone.utc).replace(tzinfo=None)
+            if ends_at is None:
+                ends_at = starts_at + timedelta(days=1)
+            elif ends_at.tzinfo:
+                ends_at = ends_at.astimezone(timezone.utc).replace(tzinfo=None)
+            
+            if ends_at <= starts_at:
+                return {"success": False, "error": "Event must end after it starts"}
+            
+            # Check if event already exists
+            existing = self.db.query(Event).filter(
+                Event.app_id == app_id
+            ).first()
+            
+            if existing:
+                return {"success": False, "error": "Event already exists"}
+            
+            # Create event
+            event = Event(
+                app_id=app_id,
+                name=name,
+                description=description,
+                location=location,
+                date=date,
+                starts_at=starts_at,
+                ends_at=ends_at,
+                ticket_price=ticket_price,
+                max_tickets=max_tickets,
+                organizer_address=organizer_address,
+                nft_asset_id=nft_asset_id
+            )
+            
+            self.db.add(event)
+            self.db.commit()
+            catalog.invalidate(app_id)
+            
+            logger.info(f"✅ Event created: {name} (App ID: {app_id})")
+            
+            return {
+                "success": True,
+                "event_id": app_id,
+                "name": name,
+                "created_at": event.created_at.isoformat()
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Event creation failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_event(self, app_id: int) -> Optional[Dict[str, Any]]:
+        """Get event details (served from the event catalog)"""
+        try:
+            cached = catalog.event(self.db, app_id)
+            return dict(cached[1]) if cached else None
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to get event: {e}")
+            return None
+    
+    def list_events(self, limit: int = 20) -> list:
+        """List all active events (served from the event catalog)"""
+        try:
+            return catalog.listing(self.db, limit)[1]
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to list events: {e}")
+            return []
+    
+    def upcoming_events(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Events starting in [start, end), soonest first
+        
+        Keyset-paginated on (starts_at, id), so every page is a range
+        scan of ix_events_starts_at however many semesters are stored.
+        
+        Args:
+            start: Window start, UTC (default: now)
+            end: Window end, UTC (default: open)
+            limit: Page size
+            cursor: next_cursor from the previous page
+        
+        Returns:
+            Page of events and the cursor for the next one
+        """
+        start = start or datetime.utcnow()
+        limit = max(1, min(limit, 100))
+        
+        query = self.db.query(Event).filter(Event.starts_at >= start)
+        
+        if end:
+            query = query.filter(Event.starts_at < end)
+        
+        if cursor:
+            try:
+                after = _decode_cursor(cursor)
+            except ValueError:
+                return {"success": False, "error": "Invalid cursor"}
+            query = query.filter(tuple_(Event.starts_at, Event.id) > after)
+        
+        events = query.order_by(Event.starts_at, Event.id).limit(limit + 1).all()
+        
+        page = events[:limit]
+        
+        return {
+            "success": True,
+            "events": [summarize_event(serialize_event(e)) for e in page],
+            "count": len(page),
+            "next_cursor": _encode_cursor(page[-1]) if len(events) > limit else None
+        }
+    
+    async def process_ticket_purchase(
+        self,
+        app_id: int,
+        buyer_address: str,
+        txid: str,
+        hold_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process ticket purchase
+        
+        Args:
+            app_id: Event app ID
+            buyer_address: Buyer wallet address
+            txid: Transaction ID
+            hold_token: Seat hold from /event/{id}/hold (optional)
+        
+        Returns:
+            Purchase result
+        """
+        try:
+            event = self.db.query(Event).filter(
+                Event.app_id == app_id
+            ).first()
+            
+            if not event:
+                return {"success": False, "error": "Event not found"}
+            
+            # Take the seat atomically (consumes the buyer's hold if any)
+            remaining = ReservationService(self.db).confirm_sale(
+                app_id,
+                buyer_address,
+                hold_token
+            )
+            
+            if remaining is None:
+                self.db.rollback()
+                
+                # The same payment was already settled (checkout and the
+                # hold sweeper can both see it confirm)
+                if hold_token and self.db.query(TransactionLog.id).filter(
+                    TransactionLog.txn_id == txid
+                ).first():
+                    return {"success": True, "event_name": event.name, "txid": txid, "already_recorded": True}
+                
+                return {"success": False, "error": "No tickets available"}
+            
+            # Claim a pre-minted ticket NFT (falls back to the event NFT)
+            pool = TicketPool(self.algo_client, self.db)
+            ticket_asset_id = pool.claim(app_id, buyer_address, event.ticket_price)
+            
+            if not ticket_asset_id:
+                logger.warning(f"⚠️ Ticket pool empty for {event.name}")
+            
+            # Log transaction
+            log = TransactionLog(
+                txn_id=txid,
+                type="payment",
+                address=buyer_address,
+                amount=event.ticket_price,
+                status="confirmed",
+                note=f"Ticket purchase for {event.name}"
+            )
+            
+            self.db.add(log)
+            MetricsService(self.db).record_sale(app_id, event.ticket_price)
+            self.db.commit()
+            catalog.invalidate(app_id)
+            
+            logger.info(f"✅ Ticket purchased: {buyer_address} for {event.name}")
+            
+            # The transfer and the stock check are algod and database round
+            # trips: keep them off the event loop
+            delivery = await asyncio.to_thread(self._deliver, app_id, ticket_asset_id, buyer_address)
+            
+            return {
+                "success": True,
+                "event_name": event.name,
+                "buyer": buyer_address,
+                "price": event.ticket_price,
+                "tickets_remaining": remaining,
+                "txid": txid,
+                "nft_asset_id": ticket_asset_id or event.nft_asset_id,
+                "delivery": delivery
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Ticket purchase processing failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _deliver(
+        self,
+        app_id: int,
+        ticket_asset_id: Optional[int],
+        buyer_address: str
+    ) -> Optional[Dict[str, Any]]:
+        """Send the ticket and top up the pool (worker thread, own session)"""
+        db = SessionLocal()
+        try:
+            pool = TicketPool(self.algo_client, db)
+            delivery = pool.transfer(ticket_asset_id, buyer_address) if ticket_asset_id else None
+            pool.ensure_stock(app_id)
+            return delivery
+        finally:
+            db.close()
+    
+    async def settle_payments(self) -> Dict[str, Any]:
+        """
+        Settle seats held under a submitted payment against the chain
+        
+        A checkout whose confirmation timed out keeps its seat "paying"
+        with the payment's txid. Confirmed payments complete the
+        purchase; payments that can no longer land (rejected, or absent
+        once algod and the indexer are both past last_valid) hand the
+        seat to the waitlist. Anything else is left for the next run.
+        
+        Returns:
+            Counts of sold, released and still pending seats
+        """
+        counts = {"sold": 0, "released": 0, "pending": 0}
+        
+        try:
+            reservations = ReservationService(self.db)
+            pending = reservations.pending_payments()
+            
+            if not pending:
+                return {"success": True, **counts}
+            
+            status = await asyncio.to_thread(self.algo_client.algod_client.status)
+            
+            for hold in pending:
+                outcome, _, _ = await asyncio.to_thread(
+                    txn_outcome,
+                    self.algo_client,
+                    hold.txn_id,
+                    hold.last_valid,
+                    status["last-round"]
+                )
+                
+                if outcome == "confirmed":
+                    result = await self.process_ticket_purchase(
+                        app_id=hold.event_id,
+                        buyer_address=hold.buyer_address,
+                        txid=hold.txn_id,
+                        hold_token=hold.token
+                    )
+                    counts["sold" if result.get("success") else "pending"] += 1
+                
+                elif outcome == "failed":
+                    reservations.abandon_payment(hold.event_id, hold.token)
+                    counts["released"] += 1
+                
+                else:
+                    counts["pending"] += 1
+            
+            if counts["sold"] or counts["released"]:
+                logger.info(
+                    f"🔁 Settled ticket payments: {counts['sold']} sold, "
+                    f"{counts['released']} released, {counts['pending']} pending"
+                )
+            
+            return {"success": True, **counts}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Ticket payment settlement failed: {e}")
+            return {"success": False, "error": str(e)}
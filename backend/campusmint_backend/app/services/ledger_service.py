@@ -0,0 +1,154 @@
+"""
+Ledger service - append-only per-club ledger with running balances
+"""
+
+import logging
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any, List
+
+from app.models.database import ClubLedgerEntry, TreasuryAllocation
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerService:
+    """
+    Every entry stores the club's balance after it, so the balance at
+    any moment is the last entry at or before that moment: one lookup
+    on (club_id, created_at, seq) instead of summing allocations.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def post(
+        self,
+        club_id: str,
+        amount: float,
+        entry_type: str,
+        ref: Optional[str] = None,
+        txn_id: Optional[str] = None,
+        at: Optional[datetime] = None
+    ) -> ClubLedgerEntry:
+        """
+        Append an entry (caller commits)
+        
+        The unique (club_id, seq) index rejects a second writer that
+        read the same previous entry, so running balances never fork.
+        
+        created_at never goes back past the previous entry: running
+        balances are in seq order, so a backdated entry (reconcile,
+        backfill) is recorded at the previous entry's time and
+        point-in-time lookups stay consistent with them.
+        """
+        last = self._last(club_id)
+        created_at = at or datetime.utcnow()
+        
+        if last and created_at < last.created_at:
+            created_at = last.created_at
+        
+        entry = ClubLedgerEntry(
+            club_id=club_id,
+            seq=(last.seq if last else 0) + 1,
+            entry_type=entry_type,
+            amount=amount,
+            balance=round((last.balance if last else 0) + amount, 6),
+            ref=ref,
+            txn_id=txn_id,
+            created_at=created_at
+        )
+        
+        self.db.add(entry)
+        self.db.flush()
+        return entry
+    
+    def get_balance(self, club_id: str, at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Club balance now, or as of a point in time
+        
+        Args:
+            club_id: Club identifier
+            at: Point in time (default: now)
+        
+        Returns:
+            Balance and the entry it was read from
+        """
+        last = self._last(club_id, at)
+        
+        return {
+            "club_id": club_id,
+            "balance": last.balance if last else 0.0,
+            "as_of": (at or datetime.utcnow()).isoformat(),
+            "last_entry": self._describe(last) if last else None
+        }
+    
+    def get_entries(
+        self,
+        club_id: str,
+        limit: int = 50,
+        before_seq: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Ledger entries, newest first (page with before_seq)"""
+        query = self.db.query(ClubLedgerEntry).filter(
+            ClubLedgerEntry.club_id == club_id
+        )
+        
+        if before_seq:
+            query = query.filter(ClubLedgerEntry.seq < before_seq)
+        
+        entries = query.order_by(ClubLedgerEntry.seq.desc()).limit(limit).all()
+        return [self._describe(e) for e in entries]
+    
+    def _last(self, club_id: str, at: Optional[datetime] = None) -> Optional[ClubLedgerEntry]:
+        query = self.db.query(ClubLedgerEntry).filter(
+            ClubLedgerEntry.club_id == club_id
+        )
+        
+        if at is None:
+            return query.order_by(ClubLedgerEntry.seq.desc()).first()
+        
+        return query.filter(
+            ClubLedgerEntry.created_at <= at
+        ).order_by(
+            ClubLedgerEntry.created_at.desc(),
+            ClubLedgerEntry.seq.desc()
+        ).first()
+    
+    def _describe(self, entry: ClubLedgerEntry) -> Dict[str, Any]:
+        return {
+            "seq": entry.seq,
+            "type": entry.entry_type,
+            "amount": entry.amount,
+            "balance": entry.balance,
+            "ref": entry.ref,
+            "txn_id": entry.txn_id,
+            "created_at": entry.created_at.isoformat()
+        }
+
+
+def backfill_ledger(db: Session):
+    """Post releases made before the ledger existed (runs once)"""
+    if db.query(ClubLedgerEntry.id).first():
+        return
+    
+    released = db.query(TreasuryAllocation).filter(
+        TreasuryAllocation.status == "released"
+    ).order_by(TreasuryAllocation.released_at, TreasuryAllocation.id).all()
+    
+    if not released:
+        return
+    
+    ledger = LedgerService(db)
+    for allocation in released:
+        ledger.post(
+            allocation.club_id,
+            allocation.amount,
+            "release",
+            ref=f"allocation:{allocation.id}",
+            txn_id=allocation.txn_id,
+            at=allocation.released_at or allocation.created_at
+        )
+    
+    db.commit()
+    logger.info(f"🛠 Club ledger backfilled from {len(released)} releases")
@@ -0,0 +1,127 @@
+"""
+Metrics service - per-minute sales and check-in rollups for organizers
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+from app.models.database import EventMetricBucket
+
+logger = logging.getLogger(__name__)
+
+_buckets = EventMetricBucket.__table__
+
+
+def minute_of(at: datetime) -> datetime:
+    """Bucket a timestamp sits in"""
+    return at.replace(second=0, microsecond=0)
+
+
+class MetricsService:
+    """
+    Counters are bumped in the same transaction as the sale or entry
+    they describe (one upsert per bucket), so reading a curve touches
+    one row per minute instead of every ticket.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def record_sale(self, app_id: int, amount: float, at: Optional[datetime] = None):
+        """Count one ticket sale (caller commits)"""
+        self._bump(app_id, minute_of(at or datetime.utcnow()), sales=1, revenue=amount or 0)
+    
+    def record_checkins(self, entries: Iterable[Tuple[int, datetime]]):
+        """Count check-ins given as (app_id, verified_at) pairs (caller commits)"""
+        per_bucket = Counter((app_id, minute_of(at)) for app_id, at in entries)
+        
+        for (app_id, minute), count in per_bucket.items():
+            self._bump(app_id, minute, checkins=count)
+    
+    def _bump(self, app_id: int, minute: datetime, sales: int = 0, revenue: float = 0, checkins: int = 0):
+        dialect = postgresql if self.db.bind.dialect.name == "postgresql" else sqlite
+        
+        upsert = dialect.insert(_buckets).values(
+            event_id=app_id,
+            minute=minute,
+            sales=sales,
+            revenue=revenue,
+            checkins=checkins
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=["event_id", "minute"],
+            set_={
+                "sales": _buckets.c.sales + upsert.excluded.sales,
+                "revenue": _buckets.c.revenue + upsert.excluded.revenue,
+                "checkins": _buckets.c.checkins + upsert.excluded.checkins
+            }
+        )
+        
+        self.db.execute(upsert)
+    
+    def get_metrics(
+        self,
+        app_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Sales and entry curves for an event
+        
+        Args:
+            app_id: Event app ID
+            start: First minute to include (optional)
+            end: Stop before this minute (optional)
+        
+        Returns:
+            Per-minute buckets with running totals
+        """
+        query = self.db.query(EventMetricBucket).filter(
+            EventMetricBucket.event_id == app_id
+        )
+        
+        if start:
+            query = query.filter(EventMetricBucket.minute >= minute_of(start))
+        if end:
+            query = query.filter(EventMetricBucket.minute < end)
+        
+        sales = []
+        checkins = []
+        sold = revenue = entered = 0
+        
+        for bucket in query.order_by(EventMetricBucket.minute):
+            minute = bucket.minute.isoformat()
+            
+            if bucket.sales:
+                sold += bucket.sales
+                revenue += bucket.revenue
+                sales.append({
+                    "minute": minute,
+                    "tickets": bucket.sales,
+                    "revenue": bucket.revenue,
+                    "total_tickets": sold
+                })
+            
+            if bucket.checkins:
+                entered += bucket.checkins
+                checkins.append({
+                    "minute": minute,
+                    "entries": bucket.checkins,
+                    "total_entries": entered
+                })
+        
+        return {
+            "event_id": app_id,
+            "bucket_seconds": 60,
+            "sales": sales,
+            "checkins": checkins,
+            "totals": {
+                "tickets_sold": sold,
+                "revenue": revenue,
+                "checked_in": entered
+            }
+        }
@@ -0,0 +1,306 @@
+"""
+Mint service - bulk NFT ticket minting in pipelined atomic groups
+"""
+
+import base64
+import json
+import logging
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from algosdk import account, encoding, mnemonic
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import AssetCreateTxn, assign_group_id
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.database import Event, Ticket
+from app.services.algo_client import AlgorandClient
+from app.services.event_catalog import catalog
+
+logger = logging.getLogger(__name__)
+
+GROUP_SIZE = 16          # protocol maximum for an atomic group
+MAX_IN_FLIGHT = 16       # groups submitted ahead of confirmations
+TICKET_UNIT_NAME = "TKT"
+
+
+class TicketMinter:
+    """
+    Mints one ASA per ticket, 16 per atomic group, keeping several
+    groups in flight per round. Progress is checkpointed to a JSON file
+    so an interrupted run resumes without minting duplicates.
+    """
+    
+    def __init__(
+        self,
+        algo_client: AlgorandClient,
+        db: Session,
+        checkpoint_dir: str = ".",
+        max_in_flight: int = MAX_IN_FLIGHT
+    ):
+        self.algo_client = algo_client
+        self.algod = algo_client.algod_client
+        self.db = db
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.max_in_flight = max_in_flight
+        
+        self.private_key = mnemonic.to_private_key(settings.admin_mnemonic)
+        self.creator = account.address_from_private_key(self.private_key)
+    
+    def mint(
+        self,
+        app_id: int,
+        count: int,
+        first_number: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Mint ticket NFTs for an event
+        
+        Args:
+            app_id: Event app ID
+            count: Number of tickets to mint
+            first_number: Number of the first ticket (default: after existing ones)
+        
+        Returns:
+            Mint result with the new asset IDs
+        """
+        try:
+            event = self.db.query(Event).filter(
+                Event.app_id == app_id
+            ).first()
+            
+            if not event:
+                return {"success": False, "error": "Event not found"}
+            
+            if first_number is None:
+                first_number = self.db.query(Ticket).filter(
+                    Ticket.event_id == app_id
+                ).count() + 1
+            
+            checkpoint = self._load_checkpoint(app_id, count, first_number)
+            groups = checkpoint["groups"]
+            count = checkpoint["count"]
+            total_groups = math.ceil(count / GROUP_SIZE)
+            
+            last_round = self.algod.status()["last-round"]
+            
+            # Re-drive groups an interrupted run left unconfirmed
+            in_flight = [g for g in groups if g["asset_ids"] is None]
+            for group in in_flight:
+                if last_round <= group["last_valid"]:
+                    self._send(group)
+            
+            while len(groups) < total_groups or in_flight:
+                params = self.algod.suggested_params()
+                
+                while len(groups) < total_groups and len(in_flight) < self.max_in_flight:
+                    group = self._build_group(event, checkpoint, len(groups), params)
+                    groups.append(group)
+                    
+                    # Persist before sending so a crash can never orphan a group
+                    self._save_checkpoint(checkpoint)
+                    self._send(group)
+                    in_flight.append(group)
+                
+                last_round = self.algod.status_after_block(last_round)["last-round"]
+                
+                for group in list(in_flight):
+                    outcome, asset_ids = self._group_outcome(group, last_round)
+                    
+                    if outcome == "confirmed":
+                        group["asset_ids"] = asset_ids
+                        self._record(event, asset_ids)
+                        in_flight.remove(group)
+                    elif outcome == "absent":
+                        # Provably never landed: safe to re-sign and resend
+                        self._rebuild_group(event, checkpoint, group, params)
+                        self._send(group)
+                
+                self._save_checkpoint(checkpoint)
+                logger.info(
+                    f"🎟 Minting {event.name}: "
+                    f"{sum(len(g['asset_ids'] or []) for g in groups)}/{count} confirmed"
+                )
+            
+            asset_ids = [a for g in groups for a in g["asset_ids"]]
+            
+            logger.info(f"✅ Minted {len(asset_ids)} tickets for {event.name}")
+            
+            return {
+                "success": True,
+                "event_id": app_id,
+                "minted": len(asset_ids),
+                "asset_ids": asset_ids,
+                "nft_asset_id": event.nft_asset_id
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Ticket minting failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    # ------------------------------------------------------------------
+    # Groups
+    # ------------------------------------------------------------------
+    
+    def _ticket_txn(self, event: Event, number: int, total: int, params) -> AssetCreateTxn:
+        suffix = f" #{number}"
+        name = event.name.encode()[:32 - len(f" #{total}")].decode(errors="ignore")
+        reserve = event.organizer_address
+        if not reserve or not self.algo_client.is_address_valid(reserve):
+            reserve = self.creator
+        
+        return AssetCreateTxn(
+            sender=self.creator,
+            sp=params,
+            total=1,
+            decimals=0,
+            default_frozen=False,
+            manager=self.creator,
+            reserve=reserve,
+            clawback=self.creator,
+            unit_name=TICKET_UNIT_NAME,
+            asset_name=name + suffix,
+            note=json.dumps({"event": event.app_id, "ticket": number}).encode()
+        )
+    
+    def _sign_group(self, event: Event, numbers: List[int], total: int, params) -> Dict[str, Any]:
+        txns = assign_group_id([
+            self._ticket_txn(event, n, total, params) for n in numbers
+        ])
+        signed = [t.sign(self.private_key) for t in txns]
+        
+        return {
+            "numbers": numbers,
+            "txids": [s.get_txid() for s in signed],
+            "signed": [encoding.msgpack_encode(s) for s in signed],
+            "last_valid": params.last,
+            "asset_ids": None
+        }
+    
+    def _build_group(self, event: Event, checkpoint: Dict, index: int, params) -> Dict[str, Any]:
+        start = checkpoint["first_number"] + index * GROUP_SIZE
+        end = min(start + GROUP_SIZE, checkpoint["first_number"] + checkpoint["count"])
+        last_number = checkpoint["first_number"] + checkpoint["count"] - 1
+        
+        return self._sign_group(event, list(range(start, end)), last_number, params)
+    
+    def _rebuild_group(self, event: Event, checkpoint: Dict, group: Dict, params):
+        last_number = checkpoint["first_number"] + checkpoint["count"] - 1
+        group.update(self._sign_group(event, group["numbers"], last_number, params))
+        self._save_checkpoint(checkpoint)
+    
+    def _send(self, group: Dict[str, Any]):
+        raw = b"".join(base64.b64decode(s) for s in group["signed"])
+        try:
+            self.algod.send_raw_transaction(base64.b64encode(raw))
+        except Exception as e:
+            # Resubmitting an already accepted group is harmless
+            logger.warning(f"⚠️ Group {group['txids'][0]} not accepted: {e}")
+    
+    def _group_outcome(
+        self,
+        group: Dict[str, Any],
+        last_round: int
+    ) -> Tuple[Optional[str], Optional[List[int]]]:
+        """
+        ("confirmed", asset_ids), ("absent", None) once the group can no
+        longer land, or (None, None) while its outcome is unknown
+        
+        Groups land atomically. A group is only absent when algod and the
+        indexer are both past its last_valid and the indexer has none of
+        its txids: re-signing on anything weaker could mint it twice.
+        """
+        asset_ids = []
+        
+        for txid in group["txids"]:
+            try:
+                info = self.algod.pending_transaction_info(txid)
+                if info.get("confirmed-round"):
+                    asset_ids.append(info["asset-index"])
+                    continue
+                if last_round <= group["last_valid"]:
+                    return None, None
+            except AlgodHTTPError as e:
+                if e.code != 404:
+                    return None, None
+            except Exception:
+                return None, None
+            
+            # Dropped from the pending pool: ask the indexer
+            try:
+                indexer = self.algo_client.indexer_client
+                found = indexer.search_transactions(txid=txid).get("transactions", [])
+                if found:
+                    asset_ids.append(found[0]["created-asset-index"])
+                    continue
+                
+                if min(last_round, indexer.health()["round"]) > group["last_valid"]:
+                    return "absent", None
+            except Exception as e:
+                logger.warning(f"⚠️ Indexer lookup failed for {txid}: {e}")
+            
+            return None, None
+        
+        return "confirmed", asset_ids
+    
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    
+    def _record(self, event: Event, asset_ids: List[int]):
+        """Store minted tickets as unsold Ticket rows"""
+        existing = {
+            row.ticket_asset_id for row in self.db.query(Ticket.ticket_asset_id).filter(
+                Ticket.ticket_asset_id.in_(asset_ids)
+            )
+        }
+        
+        for asset_id in asset_ids:
+            if asset_id not in existing:
+                self.db.add(Ticket(
+                    event_id=event.app_id,
+                    ticket_asset_id=asset_id,
+                    event_name=event.name
+                ))
+        
+        if not event.nft_asset_id:
+            event.nft_asset_id = asset_ids[0]
+        event.updated_at = datetime.utcnow()
+        
+        self.db.commit()
+        catalog.invalidate(event.app_id)
+    
+    def _checkpoint_path(self, app_id: int) -> Path:
+        return self.checkpoint_dir / f"mint_checkpoint_{app_id}.json"
+    
+    def _load_checkpoint(self, app_id: int, count: int, first_number: int) -> Dict[str, Any]:
+        path = self._checkpoint_path(app_id)
+        
+        if path.exists():
+            checkpoint = json.loads(path.read_text())
+            
+            done = all(g["asset_ids"] for g in checkpoint["groups"])
+            finished = done and len(checkpoint["groups"]) == math.ceil(
+                checkpoint["count"] / GROUP_SIZE
+            )
+            
+            if not finished:
+                logger.info(f"↩️ Resuming mint for event {app_id} from {path}")
+                return checkpoint
+        
+        return {
+            "app_id": app_id,
+            "count": count,
+            "first_number": first_number,
+            "groups": []
+        }
+    
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        path = self._checkpoint_path(checkpoint["app_id"])
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(checkpoint))
+        tmp.replace(path)
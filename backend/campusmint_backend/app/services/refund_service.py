@@ -0,0 +1,244 @@
+"""
+Refund service - pays back donors of a failed crowdfunding campaign
+"""
+
+import base64
+import copy
+import logging
+import threading
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Tuple
+
+from algosdk import account, constants, mnemonic
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import ApplicationNoOpTxn, assign_group_id, wait_for_confirmation
+
+from app.config import settings
+from app.models.database import CampaignDonor, DonationCampaign
+from app.services.algo_client import AlgorandClient
+from app.services.donor_service import DonorService
+
+logger = logging.getLogger(__name__)
+
+ACCOUNTS_PER_CALL = 4    # foreign accounts an app call may reference
+MAX_GROUP_SIZE = 16      # protocol maximum for an atomic group
+DONORS_PER_GROUP = ACCOUNTS_PER_CALL * MAX_GROUP_SIZE
+
+# Campaigns with a refund running in this process
+_running = set()
+_running_lock = threading.Lock()
+
+
+class RefundService:
+    """
+    A failed campaign (deadline passed, goal missed) refunds its donors
+    through the contract's "refund" method: each app call pays back the
+    donors it references with inner transfers, and 16 calls go out as
+    one atomic group, so 64 donors cost one round trip instead of 64.
+    
+    Donors are walked in campaign_donors id order and the cursor is
+    committed after every confirmed group, so a stopped run resumes
+    where it left off. The contract zeroes a donor's balance as it pays
+    them, which makes re-sending a group after a crash harmless.
+    
+    A donor who closed out of CINR cannot receive a transfer, so the
+    contract skips them instead of failing the group. The driver reads
+    who was paid from each call's inner transfers and flags the rest
+    with refund_skipped; their balance stays owed in the contract.
+    """
+    
+    def __init__(self, algo_client: AlgorandClient, db: Session):
+        self.algo_client = algo_client
+        self.db = db
+    
+    def refund(self, app_id: int, max_groups: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Refund a failed campaign's donors, group by group
+        
+        Args:
+            app_id: NGO app ID
+            max_groups: Stop after this many groups (default: run to the end)
+        
+        Returns:
+            Refund progress for the campaign
+        """
+        with _running_lock:
+            if app_id in _running:
+                return {"success": False, "error": "Refund already running for this campaign"}
+            _running.add(app_id)
+        
+        try:
+            return self._refund(app_id, max_groups)
+        finally:
+            with _running_lock:
+                _running.discard(app_id)
+    
+    def get_status(self, app_id: int) -> Optional[Dict[str, Any]]:
+        """Refund progress for a campaign"""
+        campaign = self.db.query(DonationCampaign).filter(
+            DonationCampaign.app_id == app_id
+        ).first()
+        
+        if not campaign:
+            return None
+        
+        remaining = self.db.query(CampaignDonor).filter(
+            CampaignDonor.app_id == app_id,
+            CampaignDonor.id > campaign.refund_cursor,
+            CampaignDonor.total > 0
+        ).count()
+        
+        skipped = self.db.query(CampaignDonor).filter(
+            CampaignDonor.app_id == app_id,
+            CampaignDonor.refund_skipped.is_(True)
+        ).count()
+        
+        return {
+            "app_id": app_id,
+            "status": campaign.refund_status,
+            "total": campaign.total,
+            "refunded": campaign.refunded,
+            "donors_remaining": remaining,
+            "donors_skipped": skipped
+        }
+    
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+    
+    def _refund(self, app_id: int, max_groups: Optional[int]) -> Dict[str, Any]:
+        # Everyone who donated up to now must be in campaign_donors
+        synced = DonorService(self.algo_client, self.db).sync(app_id)
+        if not synced.get("success"):
+            return synced
+        
+        error = self._check_failed(app_id)
+        if error:
+            return {"success": False, "error": error}
+        
+        campaign = self.db.query(DonationCampaign).filter(
+            DonationCampaign.app_id == app_id
+        ).first()
+        
+        private_key = mnemonic.to_private_key(settings.admin_mnemonic)
+        groups = 0
+        
+        while max_groups is None or groups < max_groups:
+            donors = self.db.query(CampaignDonor).filter(
+                CampaignDonor.app_id == app_id,
+                CampaignDonor.id > campaign.refund_cursor,
+                CampaignDonor.total > 0
+            ).order_by(CampaignDonor.id).limit(DONORS_PER_GROUP).all()
+            
+            if not donors:
+                campaign.refund_status = "completed"
+                self.db.commit()
+                logger.info(f"✅ Campaign {app_id} fully refunded: {campaign.refunded} units")
+                break
+            
+            try:
+                txid, paid = self._send_group(campaign, donors, private_key)
+                skipped = self._skipped(campaign, [d for d in donors if d.donor not in paid])
+            except Exception as e:
+                # Cursor untouched: the next run re-sends this group
+                campaign.refund_status = "refunding"
+                self.db.commit()
+                logger.error(f"❌ Refund group failed for app {app_id}: {e}")
+                return {**self.get_status(app_id), "success": False, "error": str(e)}
+            
+            for d in donors:
+                d.refund_skipped = d.donor in skipped
+            
+            # Unpaid donors who still hold CINR were paid by an earlier
+            # send of this group (crash before the cursor moved)
+            campaign.refund_cursor = donors[-1].id
+            campaign.refunded += sum(d.total for d in donors if d.donor not in skipped)
+            campaign.refund_status = "refunding"
+            self.db.commit()
+            groups += 1
+            
+            if skipped:
+                logger.warning(f"⚠️ Campaign {app_id}: skipped {len(skipped)} donors without a CINR holding")
+            logger.info(f"💸 Campaign {app_id}: refunded {len(donors) - len(skipped)} donors ({txid})")
+        
+        return {**self.get_status(app_id), "success": True, "groups_sent": groups}
+    
+    def _check_failed(self, app_id: int) -> Optional[str]:
+        """Why the campaign cannot be refunded, or None"""
+        state = self.algo_client.get_app_state(app_id)
+        if state is None:
+            return f"App {app_id} not found"
+        
+        values = {
+            base64.b64decode(kv["key"]): kv["value"].get("uint", 0)
+            for kv in state
+        }
+        
+        # The contract compares against the latest block's timestamp
+        algod = self.algo_client.algod_client
+        now = algod.block_info(algod.status()["last-round"])["block"]["ts"]
+        
+        if now < values.get(b"deadline", 0):
+            return "Campaign deadline has not passed"
+        
+        if values.get(b"total", 0) >= values.get(b"goal", 0):
+            return "Campaign reached its goal"
+        
+        return None
+    
+    def _send_group(
+        self,
+        campaign: DonationCampaign,
+        donors: List[CampaignDonor],
+        private_key: str
+    ) -> Tuple[str, Dict[str, int]]:
+        """Send one refund group; returns its txid and the amount paid per donor"""
+        sender = account.address_from_private_key(private_key)
+        params = self.algo_client.algod_client.suggested_params()
+        
+        calls = []
+        for i in range(0, len(donors), ACCOUNTS_PER_CALL):
+            chunk = [d.donor for d in donors[i:i + ACCOUNTS_PER_CALL]]
+            
+            # Each call covers its own fee plus one inner transfer per donor
+            sp = copy.copy(params)
+            sp.flat_fee = True
+            sp.fee = (sp.min_fee or constants.MIN_TXN_FEE) * (1 + len(chunk))
+            
+            calls.append(ApplicationNoOpTxn(
+                sender=sender,
+                sp=sp,
+                index=campaign.app_id,
+                app_args=[b"refund"],
+                accounts=chunk,
+                foreign_assets=[campaign.asset_id]
+            ))
+        
+        signed = [t.sign(private_key) for t in assign_group_id(calls)]
+        
+        algod = self.algo_client.algod_client
+        algod.send_transactions(signed)
+        wait_for_confirmation(algod, signed[0].get_txid(), 10)
+        
+        paid = {}
+        for s in signed:
+            for inner in algod.pending_transaction_info(s.get_txid()).get("inner-txns", []):
+                transfer = inner["txn"]["txn"]
+                paid[transfer["arcv"]] = paid.get(transfer["arcv"], 0) + transfer.get("aamt", 0)
+        
+        return signed[0].get_txid(), paid
+    
+    def _skipped(self, campaign: DonationCampaign, unpaid: List[CampaignDonor]) -> set:
+        """Unpaid donors the contract skipped because they hold no CINR"""
+        algod = self.algo_client.algod_client
+        skipped = set()
+        
+        for d in unpaid:
+            try:
+                algod.account_asset_info(d.donor, campaign.asset_id)
+            except AlgodHTTPError as e:
+                if e.code != 404:
+                    raise
+                skipped.add(d.donor)
+        
+        return skipped
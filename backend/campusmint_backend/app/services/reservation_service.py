@@ -0,0 +1,461 @@
+"""
+Reservation service - oversell-proof seat holds and a fair waitlist
+"""
+
+import asyncio
+import logging
+import secrets
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any
+
+from app.config import settings
+from app.models.database import Event, SeatHold
+from app.services.database import SessionLocal
+from app.services.event_catalog import catalog
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationService:
+    """
+    Seats are counted on the Event row: tickets_sold + seats_held may
+    never exceed max_tickets, and every change to either counter is a
+    single conditional UPDATE, so concurrent buyers cannot oversell.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _take_seat(self, app_id: int) -> bool:
+        """Atomically move one free seat into seats_held"""
+        result = self.db.execute(
+            update(Event)
+            .where(
+                Event.app_id == app_id,
+                Event.tickets_sold + Event.seats_held < Event.max_tickets
+            )
+            .values(seats_held=Event.seats_held + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    def hold_seat(self, app_id: int, buyer_address: str) -> Dict[str, Any]:
+        """
+        Hold a seat for a buyer, or queue them if the event is full
+        
+        Args:
+            app_id: Event app ID
+            buyer_address: Buyer wallet
+        
+        Returns:
+            Hold details (status "held" or "waiting")
+        """
+        try:
+            if not self.db.query(Event.id).filter(Event.app_id == app_id).first():
+                return {"success": False, "error": "Event not found"}
+            
+            # One live hold per buyer and event
+            existing = self.db.query(SeatHold).filter(
+                SeatHold.event_id == app_id,
+                SeatHold.buyer_address == buyer_address,
+                SeatHold.status.in_(["held", "waiting", "paying"])
+            ).first()
+            
+            if existing:
+                return self._describe(existing)
+            
+            hold = SeatHold(
+                token=secrets.token_urlsafe(16),
+                event_id=app_id,
+                buyer_address=buyer_address
+            )
+            
+            if self._take_seat(app_id):
+                hold.status = "held"
+                hold.expires_at = datetime.utcnow() + timedelta(seconds=settings.seat_hold_seconds)
+            else:
+                hold.status = "waiting"
+            
+            self.db.add(hold)
+            self.db.commit()
+            
+            if hold.status == "held":
+                catalog.invalidate(app_id)
+            
+            logger.info(f"🪑 Seat {hold.status} for {buyer_address} (event {app_id})")
+            
+            return self._describe(hold)
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Seat hold failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def claim_for_payment(
+        self,
+        app_id: int,
+        buyer_address: str,
+        hold_token: Optional[str] = None,
+        txn_id: Optional[str] = None,
+        last_valid: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Secure a seat before the buyer's payment is submitted
+        
+        The buyer's hold (their live one if no token is given, else a
+        newly taken seat) moves to "paying" with a fresh expiry, so no
+        concurrent checkout can reuse it while the payment confirms.
+        confirm_sale consumes it; release_payment hands it back.
+        
+        The payment's txid and last valid round are kept on the hold:
+        once submitted, the seat is only given up when the chain shows
+        the payment can no longer land (see abandon_payment).
+        
+        Returns:
+            Hold details, or success False if no seat could be secured
+        """
+        try:
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=settings.seat_hold_seconds)
+            
+            if not hold_token:
+                hold_token = self.db.query(SeatHold.token).filter(
+                    SeatHold.event_id == app_id,
+                    SeatHold.buyer_address == buyer_address,
+                    SeatHold.status == "held"
+                ).scalar()
+            
+            if hold_token:
+                claimed = self.db.execute(
+                    update(SeatHold)
+                    .where(
+                        SeatHold.event_id == app_id,
+                        SeatHold.token == hold_token,
+                        SeatHold.buyer_address == buyer_address,
+                        SeatHold.status == "held",
+                        SeatHold.expires_at >= now
+                    )
+                    .values(status="paying", expires_at=expires_at, txn_id=txn_id, last_valid=last_valid)
+                    .execution_options(synchronize_session=False)
+                )
+                
+                if claimed.rowcount != 1:
+                    self.db.rollback()
+                    return {"success": False, "error": "Seat hold is not active"}
+            
+            else:
+                if not self._take_seat(app_id):
+                    self.db.rollback()
+                    return {"success": False, "error": "No tickets available"}
+                
+                hold = SeatHold(
+                    token=secrets.token_urlsafe(16),
+                    event_id=app_id,
+                    buyer_address=buyer_address,
+                    status="paying",
+                    expires_at=expires_at,
+                    txn_id=txn_id,
+                    last_valid=last_valid
+                )
+                self.db.add(hold)
+                hold_token = hold.token
+            
+            self.db.commit()
+            catalog.invalidate(app_id)
+            
+            return {
+                "success": True,
+                "hold_token": hold_token,
+                "event_id": app_id,
+                "buyer": buyer_address,
+                "status": "paying",
+                "expires_at": expires_at.isoformat()
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Seat claim for payment failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def release_payment(self, app_id: int, token: str) -> Dict[str, Any]:
+        """Payment was refused: the hold goes back to "held" until it lapses"""
+        try:
+            released = self.db.execute(
+                update(SeatHold)
+                .where(
+                    SeatHold.event_id == app_id,
+                    SeatHold.token == token,
+                    SeatHold.status == "paying"
+                )
+                .values(status="held", txn_id=None, last_valid=None)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            
+            return {"success": released.rowcount == 1, "status": "held"}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Seat payment release failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def pending_payments(self) -> list:
+        """Holds whose submitted payment has not been settled yet"""
+        return self.db.query(
+            SeatHold.event_id,
+            SeatHold.token,
+            SeatHold.buyer_address,
+            SeatHold.txn_id,
+            SeatHold.last_valid
+        ).filter(
+            SeatHold.status == "paying",
+            SeatHold.txn_id.isnot(None)
+        ).order_by(SeatHold.id).all()
+    
+    def abandon_payment(self, app_id: int, token: str) -> Dict[str, Any]:
+        """
+        The payment can no longer land: expire the hold and hand its
+        seat to the waitlist
+        """
+        try:
+            abandoned = self.db.execute(
+                update(SeatHold)
+                .where(
+                    SeatHold.event_id == app_id,
+                    SeatHold.token == token,
+                    SeatHold.status == "paying"
+                )
+                .values(status="expired")
+                .execution_options(synchronize_session=False)
+            )
+            
+            if abandoned.rowcount != 1:
+                self.db.rollback()
+                return {"success": False, "error": "No payment pending"}
+            
+            self._free_seats(app_id, 1)
+            self._promote_waiting(app_id)
+            self.db.commit()
+            catalog.invalidate(app_id)
+            
+            return {"success": True, "status": "expired"}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Seat payment release failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_hold(self, app_id: int, token: str) -> Optional[Dict[str, Any]]:
+        """Hold status and queue position"""
+        hold = self.db.query(SeatHold).filter(
+            SeatHold.event_id == app_id,
+            SeatHold.token == token
+        ).first()
+        
+        return self._describe(hold) if hold else None
+    
+    def release_hold(self, app_id: int, token: str) -> Dict[str, Any]:
+        """Give a held seat back (or leave the waitlist)"""
+        try:
+            released = self.db.execute(
+                update(SeatHold)
+                .where(
+                    SeatHold.event_id == app_id,
+                    SeatHold.token == token,
+                    SeatHold.status.in_(["held", "waiting"])
+                )
+                .values(status="released")
+                .returning(SeatHold.expires_at)
+                .execution_options(synchronize_session=False)
+            ).first()
+            
+            if not released:
+                return {"success": False, "error": "No active hold"}
+            
+            # Only holds with an expiry were occupying a seat
+            if released.expires_at is not None:
+                self._free_seats(app_id, 1)
+                self._promote_waiting(app_id)
+            
+            self.db.commit()
+            
+            if released.expires_at is not None:
+                catalog.invalidate(app_id)
+            
+            return {"success": True, "status": "released"}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Seat release failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def confirm_sale(
+        self,
+        app_id: int,
+        buyer_address: str,
+        hold_token: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Turn a hold (or, without one, a free seat) into a sold ticket
+        
+        A hold token is consumed or nothing is sold, so a payment that
+        is settled twice (checkout and the sweeper) sells one seat. The
+        caller commits, so the seat and the rest of the purchase land in
+        one transaction.
+        
+        Returns:
+            Tickets remaining after the sale, or None if sold out
+        """
+        seat = None
+        
+        if hold_token:
+            confirmed = self.db.execute(
+                update(SeatHold)
+                .where(
+                    SeatHold.event_id == app_id,
+                    SeatHold.token == hold_token,
+                    SeatHold.buyer_address == buyer_address,
+                    SeatHold.status.in_(["held", "paying"])
+                )
+                .values(status="confirmed")
+                .execution_options(synchronize_session=False)
+            )
+            
+            if confirmed.rowcount == 1:
+                seat = self.db.execute(
+                    update(Event)
+                    .where(Event.app_id == app_id)
+                    .values(
+                        tickets_sold=Event.tickets_sold + 1,
+                        seats_held=Event.seats_held - 1,
+                        updated_at=datetime.utcnow()
+                    )
+                    .returning(Event.max_tickets - Event.tickets_sold - Event.seats_held)
+                    .execution_options(synchronize_session=False)
+                ).scalar()
+        
+        else:
+            # No hold: sell only if an unheld seat is left
+            seat = self.db.execute(
+                update(Event)
+                .where(
+                    Event.app_id == app_id,
+                    Event.tickets_sold + Event.seats_held < Event.max_tickets
+                )
+                .values(
+                    tickets_sold=Event.tickets_sold + 1,
+                    updated_at=datetime.utcnow()
+                )
+                .returning(Event.max_tickets - Event.tickets_sold - Event.seats_held)
+                .execution_options(synchronize_session=False)
+            ).scalar()
+        
+        return seat
+    
+    def release_expired(self) -> int:
+        """
+        Expire lapsed holds and hand their seats to the waitlist
+        
+        Holds with a submitted payment are left to settle_payments: the
+        payment may still confirm after the hold's expiry.
+        
+        Returns:
+            Number of holds expired
+        """
+        try:
+            expired = self.db.execute(
+                update(SeatHold)
+                .where(
+                    or_(
+                        SeatHold.status == "held",
+                        and_(SeatHold.status == "paying", SeatHold.txn_id.is_(None))
+                    ),
+                    SeatHold.expires_at < datetime.utcnow()
+                )
+                .values(status="expired")
+                .returning(SeatHold.event_id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            
+            for app_id, count in Counter(expired).items():
+                self._free_seats(app_id, count)
+                self._promote_waiting(app_id)
+            
+            self.db.commit()
+            
+            for app_id in set(expired):
+                catalog.invalidate(app_id)
+            
+            if expired:
+                logger.info(f"⌛ Released {len(expired)} expired seat holds")
+            
+            return len(expired)
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Hold expiry failed: {e}")
+            return 0
+    
+    def _free_seats(self, app_id: int, count: int):
+        self.db.execute(
+            update(Event)
+            .where(Event.app_id == app_id)
+            .values(seats_held=Event.seats_held - count)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _promote_waiting(self, app_id: int):
+        """Give freed seats to waiting buyers, first come first served"""
+        while True:
+            head = self.db.query(SeatHold).filter(
+                SeatHold.event_id == app_id,
+                SeatHold.status == "waiting"
+            ).order_by(SeatHold.id).first()
+            
+            if not head or not self._take_seat(app_id):
+                return
+            
+            head.status = "held"
+            head.expires_at = datetime.utcnow() + timedelta(seconds=settings.seat_hold_seconds)
+            self.db.flush()
+    
+    def _describe(self, hold: SeatHold) -> Dict[str, Any]:
+        result = {
+            "success": True,
+            "hold_token": hold.token,
+            "event_id": hold.event_id,
+            "buyer": hold.buyer_address,
+            "status": hold.status,
+            "expires_at": hold.expires_at.isoformat() if hold.expires_at else None
+        }
+        
+        if hold.status == "waiting":
+            result["position"] = self.db.query(func.count(SeatHold.id)).filter(
+                SeatHold.event_id == hold.event_id,
+                SeatHold.status == "waiting",
+                SeatHold.id < hold.id
+            ).scalar() + 1
+        
+        return result
+
+
+async def run_hold_sweeper(algo_client):
+    """
+    Background timer: release expired holds and settle submitted
+    payments against the chain every few seconds
+    """
+    # event_service imports this module
+    from app.services.event_service import EventService
+    
+    while True:
+        await asyncio.sleep(settings.seat_hold_sweep_seconds)
+        
+        db = SessionLocal()
+        try:
+            ReservationService(db).release_expired()
+            await EventService(algo_client, db).settle_payments()
+        finally:
+            db.close()
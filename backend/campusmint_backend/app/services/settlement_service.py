@@ -0,0 +1,583 @@
+"""
+Settlement service - nets treasury and inter-club flows per window
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Tuple
+
+from algosdk import account, encoding, mnemonic
+from algosdk.transaction import (
+    AssetTransferTxn,
+    SignedTransaction,
+    assign_group_id,
+    wait_for_confirmation
+)
+
+from app.config import settings
+from app.models.database import ClubTransfer, Settlement, TreasuryAllocation
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+from app.services.ledger_service import LedgerService
+from app.services.treasury_service import MAX_GROUP_SIZE, is_rejection, txn_outcome
+
+logger = logging.getLogger(__name__)
+
+TREASURY = "treasury"
+
+
+def net_transfers(flows: List[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+    """
+    Minimal set of transfers with the same net effect as the flows
+    
+    Amounts are integer base units. Each party's net position is
+    settled against the others: equal and opposite positions are paired
+    first (one transfer clears both), then the largest debtor pays the
+    largest creditor. At most (parties - 1) transfers come out.
+    
+    Args:
+        flows: (payer, payee, amount) tuples
+    
+    Returns:
+        (payer, payee, amount) net transfers
+    """
+    balance = defaultdict(int)
+    for payer, payee, amount in flows:
+        balance[payer] -= amount
+        balance[payee] += amount
+    
+    debtors = {p: -b for p, b in balance.items() if b < 0}
+    creditors = {p: b for p, b in balance.items() if b > 0}
+    transfers = []
+    
+    # Exact matches clear two parties with a single transfer
+    by_amount = defaultdict(list)
+    for party, amount in creditors.items():
+        by_amount[amount].append(party)
+    
+    for debtor, amount in sorted(debtors.items()):
+        if by_amount.get(amount):
+            creditor = by_amount[amount].pop()
+            transfers.append((debtor, creditor, amount))
+            del creditors[creditor]
+            debtors[debtor] = 0
+    
+    debtors = sorted(((a, p) for p, a in debtors.items() if a), reverse=True)
+    creditors = sorted(((a, p) for p, a in creditors.items()), reverse=True)
+    
+    while debtors and creditors:
+        owed, debtor = debtors[0]
+        due, creditor = creditors[0]
+        amount = min(owed, due)
+        transfers.append((debtor, creditor, amount))
+        
+        debtors[0] = (owed - amount, debtor)
+        creditors[0] = (due - amount, creditor)
+        
+        # Keep the largest remaining positions at the front
+        debtors = sorted((d for d in debtors if d[0]), reverse=True)
+        creditors = sorted((c for c in creditors if c[0]), reverse=True)
+    
+    return transfers
+
+
+class SettlementService:
+    """
+    Approved allocations (treasury -> club) and pending inter-club
+    transfers are netted per settlement window, so each window needs at
+    most one CINR transfer per party instead of one per flow.
+    
+    A settlement moves open -> signing -> submitted -> settled: prepare
+    builds the net transfers as one atomic group, each paying club signs
+    its leg, execute signs the treasury legs and submits. Club balances
+    only move once the group has confirmed.
+    """
+    
+    def __init__(self, db: Session, algo_client: Optional[AlgorandClient] = None):
+        self.db = db
+        self.algo_client = algo_client
+        self.scale = 10 ** settings.cinr_decimals
+    
+    def record_transfer(
+        self,
+        from_club: str,
+        to_club: str,
+        amount: float,
+        purpose: str
+    ) -> Dict[str, Any]:
+        """Record an amount one club owes another (or the treasury)"""
+        try:
+            if from_club == to_club:
+                return {"success": False, "error": "Payer and payee must differ"}
+            
+            transfer = ClubTransfer(
+                from_club=from_club,
+                to_club=to_club,
+                amount=amount,
+                purpose=purpose
+            )
+            
+            self.db.add(transfer)
+            self.db.commit()
+            
+            logger.info(f"✅ Transfer recorded: {from_club} -> {to_club} {amount} CINR")
+            
+            return {
+                "success": True,
+                "transfer_id": transfer.id,
+                "from_club": from_club,
+                "to_club": to_club,
+                "amount": amount,
+                "status": transfer.status
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Transfer record failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def settle(
+        self,
+        window_end: Optional[datetime] = None,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Net every unsettled flow created before window_end
+        
+        Args:
+            window_end: End of the settlement window (default: now)
+            dry_run: Compute the net transfers without recording them
+        
+        Returns:
+            Settlement with its net transfers
+        """
+        window_end = window_end or datetime.utcnow()
+        
+        try:
+            allocations = self.db.query(TreasuryAllocation).filter(
+                TreasuryAllocation.status == "approved",
+                TreasuryAllocation.settlement_id.is_(None),
+                TreasuryAllocation.created_at < window_end
+            ).all()
+            
+            transfers = self.db.query(ClubTransfer).filter(
+                ClubTransfer.status == "pending",
+                ClubTransfer.settlement_id.is_(None),
+                ClubTransfer.created_at < window_end
+            ).all()
+            
+            flows = [
+                (TREASURY, a.club_id, self._units(a.amount)) for a in allocations
+            ] + [
+                (t.from_club, t.to_club, self._units(t.amount)) for t in transfers
+            ]
+            
+            net = [
+                {"from": payer, "to": payee, "amount": amount / self.scale}
+                for payer, payee, amount in net_transfers(flows)
+            ]
+            
+            result = {
+                "success": True,
+                "window_end": window_end.isoformat(),
+                "gross_flows": len(flows),
+                "net_transfers": len(net),
+                "transfers": net
+            }
+            
+            if dry_run or not flows:
+                return result
+            
+            if len(net) > MAX_GROUP_SIZE:
+                return {"success": False, "error": f"{len(net)} net transfers exceed one group, settle a shorter window"}
+            
+            settlement = Settlement(
+                window_end=window_end,
+                gross_flows=len(flows),
+                net_transfers=len(net),
+                transfers=json.dumps(net),
+                # Flows that cancel out completely leave nothing to execute
+                status="open" if net else "settled",
+                settled_at=None if net else datetime.utcnow()
+            )
+            self.db.add(settlement)
+            self.db.flush()
+            
+            # Claim the flows; a concurrent settle or release makes this miss
+            claimed = self._claim(
+                TreasuryAllocation, [a.id for a in allocations], "approved", settlement.id
+            ) + self._claim(
+                ClubTransfer, [t.id for t in transfers], "pending", settlement.id
+            )
+            
+            if claimed != len(flows):
+                self.db.rollback()
+                return {"success": False, "error": "Flows changed during settlement, retry"}
+            
+            if not net:
+                self._close_flows(settlement.id, settlement.settled_at)
+            
+            self.db.commit()
+            
+            logger.info(
+                f"✅ Settlement {settlement.id}: {len(flows)} flows netted "
+                f"to {len(net)} transfers"
+            )
+            
+            result["settlement_id"] = settlement.id
+            result["status"] = settlement.status
+            return result
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Settlement failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def prepare(self, settlement_id: int, addresses: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Build the net transfers as one atomic CINR group
+        
+        Preparing again (e.g. after the group expired) replaces the
+        previous group and any club signatures collected for it.
+        
+        Args:
+            settlement_id: Settlement ID
+            addresses: Wallet address per club in the settlement
+        
+        Returns:
+            Unsigned club legs for the paying clubs to sign
+        """
+        try:
+            settlement = self.db.get(Settlement, settlement_id)
+            
+            if not settlement:
+                return {"success": False, "error": "Settlement not found"}
+            
+            if settlement.status not in ("open", "signing"):
+                return {"success": False, "error": f"Cannot prepare: status is {settlement.status}"}
+            
+            net = json.loads(settlement.transfers)
+            clubs = {t[side] for t in net for side in ("from", "to")} - {TREASURY}
+            
+            missing = sorted(clubs - set(addresses))
+            if missing:
+                return {"success": False, "error": f"Missing club addresses: {missing}"}
+            
+            invalid = sorted(c for c in clubs if not self.algo_client.is_address_valid(addresses[c]))
+            if invalid:
+                return {"success": False, "error": f"Invalid club addresses: {invalid}"}
+            
+            parties = {club: addresses[club] for club in clubs}
+            parties[TREASURY] = account.address_from_private_key(
+                mnemonic.to_private_key(settings.admin_mnemonic)
+            )
+            
+            params = self.algo_client.algod_client.suggested_params()
+            
+            txns = assign_group_id([
+                AssetTransferTxn(
+                    sender=parties[t["from"]],
+                    sp=params,
+                    receiver=parties[t["to"]],
+                    amt=self._units(t["amount"]),
+                    index=settings.cinr_asset_id,
+                    note=f"settlement:{settlement.id}".encode()
+                )
+                for t in net
+            ])
+            
+            settlement.addresses = json.dumps(parties)
+            settlement.txns = json.dumps([encoding.msgpack_encode(t) for t in txns])
+            settlement.last_valid = params.last
+            settlement.status = "signing"
+            settlement.error = None
+            self.db.commit()
+            
+            logger.info(f"📝 Settlement {settlement.id} prepared: {len(txns)} transfers")
+            
+            return {
+                "success": True,
+                "settlement_id": settlement.id,
+                "status": settlement.status,
+                "last_valid": settlement.last_valid,
+                "to_sign": [
+                    {"index": i, "club_id": t["from"], "txn": encoding.msgpack_encode(txn)}
+                    for i, (t, txn) in enumerate(zip(net, txns))
+                    if t["from"] != TREASURY
+                ]
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Settlement prepare failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def execute(self, settlement_id: int, signed_txns: List[str]) -> Dict[str, Any]:
+        """
+        Sign the treasury legs, submit the group and record it once confirmed
+        
+        A definite rejection leaves the settlement "signing" so it can be
+        signed (or prepared) again. If the outcome is unknown it stays
+        "submitted" until reconcile finds it on chain.
+        
+        Args:
+            settlement_id: Settlement ID
+            signed_txns: Base64 msgpack signed club legs, in any order
+        
+        Returns:
+            Settlement with its txids and confirmed round
+        """
+        try:
+            settlement = self.db.get(Settlement, settlement_id)
+            
+            if not settlement:
+                return {"success": False, "error": "Settlement not found"}
+            
+            if settlement.status != "signing":
+                return {"success": False, "error": f"Cannot execute: status is {settlement.status}"}
+            
+            net = json.loads(settlement.transfers)
+            txns = [encoding.msgpack_decode(t) for t in json.loads(settlement.txns)]
+            txids = [t.get_txid() for t in txns]
+            
+            signed = {}
+            for item in signed_txns:
+                stxn = encoding.msgpack_decode(item)
+                if isinstance(stxn, SignedTransaction):
+                    signed[stxn.get_txid()] = stxn
+            
+            private_key = mnemonic.to_private_key(settings.admin_mnemonic)
+            group = [
+                txn.sign(private_key) if t["from"] == TREASURY else signed.get(txid)
+                for t, txn, txid in zip(net, txns, txids)
+            ]
+            
+            unsigned = sorted({t["from"] for t, s in zip(net, group) if s is None})
+            if unsigned:
+                return {"success": False, "error": f"Missing signed transfers from: {unsigned}"}
+            
+            # Claim the settlement; a concurrent execute makes this miss
+            claimed = self.db.execute(
+                update(Settlement)
+                .where(Settlement.id == settlement_id, Settlement.status == "signing")
+                .values(status="submitted", txn_ids=json.dumps(txids), error=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.commit()
+            
+            if not claimed:
+                return {"success": False, "error": "Settlement changed during execution, retry"}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Settlement execute failed: {e}")
+            return {"success": False, "error": str(e)}
+        
+        algod = self.algo_client.algod_client
+        
+        try:
+            await asyncio.to_thread(algod.send_transactions, group)
+        except Exception as e:
+            if is_rejection(e):
+                # Nothing moved: keep the group for corrected signatures
+                self._set_status(settlement_id, "signing", error=str(e), txn_ids=None)
+                logger.error(f"❌ Settlement {settlement_id} rejected: {e}")
+                return {"success": False, "error": f"Group failed: {e}"}
+            
+            self._set_status(settlement_id, "submitted", error=f"Submission outcome unknown: {e}")
+            logger.warning(f"⚠️ Settlement {settlement_id} submission outcome unknown: {e}")
+            return {
+                "success": False,
+                "status": "submitted",
+                "txn_ids": txids,
+                "error": f"Submission outcome unknown: {e}"
+            }
+        
+        try:
+            confirmation = await asyncio.to_thread(wait_for_confirmation, algod, txids[0], 10)
+        except Exception as e:
+            logger.warning(f"⚠️ Settlement {settlement_id} not confirmed yet: {e}")
+            return {"success": False, "status": "submitted", "txn_ids": txids, "error": "Confirmation pending"}
+        
+        try:
+            self.db.expire_all()
+            settlement = self.db.get(Settlement, settlement_id)
+            self._record_settled(settlement, confirmation.get("confirmed-round"))
+            self.db.commit()
+        
+        except Exception as e:
+            # Funds moved on chain; the settlement stays "submitted" for reconcile
+            self.db.rollback()
+            logger.error(f"❌ Settlement {settlement_id} confirmed but not recorded: {e}")
+            return {"success": False, "error": str(e)}
+        
+        result = self.get_settlement(settlement_id)
+        result["success"] = True
+        result["confirmed_round"] = confirmation.get("confirmed-round")
+        return result
+    
+    def reconcile(self) -> Dict[str, Any]:
+        """
+        Settle "submitted" settlements against the chain
+        
+        Confirmed groups are recorded as settled. A group that can no
+        longer land goes back to "open" to be prepared again.
+        
+        Returns:
+            Counts of settled, reopened and still pending settlements
+        """
+        counts = {"settled": 0, "reopened": 0, "pending": 0}
+        
+        try:
+            settlements = self.db.query(Settlement).filter(
+                Settlement.status == "submitted"
+            ).all()
+            
+            if not settlements:
+                return {"success": True, **counts}
+            
+            last_round = self.algo_client.algod_client.status()["last-round"]
+            
+            for settlement in settlements:
+                # The group is atomic: its first transfer speaks for all
+                txid = json.loads(settlement.txn_ids)[0]
+                outcome, confirmed_round, _ = txn_outcome(
+                    self.algo_client, txid, settlement.last_valid, last_round
+                )
+                
+                if outcome == "confirmed":
+                    self._record_settled(settlement, confirmed_round)
+                    counts["settled"] += 1
+                
+                elif outcome == "failed":
+                    settlement.status = "open"
+                    settlement.txns = None
+                    settlement.txn_ids = None
+                    settlement.error = "Group did not land, prepare again"
+                    counts["reopened"] += 1
+                
+                else:
+                    counts["pending"] += 1
+                
+                self.db.commit()
+            
+            if counts["settled"] or counts["reopened"]:
+                logger.info(f"🔁 Reconciled settlements: {counts}")
+            
+            return {"success": True, **counts}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Settlement reconcile failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_settlement(self, settlement_id: int) -> Optional[Dict[str, Any]]:
+        """Settlement details"""
+        settlement = self.db.get(Settlement, settlement_id)
+        
+        if not settlement:
+            return None
+        
+        return {
+            "settlement_id": settlement.id,
+            "window_end": settlement.window_end.isoformat(),
+            "gross_flows": settlement.gross_flows,
+            "net_transfers": settlement.net_transfers,
+            "transfers": json.loads(settlement.transfers),
+            "txn_ids": json.loads(settlement.txn_ids) if settlement.txn_ids else None,
+            "last_valid": settlement.last_valid,
+            "status": settlement.status,
+            "error": settlement.error,
+            "created_at": settlement.created_at.isoformat(),
+            "settled_at": settlement.settled_at.isoformat() if settlement.settled_at else None
+        }
+    
+    def _record_settled(self, settlement: Settlement, confirmed_round: Optional[int]):
+        """Post the confirmed net transfers to club ledgers (caller commits)"""
+        # Club balances move by the net transfers, not the gross flows
+        ledger = LedgerService(self.db)
+        txids = json.loads(settlement.txn_ids)
+        
+        for transfer, txid in zip(json.loads(settlement.transfers), txids):
+            for club, amount in (
+                (transfer["from"], -transfer["amount"]),
+                (transfer["to"], transfer["amount"])
+            ):
+                if club != TREASURY:
+                    ledger.post(club, amount, "settlement", ref=f"settlement:{settlement.id}", txn_id=txid)
+        
+        settlement.status = "settled"
+        settlement.error = None
+        settlement.settled_at = datetime.utcnow()
+        self._close_flows(settlement.id, settlement.settled_at)
+        
+        logger.info(f"✅ Settlement {settlement.id} settled in round {confirmed_round}")
+    
+    def _close_flows(self, settlement_id: int, settled_at: datetime):
+        """The settlement paid out: its netted flows are released/settled (caller commits)"""
+        self.db.execute(
+            update(TreasuryAllocation)
+            .where(
+                TreasuryAllocation.settlement_id == settlement_id,
+                TreasuryAllocation.status == "netted"
+            )
+            .values(status="released", released_at=settled_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            update(ClubTransfer)
+            .where(
+                ClubTransfer.settlement_id == settlement_id,
+                ClubTransfer.status == "netted"
+            )
+            .values(status="settled")
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _set_status(self, settlement_id: int, status: str, **values):
+        self.db.execute(
+            update(Settlement)
+            .where(Settlement.id == settlement_id)
+            .values(status=status, **values)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+    
+    def _units(self, amount: float) -> int:
+        return int(round(amount * self.scale))
+    
+    def _claim(self, model, ids: List[int], status: str, settlement_id: int) -> int:
+        if not ids:
+            return 0
+        
+        result = self.db.execute(
+            update(model)
+            .where(
+                model.id.in_(ids),
+                model.status == status,
+                model.settlement_id.is_(None)
+            )
+            .values(status="netted", settlement_id=settlement_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+async def run_settlement_reconciler(algo_client: AlgorandClient):
+    """Background timer: settle submitted settlements against the chain"""
+    while True:
+        await asyncio.sleep(settings.release_reconcile_seconds)
+        await asyncio.to_thread(_reconcile, algo_client)
+
+
+def _reconcile(algo_client: AlgorandClient):
+    db = SessionLocal()
+    try:
+        SettlementService(db, algo_client).reconcile()
+    finally:
+        db.close()
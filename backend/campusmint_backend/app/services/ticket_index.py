@@ -0,0 +1,329 @@
+"""
+Hot ticket index - in-memory redemption during an event's entry window
+"""
+
+import asyncio
+import logging
+from array import array
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+from sqlalchemy import bindparam, update
+
+from app.models.database import Ticket, Event
+from app.services.database import SessionLocal
+from app.services.metrics_service import MetricsService
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 0.5        # seconds before a failed write-through batch is retried
+MAX_RETRY_DELAY = 10.0
+
+# Write-through statement: bindparams make one executemany per batch
+_tickets = Ticket.__table__
+_mark_used = (
+    update(_tickets)
+    .where(
+        _tickets.c.ticket_asset_id == bindparam("asset_id"),
+        _tickets.c.event_id == bindparam("for_event"),
+        _tickets.c.is_used == False  # noqa: E712
+    )
+    .values(
+        is_used=True,
+        verified_at=bindparam("used_at"),
+        entry_count=_tickets.c.entry_count + 1
+    )
+)
+
+
+class HotTicketIndex:
+    """
+    Compact index of one event's tickets
+    
+    Each ticket gets a slot; per-slot data lives in flat arrays and the
+    used flags in a bitset, so a 5,000 seat event costs a few hundred KB.
+    """
+    
+    def __init__(self, event_id: int, event_name: str):
+        self.event_id = event_id
+        self.event_name = event_name
+        self.slots: Dict[int, int] = {}     # asset id -> slot
+        self.owners: List[str] = []
+        self.entry_counts = array("I")
+        self.used_at = array("d")           # epoch seconds, 0 if unused
+        self.used = bytearray()
+    
+    def __len__(self) -> int:
+        return len(self.owners)
+    
+    def add(
+        self,
+        asset_id: int,
+        owner: str,
+        is_used: bool = False,
+        entry_count: int = 0,
+        used_at: Optional[datetime] = None
+    ) -> int:
+        """Append a ticket (or update the owner of a known one) and return its slot"""
+        if asset_id in self.slots:
+            slot = self.slots[asset_id]
+            self.owners[slot] = owner
+            return slot
+        
+        slot = len(self.owners)
+        
+        if slot % 8 == 0:
+            self.used.append(0)
+        
+        self.slots[asset_id] = slot
+        self.owners.append(owner)
+        self.entry_counts.append(entry_count or 0)
+        self.used_at.append(used_at.timestamp() if used_at else 0.0)
+        
+        if is_used:
+            self.used[slot >> 3] |= 1 << (slot & 7)
+        
+        return slot
+    
+    def is_used(self, slot: int) -> bool:
+        return bool(self.used[slot >> 3] & (1 << (slot & 7)))
+    
+    def redeem(self, wallet: str, asset_id: int) -> Tuple[str, Optional[int]]:
+        """
+        Test-and-set the used bit for a ticket
+        
+        Returns:
+            ("granted" | "used" | "missing", slot)
+        """
+        slot = self.slots.get(asset_id)
+        
+        if slot is None or self.owners[slot] != wallet:
+            return "missing", None
+        
+        if self.is_used(slot):
+            return "used", slot
+        
+        self.used[slot >> 3] |= 1 << (slot & 7)
+        self.entry_counts[slot] += 1
+        self.used_at[slot] = datetime.utcnow().timestamp()
+        
+        return "granted", slot
+
+
+class TicketIndexRegistry:
+    """
+    Hot indexes for events whose check-in is open
+    
+    Redemptions are decided in memory and written through to the
+    database by a background task; a batch that fails to write is
+    retried until it lands, so a granted entry is never lost. The index
+    is per process: run the check-in API with a single worker while an
+    index is open.
+    """
+    
+    def __init__(self, session_factory=SessionLocal, batch_size: int = 256):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.indexes: Dict[int, HotTicketIndex] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+    
+    def get(self, event_id: int) -> Optional[HotTicketIndex]:
+        return self.indexes.get(event_id)
+    
+    async def open(self, event_id: int) -> Dict[str, Any]:
+        """
+        Warm the index for an event (check-in opens)
+        
+        Opening an event that is already open keeps its index: a rebuild
+        from the database would forget redemptions still waiting to be
+        written through.
+        """
+        index = self.indexes.get(event_id)
+        
+        if index is not None:
+            return {**self._describe(index), "already_open": True}
+        
+        # The reads run off the event loop so check-ins keep flowing
+        event, rows = await asyncio.to_thread(self._load, event_id)
+        
+        # Another open may have finished while this one was loading
+        index = self.indexes.get(event_id)
+        
+        if index is not None:
+            return {**self._describe(index), "already_open": True}
+        
+        event_name = event.name if event else (rows[0].event_name if rows else "")
+        index = HotTicketIndex(event_id, event_name)
+        
+        for row in rows:
+            index.add(
+                row.ticket_asset_id,
+                row.buyer_address,
+                row.is_used,
+                row.entry_count,
+                row.verified_at
+            )
+        
+        self.indexes[event_id] = index
+        self._start_writer()
+        
+        logger.info(f"🔥 Check-in index warmed for event {event_id}: {len(index)} tickets")
+        
+        return self._describe(index)
+    
+    def _load(self, event_id: int):
+        db = self.session_factory()
+        try:
+            event = db.query(Event.name).filter(
+                Event.app_id == event_id
+            ).first()
+            
+            rows = db.query(
+                Ticket.ticket_asset_id,
+                Ticket.buyer_address,
+                Ticket.is_used,
+                Ticket.entry_count,
+                Ticket.verified_at,
+                Ticket.event_name
+            ).filter(
+                Ticket.event_id == event_id
+            ).all()
+            
+            return event, rows
+        finally:
+            db.close()
+    
+    async def close(self, event_id: int) -> Dict[str, Any]:
+        """Drop the index for an event once pending writes are flushed"""
+        if self._queue is not None:
+            await self._queue.join()
+        
+        index = self.indexes.pop(event_id, None)
+        
+        if index is None:
+            return {"success": False, "error": "Check-in is not open for this event"}
+        
+        logger.info(f"🧊 Check-in index closed for event {event_id}")
+        
+        return {"success": True, "event_id": event_id, "tickets": len(index)}
+    
+    async def close_all(self, timeout: float = 30.0):
+        """Flush and stop the writer (shutdown)"""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self.close(event_id) for event_id in list(self.indexes))),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                f"❌ Shutting down with {self._queue.qsize()} hot redemptions "
+                "not written through"
+            )
+        
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+    
+    def redeem(
+        self,
+        index: HotTicketIndex,
+        wallet: str,
+        ticket_asset_id: int
+    ) -> Dict[str, Any]:
+        """Redeem in memory and queue the database write"""
+        status, slot = index.redeem(wallet, ticket_asset_id)
+        
+        if status == "missing":
+            return {
+                "valid": False,
+                "message": "Ticket not found",
+                "event_id": index.event_id
+            }
+        
+        used_at = datetime.fromtimestamp(index.used_at[slot])
+        
+        if status == "used":
+            return {
+                "valid": False,
+                "message": "Ticket already used",
+                "used_at": used_at.isoformat() if index.used_at[slot] else None
+            }
+        
+        self._queue.put_nowait({
+            "event_id": index.event_id,
+            "asset_id": ticket_asset_id,
+            "used_at": used_at
+        })
+        
+        logger.info(f"✅ Ticket verified (hot): {ticket_asset_id} for {wallet}")
+        
+        return {
+            "valid": True,
+            "message": "Ticket verified - Entry granted",
+            "event_name": index.event_name,
+            "attendee": wallet,
+            "ticket_id": ticket_asset_id,
+            "entry_count": index.entry_counts[slot],
+            "verified_at": used_at.isoformat()
+        }
+    
+    def _describe(self, index: HotTicketIndex) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "event_id": index.event_id,
+            "tickets": len(index),
+            "already_used": sum(1 for s in range(len(index)) if index.is_used(s))
+        }
+    
+    def _start_writer(self):
+        if self._writer is None or self._writer.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._writer = asyncio.get_running_loop().create_task(self._write_through())
+    
+    async def _write_through(self):
+        """Drain redemptions into batched UPDATEs"""
+        while True:
+            batch = [await self._queue.get()]
+            
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            delay = RETRY_DELAY
+            
+            # The batch stays unfinished (close() keeps waiting) until it lands
+            while True:
+                try:
+                    await asyncio.to_thread(self._flush, batch)
+                    break
+                except Exception as e:
+                    logger.error(
+                        f"❌ Ticket write-through failed ({len(batch)} rows), "
+                        f"retrying in {delay:.1f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+            
+            for _ in batch:
+                self._queue.task_done()
+    
+    def _flush(self, batch: List[Dict[str, Any]]):
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                _mark_used,
+                [{"asset_id": r["asset_id"], "for_event": r["event_id"], "used_at": r["used_at"]} for r in batch]
+            )
+            MetricsService(db).record_checkins((r["event_id"], r["used_at"]) for r in batch)
+            db.commit()
+            
+            if result.rowcount != len(batch):
+                logger.warning(
+                    f"⚠️ {len(batch) - result.rowcount} hot redemptions were "
+                    "already used in the database"
+                )
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
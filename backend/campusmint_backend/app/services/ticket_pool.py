@@ -0,0 +1,340 @@
+"""
+Ticket pool - pre-minted ticket NFTs claimed at checkout
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any
+
+from algosdk import account, mnemonic
+from algosdk.transaction import AssetTransferTxn
+
+from app.config import settings
+from app.models.database import Event, Ticket
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+from app.services.mint_service import TicketMinter
+from app.services.treasury_service import is_rejection, txn_outcome
+
+logger = logging.getLogger(__name__)
+
+# Events with a refill running in this process
+_refilling = set()
+_refilling_lock = threading.Lock()
+
+
+class TicketPool:
+    """
+    Unsold ticket ASAs are Ticket rows without a buyer. Checkout claims
+    one with a conditional UPDATE and transfers it; the pool is topped
+    up by a background mint when it drops below the low watermark.
+    
+    A claimed ticket is "pending" until its transfer is submitted, then
+    "sent" with the txid, then "delivered" once reconcile_deliveries
+    sees it confirm. Transfers that were refused or can no longer land
+    are sent again.
+    """
+    
+    def __init__(self, algo_client: AlgorandClient, db: Session):
+        self.algo_client = algo_client
+        self.db = db
+    
+    def available(self, app_id: int) -> int:
+        """Number of unclaimed tickets for an event"""
+        return self.db.query(func.count(Ticket.id)).filter(
+            Ticket.event_id == app_id,
+            Ticket.buyer_address.is_(None)
+        ).scalar()
+    
+    def status(self, app_id: int) -> Dict[str, Any]:
+        """Pool status for an event"""
+        return {
+            "event_id": app_id,
+            "available": self.available(app_id),
+            "undelivered": self.db.query(func.count(Ticket.id)).filter(
+                Ticket.event_id == app_id,
+                Ticket.delivery_status.in_(["pending", "sent"])
+            ).scalar(),
+            "low_watermark": settings.ticket_pool_low_watermark,
+            "refilling": app_id in _refilling
+        }
+    
+    def claim(
+        self,
+        app_id: int,
+        buyer_address: str,
+        price_paid: float,
+        attempts: int = 3
+    ) -> Optional[int]:
+        """
+        Claim a free ticket for a buyer (caller commits)
+        
+        Returns:
+            Claimed ticket asset ID, or None if the pool is empty
+        """
+        free_ticket = select(Ticket.id).where(
+            Ticket.event_id == app_id,
+            Ticket.buyer_address.is_(None)
+        ).order_by(Ticket.id).limit(1).scalar_subquery()
+        
+        claim = (
+            update(Ticket)
+            .where(
+                Ticket.id == free_ticket,
+                Ticket.buyer_address.is_(None)
+            )
+            .values(
+                buyer_address=buyer_address,
+                price_paid=price_paid,
+                purchased_at=datetime.utcnow(),
+                delivery_status="pending"
+            )
+            .returning(Ticket.ticket_asset_id)
+            .execution_options(synchronize_session=False)
+        )
+        
+        # A concurrent buyer can take the same row first; pick again
+        for _ in range(attempts):
+            asset_id = self.db.execute(claim).scalar()
+            if asset_id:
+                return asset_id
+            if not self.available(app_id):
+                return None
+        
+        return None
+    
+    def transfer(
+        self,
+        asset_id: int,
+        buyer_address: str,
+        previous_txid: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a claimed ticket to its buyer (buyer must be opted in)
+        
+        The txid is recorded on the ticket before the transfer is sent,
+        and only if the ticket still has no transfer in flight (or, for a
+        resend, still has previous_txid), so one ticket is never sent
+        twice at once.
+        
+        Returns:
+            Submission result (confirmation is left to reconcile_deliveries)
+        """
+        try:
+            private_key = mnemonic.to_private_key(settings.admin_mnemonic)
+            sender = account.address_from_private_key(private_key)
+            
+            txn = AssetTransferTxn(
+                sender=sender,
+                sp=self.algo_client.algod_client.suggested_params(),
+                receiver=buyer_address,
+                amt=1,
+                index=asset_id
+            )
+            signed = txn.sign(private_key)
+            txid = signed.get_txid()
+            
+            claimed = self.db.execute(
+                update(Ticket)
+                .where(
+                    Ticket.ticket_asset_id == asset_id,
+                    Ticket.buyer_address == buyer_address,
+                    Ticket.delivery_status.in_(["pending", "sent"]),
+                    (Ticket.delivery_txid == previous_txid) if previous_txid else Ticket.delivery_txid.is_(None)
+                )
+                .values(delivery_status="sent", delivery_txid=txid, delivery_last_valid=txn.last_valid_round)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            
+            if claimed.rowcount != 1:
+                return {"success": False, "error": "Ticket transfer already in flight"}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"⚠️ Ticket {asset_id} transfer failed: {e}")
+            return {"success": False, "error": str(e)}
+        
+        try:
+            self.algo_client.algod_client.send_transaction(signed)
+        
+        except Exception as e:
+            if not is_rejection(e):
+                # May still land: reconcile_deliveries settles it
+                logger.warning(f"⚠️ Ticket {asset_id} transfer outcome unknown: {e}")
+                return {"success": False, "status": "sent", "txid": txid, "error": str(e)}
+            
+            self._mark_pending(asset_id, txid)
+            logger.warning(f"⚠️ Ticket {asset_id} transfer refused: {e}")
+            return {"success": False, "status": "pending", "error": str(e)}
+        
+        logger.info(f"📤 Ticket {asset_id} sent to {buyer_address}: {txid}")
+        
+        return {"success": True, "status": "sent", "txid": txid}
+    
+    def _mark_pending(self, asset_id: int, txid: str):
+        """The transfer cannot land: leave the ticket for the next resend"""
+        self.db.execute(
+            update(Ticket)
+            .where(Ticket.ticket_asset_id == asset_id, Ticket.delivery_txid == txid)
+            .values(delivery_status="pending", delivery_txid=None, delivery_last_valid=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+    
+    def reconcile_deliveries(self) -> Dict[str, Any]:
+        """
+        Settle ticket transfers against the chain
+        
+        Sent transfers that confirmed are marked delivered. Tickets whose
+        transfer was refused, never submitted, or can no longer land
+        (absent once algod and the indexer are both past last_valid) are
+        sent again. Anything else is left for the next run.
+        
+        Returns:
+            Counts of delivered, resent and still pending tickets
+        """
+        counts = {"delivered": 0, "resent": 0, "pending": 0}
+        
+        try:
+            rows = self.db.query(
+                Ticket.ticket_asset_id,
+                Ticket.buyer_address,
+                Ticket.delivery_status,
+                Ticket.delivery_txid,
+                Ticket.delivery_last_valid
+            ).filter(
+                Ticket.delivery_status.in_(["pending", "sent"])
+            ).order_by(Ticket.id).all()
+            
+            if not rows:
+                return {"success": True, **counts}
+            
+            last_round = self.algo_client.algod_client.status()["last-round"]
+            
+            for row in rows:
+                if row.delivery_txid:
+                    outcome, _, _ = txn_outcome(
+                        self.algo_client,
+                        row.delivery_txid,
+                        row.delivery_last_valid,
+                        last_round
+                    )
+                    
+                    if outcome == "confirmed":
+                        self.db.execute(
+                            update(Ticket)
+                            .where(
+                                Ticket.ticket_asset_id == row.ticket_asset_id,
+                                Ticket.delivery_txid == row.delivery_txid
+                            )
+                            .values(delivery_status="delivered")
+                            .execution_options(synchronize_session=False)
+                        )
+                        self.db.commit()
+                        counts["delivered"] += 1
+                        continue
+                    
+                    if outcome is None:
+                        counts["pending"] += 1
+                        continue
+                
+                result = self.transfer(row.ticket_asset_id, row.buyer_address, row.delivery_txid)
+                counts["resent" if result.get("txid") else "pending"] += 1
+            
+            if counts["delivered"] or counts["resent"]:
+                logger.info(
+                    f"🔁 Reconciled ticket deliveries: {counts['delivered']} delivered, "
+                    f"{counts['resent']} resent, {counts['pending']} pending"
+                )
+            
+            return {"success": True, **counts}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Ticket delivery reconcile failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def ensure_stock(self, app_id: int, force: bool = False) -> bool:
+        """
+        Start a background refill if the pool is below its watermark
+        (force seeds or tops up the pool regardless)
+        
+        Returns:
+            True if a refill was started
+        """
+        if not force and self.available(app_id) >= settings.ticket_pool_low_watermark:
+            return False
+        
+        event = self.db.query(Event).filter(Event.app_id == app_id).first()
+        if not event:
+            return False
+        
+        minted = self.db.query(func.count(Ticket.id)).filter(
+            Ticket.event_id == app_id
+        ).scalar()
+        
+        # Only events seeded through the pool refill automatically
+        if not force and not minted:
+            return False
+        
+        # Never mint past the event's capacity
+        batch = min(settings.ticket_pool_refill_size, event.max_tickets - minted)
+        
+        if batch <= 0:
+            return False
+        
+        with _refilling_lock:
+            if app_id in _refilling:
+                return False
+            _refilling.add(app_id)
+        
+        threading.Thread(
+            target=self._refill,
+            args=(app_id, batch),
+            name=f"ticket-pool-{app_id}",
+            daemon=True
+        ).start()
+        
+        logger.info(f"♻️ Refilling ticket pool for event {app_id}: {batch} tickets")
+        return True
+    
+    def _refill(self, app_id: int, batch: int):
+        db = SessionLocal()
+        try:
+            minter = TicketMinter(
+                self.algo_client,
+                db,
+                checkpoint_dir=settings.mint_checkpoint_dir
+            )
+            result = minter.mint(app_id, batch)
+            
+            if not result.get("success"):
+                logger.error(f"❌ Ticket pool refill failed: {result.get('error')}")
+        
+        except Exception as e:
+            logger.error(f"❌ Ticket pool refill failed: {e}")
+        
+        finally:
+            db.close()
+            with _refilling_lock:
+                _refilling.discard(app_id)
+
+
+async def run_delivery_reconciler(algo_client: AlgorandClient):
+    """Background timer: confirm or resend ticket transfers"""
+    while True:
+        await asyncio.sleep(settings.release_reconcile_seconds)
+        await asyncio.to_thread(_reconcile_deliveries, algo_client)
+
+
+def _reconcile_deliveries(algo_client: AlgorandClient):
+    db = SessionLocal()
+    try:
+        TicketPool(algo_client, db).reconcile_deliveries()
+    finally:
+        db.close()
@@ -0,0 +1,330 @@
+"""
+Ticket service - manages NFT tickets and QR verification
+"""
+
+import logging
+import json
+import qrcode
+from io import BytesIO
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any
+
+from app.config import settings
+from app.models.database import Ticket, Event
+from app.models.schemas import TicketQRPayload
+from app.services.algo_client import AlgorandClient
+from app.services.metrics_service import MetricsService
+from app.services.ticket_index import TicketIndexRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class TicketService:
+    """NFT Ticket management"""
+    
+    def __init__(
+        self,
+        algo_client: AlgorandClient,
+        db: Session,
+        ticket_index: Optional[TicketIndexRegistry] = None
+    ):
+        self.algo_client = algo_client
+        self.db = db
+        self.ticket_index = ticket_index
+    
+    def create_qr_payload(
+        self,
+        event_id: int,
+        wallet: str,
+        ticket_asset_id: int
+    ) -> str:
+        """
+        Create QR code payload (JSON)
+        
+        Args:
+            event_id: Event app ID
+            wallet: Attendee wallet
+            ticket_asset_id: Ticket NFT asset ID
+        
+        Returns:
+            JSON payload string
+        """
+        payload = {
+            "event_id": event_id,
+            "wallet": wallet,
+            "ticket_id": ticket_asset_id
+        }
+        return json.dumps(payload)
+    
+    def generate_qr_code(self, payload: str) -> bytes:
+        """
+        Generate QR code image from payload
+        
+        Args:
+            payload: JSON payload string
+        
+        Returns:
+            PNG bytes
+        """
+        try:
+            qr = qrcode.QRCode(
+                version=1,
+                error_correction=qrcode.constants.ERROR_CORRECT_L,
+                box_size=10,
+                border=4,
+            )
+            qr.add_data(payload)
+            qr.make(fit=True)
+            
+            img = qr.make_image(fill_color="black", back_color="white")
+            
+            # Convert to bytes
+            buffer = BytesIO()
+            img.save(buffer, format="PNG")
+            return buffer.getvalue()
+        
+        except Exception as e:
+            logger.error(f"❌ QR generation failed: {e}")
+            return b""
+    
+    async def register_ticket(
+        self,
+        event_id: int,
+        ticket_asset_id: int,
+        buyer_address: str,
+        event_name: str,
+        price_paid: float,
+        txid: str
+    ) -> Dict[str, Any]:
+        """
+        Register purchased ticket in database
+        
+        Args:
+            event_id: Event app ID
+            ticket_asset_id: NFT asset ID
+            buyer_address: Buyer wallet
+            event_name: Event name
+            price_paid: Price in CINR
+            txid: Purchase transaction ID
+        
+        Returns:
+            Registration result with QR code
+        """
+        try:
+            # Check if ticket already exists
+            existing = self.db.query(Ticket).filter(
+                Ticket.ticket_asset_id == ticket_asset_id
+            ).first()
+            
+            if existing and existing.buyer_address:
+                return {"success": False, "error": "Ticket already registered"}
+            
+            if existing:
+                # Pre-minted ticket: claim the unsold row
+                ticket = existing
+                ticket.buyer_address = buyer_address
+                ticket.price_paid = price_paid
+                ticket.purchased_at = datetime.utcnow()
+            else:
+                # Create ticket record
+                ticket = Ticket(
+                    event_id=event_id,
+                    ticket_asset_id=ticket_asset_id,
+                    buyer_address=buyer_address,
+                    event_name=event_name,
+                    price_paid=price_paid
+                )
+                self.db.add(ticket)
+            
+            self.db.commit()
+            
+            # Late registrations join an open check-in index
+            index = self.ticket_index.get(event_id) if self.ticket_index else None
+            if index:
+                index.add(ticket_asset_id, buyer_address)
+            
+            # Generate QR code
+            qr_payload = self.create_qr_payload(
+                event_id,
+                buyer_address,
+                ticket_asset_id
+            )
+            qr_bytes = self.generate_qr_code(qr_payload)
+            
+            logger.info(f"✅ Ticket registered: {ticket_asset_id} for {buyer_address}")
+            
+            return {
+                "success": True,
+                "ticket_asset_id": ticket_asset_id,
+                "event_name": event_name,
+                "buyer": buyer_address,
+                "qr_payload": qr_payload,
+                "qr_code": qr_bytes.hex(),  # Convert to hex for JSON
+                "registered_at": ticket.purchased_at.isoformat()
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Ticket registration failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def verify_ticket(
+        self,
+        event_id: int,
+        wallet: str,
+        ticket_asset_id: int
+    ) -> Dict[str, Any]:
+        """
+        Verify ticket for entry
+        
+        Args:
+            event_id: Event app ID
+            wallet: Attendee wallet
+            ticket_asset_id: Ticket asset ID
+        
+        Returns:
+            Verification result
+        """
+        # During an open entry window the hot index decides in memory
+        index = self.ticket_index.get(event_id) if self.ticket_index else None
+        if index:
+            return self.ticket_index.redeem(index, wallet, ticket_asset_id)
+        
+        try:
+            now = datetime.utcnow()
+            
+            # Event name is read in the same statement so the gate needs
+            # no second round trip once the ticket has been claimed
+            event_name = select(Event.name).where(
+                Event.app_id == Ticket.event_id
+            ).scalar_subquery()
+            
+            # Claim the ticket atomically: only one concurrent scan can
+            # flip is_used, every other scan matches zero rows
+            redeem = (
+                update(Ticket)
+                .where(
+                    Ticket.event_id == event_id,
+                    Ticket.ticket_asset_id == ticket_asset_id,
+                    Ticket.buyer_address == wallet,
+                    Ticket.is_used == False  # noqa: E712
+                )
+                .values(
+                    is_used=True,
+                    verified_at=now,
+                    entry_count=Ticket.entry_count + 1
+                )
+                .returning(
+                    Ticket.entry_count,
+                    Ticket.verified_at,
+                    func.coalesce(event_name, Ticket.event_name)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            
+            row = self.db.execute(redeem).first()
+            
+            if row:
+                MetricsService(self.db).record_checkins([(event_id, now)])
+            
+            self.db.commit()
+            
+            if not row:
+                return self._rejection(event_id, wallet, ticket_asset_id)
+            
+            entry_count, verified_at, name = row
+            
+            logger.info(f"✅ Ticket verified: {ticket_asset_id} for {wallet}")
+            
+            return {
+                "valid": True,
+                "message": "Ticket verified - Entry granted",
+                "event_name": name,
+                "attendee": wallet,
+                "ticket_id": ticket_asset_id,
+                "entry_count": entry_count,
+                "verified_at": verified_at.isoformat()
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Ticket verification failed: {e}")
+            return {
+                "valid": False,
+                "message": f"Verification error: {str(e)}"
+            }
+    
+    def _rejection(
+        self,
+        event_id: int,
+        wallet: str,
+        ticket_asset_id: int
+    ) -> Dict[str, Any]:
+        """Explain why a redemption matched no row (cold path only)"""
+        ticket = self.db.query(Ticket).filter(
+            Ticket.event_id == event_id,
+            Ticket.ticket_asset_id == ticket_asset_id,
+            Ticket.buyer_address == wallet
+        ).first()
+        
+        if not ticket:
+            return {
+                "valid": False,
+                "message": "Ticket not found",
+                "event_id": event_id
+            }
+        
+        return {
+            "valid": False,
+            "message": "Ticket already used",
+            "used_at": ticket.verified_at.isoformat() if ticket.verified_at else None
+        }
+    
+    def get_ticket_info(self, ticket_asset_id: int) -> Optional[Dict[str, Any]]:
+        """Get ticket information"""
+        try:
+            ticket = self.db.query(Ticket).filter(
+                Ticket.ticket_asset_id == ticket_asset_id
+            ).first()
+            
+            if not ticket:
+                return None
+            
+            return {
+                "ticket_id": ticket.ticket_asset_id,
+                "event_name": ticket.event_name,
+                "buyer": ticket.buyer_address,
+                "price_paid": ticket.price_paid,
+                "purchased_at": ticket.purchased_at.isoformat(),
+                "verified_at": ticket.verified_at.isoformat() if ticket.verified_at else None,
+                "is_used": ticket.is_used,
+                "entry_count": ticket.entry_count
+            }
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to get ticket info: {e}")
+            return None
+    
+    def list_user_tickets(self, address: str) -> list:
+        """List all tickets for a user"""
+        try:
+            tickets = self.db.query(Ticket).filter(
+                Ticket.buyer_address == address
+            ).order_by(Ticket.purchased_at.desc()).all()
+            
+            return [
+                {
+                    "ticket_id": t.ticket_asset_id,
+                    "event": t.event_name,
+                    "purchased_at": t.purchased_at.isoformat(),
+                    "is_used": t.is_used,
+                    "verified_at": t.verified_at.isoformat() if t.verified_at else None
+                }
+                for t in tickets
+            ]
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to list tickets: {e}")
+            return []
@@ -0,0 +1,826 @@
+"""
+Treasury service - manages club fund allocations and releases
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy import and_, bindparam, case, func, update
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Tuple
+
+from algosdk import account, mnemonic
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import AssetTransferTxn, assign_group_id, wait_for_confirmation
+
+from app.config import settings
+from app.models.database import TreasuryAllocation, TransactionLog
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+from app.services.ledger_service import LedgerService
+
+logger = logging.getLogger(__name__)
+
+MAX_GROUP_SIZE = 16      # protocol maximum for an atomic group
+
+# Per-allocation txid and validity, set while the batch is claimed
+_allocations = TreasuryAllocation.__table__
+_set_release_txid = (
+    update(_allocations)
+    .where(_allocations.c.id == bindparam("allocation_id"))
+    .values(txn_id=bindparam("txid"), last_valid=bindparam("valid_until"))
+)
+
+
+def restore_status():
+    """Status to hand an allocation back to when its release did not happen"""
+    return case(
+        (and_(TreasuryAllocation.admin_approval, TreasuryAllocation.club_lead_approval), "approved"),
+        else_="pending"
+    )
+
+
+def is_rejection(error: Exception) -> bool:
+    """
+    True if algod definitely refused a submission, so nothing can land
+    
+    Timeouts, connection errors and 5xx leave the outcome unknown, and
+    "already in ledger" means it did land.
+    """
+    return (
+        isinstance(error, AlgodHTTPError)
+        and error.code is not None
+        and 400 <= error.code < 500
+        and "already in ledger" not in str(error)
+    )
+
+
+def txn_outcome(
+    algo_client: AlgorandClient,
+    txid: str,
+    last_valid: Optional[int],
+    last_round: int
+) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """
+    Outcome of a submitted transaction whose confirmation was not seen
+    
+    Returns:
+        ("confirmed", round, receiver), ("failed", None, None), or
+        (None, None, None) while it may still land
+    """
+    try:
+        info = algo_client.algod_client.pending_transaction_info(txid)
+        
+        if info.get("confirmed-round"):
+            receiver = info.get("txn", {}).get("txn", {}).get("arcv")
+            return "confirmed", info["confirmed-round"], receiver
+        
+        if info.get("pool-error"):
+            return "failed", None, None
+        
+        # Still in the pool
+        return None, None, None
+    
+    except AlgodHTTPError as e:
+        if e.code != 404:
+            raise
+    
+    # algod only remembers recent transactions; the indexer has the rest
+    indexer = algo_client.indexer_client
+    
+    found = indexer.search_transactions(txid=txid).get("transactions", [])
+    
+    if found:
+        receiver = found[0].get("asset-transfer-transaction", {}).get("receiver")
+        return "confirmed", found[0].get("confirmed-round"), receiver
+    
+    # Never seen: it can no longer land once the chain is past last_valid,
+    # and the indexer has ingested every round it could have landed in
+    if last_valid is not None and min(last_round, indexer.health()["round"]) > last_valid:
+        return "failed", None, None
+    
+    return None, None, None
+
+
+class TreasuryService:
+    """Treasury fund management"""
+    
+    def __init__(self, algo_client: AlgorandClient, db: Session):
+        self.algo_client = algo_client
+        self.db = db
+    
+    def allocate_funds(
+        self,
+        club_id: str,
+        amount: float,
+        purpose: str,
+        txid: str
+    ) -> Dict[str, Any]:
+        """
+        Create fund allocation request
+        
+        Args:
+            club_id: Club identifier
+            amount: Amount in CINR
+            purpose: Purpose of allocation
+            txid: Transaction ID
+        
+        Returns:
+            Allocation result
+        """
+        try:
+            # Create allocation record
+            allocation = TreasuryAllocation(
+                club_id=club_id,
+                amount=amount,
+                purpose=purpose,
+                txn_id=txid
+            )
+            
+            self.db.add(allocation)
+            
+            # Log transaction
+            log = TransactionLog(
+                txn_id=txid,
+                type="allocation",
+                address=club_id,
+                amount=amount,
+                status="pending",
+                note=f"Allocation for {purpose}"
+            )
+            
+            self.db.add(log)
+            self.db.commit()
+            
+            logger.info(f"✅ Allocation created for {club_id}: {amount} CINR")
+            
+            return {
+                "success": True,
+                "allocation_id": allocation.id,
+                "club_id": club_id,
+                "amount": amount,
+                "status": "pending_approval",
+                "created_at": allocation.created_at.isoformat()
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Allocation creation failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def approve_allocation(
+        self,
+        allocation_id: int,
+        approved_by: str,
+        by_admin: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Approve fund allocation
+        
+        Args:
+            allocation_id: Allocation ID
+            approved_by: Approver address
+            by_admin: True if admin approval
+        
+        Returns:
+            Approval result
+        """
+        try:
+            allocation = self.db.query(TreasuryAllocation).filter(
+                TreasuryAllocation.id == allocation_id
+            ).first()
+            
+            if not allocation:
+                return {"success": False, "error": "Allocation not found"}
+            
+            if by_admin:
+                allocation.admin_approval = True
+            else:
+                allocation.club_lead_approval = True
+            
+            # Check if fully approved
+            if allocation.admin_approval and allocation.club_lead_approval:
+                allocation.status = "approved"
+                allocation.approved_by = approved_by
+            
+            allocation.updated_at = datetime.utcnow()
+            self.db.commit()
+            
+            logger.info(f"✅ Allocation {allocation_id} approved by {approved_by}")
+            
+            return {
+                "success": True,
+                "allocation_id": allocation_id,
+                "status": allocation.status,
+                "approvals": {
+                    "admin": allocation.admin_approval,
+                    "club_lead": allocation.club_lead_approval
+                }
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Approval failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def approve_batch(
+        self,
+        allocation_ids: List[int],
+        approved_by: str,
+        by_admin: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Approve many allocations with one set-based UPDATE
+        
+        Args:
+            allocation_ids: Allocation IDs
+            approved_by: Approver address
+            by_admin: True if admin approval
+        
+        Returns:
+            Per-allocation outcomes and the treasury totals after the batch
+        """
+        try:
+            ids = list(dict.fromkeys(allocation_ids))
+            flag, other = (
+                (TreasuryAllocation.admin_approval, TreasuryAllocation.club_lead_approval)
+                if by_admin else
+                (TreasuryAllocation.club_lead_approval, TreasuryAllocation.admin_approval)
+            )
+            
+            # The second approval flips the status in the same statement
+            completes = other == True  # noqa: E712
+            
+            approved = self.db.execute(
+                update(TreasuryAllocation)
+                .where(
+                    TreasuryAllocation.id.in_(ids),
+                    TreasuryAllocation.status.in_(["pending", "approved"])
+                )
+                .values({
+                    flag.key: True,
+                    "status": case((completes, "approved"), else_=TreasuryAllocation.status),
+                    "approved_by": case((completes, approved_by), else_=TreasuryAllocation.approved_by)
+                })
+                .returning(
+                    TreasuryAllocation.id,
+                    TreasuryAllocation.status,
+                    TreasuryAllocation.admin_approval,
+                    TreasuryAllocation.club_lead_approval
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            
+            outcomes = {
+                row.id: {
+                    "success": True,
+                    "status": row.status,
+                    "approvals": {
+                        "admin": row.admin_approval,
+                        "club_lead": row.club_lead_approval
+                    }
+                }
+                for row in approved
+            }
+            
+            skipped = [i for i in ids if i not in outcomes]
+            if skipped:
+                statuses = dict(self.db.query(
+                    TreasuryAllocation.id,
+                    TreasuryAllocation.status
+                ).filter(TreasuryAllocation.id.in_(skipped)).all())
+                
+                for allocation_id in skipped:
+                    status = statuses.get(allocation_id)
+                    outcomes[allocation_id] = {
+                        "success": False,
+                        "error": f"Cannot approve: status is {status}" if status else "Allocation not found"
+                    }
+            
+            # Totals are read inside the same transaction as the approvals
+            totals = self._status_totals()
+            self.db.commit()
+            
+            logger.info(f"✅ {len(approved)}/{len(ids)} allocations approved by {approved_by}")
+            
+            return {
+                "success": True,
+                "approved": len(approved),
+                "results": [dict(allocation_id=i, **outcomes[i]) for i in ids],
+                "totals": totals
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Batch approval failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _status_totals(self) -> Dict[str, Dict[str, Any]]:
+        """Allocation count and amount per status (one GROUP BY)"""
+        rows = self.db.query(
+            TreasuryAllocation.status,
+            func.count(TreasuryAllocation.id),
+            func.coalesce(func.sum(TreasuryAllocation.amount), 0)
+        ).group_by(TreasuryAllocation.status).all()
+        
+        return {
+            status: {"count": count, "amount": amount}
+            for status, count, amount in rows
+        }
+    
+    async def release_funds(
+        self,
+        allocation_id: int,
+        txid: str
+    ) -> Dict[str, Any]:
+        """
+        Release funds for approved allocation
+        
+        Args:
+            allocation_id: Allocation ID
+            txid: Release transaction ID
+        
+        Returns:
+            Release result
+        """
+        try:
+            allocation = self.db.query(TreasuryAllocation).filter(
+                TreasuryAllocation.id == allocation_id
+            ).first()
+            
+            if not allocation:
+                return {"success": False, "error": "Allocation not found"}
+            
+            if allocation.status != "approved":
+                return {
+                    "success": False,
+                    "error": f"Cannot release: status is {allocation.status}"
+                }
+            
+            # Mark as released
+            allocation.status = "released"
+            allocation.txn_id = txid
+            allocation.released_at = datetime.utcnow()
+            
+            # Update transaction log
+            log = self.db.query(TransactionLog).filter(
+                TransactionLog.txn_id == txid
+            ).first()
+            
+            if log:
+                log.status = "confirmed"
+                log.confirmed_at = datetime.utcnow()
+            
+            LedgerService(self.db).post(
+                allocation.club_id,
+                allocation.amount,
+                "release",
+                ref=f"allocation:{allocation_id}",
+                txn_id=txid,
+                at=allocation.released_at
+            )
+            
+            self.db.commit()
+            
+            logger.info(f"✅ Funds released for allocation {allocation_id}")
+            
+            return {
+                "success": True,
+                "allocation_id": allocation_id,
+                "club_id": allocation.club_id,
+                "amount": allocation.amount,
+                "status": "released",
+                "released_at": allocation.released_at.isoformat(),
+                "txid": txid
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Fund release failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    async def release_batch(self, releases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Release up to 16 approved allocations in one atomic group
+        
+        The treasury (admin) account sends one CINR transfer per
+        allocation; the group confirms or fails as a whole, and all
+        allocations are marked released in one DB transaction.
+        
+        Args:
+            releases: [{"allocation_id": ..., "recipient": ...}, ...]
+        
+        Returns:
+            Batch result with per-allocation results
+        """
+        if len(releases) > MAX_GROUP_SIZE:
+            return {"success": False, "error": f"At most {MAX_GROUP_SIZE} allocations per batch"}
+        
+        if len({item["allocation_id"] for item in releases}) != len(releases):
+            return {"success": False, "error": "Duplicate allocation in batch"}
+        
+        results = {}
+        recipients = {}
+        
+        for item in releases:
+            allocation_id = item["allocation_id"]
+            
+            if not self.algo_client.is_address_valid(item["recipient"]):
+                results[allocation_id] = {"success": False, "error": "Invalid recipient address"}
+            else:
+                recipients[allocation_id] = item["recipient"]
+        
+        try:
+            # Claim approved allocations so no concurrent release can pay them twice
+            claimed = self.db.execute(
+                update(TreasuryAllocation)
+                .where(
+                    TreasuryAllocation.id.in_(list(recipients)),
+                    TreasuryAllocation.status == "approved"
+                )
+                .values(status="releasing")
+                .returning(TreasuryAllocation.id, TreasuryAllocation.amount, TreasuryAllocation.club_id)
+                .execution_options(synchronize_session=False)
+            ).all() if recipients else []
+            
+            for allocation_id in recipients:
+                if allocation_id not in {row.id for row in claimed}:
+                    results[allocation_id] = self._release_rejection(allocation_id)
+            
+            if not claimed:
+                self.db.rollback()
+                return self._batch_result(releases, results, success=False)
+            
+            signed = self._sign_release_group(claimed, recipients)
+            
+            # Txids are stored before sending so a crash mid-batch leaves
+            # "releasing" rows that can be reconciled against the chain
+            self.db.execute(_set_release_txid, [
+                {
+                    "allocation_id": row.id,
+                    "txid": s.get_txid(),
+                    "valid_until": s.transaction.last_valid_round
+                }
+                for row, s in zip(claimed, signed)
+            ])
+            self.db.commit()
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Batch release failed: {e}")
+            return {"success": False, "error": str(e)}
+        
+        claimed_ids = [row.id for row in claimed]
+        
+        algod = self.algo_client.algod_client
+        
+        try:
+            await asyncio.to_thread(algod.send_transactions, signed)
+        except Exception as e:
+            if not is_rejection(e):
+                # A timeout may still have delivered the group: keep the rows
+                # "releasing" with their txids for reconcile_releases
+                logger.warning(f"⚠️ Batch release submission outcome unknown: {e}")
+                for row, s in zip(claimed, signed):
+                    results[row.id] = {
+                        "success": False,
+                        "status": "releasing",
+                        "txid": s.get_txid(),
+                        "error": f"Submission outcome unknown: {e}"
+                    }
+                return self._batch_result(releases, results, success=False)
+            
+            # Rejected by algod, nothing moved: hand the allocations back
+            self.db.execute(
+                update(TreasuryAllocation)
+                .where(
+                    TreasuryAllocation.id.in_(claimed_ids),
+                    TreasuryAllocation.status == "releasing"
+                )
+                .values(status="approved", txn_id=None, last_valid=None)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            
+            logger.error(f"❌ Batch release group rejected: {e}")
+            for allocation_id in claimed_ids:
+                results[allocation_id] = {"success": False, "error": f"Group failed: {e}"}
+            return self._batch_result(releases, results, success=False)
+        
+        try:
+            confirmation = await asyncio.to_thread(
+                wait_for_confirmation, algod, signed[0].get_txid(), 10
+            )
+        except Exception as e:
+            # The group may still land: keep the rows "releasing" with their txids
+            logger.warning(f"⚠️ Batch release not confirmed yet: {e}")
+            for row, s in zip(claimed, signed):
+                results[row.id] = {
+                    "success": False,
+                    "status": "releasing",
+                    "txid": s.get_txid(),
+                    "error": "Confirmation pending"
+                }
+            return self._batch_result(releases, results, success=False)
+        
+        released_at = datetime.utcnow()
+        confirmed_round = confirmation.get("confirmed-round")
+        
+        try:
+            results.update(self.record_release(
+                claimed,
+                recipients,
+                [s.get_txid() for s in signed],
+                confirmed_round,
+                released_at
+            ))
+            
+            self.db.commit()
+        
+        except Exception as e:
+            # Funds moved on chain; the rows stay "releasing" with their txids
+            self.db.rollback()
+            logger.error(f"❌ Batch release confirmed but not recorded: {e}")
+            return {"success": False, "error": str(e), "allocation_ids": claimed_ids}
+        
+        logger.info(f"✅ Released {len(claimed_ids)} allocations in round {confirmed_round}")
+        
+        result = self._batch_result(releases, results, success=True)
+        result["confirmed_round"] = confirmed_round
+        result["released_at"] = released_at.isoformat()
+        return result
+    
+    def record_release(
+        self,
+        rows,
+        recipients: Dict[int, str],
+        txids: List[str],
+        confirmed_round: Optional[int],
+        released_at: datetime
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Mark confirmed allocations released with their logs and ledger
+        entries (caller commits)
+        
+        Args:
+            rows: Allocations with id, amount and club_id, in group order
+            recipients: Recipient address per allocation ID
+            txids: Transfer txid per row
+            confirmed_round: Round the group confirmed in
+            released_at: Release time
+        
+        Returns:
+            Result per allocation ID
+        """
+        # Only rows still "releasing": a release recorded by the request
+        # and by reconcile_releases is posted once
+        updated = {
+            allocation_id for (allocation_id,) in self.db.execute(
+                update(TreasuryAllocation)
+                .where(
+                    TreasuryAllocation.id.in_([row.id for row in rows]),
+                    TreasuryAllocation.status == "releasing"
+                )
+                .values(status="released", released_at=released_at)
+                .returning(TreasuryAllocation.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+        }
+        
+        ledger = LedgerService(self.db)
+        results = {}
+        
+        for row, txid in zip(rows, txids):
+            results[row.id] = {
+                "success": True,
+                "club_id": row.club_id,
+                "amount": row.amount,
+                "status": "released",
+                "txid": txid
+            }
+            
+            if row.id not in updated:
+                continue
+            
+            ledger.post(
+                row.club_id,
+                row.amount,
+                "release",
+                ref=f"allocation:{row.id}",
+                txn_id=txid,
+                at=released_at
+            )
+            
+            self.db.add(TransactionLog(
+                txn_id=txid,
+                type="release",
+                address=recipients[row.id],
+                amount=row.amount,
+                status="confirmed",
+                confirmed_round=confirmed_round,
+                confirmed_at=released_at,
+                note=f"Release of allocation {row.id} to {row.club_id}"
+            ))
+        
+        return results
+    
+    def reconcile_releases(self) -> Dict[str, Any]:
+        """
+        Settle allocations left "releasing" against the chain
+        
+        A release whose submission or confirmation timed out (or whose
+        process died) keeps its txid. Confirmed transfers are recorded
+        as released; transfers that can no longer land (rejected, or
+        absent once algod and the indexer are both past last_valid) give
+        the allocation back. Anything else is left for the next run.
+        
+        Returns:
+            Counts of released, restored and still pending allocations
+        """
+        try:
+            rows = self.db.query(
+                TreasuryAllocation.id,
+                TreasuryAllocation.amount,
+                TreasuryAllocation.club_id,
+                TreasuryAllocation.txn_id,
+                TreasuryAllocation.last_valid
+            ).filter(
+                TreasuryAllocation.status == "releasing",
+                TreasuryAllocation.txn_id.isnot(None)
+            ).all()
+            
+            counts = {"released": 0, "restored": 0, "pending": 0}
+            
+            if not rows:
+                return {"success": True, **counts}
+            
+            last_round = self.algo_client.algod_client.status()["last-round"]
+            
+            for row in rows:
+                outcome, confirmed_round, receiver = txn_outcome(
+                    self.algo_client,
+                    row.txn_id,
+                    row.last_valid,
+                    last_round
+                )
+                
+                if outcome == "confirmed":
+                    self.record_release(
+                        [row],
+                        {row.id: receiver},
+                        [row.txn_id],
+                        confirmed_round,
+                        datetime.utcnow()
+                    )
+                    counts["released"] += 1
+                
+                elif outcome == "failed":
+                    self.db.execute(
+                        update(TreasuryAllocation)
+                        .where(
+                            TreasuryAllocation.id == row.id,
+                            TreasuryAllocation.status == "releasing"
+                        )
+                        .values(status=restore_status(), txn_id=None, last_valid=None)
+                        .execution_options(synchronize_session=False)
+                    )
+                    counts["restored"] += 1
+                
+                else:
+                    counts["pending"] += 1
+                
+                self.db.commit()
+            
+            if counts["released"] or counts["restored"]:
+                logger.info(
+                    f"🔁 Reconciled releases: {counts['released']} released, "
+                    f"{counts['restored']} restored, {counts['pending']} pending"
+                )
+            
+            return {"success": True, **counts}
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Release reconcile failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _sign_release_group(self, claimed, recipients: Dict[int, str]) -> list:
+        private_key = mnemonic.to_private_key(settings.admin_mnemonic)
+        sender = account.address_from_private_key(private_key)
+        params = self.algo_client.algod_client.suggested_params()
+        scale = 10 ** settings.cinr_decimals
+        
+        txns = assign_group_id([
+            AssetTransferTxn(
+                sender=sender,
+                sp=params,
+                receiver=recipients[row.id],
+                amt=int(round(row.amount * scale)),
+                index=settings.cinr_asset_id,
+                note=f"allocation:{row.id}".encode()
+            )
+            for row in claimed
+        ])
+        
+        return [t.sign(private_key) for t in txns]
+    
+    def _release_rejection(self, allocation_id: int) -> Dict[str, Any]:
+        allocation = self.db.query(TreasuryAllocation.status).filter(
+            TreasuryAllocation.id == allocation_id
+        ).first()
+        
+        if not allocation:
+            return {"success": False, "error": "Allocation not found"}
+        
+        return {"success": False, "error": f"Cannot release: status is {allocation.status}"}
+    
+    def _batch_result(
+        self,
+        releases: List[Dict[str, Any]],
+        results: Dict[int, Any],
+        success: bool
+    ) -> Dict[str, Any]:
+        return {
+            "success": success,
+            "released": sum(1 for r in results.values() if r.get("success")),
+            "results": [
+                dict(allocation_id=item["allocation_id"], **results[item["allocation_id"]])
+                for item in releases
+            ]
+        }
+    
+    def get_treasury_status(self) -> Dict[str, Any]:
+        """Get overall treasury status"""
+        try:
+            allocations = self.db.query(TreasuryAllocation).all()
+            
+            total_funds = sum(a.amount for a in allocations)
+            available = sum(
+                a.amount for a in allocations
+                if a.status not in ["released", "releasing", "signing", "approved", "netted"]
+            )
+            allocated = sum(
+                a.amount for a in allocations
+                if a.status in ["approved", "signing", "releasing", "released", "netted"]
+            )
+            pending = sum(
+                a.amount for a in allocations
+                if a.status == "pending_approval"
+            )
+            
+            clubs = list(set(a.club_id for a in allocations))
+            
+            return {
+                "total_funds": total_funds,
+                "available": available,
+                "allocated": allocated,
+                "pending_approval": pending,
+                "clubs_count": len(clubs),
+                "allocations_count": len(allocations)
+            }
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to get treasury status: {e}")
+            return {
+                "error": str(e)
+            }
+    
+    def get_club_allocations(self, club_id: str) -> list:
+        """Get allocations for a specific club"""
+        try:
+            allocations = self.db.query(TreasuryAllocation).filter(
+                TreasuryAllocation.club_id == club_id
+            ).order_by(
+                TreasuryAllocation.created_at.desc()
+            ).all()
+            
+            return [
+                {
+                    "id": a.id,
+                    "amount": a.amount,
+                    "purpose": a.purpose,
+                    "status": a.status,
+                    "created_at": a.created_at.isoformat(),
+                    "released_at": a.released_at.isoformat() if a.released_at else None
+                }
+                for a in allocations
+            ]
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to get club allocations: {e}")
+            return []
+
+
+async def run_release_reconciler(algo_client: AlgorandClient):
+    """Background timer: settle "releasing" allocations against the chain"""
+    while True:
+        await asyncio.sleep(settings.release_reconcile_seconds)
+        await asyncio.to_thread(_reconcile, algo_client)
+
+
+def _reconcile(algo_client: AlgorandClient):
+    db = SessionLocal()
+    try:
+        TreasuryService(algo_client, db).reconcile_releases()
+    finally:
+        db.close()
@@ -0,0 +1,283 @@
+"""
+Vault factory service - index of factory vaults by owner from chain history
+"""
+
+import asyncio
+import base64
+import logging
+from algosdk.encoding import encode_address
+from algosdk.error import AlgodHTTPError
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List
+
+from app.config import settings
+from app.models.database import FactoryVault, VaultFactory
+from app.services.algo_client import AlgorandClient
+from app.services.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SYNC_WINDOW = 50_000     # rounds fetched and committed per step
+
+
+def _btoi(value: bytes) -> int:
+    return int.from_bytes(value, "big")
+
+
+def _parse_box(value: bytes) -> Dict[str, Any]:
+    """Vault box layout (student_vault_contract/vault_factory_contract.py)"""
+    return {
+        "owner": encode_address(value[0:32]),
+        "beneficiary": encode_address(value[32:64]),
+        "asset_id": _btoi(value[64:72]),
+        "unlock_time": _btoi(value[72:80]),
+        "amount": _btoi(value[80:88])
+    }
+
+
+class VaultFactoryService:
+    """
+    The vault factory app hosts every vault in its own box, so there is
+    no app per vault to look up. Sync reads the factory's create /
+    deposit / withdraw calls from the indexer round window by round
+    window, re-reads the boxes those calls touched from algod and
+    advances the factory's last_round checkpoint in the same commit.
+    Vault pages only read the factory_vaults rows.
+    """
+    
+    def __init__(self, algo_client: AlgorandClient, db: Session):
+        self.algo_client = algo_client
+        self.db = db
+    
+    def sync(self, app_id: int) -> Dict[str, Any]:
+        """
+        Fold new factory calls into the vault index
+        
+        Args:
+            app_id: Vault factory app ID
+        
+        Returns:
+            Sync result with the new checkpoint
+        """
+        try:
+            factory = self._factory(app_id)
+            current = self.algo_client.algod_client.status()["last-round"]
+            touched = 0
+            
+            while factory.last_round < current:
+                low = factory.last_round + 1
+                high = min(current, low + SYNC_WINDOW - 1)
+                
+                touched += self._sync_window(factory, low, high)
+            
+            return {
+                "success": True,
+                "app_id": app_id,
+                "vaults_updated": touched,
+                "vault_count": factory.vault_count,
+                "last_round": factory.last_round
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"❌ Vault factory sync failed for app {app_id}: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_vaults_by_owner(
+        self,
+        owner: str,
+        app_id: Optional[int] = None,
+        include_withdrawn: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Vaults created by an address (newest first)
+        
+        Args:
+            owner: Creator address
+            app_id: Vault factory app ID (default: settings.vault_factory_app_id)
+            include_withdrawn: Also list vaults already paid out
+        """
+        query = self.db.query(FactoryVault).filter(
+            FactoryVault.owner == owner,
+            FactoryVault.app_id == (app_id or settings.vault_factory_app_id)
+        )
+        
+        if not include_withdrawn:
+            query = query.filter(FactoryVault.status == "active")
+        
+        return [self._to_dict(v) for v in query.order_by(FactoryVault.vault_id.desc())]
+    
+    def get_vault(self, vault_id: int, app_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """One vault of the factory, or None if it was never synced"""
+        vault = self.db.query(FactoryVault).filter(
+            FactoryVault.app_id == (app_id or settings.vault_factory_app_id),
+            FactoryVault.vault_id == vault_id
+        ).first()
+        
+        return self._to_dict(vault) if vault else None
+    
+    def _to_dict(self, vault: FactoryVault) -> Dict[str, Any]:
+        return {
+            "app_id": vault.app_id,
+            "vault_id": vault.vault_id,
+            "owner": vault.owner,
+            "beneficiary": vault.beneficiary,
+            "asset_id": vault.asset_id,
+            "unlock_time": vault.unlock_time,
+            "amount": vault.amount,
+            "status": vault.status,
+            "created_round": vault.created_round,
+            "updated_round": vault.updated_round
+        }
+    
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    
+    def _factory(self, app_id: int) -> VaultFactory:
+        factory = self.db.query(VaultFactory).filter(
+            VaultFactory.app_id == app_id
+        ).first()
+        
+        if factory:
+            return factory
+        
+        if self.algo_client.get_app_state(app_id) is None:
+            raise ValueError(f"App {app_id} not found")
+        
+        # Nothing to read before the app existed
+        try:
+            app = self.algo_client.indexer_client.applications(app_id)
+            created = app["application"].get("created-at-round", 1)
+        except Exception:
+            created = 1
+        
+        factory = VaultFactory(app_id=app_id, vault_count=0, last_round=created - 1)
+        self.db.add(factory)
+        self.db.commit()
+        
+        return factory
+    
+    def _search(self, **filters) -> List[Dict[str, Any]]:
+        """All indexer transactions matching the filters (follows next tokens)"""
+        indexer = self.algo_client.indexer_client
+        txns = []
+        next_page = None
+        
+        while True:
+            page = indexer.search_transactions(limit=1000, next_page=next_page, **filters)
+            txns.extend(page.get("transactions", []))
+            next_page = page.get("next-token")
+            
+            if not next_page or not page.get("transactions"):
+                return txns
+    
+    def _sync_window(self, factory: VaultFactory, low: int, high: int) -> int:
+        created = {}    # vault id -> fields from the create call
+        touched = {}    # vault id -> last round it was called in
+        
+        for t in self._search(
+            application_id=factory.app_id,
+            txn_type="appl",
+            min_round=low,
+            max_round=high
+        ):
+            call = t["application-transaction"]
+            args = [base64.b64decode(a) for a in call.get("application-args", [])]
+            
+            if call.get("application-id") != factory.app_id or call.get("on-completion") != "noop" or not args:
+                continue
+            
+            if args[0] == b"create" and t.get("logs"):
+                vault_id = _btoi(base64.b64decode(t["logs"][0]))
+                created[vault_id] = {
+                    "owner": t["sender"],
+                    "beneficiary": encode_address(args[1]),
+                    "asset_id": _btoi(args[2]),
+                    "unlock_time": _btoi(args[3]),
+                    "round": t["confirmed-round"]
+                }
+            elif args[0] in (b"deposit", b"withdraw") and len(args) > 1:
+                vault_id = _btoi(args[1])
+            else:
+                continue
+            
+            touched[vault_id] = t["confirmed-round"]
+        
+        self._apply(factory, created, touched, high)
+        
+        return len(touched)
+    
+    def _read_box(self, app_id: int, vault_id: int) -> Optional[Dict[str, Any]]:
+        """Current contents of a vault box, None once it was withdrawn"""
+        try:
+            box = self.algo_client.algod_client.application_box_by_name(
+                app_id,
+                vault_id.to_bytes(8, "big")
+            )
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        
+        return _parse_box(base64.b64decode(box["value"]))
+    
+    def _apply(self, factory: VaultFactory, created: Dict[int, Dict], touched: Dict[int, int], last_round: int):
+        """Refresh touched vaults from their boxes and move the checkpoint in one commit"""
+        if touched:
+            rows = {
+                v.vault_id: v for v in self.db.query(FactoryVault).filter(
+                    FactoryVault.app_id == factory.app_id,
+                    FactoryVault.vault_id.in_(list(touched))
+                )
+            }
+            
+            for vault_id, round_ in touched.items():
+                row = rows.get(vault_id)
+                box = self._read_box(factory.app_id, vault_id)
+                
+                if row is None:
+                    # Vaults created before the first sync are known from their box
+                    fields = created.get(vault_id) or box
+                    if fields is None:
+                        continue
+                    
+                    row = FactoryVault(
+                        app_id=factory.app_id,
+                        vault_id=vault_id,
+                        owner=fields["owner"],
+                        beneficiary=fields["beneficiary"],
+                        asset_id=fields["asset_id"],
+                        unlock_time=fields["unlock_time"],
+                        created_round=fields.get("round", round_)
+                    )
+                    self.db.add(row)
+                
+                if box is None:
+                    row.status = "withdrawn"
+                else:
+                    row.amount = box["amount"]
+                    row.status = "active"
+                
+                row.updated_round = round_
+            
+            if created:
+                factory.vault_count = max(factory.vault_count, max(created))
+        
+        factory.last_round = last_round
+        self.db.commit()
+
+
+async def run_vault_factory_sync(algo_client: AlgorandClient):
+    """Background timer: keep the configured factory's vault index current"""
+    while True:
+        await asyncio.sleep(settings.vault_factory_sync_seconds)
+        await asyncio.to_thread(_sync_factory, algo_client)
+
+
+def _sync_factory(algo_client: AlgorandClient):
+    db = SessionLocal()
+    try:
+        VaultFactoryService(algo_client, db).sync(settings.vault_factory_app_id)
+    finally:
+        db.close()
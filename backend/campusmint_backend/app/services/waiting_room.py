@@ -0,0 +1,208 @@
+"""
+Waiting room - admission control in front of ticket checkout
+"""
+
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections import deque
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Line:
+    """Queue state for one event"""
+    
+    def __init__(self, burst: float):
+        self.queue = deque()        # tokens waiting, in arrival order
+        self.issued = 0             # sequence number of the last token issued
+        self.served = 0             # every seq <= served has been admitted
+        self.pending = 0            # admitted but not yet at checkout
+        self.in_flight = 0          # checkouts currently running
+        self.allowance = burst      # token bucket
+
+
+class WaitingRoom:
+    """
+    Per-event FIFO with token-bucket admission
+    
+    Buyers are admitted at admit_rate per second and never more than
+    max_in_flight checkouts run at once, so algod sees a load it can
+    sustain. Everyone else gets a queue token and a position instead of
+    a timeout. Each wallet holds at most one token per event, so a buyer
+    cannot take several places in line. State is per process, like the
+    check-in index.
+    """
+    
+    def __init__(
+        self,
+        admit_rate: float = None,
+        max_in_flight: int = None,
+        admit_ttl: int = None
+    ):
+        self.admit_rate = admit_rate or settings.waiting_room_admit_rate
+        self.max_in_flight = max_in_flight or settings.waiting_room_max_in_flight
+        self.admit_ttl = admit_ttl or settings.waiting_room_admit_ttl
+        self.lines: Dict[int, _Line] = {}
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+        self.wallets: Dict[Tuple[int, str], str] = {}  # (event, wallet) -> live token
+    
+    def _line(self, event_id: int) -> _Line:
+        if event_id not in self.lines:
+            self.lines[event_id] = _Line(self.max_in_flight)
+        return self.lines[event_id]
+    
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+    
+    def join(self, event_id: int, wallet: str) -> Dict[str, Any]:
+        """Issue a queue token at the back of the line (or the wallet's live one)"""
+        token = self.wallets.get((event_id, wallet))
+        
+        if token in self.tokens:
+            return self.status(event_id, token)
+        
+        line = self._line(event_id)
+        line.issued += 1
+        
+        token = secrets.token_urlsafe(16)
+        self.tokens[token] = {
+            "event_id": event_id,
+            "wallet": wallet,
+            "seq": line.issued,
+            "admitted_at": None
+        }
+        self.wallets[(event_id, wallet)] = token
+        line.queue.append(token)
+        
+        return self.status(event_id, token)
+    
+    def status(self, event_id: int, token: str) -> Optional[Dict[str, Any]]:
+        """Queue position (0 once admitted)"""
+        entry = self.tokens.get(token)
+        
+        if not entry or entry["event_id"] != event_id:
+            return None
+        
+        line = self._line(event_id)
+        position = max(0, entry["seq"] - line.served)
+        
+        return {
+            "queue_token": token,
+            "event_id": event_id,
+            "admitted": entry["admitted_at"] is not None,
+            "position": position,
+            "estimated_wait_seconds": round(position / self.admit_rate, 1)
+        }
+    
+    async def stream(self, event_id: int, token: str) -> AsyncIterator[str]:
+        """Server-sent events with the position until admission"""
+        while True:
+            status = self.status(event_id, token)
+            
+            if status is None:
+                yield f"event: expired\ndata: {json.dumps({'queue_token': token})}\n\n"
+                return
+            
+            yield f"data: {json.dumps(status)}\n\n"
+            
+            if status["admitted"]:
+                return
+            
+            await asyncio.sleep(1)
+    
+    # ------------------------------------------------------------------
+    # Checkout gate
+    # ------------------------------------------------------------------
+    
+    def enter(self, event_id: int, wallet: str, token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Try to start a checkout
+        
+        Without a token the buyer goes straight through if the line is
+        empty and there is capacity; otherwise they are queued (or shown
+        the place they already hold). A token only admits the wallet it
+        was issued to.
+        
+        Returns:
+            {"admitted": True} or the buyer's queue status
+        """
+        line = self._line(event_id)
+        
+        if token is None:
+            if not line.queue and line.allowance >= 1 and self._has_capacity(line):
+                line.allowance -= 1
+                line.in_flight += 1
+                return {"admitted": True}
+            
+            return self.join(event_id, wallet)
+        
+        entry = self.tokens.get(token)
+        
+        if not entry or entry["event_id"] != event_id or entry["wallet"] != wallet:
+            return self.join(event_id, wallet)
+        
+        if entry["admitted_at"] is None:
+            return self.status(event_id, token)
+        
+        # Tokens are single use
+        line.pending -= 1
+        line.in_flight += 1
+        self._forget(token)
+        
+        return {"admitted": True}
+    
+    def leave(self, event_id: int):
+        """Checkout finished (success or failure)"""
+        line = self._line(event_id)
+        line.in_flight = max(0, line.in_flight - 1)
+    
+    def _has_capacity(self, line: _Line) -> bool:
+        return line.in_flight + line.pending < self.max_in_flight
+    
+    def _forget(self, token: str):
+        entry = self.tokens.pop(token)
+        self.wallets.pop((entry["event_id"], entry["wallet"]), None)
+    
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+    
+    def tick(self, elapsed: float):
+        """Admit from the head of each line and expire unused admissions"""
+        now = time.monotonic()
+        
+        for event_id, line in self.lines.items():
+            line.allowance = min(
+                float(self.max_in_flight),
+                line.allowance + self.admit_rate * elapsed
+            )
+            
+            while line.queue and line.allowance >= 1 and self._has_capacity(line):
+                entry = self.tokens[line.queue.popleft()]
+                line.served = entry["seq"]
+                entry["admitted_at"] = now
+                line.allowance -= 1
+                line.pending += 1
+        
+        # Admitted buyers who never came back lose their slot
+        for token, entry in list(self.tokens.items()):
+            if entry["admitted_at"] and now - entry["admitted_at"] > self.admit_ttl:
+                self._forget(token)
+                self._line(entry["event_id"]).pending -= 1
+    
+    async def run(self, interval: float = 0.2):
+        """Background admission loop"""
+        last = time.monotonic()
+        
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self.tick(now - last)
+            last = now
@@ -0,0 +1,159 @@
+"""
+CampusMint FastAPI Backend
+University fintech + NFT ticketing system on Algorand Testnet
+"""
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import asyncio
+import logging
+
+from app.routers import vault, event, ticket, treasury, health
+from app.services.database import init_db
+from app.services.algo_client import AlgorandClient
+from app.services.ticket_index import TicketIndexRegistry
+from app.services.reservation_service import run_hold_sweeper
+from app.services.ticket_pool import run_delivery_reconciler
+from app.services.waiting_room import WaitingRoom
+from app.services.donor_service import run_donor_sync
+from app.services.vault_factory_service import run_vault_factory_sync
+from app.services.treasury_service import run_release_reconciler
+from app.services.approval_service import run_proposal_sweeper
+from app.services.settlement_service import run_settlement_reconciler
+from app.config import settings
+
+# Logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Initialize FastAPI
+app = FastAPI(
+    title="CampusMint API",
+    description="University fintech + NFT ticketing on Algorand",
+    version="1.0.0"
+)
+
+# CORS configuration for mobile/web clients
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, restrict to your domain
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Global Algorand client
+algo_client = None
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize database and Algorand client on startup"""
+    global algo_client
+    logger.info("🚀 CampusMint API starting...")
+    
+    try:
+        # Initialize database
+        init_db()
+        logger.info("✅ Database initialized")
+        
+        # Initialize Algorand client
+        algo_client = AlgorandClient()
+        logger.info("✅ Algorand Testnet connected")
+        
+        app.state.algo_client = algo_client
+        app.state.ticket_index = TicketIndexRegistry()
+        
+        # Release expired seat holds and settle pending ticket payments
+        app.state.hold_sweeper = asyncio.create_task(run_hold_sweeper(app.state.algo_client))
+        
+        # Confirm ticket transfers, resend the ones that did not land
+        app.state.delivery_reconciler = asyncio.create_task(run_delivery_reconciler(app.state.algo_client))
+        
+        # Admit checkout traffic at a rate algod can sustain
+        app.state.waiting_room = WaitingRoom()
+        app.state.waiting_room_ticker = asyncio.create_task(app.state.waiting_room.run())
+        
+        # Settle treasury releases whose outcome was not known at the time
+        app.state.release_reconciler = asyncio.create_task(run_release_reconciler(app.state.algo_client))
+        
+        # Expire release proposals that ran out of validity, close settled ones
+        app.state.proposal_sweeper = asyncio.create_task(run_proposal_sweeper(app.state.algo_client))
+        
+        # Post settlements whose group outcome was not known at the time
+        app.state.settlement_reconciler = asyncio.create_task(run_settlement_reconciler(app.state.algo_client))
+        
+        # Keep crowdfunding donor totals in step with the chain
+        app.state.donor_sync = asyncio.create_task(run_donor_sync(app.state.algo_client))
+        
+        # Index vault factory vaults by owner
+        if settings.vault_factory_app_id:
+            app.state.vault_factory_sync = asyncio.create_task(
+                run_vault_factory_sync(app.state.algo_client)
+            )
+        
+    except Exception as e:
+        logger.error(f"❌ Startup failed: {e}")
+        raise
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Cleanup on shutdown"""
+    logger.info("👋 CampusMint API shutting down...")
+    
+    if hasattr(app.state, "hold_sweeper"):
+        app.state.hold_sweeper.cancel()
+    
+    if hasattr(app.state, "delivery_reconciler"):
+        app.state.delivery_reconciler.cancel()
+    
+    if hasattr(app.state, "waiting_room_ticker"):
+        app.state.waiting_room_ticker.cancel()
+    
+    if hasattr(app.state, "release_reconciler"):
+        app.state.release_reconciler.cancel()
+    
+    if hasattr(app.state, "proposal_sweeper"):
+        app.state.proposal_sweeper.cancel()
+    
+    if hasattr(app.state, "settlement_reconciler"):
+        app.state.settlement_reconciler.cancel()
+    
+    if hasattr(app.state, "donor_sync"):
+        app.state.donor_sync.cancel()
+    
+    if hasattr(app.state, "vault_factory_sync"):
+        app.state.vault_factory_sync.cancel()
+    
+    if hasattr(app.state, "ticket_index"):
+        await app.state.ticket_index.close_all()
+
+
+# Include routers
+app.include_router(health.router, prefix="/health", tags=["Health"])
+app.include_router(vault.router, prefix="/vault", tags=["Student Vault"])
+app.include_router(event.router, prefix="/event", tags=["Events"])
+app.include_router(ticket.router, prefix="/ticket", tags=["NFT Tickets"])
+app.include_router(treasury.router, prefix="/treasury", tags=["Treasury"])
+
+
+# Global error handler
+@app.exception_handler(Exception)
+async def global_exception_handler(request, exc):
+    return JSONResponse(
+        status_code=500,
+        content={"detail": str(exc), "error": exc.__class__.__name__}
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        log_level="info"
+    )
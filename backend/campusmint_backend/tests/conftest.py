@@ -0,0 +1,132 @@
+"""
+Shared fixtures: an in-memory database and a scripted Algorand client
+
+Services take (algo_client, db), so tests hand them a fresh SQLite
+database and a FakeAlgod/FakeIndexer pair whose answers each test
+sets up. Nothing talks to testnet.
+"""
+
+import pytest
+from algosdk import account, mnemonic
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import SuggestedParams
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.models.database import Base
+
+
+class FakeAlgod:
+    """algod stand-in: transactions confirm on send unless a test says otherwise"""
+    
+    def __init__(self):
+        self.round = 1000
+        self.sent = []
+        self.send_error = None
+        self.confirm = True
+        self.pool = {}  # txid -> pending_transaction_info answer
+        self.holdings = {}  # (address, asset_id) -> amount
+    
+    def status(self):
+        return {"last-round": self.round}
+    
+    def status_after_block(self, round_num):
+        self.round = max(self.round, round_num) + 1
+        return self.status()
+    
+    def suggested_params(self):
+        return SuggestedParams(fee=1000, first=self.round, last=self.round + 1000,
+                               gh="SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=",
+                               gen="testnet-v1.0", flat_fee=True, min_fee=1000)
+    
+    def send_transactions(self, txns):
+        if self.send_error:
+            raise self.send_error
+        txns = list(txns)
+        self.sent.append(txns)
+        for txn in txns:
+            self.pool[txn.get_txid()] = (
+                {"confirmed-round": self.round, "txn": {"txn": txn.dictify()}}
+                if self.confirm else {"pool-error": "", "txn": {"txn": txn.dictify()}}
+            )
+        return txns[0].get_txid()
+    
+    def send_transaction(self, txn):
+        return self.send_transactions([txn])
+    
+    def account_asset_info(self, address, asset_id):
+        if (address, asset_id) not in self.holdings:
+            raise AlgodHTTPError("account asset info not found", 404)
+        return {"asset-holding": {"asset-id": asset_id, "amount": self.holdings[(address, asset_id)]}}
+    
+    def pending_transaction_info(self, txid):
+        if txid not in self.pool:
+            raise AlgodHTTPError("txn not found", 404)
+        return self.pool[txid]
+
+
+class FakeIndexer:
+    def __init__(self, algod):
+        self.algod = algod
+        self.lag = 0
+        self.transactions = {}  # txid -> indexer transaction
+    
+    def health(self):
+        return {"round": self.algod.round - self.lag}
+    
+    def search_transactions(self, txid=None, **filters):
+        found = [self.transactions[txid]] if txid in self.transactions else []
+        return {"transactions": found, "current-round": self.health()["round"]}
+
+
+class FakeAlgoClient:
+    def __init__(self):
+        self.algod_client = FakeAlgod()
+        self.indexer_client = FakeIndexer(self.algod_client)
+    
+    def is_address_valid(self, address):
+        from algosdk import encoding
+        return encoding.is_valid_address(address)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def worker_sessions(session_factory, monkeypatch):
+    """Sessions opened by purchase workers come from the test database"""
+    from app.services import event_service
+    monkeypatch.setattr(event_service, "SessionLocal", session_factory)
+    return session_factory
+
+
+@pytest.fixture
+def algo_client():
+    return FakeAlgoClient()
+
+
+@pytest.fixture
+def treasury_key(monkeypatch):
+    """Admin account the treasury signs releases with"""
+    private_key, address = account.generate_account()
+    monkeypatch.setattr(settings, "admin_mnemonic", mnemonic.from_private_key(private_key))
+    monkeypatch.setattr(settings, "admin_address", address)
+    return private_key, address
@@ -0,0 +1,188 @@
+"""
+Multisig release proposals: approval roles, submission and expiry
+"""
+
+import asyncio
+
+import pytest
+from algosdk import account, encoding
+from algosdk.error import AlgodHTTPError
+
+from app.config import settings
+from app.models.database import TreasuryAllocation
+from app.services import approval_service
+from app.services.approval_service import ApprovalService
+from app.services.treasury_service import TreasuryService
+
+
+@pytest.fixture
+def signers(monkeypatch):
+    """Admin and two club leads, 2-of-3 treasury multisig"""
+    keys = {role: account.generate_account() for role in ("admin", "lead", "other_lead")}
+    addresses = [address for _, address in keys.values()]
+    
+    monkeypatch.setattr(settings, "admin_address", keys["admin"][1])
+    monkeypatch.setattr(settings, "treasury_club_lead_addresses", f"{keys['lead'][1]},{keys['other_lead'][1]}")
+    monkeypatch.setattr(settings, "treasury_multisig_signers", ",".join(addresses))
+    monkeypatch.setattr(settings, "treasury_multisig_threshold", 2)
+    return keys
+
+
+@pytest.fixture
+def service(db, algo_client, session_factory):
+    return ApprovalService(algo_client, db, session_factory=session_factory)
+
+
+def allocation(db, status="pending"):
+    row = TreasuryAllocation(club_id="robotics", amount=25.0, purpose="parts", status=status)
+    db.add(row)
+    db.commit()
+    return row.id
+
+
+def sign(proposal, key):
+    signed = []
+    for txn in proposal["to_sign"]:
+        msig_txn = encoding.msgpack_decode(txn)
+        msig_txn.sign(key)
+        signed.append(encoding.msgpack_encode(msig_txn))
+    return signed
+
+
+def add(service, proposal, keypair):
+    """Sign as keypair and wait for any submission it starts"""
+    private_key, address = keypair
+    
+    async def run():
+        result = await service.add_signatures(proposal["proposal_id"], address, sign(proposal, private_key))
+        await asyncio.gather(*approval_service._submissions)
+        return result
+    
+    return asyncio.run(run())
+
+
+def propose(service, *allocation_ids):
+    recipient = account.generate_account()[1]
+    return asyncio.run(service.propose([{"allocation_id": i, "recipient": recipient} for i in allocation_ids]))
+
+
+def test_two_club_leads_cannot_release_without_the_admin(db, service, signers, algo_client):
+    allocation_id = allocation(db)
+    proposal = propose(service, allocation_id)
+    
+    add(service, proposal, signers["lead"])
+    result = add(service, proposal, signers["other_lead"])
+    
+    assert result["status"] == "collecting"
+    assert result["roles_needed"] == ["admin"]
+    assert algo_client.algod_client.sent == []
+    
+    result = add(service, proposal, signers["admin"])
+    
+    db.expire_all()
+    assert len(algo_client.algod_client.sent) == 1
+    assert service.get_proposal(proposal["proposal_id"])["status"] == "released"
+    assert db.get(TreasuryAllocation, allocation_id).status == "released"
+
+
+def test_admin_and_club_lead_release(db, service, signers, algo_client):
+    allocation_id = allocation(db)
+    proposal = propose(service, allocation_id)
+    
+    add(service, proposal, signers["admin"])
+    add(service, proposal, signers["lead"])
+    
+    db.expire_all()
+    row = db.get(TreasuryAllocation, allocation_id)
+    assert (row.status, row.admin_approval, row.club_lead_approval) == ("released", True, True)
+
+
+def test_signer_without_a_role_is_rejected(db, service, signers, monkeypatch):
+    proposal = propose(service, allocation(db))
+    
+    # Still in the multisig, but no longer a club lead
+    monkeypatch.setattr(settings, "treasury_club_lead_addresses", signers["other_lead"][1])
+    result = add(service, proposal, signers["lead"])
+    
+    assert result == {"success": False, "error": "Signer has no treasury approval role"}
+
+
+def test_multisig_without_an_admin_cannot_propose(db, service, signers, monkeypatch):
+    monkeypatch.setattr(settings, "admin_address", account.generate_account()[1])
+    
+    result = propose(service, allocation(db))
+    
+    assert not result["success"]
+    assert db.get(TreasuryAllocation, 1).status == "pending"
+
+
+def test_allocation_under_signature_cannot_be_proposed_again(db, service, signers):
+    allocation_id = allocation(db)
+    propose(service, allocation_id)
+    
+    result = propose(service, allocation_id)
+    
+    assert result == {"success": False, "error": f"Allocations not releasable: [{allocation_id}]"}
+
+
+def test_send_timeout_keeps_the_proposal_for_reconcile(db, service, signers, algo_client):
+    allocation_id = allocation(db)
+    proposal = propose(service, allocation_id)
+    algo_client.algod_client.send_error = TimeoutError("read timed out")
+    
+    add(service, proposal, signers["admin"])
+    add(service, proposal, signers["lead"])
+    
+    db.expire_all()
+    row = db.get(TreasuryAllocation, allocation_id)
+    assert service.get_proposal(proposal["proposal_id"])["status"] == "submitted"
+    assert row.status == "releasing"
+    assert row.txn_id is not None
+    assert row.last_valid == proposal["last_valid"]
+    
+    # Never landed: reconcile hands it back, the sweep closes the proposal
+    algo_client.algod_client.round += 2000
+    assert TreasuryService(algo_client, db).reconcile_releases()["restored"] == 1
+    assert service.sweep()["failed"] == 1
+    
+    db.expire_all()
+    assert service.get_proposal(proposal["proposal_id"])["status"] == "failed"
+    assert db.get(TreasuryAllocation, allocation_id).status == "approved"
+
+
+def test_send_rejection_abandons_the_proposal(db, service, signers, algo_client):
+    allocation_id = allocation(db)
+    proposal = propose(service, allocation_id)
+    algo_client.algod_client.send_error = AlgodHTTPError("overspend", 400)
+    
+    add(service, proposal, signers["admin"])
+    add(service, proposal, signers["lead"])
+    
+    db.expire_all()
+    row = db.get(TreasuryAllocation, allocation_id)
+    assert service.get_proposal(proposal["proposal_id"])["status"] == "failed"
+    assert (row.status, row.txn_id) == ("approved", None)
+
+
+def test_sweep_expires_an_unsigned_proposal(db, service, signers, algo_client):
+    allocation_id = allocation(db)
+    proposal = propose(service, allocation_id)
+    add(service, proposal, signers["admin"])
+    
+    assert service.sweep()["expired"] == 0
+    
+    algo_client.algod_client.round += 2000
+    assert service.sweep()["expired"] == 1
+    
+    db.expire_all()
+    assert service.get_proposal(proposal["proposal_id"])["status"] == "expired"
+    assert db.get(TreasuryAllocation, allocation_id).status == "pending"
+
+
+def test_treasury_status_counts_allocations_under_signature(db, service, signers, algo_client):
+    propose(service, allocation(db))
+    
+    status = TreasuryService(algo_client, db).get_treasury_status()
+    
+    assert status["available"] == 0
+    assert status["allocated"] == 25.0
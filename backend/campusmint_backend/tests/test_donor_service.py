@@ -0,0 +1,19 @@
+"""
+Campaign donor sync: checkpoint never passes the indexer
+"""
+
+from app.models.database import DonationCampaign
+from app.services.donor_service import DonorService
+
+
+def test_sync_stops_at_the_indexer_round(db, algo_client):
+    db.add(DonationCampaign(app_id=42, asset_id=7, total=0, donor_count=0, donation_count=0, last_round=0))
+    db.commit()
+    algo_client.indexer_client.lag = 300
+    
+    result = DonorService(algo_client, db).sync(42)
+    
+    assert result["last_round"] == 700
+    
+    algo_client.indexer_client.lag = 0
+    assert DonorService(algo_client, db).sync(42)["last_round"] == 1000
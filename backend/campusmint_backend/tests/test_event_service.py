@@ -0,0 +1,42 @@
+"""
+Ticket purchases: chain round trips run off the event loop, on their own session
+"""
+
+import asyncio
+import threading
+
+from app.models.database import Event, Ticket
+from app.services.event_service import EventService
+from app.services.ticket_pool import TicketPool
+
+EVENT_ID = 501
+
+
+def test_purchase_delivers_the_ticket_off_the_event_loop(db, worker_sessions, algo_client, monkeypatch):
+    db.add(Event(app_id=EVENT_ID, name="Fest", ticket_price=5.0, max_tickets=10, tickets_sold=0))
+    db.add(Ticket(event_id=EVENT_ID, ticket_asset_id=9000, event_name="Fest"))
+    db.commit()
+    
+    threads = {}
+    sessions = set()
+    
+    def transfer(self, asset_id, buyer_address):
+        threads["transfer"] = threading.current_thread()
+        sessions.add(self.db)
+        return {"success": True, "txid": "TXID"}
+    
+    def ensure_stock(self, app_id, force=False):
+        threads["ensure_stock"] = threading.current_thread()
+        sessions.add(self.db)
+        return False
+    
+    monkeypatch.setattr(TicketPool, "transfer", transfer)
+    monkeypatch.setattr(TicketPool, "ensure_stock", ensure_stock)
+    
+    result = asyncio.run(EventService(algo_client, db).process_ticket_purchase(EVENT_ID, "BUYER", "PAYTXID"))
+    
+    assert result["success"]
+    assert result["nft_asset_id"] == 9000
+    assert threading.main_thread() not in threads.values()
+    assert set(threads) == {"transfer", "ensure_stock"}
+    assert db not in sessions
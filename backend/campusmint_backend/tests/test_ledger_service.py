@@ -0,0 +1,22 @@
+"""
+Club ledger: point-in-time balances follow the running balance order
+"""
+
+from datetime import datetime, timedelta
+
+from app.services.ledger_service import LedgerService
+
+
+def test_backdated_entry_does_not_rewrite_history(db):
+    ledger = LedgerService(db)
+    start = datetime(2026, 1, 1)
+    
+    ledger.post("robotics", 10.0, "release", at=start)
+    ledger.post("robotics", 20.0, "release", at=start + timedelta(hours=2))
+    # Reconciled late, with the time its transfer confirmed
+    ledger.post("robotics", 5.0, "settlement", at=start + timedelta(hours=1))
+    db.commit()
+    
+    assert ledger.get_balance("robotics", at=start + timedelta(minutes=90))["balance"] == 10.0
+    assert ledger.get_balance("robotics", at=start + timedelta(hours=2))["balance"] == 35.0
+    assert ledger.get_balance("robotics")["balance"] == 35.0
@@ -0,0 +1,54 @@
+"""
+Ticket minting: an expired group is only re-signed once it provably never landed
+"""
+
+import pytest
+from algosdk.error import AlgodHTTPError
+
+from app.models.database import Event
+from app.services.mint_service import TicketMinter
+
+
+@pytest.fixture
+def minter(db, algo_client, treasury_key, tmp_path):
+    return TicketMinter(algo_client, db, checkpoint_dir=str(tmp_path))
+
+
+@pytest.fixture
+def group(db, minter, algo_client):
+    event = Event(app_id=501, name="Fest", max_tickets=2)
+    db.add(event)
+    db.commit()
+    return minter._sign_group(event, [1, 2], 2, algo_client.algod_client.suggested_params())
+
+
+def test_expired_group_waits_for_the_indexer(minter, group, algo_client):
+    algod = algo_client.algod_client
+    algod.round = group["last_valid"] + 1
+    algo_client.indexer_client.lag = 10
+    
+    assert minter._group_outcome(group, algod.round) == (None, None)
+    
+    algo_client.indexer_client.lag = 0
+    assert minter._group_outcome(group, algod.round) == ("absent", None)
+
+
+def test_expired_group_found_by_the_indexer_is_confirmed(minter, group, algo_client):
+    algod = algo_client.algod_client
+    algod.round = group["last_valid"] + 1
+    for asset_id, txid in enumerate(group["txids"], start=700):
+        algo_client.indexer_client.transactions[txid] = {"created-asset-index": asset_id}
+    
+    assert minter._group_outcome(group, algod.round) == ("confirmed", [700, 701])
+
+
+def test_algod_error_leaves_the_outcome_unknown(minter, group, algo_client, monkeypatch):
+    algod = algo_client.algod_client
+    algod.round = group["last_valid"] + 1
+    
+    def unavailable(txid):
+        raise AlgodHTTPError("service unavailable", 503)
+    
+    monkeypatch.setattr(algod, "pending_transaction_info", unavailable)
+    
+    assert minter._group_outcome(group, algod.round) == (None, None)
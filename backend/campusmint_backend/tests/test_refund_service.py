@@ -0,0 +1,49 @@
+"""
+Campaign refunds: donors who closed out of CINR are skipped, not fatal
+"""
+
+from algosdk import account
+
+from app.models.database import CampaignDonor, DonationCampaign
+from app.services.refund_service import RefundService
+
+APP_ID = 42
+CINR = 7
+
+
+def contract_refunds(algod):
+    """Pay each referenced donor that still holds CINR, like the contract"""
+    send = algod.send_transactions
+    
+    def send_and_pay(txns):
+        txid = send(txns)
+        for stxn in txns:
+            info = algod.pool[stxn.get_txid()]
+            info["inner-txns"] = [
+                {"txn": {"txn": {"arcv": donor, "aamt": 100}}}
+                for donor in stxn.transaction.accounts
+                if (donor, CINR) in algod.holdings
+            ]
+        return txid
+    
+    algod.send_transactions = send_and_pay
+
+
+def test_closed_out_donor_is_skipped(db, algo_client, treasury_key, monkeypatch):
+    algod = algo_client.algod_client
+    donors = [account.generate_account()[1] for _ in range(3)]
+    db.add(DonationCampaign(app_id=APP_ID, asset_id=CINR, total=300, donor_count=3,
+                            donation_count=3, last_round=algod.round))
+    db.add_all(CampaignDonor(app_id=APP_ID, donor=d, total=100, donations=1) for d in donors)
+    db.commit()
+    
+    # donors[1] closed out of CINR after donating
+    algod.holdings = {(donors[0], CINR): 0, (donors[2], CINR): 0}
+    contract_refunds(algod)
+    monkeypatch.setattr(RefundService, "_check_failed", lambda self, app_id: None)
+    
+    result = RefundService(algo_client, db).refund(APP_ID)
+    
+    assert result["success"]
+    assert (result["status"], result["refunded"], result["donors_skipped"]) == ("completed", 200, 1)
+    assert db.query(CampaignDonor).filter(CampaignDonor.refund_skipped.is_(True)).one().donor == donors[1]
@@ -0,0 +1,170 @@
+"""
+Seat holds at checkout: the seat is secured before any payment is sent
+"""
+
+import asyncio
+
+import pytest
+from algosdk import account, encoding, transaction
+from fastapi import HTTPException
+
+from app.config import settings
+from app.models.database import Event, SeatHold, TransactionLog
+from app.models.schemas import EventPaymentRequest
+from app.routers.event import _checkout
+from app.services.event_service import EventService, ticket_payment_error
+from app.services.reservation_service import ReservationService
+
+EVENT_ID = 501
+ORGANIZER = account.generate_account()[1]
+
+
+def event(db, seats=1):
+    db.add(Event(
+        app_id=EVENT_ID,
+        name="Fest",
+        ticket_price=5.0,
+        max_tickets=seats,
+        tickets_sold=0,
+        organizer_address=ORGANIZER
+    ))
+    db.commit()
+    return {"name": "Fest", "ticket_price": 5.0, "organizer": ORGANIZER}
+
+
+def payment(algo_client, receiver=ORGANIZER, amount=500):
+    private_key, buyer = account.generate_account()
+    txn = transaction.AssetTransferTxn(
+        buyer,
+        algo_client.algod_client.suggested_params(),
+        receiver,
+        amount,
+        settings.cinr_asset_id
+    )
+    return txn.sign(private_key)
+
+
+def checkout(db, algo_client, details, signed):
+    request = EventPaymentRequest(signed_txn=encoding.msgpack_encode(signed), event_id=EVENT_ID)
+    return asyncio.run(_checkout(EVENT_ID, details, signed, request, EventService(algo_client, db)))
+
+
+def test_payment_must_pay_the_organizer_the_ticket_price(db, algo_client):
+    details = event(db)
+    
+    assert ticket_payment_error(details, payment(algo_client).transaction) is None
+    assert ticket_payment_error(details, payment(algo_client, amount=1).transaction) == "Ticket payment must be 5.0 CINR"
+    assert ticket_payment_error(details, payment(algo_client, receiver=account.generate_account()[1]).transaction) == (
+        "Ticket payment must go to the event organizer"
+    )
+
+
+def test_checkout_refuses_a_sold_out_event_before_paying(db, algo_client):
+    details = event(db)
+    ReservationService(db).hold_seat(EVENT_ID, "OTHER")
+    
+    with pytest.raises(HTTPException) as refused:
+        checkout(db, algo_client, details, payment(algo_client))
+    
+    assert refused.value.status_code == 409
+    assert algo_client.algod_client.sent == []
+
+
+def test_checkout_sells_the_claimed_seat(db, worker_sessions, algo_client):
+    details = event(db)
+    signed = payment(algo_client)
+    
+    result = checkout(db, algo_client, details, signed)
+    
+    assert result.txid == signed.get_txid()
+    assert db.query(SeatHold).one().status == "confirmed"
+    assert db.get(Event, 1).tickets_sold == 1
+
+
+def test_unconfirmed_payment_keeps_the_seat_until_it_lands(db, worker_sessions, algo_client):
+    details = event(db)
+    signed = payment(algo_client)
+    algo_client.algod_client.confirm = False
+    
+    with pytest.raises(HTTPException) as pending:
+        checkout(db, algo_client, details, signed)
+    
+    assert pending.value.status_code == 504
+    hold = db.query(SeatHold).one()
+    assert (hold.status, hold.txn_id) == ("paying", signed.get_txid())
+    
+    # The hold lapses, but the payment may still land: the seat is kept
+    hold.expires_at = hold.created_at
+    db.commit()
+    assert ReservationService(db).release_expired() == 0
+    
+    algo_client.algod_client.pool[signed.get_txid()]["confirmed-round"] = 1005
+    settled = asyncio.run(EventService(algo_client, db).settle_payments())
+    
+    assert settled["sold"] == 1
+    db.expire_all()
+    assert db.query(SeatHold).one().status == "confirmed"
+    assert db.query(TransactionLog).one().txn_id == signed.get_txid()
+
+
+def test_hold_under_payment_cannot_be_claimed_twice(db):
+    event(db)
+    service = ReservationService(db)
+    hold = service.hold_seat(EVENT_ID, "BUYER")
+    
+    first = service.claim_for_payment(EVENT_ID, "BUYER", hold["hold_token"])
+    second = service.claim_for_payment(EVENT_ID, "BUYER", hold["hold_token"])
+    
+    assert first["status"] == "paying"
+    assert second == {"success": False, "error": "Seat hold is not active"}
+
+
+def test_claim_without_a_token_uses_the_buyers_hold(db):
+    event(db)
+    service = ReservationService(db)
+    hold = service.hold_seat(EVENT_ID, "BUYER")
+    
+    claimed = service.claim_for_payment(EVENT_ID, "BUYER")
+    
+    assert claimed["hold_token"] == hold["hold_token"]
+    assert db.get(Event, 1).seats_held == 1
+
+
+def test_failed_payment_keeps_the_seat_held(db):
+    event(db)
+    service = ReservationService(db)
+    claimed = service.claim_for_payment(EVENT_ID, "BUYER")
+    
+    service.release_payment(EVENT_ID, claimed["hold_token"])
+    
+    assert service.get_hold(EVENT_ID, claimed["hold_token"])["status"] == "held"
+    assert service.confirm_sale(EVENT_ID, "BUYER", claimed["hold_token"]) == 0
+    assert db.query(SeatHold).one().status == "confirmed"
+
+
+def test_last_seat_goes_to_one_checkout(db):
+    event(db)
+    service = ReservationService(db)
+    
+    first = service.claim_for_payment(EVENT_ID, "FIRST")
+    second = service.claim_for_payment(EVENT_ID, "SECOND")
+    
+    assert first["status"] == "paying"
+    assert second == {"success": False, "error": "No tickets available"}
+    assert service.hold_seat(EVENT_ID, "SECOND")["status"] == "waiting"
+
+
+def test_payment_that_never_lands_frees_the_seat_for_the_waitlist(db, algo_client):
+    event(db)
+    service = ReservationService(db)
+    claimed = service.claim_for_payment(EVENT_ID, "FIRST", txn_id="LOSTTXID", last_valid=1100)
+    waiting = service.hold_seat(EVENT_ID, "SECOND")
+    
+    assert asyncio.run(EventService(algo_client, db).settle_payments())["pending"] == 1
+    
+    algo_client.algod_client.round = 1200
+    assert asyncio.run(EventService(algo_client, db).settle_payments())["released"] == 1
+    
+    assert service.get_hold(EVENT_ID, claimed["hold_token"])["status"] == "expired"
+    assert service.get_hold(EVENT_ID, waiting["hold_token"])["status"] == "held"
+    assert service.confirm_sale(EVENT_ID, "FIRST", claimed["hold_token"]) is None
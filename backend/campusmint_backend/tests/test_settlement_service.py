@@ -0,0 +1,108 @@
+"""
+Settlements: ledger entries only once the net transfers confirm
+"""
+
+import asyncio
+
+from algosdk import account, encoding
+
+from app.models.database import ClubLedgerEntry, ClubTransfer, TreasuryAllocation
+from app.services.settlement_service import SettlementService
+
+
+def settled_window(db):
+    """Treasury owes robotics 25, robotics owes chess 40: robotics pays chess 15"""
+    db.add(TreasuryAllocation(
+        club_id="robotics",
+        amount=25.0,
+        purpose="parts",
+        status="approved",
+        admin_approval=True,
+        club_lead_approval=True
+    ))
+    db.add(ClubTransfer(from_club="robotics", to_club="chess", amount=40.0, purpose="venue"))
+    db.commit()
+
+
+def wallets():
+    return {club: account.generate_account() for club in ("robotics", "chess")}
+
+
+def prepare(service, keys):
+    result = service.settle()
+    prepared = service.prepare(result["settlement_id"], {club: address for club, (_, address) in keys.items()})
+    return result["settlement_id"], prepared
+
+
+def sign(prepared, keys):
+    return [
+        encoding.msgpack_encode(encoding.msgpack_decode(leg["txn"]).sign(keys[leg["club_id"]][0]))
+        for leg in prepared["to_sign"]
+    ]
+
+
+def test_settle_posts_nothing_before_execution(db, algo_client, treasury_key):
+    settled_window(db)
+    
+    result = SettlementService(db, algo_client).settle()
+    
+    assert result["transfers"] == [
+        {"from": "treasury", "to": "chess", "amount": 25.0},
+        {"from": "robotics", "to": "chess", "amount": 15.0}
+    ]
+    assert result["status"] == "open"
+    assert db.query(ClubLedgerEntry).count() == 0
+
+
+def test_execute_submits_the_group_then_posts_the_ledger(db, algo_client, treasury_key):
+    settled_window(db)
+    keys = wallets()
+    service = SettlementService(db, algo_client)
+    
+    settlement_id, prepared = prepare(service, keys)
+    assert [leg["club_id"] for leg in prepared["to_sign"]] == ["robotics"]
+    
+    result = asyncio.run(service.execute(settlement_id, sign(prepared, keys)))
+    
+    assert result["success"]
+    assert result["status"] == "settled"
+    assert len(algo_client.algod_client.sent) == 1
+    balances = {e.club_id: e.balance for e in db.query(ClubLedgerEntry)}
+    assert balances == {"robotics": -15.0, "chess": 40.0}
+    
+    db.expire_all()
+    allocation = db.query(TreasuryAllocation).one()
+    assert (allocation.status, allocation.released_at is not None) == ("released", True)
+    assert db.query(ClubTransfer).one().status == "settled"
+
+
+def test_execute_needs_every_paying_club(db, algo_client, treasury_key):
+    settled_window(db)
+    service = SettlementService(db, algo_client)
+    settlement_id, _ = prepare(service, wallets())
+    
+    result = asyncio.run(service.execute(settlement_id, []))
+    
+    assert result == {"success": False, "error": "Missing signed transfers from: ['robotics']"}
+    assert service.get_settlement(settlement_id)["status"] == "signing"
+    assert algo_client.algod_client.sent == []
+
+
+def test_unknown_outcome_waits_for_reconcile(db, algo_client, treasury_key):
+    settled_window(db)
+    keys = wallets()
+    service = SettlementService(db, algo_client)
+    settlement_id, prepared = prepare(service, keys)
+    algo_client.algod_client.send_error = TimeoutError("read timed out")
+    
+    result = asyncio.run(service.execute(settlement_id, sign(prepared, keys)))
+    
+    assert result["status"] == "submitted"
+    assert service.reconcile()["pending"] == 1
+    
+    # Never landed: the settlement reopens without touching the ledger
+    algo_client.algod_client.round += 2000
+    assert service.reconcile()["reopened"] == 1
+    assert service.get_settlement(settlement_id)["status"] == "open"
+    assert db.query(ClubLedgerEntry).count() == 0
+    assert db.query(ClubTransfer).one().status == "netted"
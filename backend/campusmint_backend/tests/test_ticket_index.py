@@ -0,0 +1,93 @@
+"""
+Hot check-in index: reopening and write-through failures lose no entry
+"""
+
+import asyncio
+
+from app.models.database import Event, Ticket
+from app.services import ticket_index
+from app.services.ticket_index import TicketIndexRegistry
+
+EVENT_ID = 501
+WALLET = "WALLET"
+
+
+def tickets(db, count=3):
+    db.add(Event(app_id=EVENT_ID, name="Fest", max_tickets=count))
+    db.add_all(
+        Ticket(event_id=EVENT_ID, ticket_asset_id=9000 + i, buyer_address=WALLET, event_name="Fest")
+        for i in range(count)
+    )
+    db.commit()
+
+
+def used(db, asset_id):
+    db.expire_all()
+    return db.query(Ticket).filter(Ticket.ticket_asset_id == asset_id).one().is_used
+
+
+def test_reopening_keeps_queued_redemptions(db, session_factory):
+    tickets(db)
+    registry = TicketIndexRegistry(session_factory=session_factory)
+    
+    async def run():
+        await registry.open(EVENT_ID)
+        registry.redeem(registry.get(EVENT_ID), WALLET, 9000)
+        
+        # Reopened before the write-through ran: the database still says unused
+        reopened = await registry.open(EVENT_ID)
+        second = registry.redeem(registry.get(EVENT_ID), WALLET, 9000)
+        
+        await registry.close_all()
+        return reopened, second
+    
+    reopened, second = asyncio.run(run())
+    
+    assert reopened["already_open"]
+    assert reopened["already_used"] == 1
+    assert second["message"] == "Ticket already used"
+    assert used(db, 9000)
+
+
+def test_failed_write_through_is_retried(db, session_factory, monkeypatch):
+    tickets(db)
+    monkeypatch.setattr(ticket_index, "RETRY_DELAY", 0.01)
+    registry = TicketIndexRegistry(session_factory=session_factory)
+    flush = registry._flush
+    failures = []
+    
+    def flaky_flush(batch):
+        if not failures:
+            failures.append(batch)
+            raise RuntimeError("database is locked")
+        flush(batch)
+    
+    registry._flush = flaky_flush
+    
+    async def run():
+        await registry.open(EVENT_ID)
+        registry.redeem(registry.get(EVENT_ID), WALLET, 9001)
+        await registry.close(EVENT_ID)
+        await registry.close_all()
+    
+    asyncio.run(run())
+    
+    assert len(failures) == 1
+    assert used(db, 9001)
+
+
+def test_write_through_only_marks_the_events_own_ticket(db, session_factory):
+    tickets(db)
+    registry = TicketIndexRegistry(session_factory=session_factory)
+    
+    async def run():
+        await registry.open(EVENT_ID)
+        # The ticket moved to another event after the index was warmed
+        db.query(Ticket).filter(Ticket.ticket_asset_id == 9002).update({"event_id": EVENT_ID + 1})
+        db.commit()
+        registry.redeem(registry.get(EVENT_ID), WALLET, 9002)
+        await registry.close_all()
+    
+    asyncio.run(run())
+    
+    assert not used(db, 9002)
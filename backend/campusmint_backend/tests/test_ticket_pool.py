@@ -0,0 +1,67 @@
+"""
+Ticket delivery: every claimed ticket is confirmed or sent again
+"""
+
+from algosdk import account
+from algosdk.error import AlgodHTTPError
+
+from app.models.database import Ticket
+from app.services.ticket_pool import TicketPool
+
+EVENT_ID = 501
+BUYER = account.generate_account()[1]
+
+
+def claimed(db, pool):
+    db.add(Ticket(event_id=EVENT_ID, ticket_asset_id=9000, event_name="Fest"))
+    db.commit()
+    asset_id = pool.claim(EVENT_ID, BUYER, 5.0)
+    db.commit()
+    return asset_id
+
+
+def delivery(db):
+    db.expire_all()
+    ticket = db.query(Ticket).one()
+    return ticket.delivery_status, ticket.delivery_txid
+
+
+def test_transfer_is_delivered_once_it_confirms(db, algo_client, treasury_key):
+    pool = TicketPool(algo_client, db)
+    asset_id = claimed(db, pool)
+    
+    sent = pool.transfer(asset_id, BUYER)
+    
+    assert delivery(db) == ("sent", sent["txid"])
+    assert pool.reconcile_deliveries()["delivered"] == 1
+    assert delivery(db) == ("delivered", sent["txid"])
+
+
+def test_refused_transfer_is_sent_again(db, algo_client, treasury_key):
+    pool = TicketPool(algo_client, db)
+    asset_id = claimed(db, pool)
+    algo_client.algod_client.send_error = AlgodHTTPError("receiver not opted in", 400)
+    
+    assert pool.transfer(asset_id, BUYER)["status"] == "pending"
+    assert delivery(db) == ("pending", None)
+    
+    algo_client.algod_client.send_error = None
+    assert pool.reconcile_deliveries()["resent"] == 1
+    assert delivery(db)[0] == "sent"
+
+
+def test_lost_transfer_is_sent_again_after_last_valid(db, algo_client, treasury_key):
+    pool = TicketPool(algo_client, db)
+    asset_id = claimed(db, pool)
+    algo_client.algod_client.send_error = TimeoutError("read timed out")
+    
+    lost = pool.transfer(asset_id, BUYER)
+    
+    assert lost["status"] == "sent"
+    assert pool.reconcile_deliveries()["pending"] == 1
+    assert pool.transfer(asset_id, BUYER)["error"] == "Ticket transfer already in flight"
+    
+    algo_client.algod_client.send_error = None
+    algo_client.algod_client.round += 2000
+    assert pool.reconcile_deliveries()["resent"] == 1
+    assert delivery(db)[1] not in (None, lost["txid"])
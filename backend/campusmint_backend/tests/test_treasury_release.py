@@ -0,0 +1,138 @@
+"""
+Batch releases: claims, submission failures and reconcile
+"""
+
+import asyncio
+
+from algosdk import account
+from algosdk.error import AlgodHTTPError
+
+from app.models.database import ClubLedgerEntry, TreasuryAllocation
+from app.services.treasury_service import TreasuryService
+
+
+def approved_allocation(db, club_id="robotics", amount=25.0):
+    allocation = TreasuryAllocation(
+        club_id=club_id,
+        amount=amount,
+        purpose="parts",
+        status="approved",
+        admin_approval=True,
+        club_lead_approval=True
+    )
+    db.add(allocation)
+    db.commit()
+    return allocation.id
+
+
+def release(service, *allocation_ids):
+    recipient = account.generate_account()[1]
+    return asyncio.run(service.release_batch([
+        {"allocation_id": allocation_id, "recipient": recipient}
+        for allocation_id in allocation_ids
+    ]))
+
+
+def status(db, allocation_id):
+    db.expire_all()
+    return db.get(TreasuryAllocation, allocation_id)
+
+
+def test_release_marks_allocations_released(db, algo_client, treasury_key):
+    ids = [approved_allocation(db), approved_allocation(db, "chess", 10.0)]
+    
+    result = release(TreasuryService(algo_client, db), *ids)
+    
+    assert result["success"] and result["released"] == 2
+    assert len(algo_client.algod_client.sent) == 1
+    assert [status(db, i).status for i in ids] == ["released", "released"]
+
+
+def test_claimed_allocation_is_not_released_twice(db, algo_client, treasury_key):
+    allocation_id = approved_allocation(db)
+    algo_client.algod_client.send_error = TimeoutError("read timed out")
+    service = TreasuryService(algo_client, db)
+    
+    release(service, allocation_id)
+    algo_client.algod_client.send_error = None
+    second = release(service, allocation_id)
+    
+    assert not second["success"]
+    assert second["results"][0]["error"] == "Cannot release: status is releasing"
+    assert algo_client.algod_client.sent == []
+
+
+def test_timeout_keeps_the_batch_releasing(db, algo_client, treasury_key):
+    allocation_id = approved_allocation(db)
+    algo_client.algod_client.send_error = TimeoutError("read timed out")
+    
+    result = release(TreasuryService(algo_client, db), allocation_id)
+    
+    allocation = status(db, allocation_id)
+    assert not result["success"]
+    assert result["results"][0]["status"] == "releasing"
+    assert allocation.status == "releasing"
+    assert allocation.txn_id == result["results"][0]["txid"]
+    assert allocation.last_valid == algo_client.algod_client.round + 1000
+
+
+def test_rejection_hands_the_batch_back(db, algo_client, treasury_key):
+    allocation_id = approved_allocation(db)
+    algo_client.algod_client.send_error = AlgodHTTPError("overspend", 400)
+    
+    result = release(TreasuryService(algo_client, db), allocation_id)
+    
+    allocation = status(db, allocation_id)
+    assert not result["success"]
+    assert (allocation.status, allocation.txn_id) == ("approved", None)
+
+
+def test_already_in_ledger_is_not_a_rejection(db, algo_client, treasury_key):
+    allocation_id = approved_allocation(db)
+    algo_client.algod_client.send_error = AlgodHTTPError("transaction already in ledger", 400)
+    
+    release(TreasuryService(algo_client, db), allocation_id)
+    
+    assert status(db, allocation_id).status == "releasing"
+
+
+def test_reconcile_records_a_release_that_landed(db, algo_client, treasury_key):
+    allocation_id = approved_allocation(db)
+    algod = algo_client.algod_client
+    algod.send_error = TimeoutError("read timed out")
+    service = TreasuryService(algo_client, db)
+    txid = release(service, allocation_id)["results"][0]["txid"]
+    
+    # It did land; algod has since forgotten it, the indexer has it
+    algo_client.indexer_client.transactions[txid] = {
+        "confirmed-round": algod.round,
+        "asset-transfer-transaction": {"receiver": "RECEIVER"}
+    }
+    
+    assert service.reconcile_releases()["released"] == 1
+    assert service.reconcile_releases()["released"] == 0
+    
+    assert status(db, allocation_id).status == "released"
+    assert db.query(ClubLedgerEntry).count() == 1
+
+
+def test_reconcile_waits_until_the_release_can_no_longer_land(db, algo_client, treasury_key):
+    allocation_id = approved_allocation(db)
+    algod = algo_client.algod_client
+    algod.send_error = TimeoutError("read timed out")
+    service = TreasuryService(algo_client, db)
+    release(service, allocation_id)
+    
+    # Still inside the validity window: may land
+    assert service.reconcile_releases()["pending"] == 1
+    
+    # algod is past last_valid but the indexer has not caught up
+    algod.round += 2000
+    algo_client.indexer_client.lag = 1500
+    assert service.reconcile_releases()["pending"] == 1
+    
+    algo_client.indexer_client.lag = 0
+    assert service.reconcile_releases()["restored"] == 1
+    
+    allocation = status(db, allocation_id)
+    assert (allocation.status, allocation.txn_id) == ("approved", None)
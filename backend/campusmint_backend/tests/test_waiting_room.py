@@ -0,0 +1,51 @@
+"""
+Checkout waiting room: one place in line per wallet
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.schemas import QueueJoinRequest
+from app.routers.event import join_queue
+from app.services.event_service import EventService
+from app.services.waiting_room import WaitingRoom
+
+EVENT_ID = 501
+
+
+@pytest.fixture
+def room():
+    return WaitingRoom(admit_rate=1, max_in_flight=1, admit_ttl=60)
+
+
+def test_wallet_keeps_one_place_in_line(room):
+    first = room.join(EVENT_ID, "ALICE")
+    again = room.join(EVENT_ID, "ALICE")
+    other = room.join(EVENT_ID, "BOB")
+    
+    assert again["queue_token"] == first["queue_token"]
+    assert (first["position"], other["position"]) == (1, 2)
+
+
+def test_token_only_admits_its_own_wallet(room):
+    token = room.join(EVENT_ID, "ALICE")["queue_token"]
+    room.tick(1)
+    
+    # Someone else presenting Alice's admitted token is queued instead
+    assert not room.enter(EVENT_ID, "BOB", token).get("admitted")
+    assert room.enter(EVENT_ID, "ALICE", token) == {"admitted": True}
+    
+    # The token is spent: Alice can line up again
+    assert room.join(EVENT_ID, "ALICE")["queue_token"] != token
+
+
+def test_queue_for_unknown_event_is_404(db, algo_client, room):
+    request = QueueJoinRequest(buyer_address="A" * 58)
+    
+    with pytest.raises(HTTPException) as missing:
+        asyncio.run(join_queue(EVENT_ID, request, EventService(algo_client, db), room))
+    
+    assert missing.value.status_code == 404
+    assert room.tokens == {}
@@ -0,0 +1,601 @@
+"""
+Build every CampusMint contract into deployable artifacts
+
+Each contract is compiled in its own worker process (PyTeal -> TEAL ->
+algod bytecode) and written to artifacts/<name>/:
+
+    approval.teal, approval.bin, approval.map.json
+    clear.teal,    clear.bin,    clear.map.json
+    contract.json  (state schema, call interface, template offsets,
+                    ARC-4 methods for Router contracts)
+
+Template variables (TMPL_*) are compiled with fixed-size placeholders
+whose byte offsets go into contract.json; deploy scripts patch the real
+values into approval.bin without compiling again.
+
+Contracts whose inputs (source and the local modules it imports, PyTeal
+version, TEAL version) have not changed since the last build are skipped; artifacts/manifest.json
+records what each build was made from. Bytecode comes from algod's
+/compile through the TEAL compile cache, so an unchanged program is
+never sent to the node twice. Rebuilt contracts are then profiled
+(profile_contracts.py) against the committed cost baseline.
+
+Usage:
+    python build_contracts.py                  # build what changed
+    python build_contracts.py smart_savings    # just one contract
+    python build_contracts.py --force          # rebuild everything
+
+Set ALGOD_SERVER / ALGOD_TOKEN to compile against another node.
+"""
+
+import argparse
+import ast
+import base64
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+ARTIFACTS_DIR = ROOT / "artifacts"
+MANIFEST_PATH = ARTIFACTS_DIR / "manifest.json"
+
+# Bump when the artifact layout changes to force a rebuild
+BUILD_FORMAT = 2
+
+SMART_VAULT_CONTRACTS = ROOT / "savings-vault-contract" / "smart-vault-project" / "contracts"
+
+# ==========================================
+# CONTRACTS
+# ==========================================
+
+def schema(global_uints, global_bytes, local_uints, local_bytes):
+    return {
+        "global": {"num_uints": global_uints, "num_byte_slices": global_bytes},
+        "local": {"num_uints": local_uints, "num_byte_slices": local_bytes}
+    }
+
+
+CONTRACTS = {
+    "simple_vault": {
+        "source": SMART_VAULT_CONTRACTS / "simple_vault_fixed.py",
+        "approval": "approval_program",
+        "clear": "clear_state_program",
+        "version": 8,
+        "interface": {
+            "description": "Per-user CINR time lock (local state)",
+            "schema": schema(3, 0, 2, 1),
+            "opt_in": True,
+            "methods": [
+                {"name": "deposit", "args": [
+                    {"name": "amount", "type": "uint64"},
+                    {"name": "unlock_time", "type": "uint64"}
+                ]},
+                {"name": "withdraw", "args": []}
+            ]
+        }
+    },
+    "smart_savings": {
+        "source": SMART_VAULT_CONTRACTS / "smart_savings_contract.py",
+        "approval": "approval_program",
+        "clear": "clear_state_program",
+        "version": 8,
+        "interface": {
+            "description": "Goal-based savings with HTLC emergency withdrawal",
+            "schema": schema(5, 0, 5, 3),
+            "opt_in": True,
+            "methods": [
+                {"name": "create", "args": [
+                    {"name": "goal", "type": "uint64"},
+                    {"name": "unlock_time", "type": "uint64"},
+                    {"name": "cause", "type": "string"},
+                    {"name": "emergency_password", "type": "string"}
+                ]},
+                {"name": "deposit", "args": [
+                    {"name": "amount", "type": "uint64"}
+                ]},
+                {"name": "withdraw", "args": []},
+                {"name": "emergency", "args": [
+                    {"name": "password", "type": "string"}
+                ]}
+            ]
+        }
+    },
+    "smart_savings_abi": {
+        "source": SMART_VAULT_CONTRACTS / "smart_savings_abi.py",
+        "router": "router",
+        "version": 8,
+        "interface": {
+            "description": "Goal-based savings with HTLC emergency withdrawal (ARC-4 methods)",
+            "schema": schema(5, 0, 5, 3),
+            "opt_in": True
+        }
+    },
+    "smart_savings_box": {
+        "source": SMART_VAULT_CONTRACTS / "smart_savings_box_contract.py",
+        "approval": "approval_program",
+        "clear": "clear_state_program",
+        "version": 8,
+        "interface": {
+            "description": "Goal-based savings with HTLC emergency withdrawal (one box per student)",
+            "schema": schema(4, 0, 0, 0),
+            "opt_in": False,
+            "boxes": "sender address (72 + len(cause) bytes)",
+            "methods": [
+                {"name": "create", "args": [
+                    {"name": "goal", "type": "uint64"},
+                    {"name": "unlock_time", "type": "uint64"},
+                    {"name": "cause", "type": "string"},
+                    {"name": "emergency_password", "type": "string"}
+                ], "group": ["pay", "appl"]},
+                {"name": "deposit", "args": [
+                    {"name": "amount", "type": "uint64"}
+                ]},
+                {"name": "withdraw", "args": []},
+                {"name": "emergency", "args": [
+                    {"name": "password", "type": "string"}
+                ]},
+                {"name": "close", "args": [], "inner": ["pay"]}
+            ]
+        }
+    },
+    "simple_vault_abi": {
+        "source": SMART_VAULT_CONTRACTS / "simple_vault_abi.py",
+        "router": "router",
+        "version": 8,
+        "interface": {
+            "description": "Per-user CINR time lock (ARC-4 methods)",
+            "schema": schema(3, 0, 2, 1),
+            "opt_in": True
+        }
+    },
+    "student_vault": {
+        "source": ROOT / "student_vault_contract" / "vault_contract.py",
+        "approval": "asa_vault_approval_program",
+        "clear": "vault_clear_program",
+        "version": 6,
+        "templates": {
+            "TMPL_UNLOCK_TIME": "uint64",
+            "TMPL_ASSET_ID": "uint64",
+            "TMPL_BENEFICIARY": "address"
+        },
+        "interface": {
+            "description": "Single ASA vault released to a beneficiary after unlock_time",
+            "schema": schema(3, 2, 0, 0),
+            "opt_in": False,
+            "methods": [
+                {"name": "deposit", "args": [], "group": ["appl", "axfer"]},
+                {"name": "withdraw", "args": [], "inner": ["axfer"]}
+            ]
+        }
+    },
+    "algo_vault": {
+        "source": ROOT / "student_vault_contract" / "vault_contract.py",
+        "approval": "algo_vault_approval_program",
+        "clear": "vault_clear_program",
+        "version": 6,
+        "templates": {
+            "TMPL_UNLOCK_TIME": "uint64",
+            "TMPL_BENEFICIARY": "address"
+        },
+        "interface": {
+            "description": "Single ALGO vault released to a beneficiary after unlock_time",
+            "schema": schema(2, 2, 0, 0),
+            "opt_in": False,
+            "methods": [
+                {"name": "deposit", "args": [], "group": ["appl", "pay"]},
+                {"name": "withdraw", "args": [], "inner": ["pay"]}
+            ]
+        }
+    },
+    "vault_factory": {
+        "source": ROOT / "student_vault_contract" / "vault_factory_contract.py",
+        "approval": "vault_factory_approval_program",
+        "clear": "vault_factory_clear_program",
+        "version": 8,
+        "interface": {
+            "description": "Many ALGO / ASA time-locked vaults in one app (one box per vault)",
+            "schema": schema(1, 0, 0, 0),
+            "opt_in": False,
+            "boxes": "itob(vault_id) (88 bytes)",
+            "methods": [
+                {"name": "create", "args": [
+                    {"name": "beneficiary", "type": "address"},
+                    {"name": "asset_id", "type": "uint64"},
+                    {"name": "unlock_time", "type": "uint64"}
+                ], "group": ["pay", "appl"], "inner": ["axfer"], "returns": "vault_id (log)"},
+                {"name": "deposit", "args": [
+                    {"name": "vault_id", "type": "uint64"}
+                ], "group": ["appl", "pay|axfer"]},
+                {"name": "withdraw", "args": [
+                    {"name": "vault_id", "type": "uint64"}
+                ], "inner": ["pay|axfer", "pay"]}
+            ]
+        }
+    },
+    "crowdfunding": {
+        "source": ROOT / "club_treasury_vault.ipynb",
+        "approval": "approval",
+        "clear": "clear",
+        "version": 8,
+        "interface": {
+            "description": "NGO crowdfunding with escrowed donations and batched refunds",
+            "schema": schema(4, 1, 1, 0),
+            "opt_in": True,
+            "create_args": [
+                {"name": "creator", "type": "bytes"},
+                {"name": "goal", "type": "uint64"},
+                {"name": "deadline", "type": "uint64"},
+                {"name": "asset_id", "type": "uint64"}
+            ],
+            "methods": [
+                {"name": "donate", "args": [], "group": ["appl", "axfer"]},
+                {"name": "refund", "args": [], "accounts": "donors (up to 4)", "inner": ["axfer"]}
+            ]
+        }
+    }
+}
+
+# ==========================================
+# INPUTS
+# ==========================================
+
+def notebook_contract_source(path):
+    """
+    Contract code of a notebook: the cell defining approval() and
+    clear(), up to where it starts compiling and deploying
+    """
+    notebook = json.loads(Path(path).read_text(encoding="utf-8"))
+    
+    for cell in notebook["cells"]:
+        source = "".join(cell["source"])
+        if cell["cell_type"] == "code" and "def approval(" in source and "def clear(" in source:
+            return source.split("\napproval_teal =", 1)[0] + "\n"
+    
+    raise ValueError(f"No contract cell in {path}")
+
+
+def contract_source(spec):
+    if spec["source"].suffix == ".ipynb":
+        return notebook_contract_source(spec["source"])
+    return spec["source"].read_text(encoding="utf-8")
+
+
+def module_search_path(spec):
+    """Folders a contract's imports resolve from (see load_namespace)"""
+    return list(dict.fromkeys([spec["source"].parent, SMART_VAULT_CONTRACTS, ROOT]))
+
+
+def local_imports(source, search):
+    """Files under the search folders that a source imports"""
+    names = set()
+    
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # "from helpers import x" may name a module or a submodule
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    
+    found = []
+    for name in sorted(names):
+        module = Path(*name.split("."))
+        for folder in search:
+            candidates = [folder / f"{module}.py", folder / module / "__init__.py"]
+            match = next((c for c in candidates if c.is_file()), None)
+            if match:
+                found.append(match)
+                break
+    
+    return found
+
+
+def contract_dependencies(spec):
+    """Local helper modules a contract imports, directly or through each other"""
+    search = module_search_path(spec)
+    sources = {}
+    pending = [contract_source(spec)]
+    
+    while pending:
+        for path in local_imports(pending.pop(), search):
+            if path not in sources and path != spec["source"]:
+                sources[path] = path.read_text(encoding="utf-8")
+                pending.append(sources[path])
+    
+    return sources
+
+
+def input_hash(name, spec):
+    """Everything the artifacts depend on"""
+    digest = hashlib.sha256()
+    
+    helpers = [
+        f"{path.relative_to(ROOT).as_posix()}\n{source}"
+        for path, source in sorted(contract_dependencies(spec).items())
+    ]
+    
+    for part in (
+        f"format={BUILD_FORMAT}",
+        f"pyteal={importlib.metadata.version('pyteal')}",
+        f"version={spec['version']}",
+        json.dumps(spec["interface"], sort_keys=True),
+        json.dumps(spec.get("templates", {}), sort_keys=True),
+        contract_source(spec),
+        *helpers
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    
+    return digest.hexdigest()
+
+
+# ==========================================
+# TEMPLATES
+# ==========================================
+
+TEMPLATE_SIZES = {"uint64": 8, "address": 32}
+
+
+def template_placeholder(name, kind):
+    """Fixed-size stand-in value, unique enough to find in the bytecode"""
+    return hashlib.sha512(f"campusmint:{name}".encode()).digest()[:TEMPLATE_SIZES[kind]]
+
+
+def fill_placeholders(teal, templates, values=None):
+    """
+    TEAL with every TMPL_* replaced by its placeholder literal (or by
+    the real value, when values are given)
+    """
+    from algosdk import encoding
+    
+    for name, kind in templates.items():
+        if values is None:
+            value = template_placeholder(name, kind)
+        elif kind == "address":
+            value = encoding.decode_address(values[name])
+        else:
+            value = int(values[name]).to_bytes(TEMPLATE_SIZES[kind], "big")
+        
+        literal = encoding.encode_address(value) if kind == "address" else "0x" + value.hex()
+        teal = re.sub(rf"\b{name}\b", literal, teal)
+    
+    return teal
+
+
+def template_offsets(bytecode, templates):
+    """Where each placeholder sits in the assembled program"""
+    offsets = {}
+    
+    for name, kind in templates.items():
+        placeholder = template_placeholder(name, kind)
+        found = [m.start() for m in re.finditer(re.escape(placeholder), bytecode)]
+        
+        if not found:
+            raise ValueError(f"{name} not found in bytecode")
+        
+        offsets[name] = {"type": kind, "offsets": found}
+    
+    return offsets
+
+
+# ==========================================
+# WORKER
+# ==========================================
+
+def load_namespace(name, spec):
+    """Module globals of a contract's source"""
+    # Helper modules next to the contract import like they do when it
+    # is run as a script
+    for folder in reversed(module_search_path(spec)):
+        if str(folder) not in sys.path:
+            sys.path.insert(0, str(folder))
+    
+    if spec["source"].suffix == ".ipynb":
+        namespace = {"__name__": f"contract_{name}"}
+        exec(compile(contract_source(spec), str(spec["source"]), "exec"), namespace)
+        return namespace
+    
+    module_spec = importlib.util.spec_from_file_location(f"contract_{name}", spec["source"])
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return vars(module)
+
+
+def load_programs(name, spec):
+    """approval() and clear() expressions of a contract"""
+    namespace = load_namespace(name, spec)
+    return namespace[spec["approval"]](), namespace[spec["clear"]]()
+
+
+def contract_abi(name):
+    """
+    ARC-4 description (algosdk.abi.Contract) of a contract built from
+    a PyTeal Router, None for contracts dispatching on raw app args
+    """
+    spec = CONTRACTS[name]
+    if "router" not in spec:
+        return None
+    
+    router = load_namespace(name, spec)[spec["router"]]
+    return router.compile_program(version=spec["version"])[2]
+
+
+def contract_teal(name, template_values=None):
+    """
+    Approval and clear TEAL of a contract, compiled in process
+    
+    TMPL_* variables are left in unless template_values are given.
+    Router contracts (ARC-4) are compiled by their router, which builds
+    the method selector dispatch.
+    """
+    from pyteal import Mode, compileTeal
+    
+    spec = CONTRACTS[name]
+    templates = spec.get("templates", {})
+    
+    if "router" in spec:
+        router = load_namespace(name, spec)[spec["router"]]
+        approval, clear, _ = router.compile_program(version=spec["version"])
+        return approval, clear
+    
+    programs = []
+    for expr in load_programs(name, spec):
+        teal = compileTeal(expr, mode=Mode.Application, version=spec["version"])
+        if templates and template_values is not None:
+            teal = fill_placeholders(teal, templates, template_values)
+        programs.append(teal)
+    
+    return tuple(programs)
+
+
+def build_contract(name, inputs):
+    """Compile one contract and write its artifacts (runs in a worker)"""
+    from algosdk.v2client import algod
+    
+    sys.path.insert(0, str(SMART_VAULT_CONTRACTS))
+    from teal_cache import compile_teal_entry
+    
+    started = time.perf_counter()
+    spec = CONTRACTS[name]
+    
+    client = algod.AlgodClient(
+        os.getenv("ALGOD_TOKEN", ""),
+        os.getenv("ALGOD_SERVER", "https://testnet-api.algonode.cloud")
+    )
+    
+    approval, clear = contract_teal(name)
+    out_dir = ARTIFACTS_DIR / name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    templates = spec.get("templates", {})
+    
+    programs = {}
+    for kind, teal in (("approval", approval), ("clear", clear)):
+        entry = compile_teal_entry(client, fill_placeholders(teal, templates), cache_dir=ROOT)
+        bytecode = base64.b64decode(entry["result"])
+        
+        (out_dir / f"{kind}.teal").write_text(teal)
+        (out_dir / f"{kind}.bin").write_bytes(bytecode)
+        (out_dir / f"{kind}.map.json").write_text(json.dumps(entry["sourcemap"], indent=2))
+        
+        programs[kind] = {
+            "size": len(bytecode),
+            "sha256": hashlib.sha256(bytecode).hexdigest()
+        }
+        
+        if kind == "approval" and templates:
+            programs[kind]["templates"] = template_offsets(bytecode, templates)
+    
+    interface = {
+        "name": name,
+        "teal_version": spec["version"],
+        **spec["interface"],
+        "programs": programs
+    }
+    
+    contract = contract_abi(name)
+    if contract is not None:
+        interface["arc4"] = contract.dictify()
+    (out_dir / "contract.json").write_text(json.dumps(interface, indent=2))
+    
+    return {
+        "inputs": inputs,
+        "programs": programs,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+
+# ==========================================
+# BUILD
+# ==========================================
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        return json.loads(MANIFEST_PATH.read_text())
+    return {}
+
+
+def is_current(name, inputs, manifest):
+    entry = manifest.get(name)
+    return (
+        entry is not None
+        and entry["inputs"] == inputs
+        and all((ARTIFACTS_DIR / name / f).exists() for f in ("approval.bin", "clear.bin", "contract.json"))
+    )
+
+
+def build(names=None, force=False, jobs=None):
+    """
+    Build contracts in parallel, skipping unchanged ones
+    
+    Returns:
+        True if every contract built (or was current)
+    """
+    names = names or list(CONTRACTS)
+    manifest = load_manifest()
+    
+    todo = {}
+    for name in names:
+        inputs = input_hash(name, CONTRACTS[name])
+        if not force and is_current(name, inputs, manifest):
+            print(f"   ⏭  {name}: up to date")
+        else:
+            todo[name] = inputs
+    
+    if not todo:
+        print("\n✅ Nothing to build\n")
+        return True
+    
+    print(f"\n🔨 Building {len(todo)} contract(s)...\n")
+    
+    failed = []
+    with ProcessPoolExecutor(max_workers=jobs or min(len(todo), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(build_contract, name, inputs): name for name, inputs in todo.items()}
+        
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                manifest[name] = future.result()
+                programs = manifest[name]["programs"]
+                print(
+                    f"   ✅ {name}: approval {programs['approval']['size']} bytes, "
+                    f"clear {programs['clear']['size']} bytes ({manifest[name]['seconds']}s)"
+                )
+            except Exception as e:
+                failed.append(name)
+                print(f"   ❌ {name}: {e}")
+    
+    ARTIFACTS_DIR.mkdir(exist_ok=True)
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    
+    # Regression report for every contract that changed
+    from profile_contracts import SCENARIOS, report
+    report([name for name in todo if name not in failed and name in SCENARIOS])
+    
+    if failed:
+        print(f"\n❌ {len(failed)} contract(s) failed: {', '.join(sorted(failed))}\n")
+        return False
+    
+    print(f"\n✅ Artifacts written to {ARTIFACTS_DIR}\n")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build CampusMint contract artifacts")
+    parser.add_argument("contracts", nargs="*", help=f"contracts to build (default: all of {', '.join(CONTRACTS)})")
+    parser.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per contract, up to CPU count)")
+    args = parser.parse_args()
+    
+    unknown = set(args.contracts) - set(CONTRACTS)
+    if unknown:
+        parser.error(f"unknown contract(s): {', '.join(sorted(unknown))}")
+    
+    sys.exit(0 if build(args.contracts, force=args.force, jobs=args.jobs) else 1)
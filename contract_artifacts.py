@@ -0,0 +1,100 @@
+"""
+Contract artifacts
+
+Loads programs built by build_contracts.py (next to this file) so
+deploy scripts ship bytecode without importing PyTeal or calling
+algod's /compile. The deploy folders import it through their own
+contract_artifacts.py, which re-exports this module.
+
+Usage:
+    from contract_artifacts import load_contract
+    vault = load_contract("student_vault", {
+        "TMPL_UNLOCK_TIME": unlock_time,
+        "TMPL_ASSET_ID": asset_id,
+        "TMPL_BENEFICIARY": beneficiary
+    })
+    ApplicationCreateTxn(..., approval_program=vault["approval_program"], ...)
+"""
+
+import json
+from pathlib import Path
+
+from algosdk import abi, encoding
+from algosdk.transaction import StateSchema
+
+
+def artifacts_dir():
+    """The artifacts/ folder next to build_contracts.py"""
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "build_contracts.py").exists():
+            return parent / "artifacts"
+    
+    raise FileNotFoundError("build_contracts.py not found above this script")
+
+
+def load_contract(name, template_values=None):
+    """
+    Bytecode, schema and interface of a built contract
+    
+    Args:
+        name: Contract name in build_contracts.py (e.g. "smart_savings")
+        template_values: Values for the contract's TMPL_* variables
+            (ints for uint64, address strings for address)
+    
+    Returns:
+        Dict with approval_program, clear_program (bytes),
+        global_schema, local_schema (StateSchema), interface and
+        abi (algosdk.abi.Contract for ARC-4 contracts, else None)
+    """
+    contract_dir = artifacts_dir() / name
+    
+    if not (contract_dir / "contract.json").exists():
+        raise FileNotFoundError(
+            f"No build for '{name}' in {contract_dir.parent}. "
+            f"Run: python build_contracts.py {name}"
+        )
+    
+    interface = json.loads((contract_dir / "contract.json").read_text())
+    schema = interface["schema"]
+    
+    approval_program = (contract_dir / "approval.bin").read_bytes()
+    templates = interface["programs"]["approval"].get("templates", {})
+    
+    if templates or template_values:
+        approval_program = patch_program(approval_program, templates, template_values or {})
+    
+    return {
+        "approval_program": approval_program,
+        "clear_program": (contract_dir / "clear.bin").read_bytes(),
+        "global_schema": StateSchema(**schema["global"]),
+        "local_schema": StateSchema(**schema["local"]),
+        "interface": interface,
+        "abi": abi.Contract.undictify(interface["arc4"]) if "arc4" in interface else None
+    }
+
+
+def patch_program(program, templates, values):
+    """
+    Write template values into the bytecode at their recorded offsets
+    
+    Every template is fixed-size, so nothing else in the program moves.
+    """
+    missing = set(templates) - set(values)
+    unknown = set(values) - set(templates)
+    if missing or unknown:
+        raise ValueError(
+            f"Template values mismatch: missing {sorted(missing)}, unknown {sorted(unknown)}"
+        )
+    
+    program = bytearray(program)
+    
+    for name, template in templates.items():
+        if template["type"] == "address":
+            value = encoding.decode_address(values[name])
+        else:
+            value = int(values[name]).to_bytes(8, "big")
+        
+        for offset in template["offsets"]:
+            program[offset:offset + len(value)] = value
+    
+    return bytes(program)
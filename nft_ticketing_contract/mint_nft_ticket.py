@@ -0,0 +1,74 @@
+"""
+Bulk NFT ticket minting for an event
+
+Usage:
+    python mint_nft_ticket.py <event_app_id> <ticket_count>
+
+Runs the backend's TicketMinter: ticket ASAs are created in atomic
+groups of 16 with several groups in flight per round, and the new asset
+IDs are written to the backend database (Event.nft_asset_id + Ticket
+rows). If the run is interrupted, run the same command again - it
+resumes from mint_checkpoint_<event_app_id>.json in this folder.
+
+Uses ADMIN_MNEMONIC and DATABASE_URL from the backend's .env file.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+BACKEND_DIR = HERE.parent / "backend" / "campusmint_backend"
+
+
+def mint_tickets(event_app_id, ticket_count):
+    # Backend settings are read from its own .env
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, str(BACKEND_DIR))
+    
+    from app.services.algo_client import AlgorandClient
+    from app.services.database import SessionLocal, init_db
+    from app.services.mint_service import TicketMinter
+    
+    print("\n" + "="*70)
+    print("🎟  MINTING NFT TICKETS")
+    print("="*70)
+    print(f"\nEvent App ID: {event_app_id}")
+    print(f"Tickets:      {ticket_count}")
+    
+    init_db()
+    db = SessionLocal()
+    
+    try:
+        minter = TicketMinter(AlgorandClient(), db, checkpoint_dir=str(HERE))
+        print(f"Creator:      {minter.creator}")
+        print("\n⏳ Submitting groups of 16 (progress is checkpointed)...")
+        
+        result = minter.mint(event_app_id, ticket_count)
+    finally:
+        db.close()
+    
+    if not result.get("success"):
+        print(f"\n❌ Minting failed: {result.get('error')}")
+        print("   Run the same command again to resume.\n")
+        return None
+    
+    asset_ids = result["asset_ids"]
+    
+    print("\n" + "="*70)
+    print(f"🎉 SUCCESS! {result['minted']} TICKETS MINTED")
+    print("="*70)
+    print(f"\n   First asset: {asset_ids[0]}")
+    print(f"   Last asset:  {asset_ids[-1]}")
+    print(f"   Event NFT:   {result['nft_asset_id']}")
+    print("\n" + "="*70 + "\n")
+    
+    return asset_ids
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python mint_nft_ticket.py <event_app_id> <ticket_count>")
+        sys.exit(1)
+    
+    mint_tickets(int(sys.argv[1]), int(sys.argv[2]))
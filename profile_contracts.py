@@ -0,0 +1,525 @@
+"""
+Profile every branch of the CampusMint approval programs
+
+Each contract is compiled from its PyTeal source (no node needed) and
+every branch - create, opt-in, deposit, withdraw, emergency, refund... -
+is run through the local AVM interpreter (avm.py) with synthetic
+transactions. For each branch the profile records:
+
+    cost      opcode cost (budget: 700 per app call in the group)
+    stack     peak stack depth
+    global    global state reads / writes
+    local     local state reads / writes
+    box       box reads / writes
+    inner     inner transactions sent
+
+The profile is compared with the committed baseline in
+contract_profile.json. A branch that got more expensive, went deeper on
+the stack, touches more state, sends more inner transactions or stopped
+approving is reported as a regression. build_contracts.py prints this
+report for every contract it rebuilds.
+
+Usage:
+    python profile_contracts.py                  # report vs baseline
+    python profile_contracts.py smart_savings    # just one contract
+    python profile_contracts.py --update         # accept as new baseline
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+
+from algosdk import encoding
+
+import avm
+from build_contracts import CONTRACTS, ROOT, contract_teal, fill_placeholders, input_hash
+
+BASELINE_PATH = ROOT / "contract_profile.json"
+
+METRICS = ["cost", "stack", "global_reads", "global_writes", "local_reads",
+           "local_writes", "box_reads", "box_writes", "inner"]
+
+# Synthetic accounts and values
+CREATOR = encoding.encode_address(hashlib.sha256(b"creator").digest())
+STUDENT = encoding.encode_address(hashlib.sha256(b"student").digest())
+DONORS = [encoding.encode_address(hashlib.sha256(f"donor{i}".encode()).digest()) for i in range(4)]
+CINR = 10458941
+NOW = 1_700_000_000
+DAY = 86400
+
+# ==========================================
+# SCENARIOS
+# ==========================================
+#
+# One per branch. "global" / "local" are the state before the call
+# ("local" maps accounts to their local state, which also opts them
+# in; "boxes" maps box names to contents); "group" builds the
+# transactions from the app ID, with the profiled app call at "index".
+# "create" runs the call as the app's creation.
+
+def branch(group, global_state=None, local_state=None, create=False, templates=None,
+           boxes=None, index=0):
+    return {
+        "group": group,
+        "global": global_state or {},
+        "local": local_state or {},
+        "boxes": boxes or {},
+        "index": index,
+        "create": create,
+        "templates": templates or {}
+    }
+
+
+def savings_local(**overrides):
+    state = {
+        b"owner": avm.to_address(STUDENT),
+        b"total": 5000,
+        b"goal": 10000,
+        b"unlock_time": NOW - DAY,
+        b"cause": b"laptop",
+        b"emergency_hash": hashlib.sha256(b"hunter2").digest(),
+        b"created_at": NOW - 30 * DAY,
+        b"last_deposit": NOW - DAY
+    }
+    state.update({key.encode(): value for key, value in overrides.items()})
+    return {STUDENT: state}
+
+
+def savings_global(total_locked=50_000, active_savers=10):
+    """Campus totals of a savings / vault app that already has savers"""
+    return {
+        b"total_locked": total_locked,
+        b"active_savers": active_savers,
+        b"emergency_count": 2,
+        b"total_penalties": 200
+    }
+
+
+def savings_box(total=5000, unlock_time=NOW - DAY, cause=b"laptop"):
+    """A student's savings box (layout in smart_savings_box_contract.py)"""
+    record = b"".join(value.to_bytes(8, "big") for value in (
+        total, 10000, unlock_time, NOW - 30 * DAY, NOW - DAY
+    ))
+    return {avm.to_address(STUDENT): record + hashlib.sha256(b"hunter2").digest() + cause}
+
+
+def vault_templates(asset=True):
+    values = {"TMPL_UNLOCK_TIME": NOW - DAY, "TMPL_BENEFICIARY": STUDENT}
+    if asset:
+        values["TMPL_ASSET_ID"] = CINR
+    return values
+
+
+def vault_global(asset=True):
+    state = {
+        b"owner": avm.to_address(CREATOR),
+        b"unlock_time": NOW - DAY,
+        b"beneficiary": avm.to_address(STUDENT),
+        b"amount": 2500
+    }
+    if asset:
+        state[b"asset_id"] = CINR
+    return state
+
+
+def factory_box(asset_id=0, amount=2500):
+    """Vault 1 of the vault factory (layout in vault_factory_contract.py)"""
+    record = avm.to_address(CREATOR) + avm.to_address(STUDENT) + b"".join(
+        value.to_bytes(8, "big") for value in (asset_id, NOW - DAY, amount)
+    )
+    return {(1).to_bytes(8, "big"): record}
+
+
+def crowdfunding_global(**overrides):
+    state = {
+        b"creator": avm.to_address(CREATOR),
+        b"goal": 1_000_000,
+        b"deadline": NOW + DAY,
+        b"asset": CINR,
+        b"total": 400
+    }
+    state.update({key.encode(): value for key, value in overrides.items()})
+    return state
+
+
+SCENARIOS = {
+    "simple_vault": {
+        "create": branch(lambda app: [avm.app_call(CREATOR, 0)], create=True),
+        "opt_in": branch(
+            lambda app: [avm.app_call(STUDENT, app, on_complete=1)],
+            local_state={STUDENT: {}}
+        ),
+        "deposit": branch(
+            lambda app: [avm.app_call(STUDENT, app, "deposit", 1000, NOW + DAY)],
+            local_state={STUDENT: {b"amount": 0}}, global_state=savings_global()
+        ),
+        "withdraw": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw")],
+            local_state={STUDENT: {b"owner": avm.to_address(STUDENT), b"amount": 1000, b"unlock": NOW - DAY}},
+            global_state=savings_global()
+        ),
+    },
+    "simple_vault_abi": {
+        "create": branch(lambda app: [avm.app_call(CREATOR, 0)], create=True),
+        "opt_in": branch(
+            lambda app: [avm.app_call(STUDENT, app, on_complete=1)],
+            local_state={STUDENT: {}}
+        ),
+        "deposit": branch(
+            lambda app: [avm.method_call(STUDENT, app, "deposit(uint64,uint64)uint64", 1000, NOW + DAY)],
+            local_state={STUDENT: {b"amount": 0}}, global_state=savings_global()
+        ),
+        "withdraw": branch(
+            lambda app: [avm.method_call(STUDENT, app, "withdraw()uint64")],
+            local_state={STUDENT: {b"owner": avm.to_address(STUDENT), b"amount": 1000, b"unlock": NOW - DAY}},
+            global_state=savings_global()
+        ),
+        "status": branch(
+            lambda app: [avm.method_call(STUDENT, app, "status()(uint64,uint64)")],
+            local_state={STUDENT: {b"owner": avm.to_address(STUDENT), b"amount": 1000, b"unlock": NOW + DAY}}
+        ),
+    },
+    "smart_savings": {
+        "create_app": branch(lambda app: [avm.app_call(CREATOR, 0)], create=True),
+        "opt_in": branch(
+            lambda app: [avm.app_call(STUDENT, app, on_complete=1)],
+            local_state={STUDENT: {}}
+        ),
+        "create": branch(
+            lambda app: [avm.app_call(STUDENT, app, "create", 10000, NOW + 30 * DAY, "laptop", "hunter2")],
+            local_state={STUDENT: {b"total": 0}}, global_state=savings_global()
+        ),
+        "deposit": branch(
+            lambda app: [avm.app_call(STUDENT, app, "deposit", 500)],
+            local_state=savings_local(), global_state=savings_global()
+        ),
+        "withdraw": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw")],
+            local_state=savings_local(), global_state=savings_global()
+        ),
+        "emergency": branch(
+            lambda app: [avm.app_call(STUDENT, app, "emergency", "hunter2")],
+            local_state=savings_local(unlock_time=NOW + DAY), global_state=savings_global()
+        ),
+    },
+    "smart_savings_abi": {
+        "create_app": branch(lambda app: [avm.app_call(CREATOR, 0)], create=True),
+        "opt_in": branch(
+            lambda app: [avm.app_call(STUDENT, app, on_complete=1)],
+            local_state={STUDENT: {}}
+        ),
+        "create": branch(
+            lambda app: [avm.method_call(
+                STUDENT, app, "create(uint64,uint64,string,string)void",
+                10000, NOW + 30 * DAY, "laptop", "hunter2"
+            )],
+            local_state={STUDENT: {b"total": 0}}, global_state=savings_global()
+        ),
+        "opt_in_create": branch(
+            lambda app: [avm.method_call(
+                STUDENT, app, "create(uint64,uint64,string,string)void",
+                10000, NOW + 30 * DAY, "laptop", "hunter2", on_complete=1
+            )],
+            local_state={STUDENT: {}}, global_state=savings_global()
+        ),
+        "deposit": branch(
+            lambda app: [avm.method_call(STUDENT, app, "deposit(uint64)uint64", 500)],
+            local_state=savings_local(), global_state=savings_global()
+        ),
+        "withdraw": branch(
+            lambda app: [avm.method_call(STUDENT, app, "withdraw()uint64")],
+            local_state=savings_local(), global_state=savings_global()
+        ),
+        "emergency": branch(
+            lambda app: [avm.method_call(STUDENT, app, "emergency(string)uint64", "hunter2")],
+            local_state=savings_local(unlock_time=NOW + DAY), global_state=savings_global()
+        ),
+    },
+    "smart_savings_box": {
+        "create_app": branch(lambda app: [avm.app_call(CREATOR, 0)], create=True),
+        "create": branch(
+            lambda app: [
+                avm.payment(STUDENT, avm.application_address(app), 2500 + 400 * (32 + 78)),
+                avm.app_call(STUDENT, app, "create", 10000, NOW + 30 * DAY, "laptop", "hunter2")
+            ],
+            index=1
+        ),
+        "deposit": branch(
+            lambda app: [avm.app_call(STUDENT, app, "deposit", 500)],
+            boxes=savings_box(), global_state=savings_global()
+        ),
+        "withdraw": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw")],
+            boxes=savings_box(), global_state=savings_global()
+        ),
+        "emergency": branch(
+            lambda app: [avm.app_call(STUDENT, app, "emergency", "hunter2")],
+            boxes=savings_box(unlock_time=NOW + DAY), global_state=savings_global()
+        ),
+        "close": branch(
+            lambda app: [avm.app_call(STUDENT, app, "close", Fee=2000)],
+            boxes=savings_box(total=0)
+        ),
+    },
+    "student_vault": {
+        "create": branch(
+            lambda app: [avm.app_call(CREATOR, 0)],
+            create=True, templates=vault_templates()
+        ),
+        "deposit": branch(
+            lambda app: [
+                avm.app_call(CREATOR, app, "deposit"),
+                avm.asset_transfer(CREATOR, avm.application_address(app), CINR, 2500)
+            ],
+            global_state=vault_global(), templates=vault_templates()
+        ),
+        "opt_in_asset": branch(
+            lambda app: [avm.app_call(CREATOR, app, "opt_in_asset", Assets=[CINR], Fee=2000)],
+            global_state=vault_global(), templates=vault_templates()
+        ),
+        "withdraw": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw", Assets=[CINR])],
+            global_state=vault_global(), templates=vault_templates()
+        ),
+    },
+    "algo_vault": {
+        "create": branch(
+            lambda app: [avm.app_call(CREATOR, 0)],
+            create=True, templates=vault_templates(asset=False)
+        ),
+        "deposit": branch(
+            lambda app: [
+                avm.app_call(CREATOR, app, "deposit"),
+                avm.payment(CREATOR, avm.application_address(app), 2500)
+            ],
+            global_state=vault_global(asset=False), templates=vault_templates(asset=False)
+        ),
+        "withdraw": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw")],
+            global_state=vault_global(asset=False), templates=vault_templates(asset=False)
+        ),
+    },
+    "vault_factory": {
+        "create_app": branch(lambda app: [avm.app_call(CREATOR, 0)], create=True),
+        "create": branch(
+            lambda app: [
+                avm.payment(CREATOR, avm.application_address(app), 40900),
+                avm.app_call(CREATOR, app, "create", avm.to_address(STUDENT), 0, NOW + DAY)
+            ],
+            global_state={b"vault_count": 0}, index=1
+        ),
+        "deposit": branch(
+            lambda app: [
+                avm.app_call(CREATOR, app, "deposit", 1),
+                avm.payment(CREATOR, avm.application_address(app), 2500)
+            ],
+            global_state={b"vault_count": 1}, boxes=factory_box()
+        ),
+        "deposit_asa": branch(
+            lambda app: [
+                avm.app_call(CREATOR, app, "deposit", 1),
+                avm.asset_transfer(CREATOR, avm.application_address(app), CINR, 2500)
+            ],
+            global_state={b"vault_count": 1}, boxes=factory_box(CINR)
+        ),
+        "withdraw": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw", 1, Fee=3000)],
+            global_state={b"vault_count": 1}, boxes=factory_box()
+        ),
+        "withdraw_asa": branch(
+            lambda app: [avm.app_call(STUDENT, app, "withdraw", 1, Assets=[CINR], Fee=3000)],
+            global_state={b"vault_count": 1}, boxes=factory_box(CINR)
+        ),
+    },
+    "crowdfunding": {
+        "create": branch(
+            lambda app: [avm.app_call(CREATOR, 0, avm.to_address(CREATOR), 1_000_000, NOW + DAY, CINR)],
+            create=True
+        ),
+        "opt_in": branch(
+            lambda app: [avm.app_call(DONORS[0], app, on_complete=1)],
+            global_state=crowdfunding_global(), local_state={DONORS[0]: {}}
+        ),
+        "opt_in_asset": branch(
+            lambda app: [avm.app_call(CREATOR, app, "opt_in_asset", Assets=[CINR], Fee=2000)],
+            global_state=crowdfunding_global()
+        ),
+        "donate": branch(
+            lambda app: [
+                avm.app_call(DONORS[0], app, "donate"),
+                avm.asset_transfer(DONORS[0], avm.application_address(app), CINR, 100)
+            ],
+            global_state=crowdfunding_global(), local_state={DONORS[0]: {b"donated": 300}}
+        ),
+        # Worst case: a full call of 4 donors, all owed a refund
+        "refund": branch(
+            lambda app: [avm.app_call(CREATOR, app, "refund", Accounts=DONORS, Assets=[CINR], Fee=5000)],
+            global_state=crowdfunding_global(deadline=NOW - DAY),
+            local_state={donor: {b"donated": 100} for donor in DONORS}
+        ),
+    },
+}
+
+# ==========================================
+# PROFILING
+# ==========================================
+
+def run_branch(name, teal, scenario):
+    """Evaluate one branch on a fresh ledger: (avm.Result, opcode budget)"""
+    templates = CONTRACTS[name].get("templates", {})
+    program = avm.assemble(fill_placeholders(teal, templates, scenario["templates"]) if templates else teal)
+    
+    ledger = avm.Ledger(timestamp=NOW)
+    app_id = ledger.create_app(CREATOR, scenario["global"])
+    ledger.apps[app_id].boxes.update(scenario["boxes"])
+    
+    # Everyone (the app escrow included) can pay and receive ALGO and CINR
+    for account in [CREATOR, STUDENT, *DONORS, avm.application_address(app_id)]:
+        ledger.fund(account, 10**9)
+        ledger.holdings[(avm.to_address(account), CINR)] = 10**9
+    for account, state in scenario["local"].items():
+        ledger.opt_in(account, app_id, state)
+    
+    group = scenario["group"](app_id)
+    budget = avm.BUDGET_PER_APP_CALL * sum(1 for t in group if t["TypeEnum"] == 6)
+    
+    result = avm.evaluate(program, group, scenario["index"], ledger, budget=budget,
+                          app_id=app_id if scenario["create"] else None)
+    return result, budget
+
+
+def profile_contract(name):
+    """Metrics of every branch of a contract"""
+    teal, _ = contract_teal(name)
+    branches = {}
+    
+    for branch_name, scenario in SCENARIOS[name].items():
+        result, budget = run_branch(name, teal, scenario)
+        
+        branches[branch_name] = {
+            "approved": result.approved,
+            "error": result.error,
+            "cost": result.cost,
+            "budget": budget,
+            "stack": result.max_stack,
+            "global_reads": result.count("global"),
+            "global_writes": result.count("global", writes=True),
+            "local_reads": result.count("local"),
+            "local_writes": result.count("local", writes=True),
+            "box_reads": result.count("box"),
+            "box_writes": result.count("box", writes=True),
+            "inner": len(result.inner_txns)
+        }
+    
+    return {"inputs": input_hash(name, CONTRACTS[name]), "branches": branches}
+
+
+# ==========================================
+# REPORT
+# ==========================================
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+def regressions(current, baseline):
+    """What got worse in a branch compared with its baseline"""
+    if baseline is None:
+        return []
+    
+    found = []
+    if baseline["approved"] and not current["approved"]:
+        found.append(f"no longer approves ({current['error']})")
+    
+    for metric in METRICS:
+        if current[metric] > baseline[metric]:
+            found.append(f"{metric} {baseline[metric]} -> {current[metric]}")
+    
+    return found
+
+
+def cell(current, baseline, metric):
+    value = current[metric]
+    if baseline is None or baseline[metric] == value:
+        return str(value)
+    return f"{value} ({value - baseline[metric]:+d})"
+
+
+def print_report(name, profile, baseline):
+    """Print a contract's branch table; returns the number of problems"""
+    problems = 0
+    changed = baseline is not None and baseline["inputs"] != profile["inputs"]
+    status = "changed since baseline" if changed else ("no baseline" if baseline is None else "unchanged")
+    
+    print(f"\n📊 {name} ({status})\n")
+    print(f"   {'branch':<12} {'cost':>12} {'stack':>8} {'global r/w':>11} {'local r/w':>10} {'box r/w':>8} {'inner':>6}")
+    
+    for branch_name, current in profile["branches"].items():
+        before = (baseline or {}).get("branches", {}).get(branch_name)
+        
+        cost = f"{cell(current, before, 'cost')}/{current['budget']}"
+        state = [
+            f"{current[f'{scope}_reads']}/{current[f'{scope}_writes']}"
+            for scope in ("global", "local", "box")
+        ]
+        print(
+            f"   {branch_name:<12} {cost:>12} {cell(current, before, 'stack'):>8} "
+            f"{state[0]:>11} {state[1]:>10} {state[2]:>8} {cell(current, before, 'inner'):>6}"
+        )
+        
+        issues = regressions(current, before)
+        if not current["approved"]:
+            issues.insert(0, f"rejected: {current['error']}")
+        if current["cost"] > current["budget"]:
+            issues.append("over the opcode budget")
+        
+        for issue in dict.fromkeys(issues):
+            print(f"      ⚠️  {issue}")
+        problems += len(issues)
+    
+    return problems
+
+
+def report(names=None, update=False):
+    """
+    Profile contracts and compare them with the baseline
+    
+    Returns:
+        Number of regressions found (0 when updating the baseline)
+    """
+    names = names or list(SCENARIOS)
+    baseline = load_baseline()
+    problems = 0
+    
+    for name in names:
+        profile = profile_contract(name)
+        problems += print_report(name, profile, baseline.get(name))
+        baseline[name] = profile
+    
+    if update:
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\n✅ Baseline updated: {BASELINE_PATH.name}\n")
+        return 0
+    
+    if problems:
+        print(f"\n❌ {problems} regression(s) - fix them or accept with --update\n")
+    else:
+        print("\n✅ No regressions\n")
+    
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile CampusMint approval programs")
+    parser.add_argument("contracts", nargs="*", help=f"contracts to profile (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--update", action="store_true", help="write the profile as the new baseline")
+    args = parser.parse_args()
+    
+    unknown = set(args.contracts) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown contract(s): {', '.join(sorted(unknown))}")
+    
+    sys.exit(1 if report(args.contracts, update=args.update) else 0)
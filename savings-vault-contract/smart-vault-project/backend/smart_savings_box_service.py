@@ -0,0 +1,382 @@
+"""
+Smart Savings Service (box storage)
+Backend for the box-storage Smart Savings contract
+(smart_savings_box_contract.py). Same calls as smart_savings_service.py,
+but each student's record is a box named by their address:
+- No opt-in: create_savings pays for the box and creates it in one group
+- close_savings deletes an emptied box and refunds its deposit
+"""
+
+from algosdk import account, encoding, logic
+from algosdk.v2client import algod
+from algosdk.transaction import (
+    ApplicationNoOpTxn,
+    PaymentTxn,
+    assign_group_id,
+    wait_for_confirmation
+)
+from smart_savings_service import (
+    load_config,
+    read_campus_totals,
+    timestamp_to_readable,
+    get_time_remaining
+)
+import base64
+import time
+
+# Box layout (see smart_savings_box_contract.py)
+CAUSE_OFFSET = 72
+MAX_CAUSE_LENGTH = 64
+
+
+def box_cost(cause):
+    """Minimum balance (microAlgos) of a savings box: 2500 + 400 * (name + size)"""
+    return 2500 + 400 * (32 + CAUSE_OFFSET + len(cause.encode()))
+
+
+def parse_record(value):
+    """Decode a savings box into its fields"""
+    fields = ["total", "goal", "unlock_time", "created_at", "last_deposit"]
+    record = {
+        name: int.from_bytes(value[i * 8:(i + 1) * 8], 'big')
+        for i, name in enumerate(fields)
+    }
+    record["emergency_hash"] = value[40:CAUSE_OFFSET]
+    record["cause"] = value[CAUSE_OFFSET:].decode()
+    return record
+
+
+class SmartSavingsService:
+    """Service for box-storage Smart Savings with HTLC emergency withdrawals"""
+    
+    def __init__(self):
+        config = load_config()
+        
+        self.client = algod.AlgodClient(
+            config['ALGOD_TOKEN'],
+            config['ALGOD_SERVER']
+        )
+        
+        self.asset_id = int(config['ASSET_ID'])
+        
+        if not config.get('SAVINGS_BOX_APP_ID'):
+            print("❌ ERROR: SAVINGS_BOX_APP_ID not set in .env!")
+            print("   Deploy savings contract first: python deploy_savings_box.py")
+            exit(1)
+        
+        self.app_id = int(config['SAVINGS_BOX_APP_ID'])
+        self.app_address = logic.get_application_address(self.app_id)
+        
+        print(f"✅ Smart Savings Service Initialized (box storage)")
+        print(f"   CINR Asset ID: {self.asset_id}")
+        print(f"   Savings App ID: {self.app_id}\n")
+    
+    
+    def _call(self, user_private_key, app_args, fee=None):
+        """Send one app call referencing the sender's savings box"""
+        user_address = account.address_from_private_key(user_private_key)
+        params = self.client.suggested_params()
+        
+        if fee is not None:
+            params.flat_fee = True
+            params.fee = fee
+        
+        txn = ApplicationNoOpTxn(
+            sender=user_address,
+            sp=params,
+            index=self.app_id,
+            app_args=app_args,
+            boxes=[(self.app_id, encoding.decode_address(user_address))]
+        )
+        
+        signed_txn = txn.sign(user_private_key)
+        tx_id = self.client.send_transaction(signed_txn)
+        wait_for_confirmation(self.client, tx_id, 4)
+        
+        return tx_id
+    
+    
+    def create_savings(
+        self,
+        user_private_key,
+        goal_amount,          # Total goal in rupees
+        goal_days,            # Days until goal
+        cause,                # What they're saving for
+        emergency_password    # Secret password for emergencies
+    ):
+        """Create a new savings box with emergency password (no opt-in)"""
+        
+        if len(cause.encode()) > MAX_CAUSE_LENGTH:
+            return {"success": False, "error": f"Cause longer than {MAX_CAUSE_LENGTH} bytes"}
+        
+        unlock_timestamp = int(time.time()) + (goal_days * 24 * 60 * 60)
+        unlock_date = timestamp_to_readable(unlock_timestamp)
+        deposit = box_cost(cause)
+        
+        print(f"\n💰 Creating Smart Savings Account")
+        print(f"=" * 60)
+        print(f"Goal Amount:       ₹{goal_amount:,.2f}")
+        print(f"Goal Period:       {goal_days} days")
+        print(f"Unlock Date:       {unlock_date}")
+        print(f"Saving For:        {cause}")
+        print(f"Emergency Setup:   Password protected (HTLC)")
+        print(f"Box Deposit:       {deposit / 1_000_000} ALGO (refunded on close)")
+        print(f"=" * 60 + "\n")
+        
+        user_address = account.address_from_private_key(user_private_key)
+        params = self.client.suggested_params()
+        
+        # Convert amounts
+        goal_units = int(goal_amount * 100)
+        
+        # Prepare app args
+        app_args = [
+            b"create",
+            goal_units.to_bytes(8, 'big'),
+            unlock_timestamp.to_bytes(8, 'big'),
+            cause.encode(),
+            emergency_password.encode()  # Contract will hash this
+        ]
+        
+        # Box payment + create call, sent atomically
+        pay_txn = PaymentTxn(
+            sender=user_address,
+            sp=params,
+            receiver=self.app_address,
+            amt=deposit
+        )
+        
+        call_txn = ApplicationNoOpTxn(
+            sender=user_address,
+            sp=params,
+            index=self.app_id,
+            app_args=app_args,
+            boxes=[(self.app_id, encoding.decode_address(user_address))]
+        )
+        
+        assign_group_id([pay_txn, call_txn])
+        
+        try:
+            tx_id = self.client.send_transactions([
+                pay_txn.sign(user_private_key),
+                call_txn.sign(user_private_key)
+            ])
+            wait_for_confirmation(self.client, tx_id, 4)
+        
+        except Exception as e:
+            print(f"❌ Create failed: {e}")
+            print(f"   (Each address can hold one savings account)\n")
+            return {"success": False, "error": str(e)}
+        
+        print(f"✅ Savings Account Created!")
+        print(f"   Transaction: {tx_id}")
+        print(f"   Goal: ₹{goal_amount:,.2f} by {unlock_date}")
+        print(f"   Emergency withdrawal: Available after 7 days\n")
+        
+        print(f"⚠️  IMPORTANT: Remember your emergency password!")
+        print(f"   You'll need it for emergency withdrawals\n")
+        
+        return {
+            "success": True,
+            "tx_id": tx_id,
+            "goal_amount": goal_amount,
+            "unlock_time": unlock_timestamp,
+            "box_deposit": deposit
+        }
+    
+    
+    def deposit(self, user_private_key, amount):
+        """Make a deposit to savings account"""
+        
+        print(f"\n💵 Adding ₹{amount:,.2f} to savings...")
+        
+        amount_units = int(amount * 100)
+        
+        tx_id = self._call(user_private_key, [
+            b"deposit",
+            amount_units.to_bytes(8, 'big')
+        ])
+        
+        print(f"✅ Deposit successful!")
+        print(f"   Added: ₹{amount:,.2f}")
+        print(f"   TX: {tx_id}\n")
+        
+        return {"success": True, "tx_id": tx_id, "amount": amount}
+    
+    
+    def withdraw(self, user_private_key):
+        """Normal withdrawal (after goal date)"""
+        
+        print("\n💸 Attempting Normal Withdrawal...")
+        print("   (Full amount, no penalty)\n")
+        
+        try:
+            tx_id = self._call(user_private_key, [b"withdraw"])
+            print(f"✅ Withdrawal Successful!")
+            print(f"   Full amount released (no penalty)")
+            print(f"   TX: {tx_id}\n")
+            
+            return {"success": True, "tx_id": tx_id, "penalty": 0}
+        
+        except Exception as e:
+            error_msg = str(e)
+            
+            if "assert" in error_msg.lower():
+                print(f"❌ Withdrawal Denied: Goal date not reached yet")
+                print(f"   Use emergency withdrawal if urgent\n")
+            else:
+                print(f"❌ Withdrawal failed: {e}\n")
+            
+            return {"success": False, "error": str(e)}
+    
+    
+    def emergency_withdraw(self, user_private_key, emergency_password):
+        """Emergency withdrawal with password (2% penalty)"""
+        
+        print("\n🚨 EMERGENCY WITHDRAWAL")
+        print("=" * 60)
+        print("⚠️  This will charge a 2% penalty")
+        print("⚠️  You get 98% of your savings")
+        print("⚠️  Must be at least 7 days since account creation")
+        print("=" * 60 + "\n")
+        
+        try:
+            tx_id = self._call(user_private_key, [
+                b"emergency",
+                emergency_password.encode()
+            ])
+            print(f"✅ Emergency Withdrawal Approved!")
+            print(f"   Password verified ✓")
+            print(f"   Penalty: 2%")
+            print(f"   TX: {tx_id}\n")
+            
+            return {"success": True, "tx_id": tx_id, "penalty": 2}
+        
+        except Exception as e:
+            error_msg = str(e).lower()
+            
+            if "assert" in error_msg or "logic eval error" in error_msg:
+                print(f"❌ Emergency Withdrawal Denied!")
+                print(f"   Reason: Incorrect password or conditions not met")
+                print(f"\n   Troubleshooting:")
+                print(f"   - Check if password is correct")
+                print(f"   - Account must be at least 7 days old\n")
+            else:
+                print(f"❌ Emergency withdrawal failed: {e}\n")
+            
+            return {"success": False, "error": str(e)}
+    
+    
+    def close_savings(self, user_private_key):
+        """Delete an emptied savings box and get its deposit back"""
+        
+        print("\n🧹 Closing savings account...")
+        
+        params = self.client.suggested_params()
+        
+        try:
+            # Covers the refund's inner payment too
+            tx_id = self._call(user_private_key, [b"close"], fee=2 * params.min_fee)
+            print(f"✅ Savings account closed, box deposit refunded")
+            print(f"   TX: {tx_id}\n")
+            
+            return {"success": True, "tx_id": tx_id}
+        
+        except Exception as e:
+            print(f"❌ Close failed: {e}")
+            print(f"   (Withdraw your savings first)\n")
+            return {"success": False, "error": str(e)}
+    
+    
+    def get_status(self, user_address):
+        """Get savings account status (one box read, no account lookup)"""
+        
+        try:
+            try:
+                response = self.client.application_box_by_name(
+                    self.app_id,
+                    encoding.decode_address(user_address)
+                )
+            except Exception:
+                print("\n📊 Savings Status: Not initialized")
+                print("   Create a savings account first\n")
+                return {"success": True, "initialized": False}
+            
+            savings_data = parse_record(base64.b64decode(response['value']))
+            
+            # Extract data
+            total_saved = savings_data['total'] / 100
+            goal_amount = savings_data['goal'] / 100
+            unlock_time = savings_data['unlock_time']
+            cause = savings_data['cause'] or "Unknown"
+            created_at = savings_data['created_at']
+            
+            # Calculate progress
+            progress = (total_saved / goal_amount * 100) if goal_amount > 0 else 0
+            
+            current_time = int(time.time())
+            can_withdraw = current_time >= unlock_time
+            days_since_creation = (current_time - created_at) // (24 * 60 * 60)
+            emergency_available = days_since_creation >= 7
+            
+            unlock_date = timestamp_to_readable(unlock_time)
+            time_remaining = get_time_remaining(unlock_time)
+            
+            # Display status
+            print("\n" + "="*60)
+            print("💰 SMART SAVINGS STATUS")
+            print("="*60)
+            print(f"Saving For:        {cause}")
+            print(f"Goal Amount:       ₹{goal_amount:,.2f}")
+            print(f"Saved So Far:      ₹{total_saved:,.2f}")
+            print(f"Progress:          {progress:.1f}%")
+            print(f"")
+            print(f"Unlock Date:       {unlock_date}")
+            print(f"Time Remaining:    {time_remaining}")
+            print(f"Status:            {'🔓 UNLOCKED' if can_withdraw else '🔒 LOCKED'}")
+            print(f"")
+            print(f"Account Age:       {days_since_creation} days")
+            print(f"Emergency Option:  {'✅ Available (2% penalty)' if emergency_available else '❌ Wait ' + str(7 - days_since_creation) + ' more days'}")
+            print("="*60 + "\n")
+            
+            return {
+                "success": True,
+                "initialized": True,
+                "total_saved": total_saved,
+                "goal_amount": goal_amount,
+                "progress": progress,
+                "unlock_time": unlock_time,
+                "can_withdraw": can_withdraw,
+                "emergency_available": emergency_available,
+                "days_since_creation": days_since_creation
+            }
+        
+        except Exception as e:
+            print(f"\n❌ Error: {e}\n")
+            return {"success": False, "error": str(e)}
+    
+    def get_campus_totals(self):
+        """Campus-wide totals kept in the app's global state (one read)"""
+        
+        try:
+            totals = read_campus_totals(self.client, self.app_id)
+            
+            print("\n" + "="*60)
+            print("🏫 CAMPUS SAVINGS")
+            print("="*60)
+            print(f"Total Locked:          ₹{totals['total_locked']:,.2f}")
+            print(f"Active Savers:         {totals['active_savers']}")
+            print(f"Emergency Withdrawals: {totals['emergency_withdrawals']}")
+            print(f"Penalties Collected:   ₹{totals['total_penalties']:,.2f}")
+            print("="*60 + "\n")
+            
+            return {"success": True, **totals}
+        
+        except Exception as e:
+            print(f"\n❌ Error: {e}\n")
+            return {"success": False, "error": str(e)}
+
+
+if __name__ == "__main__":
+    print("\n⚠️  This is the Smart Savings Service module (box storage)")
+    print("Deploy with 'python deploy_savings_box.py' first\n")
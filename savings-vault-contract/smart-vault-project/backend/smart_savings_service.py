@@ -13,7 +13,7 @@ from algosdk.transaction import (
 )
 from pathlib import Path
 from datetime import datetime
-import hashlib
+import base64
 import time
 
 # ==========================================
@@ -72,6 +72,25 @@ def get_time_remaining(unlock_timestamp):
     return ", ".join(parts)
 
 
+def read_campus_totals(client, app_id):
+    """
+    Campus-wide totals from the savings app's global state, which the
+    contract updates on every deposit and withdrawal (amounts in ₹)
+    """
+    state = client.application_info(app_id)['params'].get('global-state', [])
+    values = {
+        base64.b64decode(item['key']).decode(): item['value'].get('uint', 0)
+        for item in state
+    }
+    
+    return {
+        "total_locked": values.get('total_locked', 0) / 100,
+        "active_savers": values.get('active_savers', 0),
+        "emergency_withdrawals": values.get('emergency_count', 0),
+        "total_penalties": values.get('total_penalties', 0) / 100
+    }
+
+
 class SmartSavingsService:
     """Service for Smart Savings with HTLC emergency withdrawals"""
     
@@ -415,6 +434,27 @@ class SmartSavingsService:
         except Exception as e:
             print(f"\n❌ Error: {e}\n")
             return {"success": False, "error": str(e)}
+    
+    def get_campus_totals(self):
+        """Campus-wide totals kept in the app's global state (one read)"""
+        
+        try:
+            totals = read_campus_totals(self.client, self.app_id)
+            
+            print("\n" + "="*60)
+            print("🏫 CAMPUS SAVINGS")
+            print("="*60)
+            print(f"Total Locked:          ₹{totals['total_locked']:,.2f}")
+            print(f"Active Savers:         {totals['active_savers']}")
+            print(f"Emergency Withdrawals: {totals['emergency_withdrawals']}")
+            print(f"Penalties Collected:   ₹{totals['total_penalties']:,.2f}")
+            print("="*60 + "\n")
+            
+            return {"success": True, **totals}
+        
+        except Exception as e:
+            print(f"\n❌ Error: {e}\n")
+            return {"success": False, "error": str(e)}
 
 
 if __name__ == "__main__":
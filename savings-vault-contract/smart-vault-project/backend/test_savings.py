@@ -31,10 +31,11 @@ def main():
         print("║  4. Check savings status                                ║")
         print("║  5. Normal withdrawal (after goal date)                 ║")
         print("║  6. Emergency withdrawal (2% penalty)                   ║")
+        print("║  7. Campus-wide savings totals                          ║")
         print("║  0. Exit                                                ║")
         print("╚══════════════════════════════════════════════════════════╝")
         
-        choice = input("\nEnter choice (0-6): ")
+        choice = input("\nEnter choice (0-7): ")
         
         if choice == "0":
             print("\n👋 Goodbye!\n")
@@ -112,6 +113,10 @@ def main():
             
             input("\nPress Enter to continue...")
         
+        elif choice == "7":
+            savings.get_campus_totals()
+            input("Press Enter to continue...")
+        
         else:
             print("\n❌ Invalid choice\n")
 
@@ -0,0 +1,149 @@
+"""
+ARC-4 app clients
+
+Calls the ABI versions of the vault and savings contracts
+(simple_vault_abi.py, smart_savings_abi.py) through algosdk's
+AtomicTransactionComposer. Each call is generated from the contract's
+ARC-4 description, which build_contracts.py (repo root) writes into
+artifacts/<name>/contract.json: the SDK puts in the method selector,
+ABI-encodes the arguments and decodes the return value, so nothing is
+packed by hand and a signature change in the contract shows up here on
+the next build.
+
+Usage:
+    from abi_clients import SmartSavingsClient
+    savings = SmartSavingsClient(algod_client, app_id, private_key)
+    savings.create(goal, unlock_time, "laptop", "password", opt_in=True)
+    total = savings.deposit(500)
+"""
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    AtomicTransactionComposer,
+    TransactionWithSigner
+)
+from algosdk.transaction import ApplicationCreateTxn, ApplicationOptInTxn, OnComplete
+
+from contract_artifacts import load_contract
+
+
+class AppClient:
+    """Method calls to one deployed ARC-4 app, sent from one account"""
+    
+    contract_name = None
+    
+    def __init__(self, client, app_id, private_key):
+        self.client = client
+        self.app_id = app_id
+        self.sender = account.address_from_private_key(private_key)
+        self.signer = AccountTransactionSigner(private_key)
+        
+        contract = load_contract(self.contract_name)["abi"]
+        if contract is None:
+            raise ValueError(f"'{self.contract_name}' has no ARC-4 methods; rebuild it")
+        self.contract = contract
+    
+    @classmethod
+    def deploy(cls, client, private_key):
+        """Create the app from its built artifacts and return a client for it"""
+        artifacts = load_contract(cls.contract_name)
+        sender = account.address_from_private_key(private_key)
+        
+        txn = ApplicationCreateTxn(
+            sender=sender,
+            sp=client.suggested_params(),
+            on_complete=OnComplete.NoOpOC,
+            approval_program=artifacts["approval_program"],
+            clear_program=artifacts["clear_program"],
+            global_schema=artifacts["global_schema"],
+            local_schema=artifacts["local_schema"]
+        )
+        
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(TransactionWithSigner(txn, AccountTransactionSigner(private_key)))
+        result = atc.execute(client, 4)
+        
+        app_id = client.pending_transaction_info(result.tx_ids[0])["application-index"]
+        return cls(client, app_id, private_key)
+    
+    def compose(self, atc, method, *args, on_complete=OnComplete.NoOpOC, **fields):
+        """Add a method call to an atomic group being built"""
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=self.contract.get_method_by_name(method),
+            sender=self.sender,
+            sp=self.client.suggested_params(),
+            signer=self.signer,
+            method_args=list(args),
+            on_complete=on_complete,
+            **fields
+        )
+        return atc
+    
+    def call(self, method, *args, on_complete=OnComplete.NoOpOC, **fields):
+        """Send one method call and return its decoded return value"""
+        atc = self.compose(AtomicTransactionComposer(), method, *args, on_complete=on_complete, **fields)
+        result = atc.execute(self.client, 4)
+        return result.abi_results[0].return_value
+    
+    def read(self, method, *args, **fields):
+        """Return value of a call simulated by algod (nothing is sent)"""
+        atc = self.compose(AtomicTransactionComposer(), method, *args, **fields)
+        result = atc.simulate(self.client)
+        return result.abi_results[0].return_value
+    
+    def opt_in(self):
+        """Bare opt-in (no method)"""
+        txn = ApplicationOptInTxn(self.sender, self.client.suggested_params(), self.app_id)
+        
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(TransactionWithSigner(txn, self.signer))
+        return atc.execute(self.client, 4).tx_ids[0]
+
+
+def _on_complete(opt_in):
+    return OnComplete.OptInOC if opt_in else OnComplete.NoOpOC
+
+
+class SimpleVaultClient(AppClient):
+    """simple_vault_abi: per-user CINR time lock"""
+    
+    contract_name = "simple_vault_abi"
+    
+    def deposit(self, amount, unlock_time, opt_in=False):
+        """Lock amount until unlock_time (opt_in=True: first deposit, opts in too)"""
+        return self.call("deposit", amount, unlock_time, on_complete=_on_complete(opt_in))
+    
+    def withdraw(self):
+        """Amount released after unlock_time"""
+        return self.call("withdraw")
+    
+    def status(self):
+        """(amount, unlock_time) of the sender's vault"""
+        return tuple(self.read("status"))
+
+
+class SmartSavingsClient(AppClient):
+    """smart_savings_abi: goal-based savings with HTLC emergency withdrawal"""
+    
+    contract_name = "smart_savings_abi"
+    
+    def create(self, goal, unlock_time, cause, emergency_password, opt_in=False):
+        """Open the sender's savings (opt_in=True: opt in in the same call)"""
+        return self.call(
+            "create", goal, unlock_time, cause, emergency_password,
+            on_complete=_on_complete(opt_in)
+        )
+    
+    def deposit(self, amount):
+        """New total saved"""
+        return self.call("deposit", amount)
+    
+    def withdraw(self):
+        """Amount released after unlock_time"""
+        return self.call("withdraw")
+    
+    def emergency(self, password):
+        """Amount released before unlock_time, after the 2% penalty"""
+        return self.call("emergency", password)
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Contract artifacts
+
+The loader lives once, in contract_artifacts.py at the repo root (next
+to build_contracts.py). Deploy scripts run from this folder, so this
+module loads that file and re-exports it:
+
+    from contract_artifacts import load_contract
+"""
+
+import importlib.util
+from pathlib import Path
+
+
+def _load_shared():
+    for parent in Path(__file__).resolve().parents:
+        shared = parent / "contract_artifacts.py"
+        if (parent / "build_contracts.py").exists() and shared.exists():
+            spec = importlib.util.spec_from_file_location("campusmint_contract_artifacts", shared)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+    
+    raise FileNotFoundError("contract_artifacts.py not found next to build_contracts.py")
+
+
+_shared = _load_shared()
+
+artifacts_dir = _shared.artifacts_dir
+load_contract = _shared.load_contract
+patch_program = _shared.patch_program
@@ -6,11 +6,10 @@ from algosdk import account, mnemonic
 from algosdk.v2client import algod
 from algosdk.transaction import (
     ApplicationCreateTxn,
-    StateSchema,
     OnComplete,
     wait_for_confirmation
 )
-import base64
+from contract_artifacts import load_contract
 from pathlib import Path
 
 # ==========================================
@@ -83,47 +82,24 @@ def deploy_savings():
         return
     
     # Read contract files
-    print("📄 Reading contract files...")
+    print("📄 Loading contract artifacts...")
     
+    # Built by build_contracts.py at the repo root (no compile at deploy time)
     try:
-        with open("savings_approval.teal", "r") as f:
-            approval_teal = f.read()
-            print("   ✅ savings_approval.teal")
-        
-        with open("savings_clear.teal", "r") as f:
-            clear_teal = f.read()
-            print("   ✅ savings_clear.teal")
-    
-    except FileNotFoundError:
-        print("   ❌ Contract files not found!")
-        print("\n   Run this first: python smart_savings_contract.py")
-        return
-    
-    # Compile to bytecode
-    print("\n🔨 Compiling to bytecode...")
-    
-    approval_result = client.compile(approval_teal)
-    approval_program = base64.b64decode(approval_result['result'])
-    
-    clear_result = client.compile(clear_teal)
-    clear_program = base64.b64decode(clear_result['result'])
+        contract = load_contract("smart_savings")
+        print("   ✅ smart_savings")
     
-    print("   ✅ Compilation successful\n")
+    except FileNotFoundError as e:
+        print(f"   ❌ {e}")
+        return
     
-    # Define state schema
-    print("📊 Defining state schema...")
+    approval_program = contract["approval_program"]
+    clear_program = contract["clear_program"]
     
-    # Local schema: variables stored per user
-    local_schema = StateSchema(
-        num_uints=5,      # total, goal, unlock_time, created_at, last_deposit
-        num_byte_slices=3 # owner, cause, emergency_hash
-    )
+    print("📊 State schema (from contract.json)...")
     
-    # Global schema
-    global_schema = StateSchema(
-        num_uints=1,      # asset_id
-        num_byte_slices=0
-    )
+    local_schema = contract["local_schema"]
+    global_schema = contract["global_schema"]
     
     print(f"   Local: {local_schema.num_uints} integers, {local_schema.num_byte_slices} strings")
     print(f"   Global: {global_schema.num_uints} integers, {global_schema.num_byte_slices} strings\n")
@@ -0,0 +1,141 @@
+"""
+Deploy Smart Savings Contract (box storage) to Algorand Testnet
+"""
+
+from algosdk import account, mnemonic, logic
+from algosdk.v2client import algod
+from algosdk.transaction import (
+    ApplicationCreateTxn,
+    OnComplete,
+    PaymentTxn,
+    wait_for_confirmation
+)
+from contract_artifacts import load_contract
+from deploy_savings import load_config
+from pathlib import Path
+
+# The app account's own minimum balance; students pay for their boxes
+APP_ACCOUNT_FUNDING = 100_000
+
+
+def deploy_savings_box():
+    """Deploy box-storage Smart Savings contract to testnet"""
+    
+    print("\n" + "="*70)
+    print("🚀 DEPLOYING SMART SAVINGS CONTRACT (BOX STORAGE)")
+    print("="*70 + "\n")
+    
+    # Load config
+    config = load_config()
+    
+    # Connect to Algorand
+    print("📡 Connecting to Algorand testnet...")
+    
+    client = algod.AlgodClient(
+        config['ALGOD_TOKEN'],
+        config['ALGOD_SERVER']
+    )
+    
+    status = client.status()
+    print(f"✅ Connected!")
+    print(f"   Current round: {status['last-round']}\n")
+    
+    # Get creator account
+    print("👤 Loading creator account...")
+    
+    creator_private_key = mnemonic.to_private_key(config['CREATOR_MNEMONIC'])
+    creator_address = account.address_from_private_key(creator_private_key)
+    
+    print(f"   Address: {creator_address}\n")
+    
+    # Built by build_contracts.py at the repo root (no compile at deploy time)
+    print("📄 Loading contract artifacts...")
+    
+    try:
+        contract = load_contract("smart_savings_box")
+        print("   ✅ smart_savings_box\n")
+    
+    except FileNotFoundError as e:
+        print(f"   ❌ {e}")
+        return
+    
+    # Create the app (no global or local state)
+    print("📤 Creating application...")
+    
+    params = client.suggested_params()
+    
+    txn = ApplicationCreateTxn(
+        sender=creator_address,
+        sp=params,
+        on_complete=OnComplete.NoOpOC,
+        approval_program=contract["approval_program"],
+        clear_program=contract["clear_program"],
+        global_schema=contract["global_schema"],
+        local_schema=contract["local_schema"],
+    )
+    
+    tx_id = client.send_transaction(txn.sign(creator_private_key))
+    confirmed_txn = wait_for_confirmation(client, tx_id, 4)
+    app_id = confirmed_txn['application-index']
+    
+    print(f"   ✅ Application ID: {app_id}\n")
+    
+    # Boxes can only be created once the app account exists
+    print("💰 Funding app account...")
+    
+    app_address = logic.get_application_address(app_id)
+    
+    fund_txn = PaymentTxn(
+        sender=creator_address,
+        sp=client.suggested_params(),
+        receiver=app_address,
+        amt=APP_ACCOUNT_FUNDING
+    )
+    
+    tx_id = client.send_transaction(fund_txn.sign(creator_private_key))
+    wait_for_confirmation(client, tx_id, 4)
+    
+    print(f"   ✅ Sent {APP_ACCOUNT_FUNDING / 1_000_000} ALGO to {app_address}\n")
+    
+    # Update .env file
+    print("💾 Updating .env file...")
+    
+    env_path = Path(__file__).parent.parent / '.env'
+    if not env_path.exists():
+        env_path = Path.cwd() / '.env'
+    
+    with open(env_path, "r") as f:
+        env_content = f.read()
+    
+    # Update or add SAVINGS_BOX_APP_ID
+    if "SAVINGS_BOX_APP_ID=" in env_content:
+        lines = env_content.split('\n')
+        for i, line in enumerate(lines):
+            if line.startswith("SAVINGS_BOX_APP_ID="):
+                lines[i] = f"SAVINGS_BOX_APP_ID={app_id}"
+        env_content = '\n'.join(lines)
+    else:
+        env_content += f"\nSAVINGS_BOX_APP_ID={app_id}\n"
+    
+    with open(env_path, "w") as f:
+        f.write(env_content)
+    
+    print(f"   ✅ Added SAVINGS_BOX_APP_ID={app_id} to .env\n")
+    
+    print("="*70)
+    print("✨ DEPLOYMENT COMPLETE!")
+    print("="*70)
+    print("\nStudents don't opt in: smart_savings_box_service.SmartSavingsService")
+    print("creates each savings box with a payment + app call group.\n")
+    
+    return app_id
+
+
+if __name__ == "__main__":
+    try:
+        deploy_savings_box()
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        print()
\ No newline at end of file
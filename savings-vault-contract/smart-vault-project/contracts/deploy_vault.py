@@ -6,11 +6,10 @@ from algosdk import account, mnemonic
 from algosdk.v2client import algod
 from algosdk.transaction import (
     ApplicationCreateTxn,
-    StateSchema,
     OnComplete,
     wait_for_confirmation
 )
-import base64
+from contract_artifacts import load_contract
 import os
 import sys
 
@@ -68,48 +67,31 @@ def deploy_vault():
         return
     
     # ==========================================
-    # STEP 3: READ AND COMPILE CONTRACT
+    # STEP 3: LOAD CONTRACT ARTIFACTS
     # ==========================================
     
-    print("📄 Reading contract files...")
+    print("📄 Loading contract artifacts...")
     
-    # Read TEAL files
-    with open("vault_approval.teal", "r") as f:
-        approval_teal = f.read()
-        print("   ✅ vault_approval.teal")
-    
-    with open("vault_clear.teal", "r") as f:
-        clear_teal = f.read()
-        print("   ✅ vault_clear.teal")
-    
-    # Compile to bytecode
-    print("\n🔨 Compiling to bytecode...")
-    
-    approval_result = client.compile(approval_teal)
-    approval_program = base64.b64decode(approval_result['result'])
+    # Built by build_contracts.py at the repo root (no compile at deploy time)
+    try:
+        contract = load_contract("simple_vault")
+        print("   ✅ simple_vault")
     
-    clear_result = client.compile(clear_teal)
-    clear_program = base64.b64decode(clear_result['result'])
+    except FileNotFoundError as e:
+        print(f"   ❌ {e}")
+        return
     
-    print("   ✅ Compilation successful\n")
+    approval_program = contract["approval_program"]
+    clear_program = contract["clear_program"]
     
     # ==========================================
-    # STEP 4: DEFINE STATE SCHEMA
+    # STEP 4: STATE SCHEMA
     # ==========================================
     
-    print("📊 Defining state schema...")
-    
-    # Local schema: variables stored per user
-    local_schema = StateSchema(
-        num_uints=2,      # amount, unlock_time
-        num_byte_slices=1 # owner
-    )
+    print("📊 State schema (from contract.json)...")
     
-    # Global schema: variables shared by everyone
-    global_schema = StateSchema(
-        num_uints=1,      # asset_id
-        num_byte_slices=0
-    )
+    local_schema = contract["local_schema"]
+    global_schema = contract["global_schema"]
     
     print(f"   Local: {local_schema.num_uints} integers, {local_schema.num_byte_slices} strings")
     print(f"   Global: {global_schema.num_uints} integers, {global_schema.num_byte_slices} strings\n")
@@ -224,5 +206,5 @@ if __name__ == "__main__":
         print("\nTroubleshooting:")
         print("  1. Check .env file has CREATOR_MNEMONIC")
         print("  2. Ensure balance > 0.5 ALGO")
-        print("  3. Verify contract compiled (run simple_vault.py first)")
+        print("  3. Verify contract built (run build_contracts.py first)")
         print("\n")
\ No newline at end of file
@@ -7,11 +7,10 @@ from algosdk import account, mnemonic
 from algosdk.v2client import algod
 from algosdk.transaction import (
     ApplicationCreateTxn,
-    StateSchema,
     OnComplete,
     wait_for_confirmation
 )
-import base64
+from contract_artifacts import load_contract
 
 # ==========================================
 # CONFIGURATION (from your .env file)
@@ -73,61 +72,31 @@ def deploy_vault():
         return
     
     # ==========================================
-    # STEP 3: READ AND COMPILE CONTRACT
+    # STEP 3: LOAD CONTRACT ARTIFACTS
     # ==========================================
     
-    print("📄 Reading contract files...")
+    print("📄 Loading contract artifacts...")
     
+    # Built by build_contracts.py at the repo root (no compile at deploy time)
     try:
-        # Read TEAL files
-        with open("vault_approval.teal", "r") as f:
-            approval_teal = f.read()
-            print("   ✅ vault_approval.teal")
-        
-        with open("vault_clear.teal", "r") as f:
-            clear_teal = f.read()
-            print("   ✅ vault_clear.teal")
+        contract = load_contract("simple_vault")
+        print("   ✅ simple_vault")
     
     except FileNotFoundError as e:
-        print(f"   ❌ File not found: {e}")
-        print("\n   Make sure you:")
-        print("   1. Are in the contracts/ directory")
-        print("   2. Have run: python simple_vault.py")
+        print(f"   ❌ {e}")
         return
     
-    # Compile to bytecode
-    print("\n🔨 Compiling to bytecode...")
-    
-    try:
-        approval_result = client.compile(approval_teal)
-        approval_program = base64.b64decode(approval_result['result'])
-        
-        clear_result = client.compile(clear_teal)
-        clear_program = base64.b64decode(clear_result['result'])
-        
-        print("   ✅ Compilation successful\n")
-    
-    except Exception as e:
-        print(f"   ❌ Compilation failed: {e}")
-        return
+    approval_program = contract["approval_program"]
+    clear_program = contract["clear_program"]
     
     # ==========================================
-    # STEP 4: DEFINE STATE SCHEMA
+    # STEP 4: STATE SCHEMA
     # ==========================================
     
-    print("📊 Defining state schema...")
+    print("📊 State schema (from contract.json)...")
     
-    # Local schema: variables stored per user
-    local_schema = StateSchema(
-        num_uints=2,      # amount, unlock_time
-        num_byte_slices=1 # owner
-    )
-    
-    # Global schema: variables shared by everyone
-    global_schema = StateSchema(
-        num_uints=1,      # asset_id
-        num_byte_slices=0
-    )
+    local_schema = contract["local_schema"]
+    global_schema = contract["global_schema"]
     
     print(f"   Local: {local_schema.num_uints} integers, {local_schema.num_byte_slices} strings")
     print(f"   Global: {global_schema.num_uints} integers, {global_schema.num_byte_slices} strings\n")
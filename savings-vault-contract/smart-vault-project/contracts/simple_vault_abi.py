@@ -0,0 +1,167 @@
+"""
+Simple Smart Vault Contract - ARC-4 ABI VERSION
+Purpose: Lock CINR tokens until a specific date
+
+Same vault as simple_vault_fixed.py, but calls are ARC-4 methods:
+the first app arg is a 4-byte method selector instead of an operation
+name, arguments are ABI-encoded (uint64 = 8 bytes) and results come
+back as the call's return value. Clients build calls from the ARC-4
+description in artifacts/simple_vault_abi/contract.json (see
+abi_clients.py) instead of packing app args by hand.
+
+Methods:
+- deposit(uint64,uint64)uint64   lock an amount until unlock_time,
+                                 returns the amount locked
+- withdraw()uint64               after unlock_time, returns the
+                                 amount released
+- status()(uint64,uint64)        read-only: (amount, unlock_time)
+
+deposit can also be sent as the opt-in call (one transaction instead
+of opt-in + deposit). Campus-wide totals (total_locked, active_savers)
+live in global state.
+"""
+
+from pyteal import *
+
+# ==========================================
+# STATE VARIABLES
+# ==========================================
+
+# Local state (each user has their own)
+local_owner = Bytes("owner")          # Who owns this vault
+local_amount = Bytes("amount")        # How much CINR deposited
+local_unlock_time = Bytes("unlock")   # When it unlocks (Unix timestamp)
+
+# Global state (campus totals)
+global_total_locked = Bytes("total_locked")    # Sum of every vault's amount
+global_active_savers = Bytes("active_savers")  # Vaults with an amount > 0
+
+# ==========================================
+# CAMPUS TOTALS
+# ==========================================
+
+def update_totals(old_amount, new_amount):
+    """Move the campus totals from the sender's old amount to new_amount"""
+    return Seq([
+        App.globalPut(
+            global_total_locked,
+            App.globalGet(global_total_locked) + new_amount - old_amount
+        ),
+        App.globalPut(
+            global_active_savers,
+            App.globalGet(global_active_savers) + (new_amount > Int(0)) - (old_amount > Int(0))
+        )
+    ])
+
+
+def on_leave():
+    """Close-out / clear state: whatever was still locked leaves the totals"""
+    amount = App.localGet(Txn.sender(), local_amount)
+    return Seq([
+        If(amount > Int(0), update_totals(amount, Int(0))),
+        Approve()
+    ])
+
+# ==========================================
+# BARE CALLS (no method selector)
+# ==========================================
+
+router = Router(
+    "SimpleVault",
+    BareCallActions(
+        # App creation: campus totals start at 0
+        no_op=OnCompleteAction.create_only(Seq([
+            App.globalPut(global_total_locked, Int(0)),
+            App.globalPut(global_active_savers, Int(0)),
+            Approve()
+        ])),
+        
+        # Plain opt-in initializes the vault to 0
+        opt_in=OnCompleteAction.call_only(Seq([
+            App.localPut(Txn.sender(), local_amount, Int(0)),
+            Approve()
+        ])),
+        
+        # Users can always leave
+        close_out=OnCompleteAction.call_only(on_leave())
+    ),
+    "Per-user CINR time lock",
+    clear_state=on_leave()
+)
+
+# ==========================================
+# METHODS
+# ==========================================
+
+# The router checks selectors in the order methods are added, so the
+# frequent calls come first
+
+@router.method(no_op=CallConfig.CALL, opt_in=CallConfig.CALL)
+def deposit(amount: abi.Uint64, unlock_time: abi.Uint64, *, output: abi.Uint64) -> Expr:
+    """Lock an amount of CINR until unlock_time; returns the amount locked"""
+    return Seq([
+        update_totals(App.localGet(Txn.sender(), local_amount), amount.get()),
+        App.localPut(Txn.sender(), local_owner, Txn.sender()),
+        App.localPut(Txn.sender(), local_amount, amount.get()),
+        App.localPut(Txn.sender(), local_unlock_time, unlock_time.get()),
+        output.set(amount.get())
+    ])
+
+
+@router.method
+def withdraw(*, output: abi.Uint64) -> Expr:
+    """Release the vault after unlock_time; returns the amount released"""
+    return Seq([
+        # Verify sender owns this vault
+        Assert(Txn.sender() == App.localGet(Txn.sender(), local_owner)),
+        
+        # Verify time lock has expired
+        Assert(Global.latest_timestamp() >= App.localGet(Txn.sender(), local_unlock_time)),
+        
+        # (Actual token transfer happens in backend)
+        output.set(App.localGet(Txn.sender(), local_amount)),
+        App.localPut(Txn.sender(), local_amount, Int(0)),
+        update_totals(output.get(), Int(0))
+    ])
+
+
+@router.method
+def status(*, output: abi.Tuple2[abi.Uint64, abi.Uint64]) -> Expr:
+    """The sender's (amount, unlock_time)"""
+    amount = abi.Uint64()
+    unlock_time = abi.Uint64()
+    return Seq([
+        amount.set(App.localGet(Txn.sender(), local_amount)),
+        unlock_time.set(App.localGet(Txn.sender(), local_unlock_time)),
+        output.set(amount, unlock_time)
+    ])
+
+
+# ==========================================
+# COMPILE THE CONTRACT
+# ==========================================
+
+if __name__ == "__main__":
+    import json
+    
+    print("\n🔨 Compiling Smart Vault Contract (ABI)...\n")
+    
+    approval_teal, clear_teal, contract = router.compile_program(version=8)
+    
+    with open("vault_abi_approval.teal", "w") as f:
+        f.write(approval_teal)
+        print("✅ Created: vault_abi_approval.teal")
+    
+    with open("vault_abi_clear.teal", "w") as f:
+        f.write(clear_teal)
+        print("✅ Created: vault_abi_clear.teal")
+    
+    with open("vault_abi_contract.json", "w") as f:
+        json.dump(contract.dictify(), f, indent=2)
+        print("✅ Created: vault_abi_contract.json")
+    
+    print("\n🎉 Compilation successful!")
+    print("\nMethods:")
+    for method in contract.methods:
+        print(f"  - {method.get_signature()}")
+    print()
\ No newline at end of file
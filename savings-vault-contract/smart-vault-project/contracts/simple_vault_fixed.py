@@ -2,6 +2,7 @@
 Simple Smart Vault Contract - FIXED VERSION
 Purpose: Lock CINR tokens until a specific date
 Now handles deployment correctly
+Campus-wide totals live in global state (one application_info read)
 """
 
 from pyteal import *
@@ -23,6 +24,8 @@ def approval_program():
     
     # Global state (shared)
     global_asset_id = Bytes("asset_id")   # CINR token ID
+    global_total_locked = Bytes("total_locked")    # Sum of every vault's amount
+    global_active_savers = Bytes("active_savers")  # Vaults with an amount > 0
     
     # ==========================================
     # STEP 2: DEFINE OPERATIONS
@@ -36,11 +39,32 @@ def approval_program():
     # ==========================================
     
     on_creation = Seq([
-        # When app is created, just return success
-        # No initialization needed
+        # When app is created, campus totals start at 0
+        App.globalPut(global_total_locked, Int(0)),
+        App.globalPut(global_active_savers, Int(0)),
         Return(Int(1))
     ])
     
+    # ==========================================
+    # CAMPUS TOTALS
+    # ==========================================
+    
+    # Sender's amount before this call
+    old_amount = ScratchVar(TealType.uint64)
+    
+    def update_totals(new_amount):
+        """Move the campus totals from the sender's old amount to new_amount"""
+        return Seq([
+            App.globalPut(
+                global_total_locked,
+                App.globalGet(global_total_locked) + new_amount - old_amount.load()
+            ),
+            App.globalPut(
+                global_active_savers,
+                App.globalGet(global_active_savers) + (new_amount > Int(0)) - (old_amount.load() > Int(0))
+            )
+        ])
+    
     # ==========================================
     # HANDLE OPT-IN
     # ==========================================
@@ -64,6 +88,7 @@ def approval_program():
         # 2. Save how much they deposited
         # Txn.application_args[1] = amount from user
         # Btoi = convert Bytes to Integer
+        old_amount.store(App.localGet(Txn.sender(), local_amount)),
         App.localPut(
             Txn.sender(),
             local_amount,
@@ -78,7 +103,10 @@ def approval_program():
             Btoi(Txn.application_args[2])
         ),
         
-        # 4. Return success (1 = success, 0 = fail)
+        # 4. Update campus totals
+        update_totals(Btoi(Txn.application_args[1])),
+        
+        # 5. Return success (1 = success, 0 = fail)
         Return(Int(1))
     ])
     
@@ -104,8 +132,10 @@ def approval_program():
         # 3. If both checks pass, allow withdrawal
         # (Actual token transfer happens in backend)
         
-        # 4. Reset amount to 0
+        # 4. Reset amount to 0 and update campus totals
+        old_amount.store(App.localGet(Txn.sender(), local_amount)),
         App.localPut(Txn.sender(), local_amount, Int(0)),
+        update_totals(Int(0)),
         
         # 5. Return success
         Return(Int(1))
@@ -139,8 +169,23 @@ def clear_state_program():
     """
     Runs when user closes out of app
     We allow it (user can always leave)
+    Whatever was still locked leaves the campus totals
     """
-    return Return(Int(1))
+    amount = App.localGet(Txn.sender(), Bytes("amount"))
+    
+    return Seq([
+        If(amount > Int(0), Seq([
+            App.globalPut(
+                Bytes("total_locked"),
+                App.globalGet(Bytes("total_locked")) - amount
+            ),
+            App.globalPut(
+                Bytes("active_savers"),
+                App.globalGet(Bytes("active_savers")) - Int(1)
+            )
+        ])),
+        Return(Int(1))
+    ])
 
 
 # ==========================================
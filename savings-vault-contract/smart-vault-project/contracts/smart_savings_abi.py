@@ -0,0 +1,220 @@
+"""
+Smart Savings Contract with HTLC - ARC-4 ABI VERSION
+Features:
+- Multiple deposits over time
+- Time-locked withdrawals
+- Emergency withdrawal with password hash
+- 2% penalty on emergency withdrawals
+- 7-day minimum before emergency can be used
+- Campus-wide totals in global state (one application_info read)
+
+Same savings rules and local state as smart_savings_contract.py, but
+calls are ARC-4 methods: the first app arg is a 4-byte method selector
+instead of an operation name, uint64 args are 8 bytes and strings are
+length-prefixed, and results come back as the call's return value.
+Clients build calls from the ARC-4 description in
+artifacts/smart_savings_abi/contract.json (see abi_clients.py).
+
+Methods:
+- create(uint64,uint64,string,string)void   also accepted as the opt-in call
+- deposit(uint64)uint64                     returns the new total
+- withdraw()uint64                          returns the amount released
+- emergency(string)uint64                   returns the amount released
+                                            after the 2% penalty
+"""
+
+from pyteal import *
+
+# ==========================================
+# STATE VARIABLES
+# ==========================================
+
+# Local state (per user)
+local_owner = Bytes("owner")              # Account owner
+local_total = Bytes("total")              # Total saved (in CINR smallest units)
+local_goal = Bytes("goal")                # Savings goal
+local_unlock = Bytes("unlock_time")       # Normal unlock time
+local_cause = Bytes("cause")              # What they're saving for
+local_emg_hash = Bytes("emergency_hash")  # SHA256 hash of emergency password
+local_created = Bytes("created_at")       # When account was created
+local_last_deposit = Bytes("last_deposit") # Timestamp of last deposit
+
+# Global state (campus totals)
+global_total_locked = Bytes("total_locked")       # Sum of every user's total
+global_active_savers = Bytes("active_savers")     # Users with a total > 0
+global_emergency_count = Bytes("emergency_count") # Emergency withdrawals so far
+global_total_penalties = Bytes("total_penalties") # Sum of 2% emergency penalties
+
+# Verify sender owns this account
+is_owner = Txn.sender() == App.localGet(Txn.sender(), local_owner)
+
+# ==========================================
+# CAMPUS TOTALS
+# ==========================================
+
+def update_totals(old_total, new_total):
+    """Move the campus totals from the sender's old total to new_total"""
+    return Seq([
+        App.globalPut(
+            global_total_locked,
+            App.globalGet(global_total_locked) + new_total - old_total
+        ),
+        App.globalPut(
+            global_active_savers,
+            App.globalGet(global_active_savers) + (new_total > Int(0)) - (old_total > Int(0))
+        )
+    ])
+
+
+def on_leave():
+    """Close-out / clear state: whatever the user still had saved leaves the totals"""
+    total = App.localGet(Txn.sender(), local_total)
+    return Seq([
+        If(total > Int(0), update_totals(total, Int(0))),
+        Approve()
+    ])
+
+# ==========================================
+# BARE CALLS (no method selector)
+# ==========================================
+
+router = Router(
+    "SmartSavings",
+    BareCallActions(
+        # App creation: campus totals start at 0
+        no_op=OnCompleteAction.create_only(Seq([
+            App.globalPut(global_total_locked, Int(0)),
+            App.globalPut(global_active_savers, Int(0)),
+            App.globalPut(global_emergency_count, Int(0)),
+            App.globalPut(global_total_penalties, Int(0)),
+            Approve()
+        ])),
+        
+        # Plain opt-in initializes the user's savings to 0
+        opt_in=OnCompleteAction.call_only(Seq([
+            App.localPut(Txn.sender(), local_total, Int(0)),
+            Approve()
+        ])),
+        
+        # Users can always close out
+        close_out=OnCompleteAction.call_only(on_leave())
+    ),
+    "Goal-based savings with HTLC emergency withdrawal",
+    clear_state=on_leave()
+)
+
+# ==========================================
+# METHODS
+# ==========================================
+
+# The router checks selectors in the order methods are added, so the
+# frequent calls come first
+
+@router.method
+def deposit(amount: abi.Uint64, *, output: abi.Uint64) -> Expr:
+    """Add to the savings; returns the new total"""
+    old_total = ScratchVar(TealType.uint64)
+    return Seq([
+        Assert(is_owner),
+        old_total.store(App.localGet(Txn.sender(), local_total)),
+        output.set(old_total.load() + amount.get()),
+        App.localPut(Txn.sender(), local_total, output.get()),
+        App.localPut(Txn.sender(), local_last_deposit, Global.latest_timestamp()),
+        update_totals(old_total.load(), output.get())
+    ])
+
+
+@router.method
+def withdraw(*, output: abi.Uint64) -> Expr:
+    """Withdraw everything after unlock_time; returns the amount released"""
+    return Seq([
+        Assert(is_owner),
+        
+        # Verify time lock has expired
+        Assert(Global.latest_timestamp() >= App.localGet(Txn.sender(), local_unlock)),
+        
+        output.set(App.localGet(Txn.sender(), local_total)),
+        App.localPut(Txn.sender(), local_total, Int(0)),
+        update_totals(output.get(), Int(0))
+    ])
+
+
+@router.method
+def emergency(password: abi.String, *, output: abi.Uint64) -> Expr:
+    """
+    Withdraw before unlock_time with the emergency password (at least
+    7 days after create); returns the amount released after the 2% penalty
+    """
+    total = ScratchVar(TealType.uint64)
+    return Seq([
+        Assert(is_owner),
+        Assert(Sha256(password.get()) == App.localGet(Txn.sender(), local_emg_hash)),
+        
+        # 7 days = 604800 seconds
+        Assert(Global.latest_timestamp() >= App.localGet(Txn.sender(), local_created) + Int(604800)),
+        
+        # penalty = total / 50
+        total.store(App.localGet(Txn.sender(), local_total)),
+        output.set(total.load() - total.load() / Int(50)),
+        App.localPut(Txn.sender(), local_total, Int(0)),
+        update_totals(total.load(), Int(0)),
+        
+        App.globalPut(global_emergency_count, App.globalGet(global_emergency_count) + Int(1)),
+        App.globalPut(
+            global_total_penalties,
+            App.globalGet(global_total_penalties) + total.load() / Int(50)
+        )
+    ])
+
+
+@router.method(no_op=CallConfig.CALL, opt_in=CallConfig.CALL)
+def create(
+    goal: abi.Uint64,
+    unlock_time: abi.Uint64,
+    cause: abi.String,
+    emergency_password: abi.String
+) -> Expr:
+    """Open a savings account; the password is stored as its SHA256 hash"""
+    return Seq([
+        # Anything saved before is dropped from the campus totals
+        update_totals(App.localGet(Txn.sender(), local_total), Int(0)),
+        
+        App.localPut(Txn.sender(), local_owner, Txn.sender()),
+        App.localPut(Txn.sender(), local_total, Int(0)),
+        App.localPut(Txn.sender(), local_goal, goal.get()),
+        App.localPut(Txn.sender(), local_unlock, unlock_time.get()),
+        App.localPut(Txn.sender(), local_cause, cause.get()),
+        App.localPut(Txn.sender(), local_emg_hash, Sha256(emergency_password.get())),
+        App.localPut(Txn.sender(), local_created, Global.latest_timestamp()),
+        App.localPut(Txn.sender(), local_last_deposit, Int(0))
+    ])
+
+
+# ==========================================
+# COMPILE CONTRACT
+# ==========================================
+
+if __name__ == "__main__":
+    import json
+    
+    print("\n🔨 Compiling Smart Savings Contract (ABI)...\n")
+    
+    approval_teal, clear_teal, contract = router.compile_program(version=8)
+    
+    with open("savings_abi_approval.teal", "w") as f:
+        f.write(approval_teal)
+        print("✅ Created: savings_abi_approval.teal")
+    
+    with open("savings_abi_clear.teal", "w") as f:
+        f.write(clear_teal)
+        print("✅ Created: savings_abi_clear.teal")
+    
+    with open("savings_abi_contract.json", "w") as f:
+        json.dump(contract.dictify(), f, indent=2)
+        print("✅ Created: savings_abi_contract.json")
+    
+    print("\n🎉 Compilation successful!")
+    print("\nMethods:")
+    for method in contract.methods:
+        print(f"  - {method.get_signature()}")
+    print()
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Smart Savings Contract with HTLC (box storage)
+Same rules as smart_savings_contract.py, but each student's savings
+record lives in a box named by their address instead of local state:
+- No opt-in: create is one atomic group (box payment + app call)
+- The student pays the box's minimum balance and gets it back on close
+- Multiple deposits, time-locked withdrawals
+- Emergency withdrawal with password hash after 7 days
+- Campus-wide totals in global state (one application_info read)
+
+Box layout (name = 32-byte student address):
+    0   total           uint64
+    8   goal            uint64
+    16  unlock_time     uint64
+    24  created_at      uint64
+    32  last_deposit    uint64
+    40  emergency_hash  32 bytes (SHA256 of emergency password)
+    72  cause           up to 64 bytes
+
+Global state (campus totals):
+    total_locked     sum of every student's total
+    active_savers    students with a total > 0
+    emergency_count  emergency withdrawals so far
+    total_penalties  sum of 2% emergency penalties
+"""
+
+from pyteal import *
+
+# ==========================================
+# BOX LAYOUT
+# ==========================================
+
+TOTAL = 0
+GOAL = 8
+UNLOCK_TIME = 16
+CREATED_AT = 24
+LAST_DEPOSIT = 32
+EMERGENCY_HASH = 40
+CAUSE = 72
+
+MAX_CAUSE_LENGTH = 64
+
+# Box minimum balance: 2500 + 400 * (name length + box size) microAlgos
+BOX_FLAT_MBR = 2500
+BOX_BYTE_MBR = 400
+
+
+def box_mbr(size):
+    """Minimum balance a savings box of `size` bytes locks in the app account"""
+    return Int(BOX_FLAT_MBR) + Int(BOX_BYTE_MBR) * (Int(32) + size)
+
+
+def approval_program():
+    """
+    Smart Savings with HTLC emergency withdrawal, one box per student
+    """
+    
+    # ==========================================
+    # STATE
+    # ==========================================
+    
+    # The sender's own box: nobody can touch another student's record
+    record = Txn.sender()
+    
+    def get(offset):
+        return Btoi(App.box_extract(record, Int(offset), Int(8)))
+    
+    def put(offset, value):
+        return App.box_replace(record, Int(offset), Itob(value))
+    
+    global_total_locked = Bytes("total_locked")
+    global_active_savers = Bytes("active_savers")
+    global_emergency_count = Bytes("emergency_count")
+    global_total_penalties = Bytes("total_penalties")
+    
+    # Sender's total before this call
+    old_total = ScratchVar(TealType.uint64)
+    
+    def update_totals(new_total):
+        """Move the campus totals from the sender's old total to new_total"""
+        return Seq([
+            App.globalPut(
+                global_total_locked,
+                App.globalGet(global_total_locked) + new_total - old_total.load()
+            ),
+            App.globalPut(
+                global_active_savers,
+                App.globalGet(global_active_savers) + (new_total > Int(0)) - (old_total.load() > Int(0))
+            )
+        ])
+    
+    # ==========================================
+    # OPERATIONS
+    # ==========================================
+    
+    op_create = Bytes("create")
+    op_deposit = Bytes("deposit")
+    op_withdraw = Bytes("withdraw")
+    op_emergency = Bytes("emergency")
+    op_close = Bytes("close")
+    
+    # ==========================================
+    # HANDLE APP CREATION
+    # ==========================================
+    
+    on_creation = Seq([
+        # Campus totals start at 0
+        App.globalPut(global_total_locked, Int(0)),
+        App.globalPut(global_active_savers, Int(0)),
+        App.globalPut(global_emergency_count, Int(0)),
+        App.globalPut(global_total_penalties, Int(0)),
+        Return(Int(1))
+    ])
+    
+    # ==========================================
+    # OPERATION 1: CREATE SAVINGS ACCOUNT
+    # ==========================================
+    
+    cause = Txn.application_args[3]
+    record_size = Int(CAUSE) + Len(cause)
+    box_payment = Gtxn[Txn.group_index() - Int(1)]
+    
+    handle_create = Seq([
+        Assert(Len(cause) <= Int(MAX_CAUSE_LENGTH)),
+        
+        # The student pays for their own box in the same group
+        Assert(Txn.group_index() > Int(0)),
+        Assert(box_payment.type_enum() == TxnType.Payment),
+        Assert(box_payment.sender() == Txn.sender()),
+        Assert(box_payment.receiver() == Global.current_application_address()),
+        Assert(box_payment.amount() >= box_mbr(record_size)),
+        
+        # Fails if the student already has a savings box
+        # (total and last deposit start at 0)
+        Assert(App.box_create(record, record_size)),
+        
+        put(GOAL, Btoi(Txn.application_args[1])),
+        put(UNLOCK_TIME, Btoi(Txn.application_args[2])),
+        put(CREATED_AT, Global.latest_timestamp()),
+        
+        # Hash and save emergency password
+        App.box_replace(record, Int(EMERGENCY_HASH), Sha256(Txn.application_args[4])),
+        App.box_replace(record, Int(CAUSE), cause),
+        
+        Return(Int(1))
+    ])
+    
+    # ==========================================
+    # OPERATION 2: DEPOSIT (Multiple times)
+    # ==========================================
+    
+    handle_deposit = Seq([
+        # Reading the box fails if the sender has no savings account
+        old_total.store(get(TOTAL)),
+        put(TOTAL, old_total.load() + Btoi(Txn.application_args[1])),
+        put(LAST_DEPOSIT, Global.latest_timestamp()),
+        update_totals(old_total.load() + Btoi(Txn.application_args[1])),
+        
+        Return(Int(1))
+    ])
+    
+    # ==========================================
+    # OPERATION 3: NORMAL WITHDRAWAL
+    # ==========================================
+    
+    handle_withdraw = Seq([
+        # Verify time lock has expired
+        Assert(Global.latest_timestamp() >= get(UNLOCK_TIME)),
+        
+        # Reset total to 0 (withdrawal complete)
+        old_total.store(get(TOTAL)),
+        put(TOTAL, Int(0)),
+        update_totals(Int(0)),
+        
+        Return(Int(1))
+    ])
+    
+    # ==========================================
+    # OPERATION 4: EMERGENCY WITHDRAWAL (HTLC)
+    # ==========================================
+    
+    handle_emergency = Seq([
+        # User sends password, we hash and compare
+        Assert(
+            Sha256(Txn.application_args[1]) == App.box_extract(record, Int(EMERGENCY_HASH), Int(32))
+        ),
+        
+        # Verify minimum time has passed (7 days = 604800 seconds)
+        Assert(Global.latest_timestamp() >= get(CREATED_AT) + Int(604800)),
+        
+        # Reset total to 0 (emergency withdrawal complete)
+        old_total.store(get(TOTAL)),
+        put(TOTAL, Int(0)),
+        update_totals(Int(0)),
+        
+        # penalty = total / 50
+        App.globalPut(global_emergency_count, App.globalGet(global_emergency_count) + Int(1)),
+        App.globalPut(
+            global_total_penalties,
+            App.globalGet(global_total_penalties) + old_total.load() / Int(50)
+        ),
+        
+        Return(Int(1))
+    ])
+    
+    # ==========================================
+    # OPERATION 5: CLOSE (refund the box deposit)
+    # ==========================================
+    
+    record_length = App.box_length(record)
+    
+    handle_close = Seq([
+        # Only an emptied account can be closed
+        Assert(get(TOTAL) == Int(0)),
+        
+        record_length,
+        Assert(App.box_delete(record)),
+        
+        # Return the box minimum balance (fee paid by the caller)
+        InnerTxnBuilder.Execute({
+            TxnField.type_enum: TxnType.Payment,
+            TxnField.receiver: Txn.sender(),
+            TxnField.amount: box_mbr(record_length.value()),
+            TxnField.fee: Int(0)
+        }),
+        
+        Return(Int(1))
+    ])
+    
+    # ==========================================
+    # MAIN PROGRAM LOGIC
+    # ==========================================
+    
+    program = Cond(
+        # Handle app creation
+        [Txn.application_id() == Int(0), on_creation],
+        
+        # Handle operations (no opt-in, update or delete)
+        [Txn.on_completion() == OnComplete.NoOp,
+            Cond(
+                [Txn.application_args[0] == op_create, handle_create],
+                [Txn.application_args[0] == op_deposit, handle_deposit],
+                [Txn.application_args[0] == op_withdraw, handle_withdraw],
+                [Txn.application_args[0] == op_emergency, handle_emergency],
+                [Txn.application_args[0] == op_close, handle_close]
+            )
+        ]
+    )
+    
+    return program
+
+
+def clear_state_program():
+    """Nothing to clear: savings live in boxes, not local state"""
+    return Return(Int(1))
+
+
+# ==========================================
+# COMPILE CONTRACT
+# ==========================================
+
+if __name__ == "__main__":
+    print("\n🔨 Compiling Smart Savings Contract (box storage)...\n")
+    
+    # Compile approval program
+    approval_teal = compileTeal(
+        approval_program(),
+        mode=Mode.Application,
+        version=8
+    )
+    
+    # Compile clear state program
+    clear_teal = compileTeal(
+        clear_state_program(),
+        mode=Mode.Application,
+        version=8
+    )
+    
+    # Save to files
+    with open("savings_box_approval.teal", "w") as f:
+        f.write(approval_teal)
+        print("✅ Created: savings_box_approval.teal")
+    
+    with open("savings_box_clear.teal", "w") as f:
+        f.write(clear_teal)
+        print("✅ Created: savings_box_clear.teal")
+    
+    print("\n🎉 Compilation successful!")
+    print("\nFeatures:")
+    print("  ✅ No opt-in (one box per student)")
+    print("  ✅ Multiple deposits")
+    print("  ✅ Time-locked withdrawals")
+    print("  ✅ Emergency withdrawal with password")
+    print("  ✅ 7-day minimum before emergency")
+    print("  ✅ Box deposit refunded on close")
+    print("\nNext step: Deploy to testnet")
+    print("Run: python deploy_savings_box.py\n")
\ No newline at end of file
@@ -6,6 +6,7 @@ Features:
 - Emergency withdrawal with password hash
 - 2% penalty on emergency withdrawals
 - 7-day minimum before emergency can be used
+- Campus-wide totals in global state (one application_info read)
 """
 
 from pyteal import *
@@ -31,6 +32,10 @@ def approval_program():
     
     # Global state (shared)
     global_asset_id = Bytes("asset_id")       # CINR token ID
+    global_total_locked = Bytes("total_locked")       # Sum of every user's total
+    global_active_savers = Bytes("active_savers")     # Users with a total > 0
+    global_emergency_count = Bytes("emergency_count") # Emergency withdrawals so far
+    global_total_penalties = Bytes("total_penalties") # Sum of 2% emergency penalties
     
     # ==========================================
     # OPERATIONS
@@ -46,10 +51,34 @@ def approval_program():
     # ==========================================
     
     on_creation = Seq([
-        # Just return success on app creation
+        # Campus totals start at 0
+        App.globalPut(global_total_locked, Int(0)),
+        App.globalPut(global_active_savers, Int(0)),
+        App.globalPut(global_emergency_count, Int(0)),
+        App.globalPut(global_total_penalties, Int(0)),
         Return(Int(1))
     ])
     
+    # ==========================================
+    # CAMPUS TOTALS
+    # ==========================================
+    
+    # Sender's total before this call
+    old_total = ScratchVar(TealType.uint64)
+    
+    def update_totals(new_total):
+        """Move the campus totals from the sender's old total to new_total"""
+        return Seq([
+            App.globalPut(
+                global_total_locked,
+                App.globalGet(global_total_locked) + new_total - old_total.load()
+            ),
+            App.globalPut(
+                global_active_savers,
+                App.globalGet(global_active_savers) + (new_total > Int(0)) - (old_total.load() > Int(0))
+            )
+        ])
+    
     # ==========================================
     # HANDLE OPT-IN
     # ==========================================
@@ -67,6 +96,10 @@ def approval_program():
     handle_create = Seq([
         # When user creates savings account
         
+        # Anything saved before is dropped from the campus totals
+        old_total.store(App.localGet(Txn.sender(), local_total)),
+        update_totals(Int(0)),
+        
         # Save owner
         App.localPut(Txn.sender(), local_owner, Txn.sender()),
         
@@ -122,11 +155,13 @@ def approval_program():
         ),
         
         # Add to total saved
+        old_total.store(App.localGet(Txn.sender(), local_total)),
         App.localPut(
             Txn.sender(),
             local_total,
-            App.localGet(Txn.sender(), local_total) + Btoi(Txn.application_args[1])
+            old_total.load() + Btoi(Txn.application_args[1])
         ),
+        update_totals(old_total.load() + Btoi(Txn.application_args[1])),
         
         # Update last deposit time
         App.localPut(
@@ -154,7 +189,9 @@ def approval_program():
         ),
         
         # Reset total to 0 (withdrawal complete)
+        old_total.store(App.localGet(Txn.sender(), local_total)),
         App.localPut(Txn.sender(), local_total, Int(0)),
+        update_totals(Int(0)),
         
         Return(Int(1))
     ])
@@ -190,7 +227,15 @@ def approval_program():
         # Reset total to 0 (emergency withdrawal complete)
         # In full implementation, we'd transfer (total - penalty) to user
         # and penalty to charity address
+        old_total.store(App.localGet(Txn.sender(), local_total)),
         App.localPut(Txn.sender(), local_total, Int(0)),
+        update_totals(Int(0)),
+        
+        App.globalPut(global_emergency_count, App.globalGet(global_emergency_count) + Int(1)),
+        App.globalPut(
+            global_total_penalties,
+            App.globalGet(global_total_penalties) + old_total.load() / Int(50)
+        ),
         
         Return(Int(1))
     ])
@@ -221,8 +266,25 @@ def approval_program():
 
 
 def clear_state_program():
-    """Allow users to close out of app"""
-    return Return(Int(1))
+    """
+    Allow users to close out of app
+    Whatever they still had saved leaves the campus totals
+    """
+    total = App.localGet(Txn.sender(), Bytes("total"))
+    
+    return Seq([
+        If(total > Int(0), Seq([
+            App.globalPut(
+                Bytes("total_locked"),
+                App.globalGet(Bytes("total_locked")) - total
+            ),
+            App.globalPut(
+                Bytes("active_savers"),
+                App.globalGet(Bytes("active_savers")) - Int(1)
+            )
+        ])),
+        Return(Int(1))
+    ])
 
 
 # ==========================================
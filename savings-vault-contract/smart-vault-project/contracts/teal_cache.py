@@ -0,0 +1,168 @@
+"""
+TEAL compile cache
+
+algod's /compile is a network round trip on every deploy (and the
+public nodes rate-limit it). Compiled bytecode is cached on disk, keyed
+by the TEAL source hash and the node's compiler version, so a program
+is only sent to algod again when its source or the compiler changes.
+
+The compiler version is remembered per node in the cache directory, so
+a process whose programs are all cached (offline, or freshly started)
+never calls algod. It is checked against the node again on the first
+cache miss of a process, which has to reach algod anyway.
+
+Usage:
+    from teal_cache import compile_teal_file
+    approval_program = compile_teal_file(client, "vault_approval.teal")
+"""
+
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_DIR_NAME = ".teal_cache"
+VERSIONS_FILE = "compiler_versions.json"
+
+# Compiler version per node, and the nodes asked in this process
+_versions = {}
+_checked = set()
+
+
+def _write_json(path, data):
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2))
+    tmp_path.replace(path)
+
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def compiler_version(client, cache_dir=".", refresh=False):
+    """
+    Build version of the node's TEAL compiler
+    
+    Args:
+        client: algod client (only asked when the version is not known
+            yet, or on refresh)
+        cache_dir: Directory the .teal_cache folder lives in
+        refresh: Ask the node even if the version is remembered
+    
+    Returns:
+        Version string, e.g. "3.21.0-a1b2c3d4"
+    """
+    address = str(getattr(client, "algod_address", None))
+    versions_path = Path(cache_dir) / CACHE_DIR_NAME / VERSIONS_FILE
+    
+    if address not in _versions:
+        known = _read_json(versions_path).get(address)
+        if known:
+            _versions[address] = known
+    
+    if address in _versions and not (refresh and address not in _checked):
+        return _versions[address]
+    
+    build = client.versions()["build"]
+    version = (
+        f"{build['major']}.{build['minor']}.{build['build_number']}"
+        f"-{build['commit_hash']}"
+    )
+    _versions[address] = version
+    _checked.add(address)
+    
+    versions = _read_json(versions_path)
+    if versions.get(address) != version:
+        versions[address] = version
+        _write_json(versions_path, versions)
+    
+    return version
+
+
+def compile_teal(client, teal_source, cache_dir="."):
+    """
+    Bytecode for a TEAL program, from the cache when possible
+    
+    Args:
+        client: algod client (only used on a cache miss)
+        teal_source: TEAL program text
+        cache_dir: Directory the .teal_cache folder lives in
+    
+    Returns:
+        Program bytecode
+    """
+    entry = compile_teal_entry(client, teal_source, cache_dir)
+    return base64.b64decode(entry["result"])
+
+
+def compile_teal_entry(client, teal_source, cache_dir="."):
+    """
+    Cache entry for a TEAL program (compiling it on a miss)
+    
+    Returns:
+        Dict with the base64 bytecode ("result"), program hash
+        ("hash") and algod's pc-to-line source map ("sourcemap")
+    """
+    source_hash = hashlib.sha256(teal_source.encode()).hexdigest()
+    
+    version = compiler_version(client, cache_dir)
+    entry = _cached_entry(cache_dir, version, source_hash)
+    
+    if entry is None:
+        # A miss goes to algod anyway: make sure the compiler version is
+        # still the node's before compiling under it
+        checked = compiler_version(client, cache_dir, refresh=True)
+        if checked != version:
+            version = checked
+            entry = _cached_entry(cache_dir, version, source_hash)
+    
+    if entry is not None:
+        return entry
+    
+    result = client.compile(teal_source, source_map=True)
+    entry = {
+        "compiler_version": version,
+        "source_sha256": source_hash,
+        "hash": result["hash"],
+        "result": result["result"],
+        "sourcemap": result.get("sourcemap")
+    }
+    
+    _write_json(_entry_path(cache_dir, version, source_hash), entry)
+    
+    return entry
+
+
+def _entry_path(cache_dir, version, source_hash):
+    key = hashlib.sha256(f"{version}\n{source_hash}".encode()).hexdigest()
+    return Path(cache_dir) / CACHE_DIR_NAME / f"{key}.json"
+
+
+def _cached_entry(cache_dir, version, source_hash):
+    """Cache entry, or None if missing or unreadable (compiled again)"""
+    entry = _read_json(_entry_path(cache_dir, version, source_hash))
+    
+    if "result" in entry and "sourcemap" in entry:
+        return entry
+    
+    return None
+
+
+def compile_teal_file(client, teal_path):
+    """
+    Bytecode for a .teal file (cached next to the file)
+    
+    Args:
+        client: algod client
+        teal_path: Path to the .teal file
+    
+    Returns:
+        Program bytecode
+    """
+    teal_path = Path(teal_path)
+    return compile_teal(client, teal_path.read_text(), cache_dir=teal_path.parent)
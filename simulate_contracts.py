@@ -0,0 +1,713 @@
+"""
+Simulate CampusMint contract lifecycles on the local AVM
+
+Deploys the contracts onto an in-memory ledger (avm.Ledger) and plays
+randomised deposit / withdraw / emergency / refund scenarios against
+them. Time locks are passed by moving the ledger's clock instead of
+waiting for it, so the 1-minute vault demo takes microseconds here and
+thousands of runs finish in seconds.
+
+Every step checks that the contract allows what it must allow and
+refuses what it must refuse (early withdrawals, wrong passwords, other
+people's vaults...) and that ALGO only ever leaves the ledger as fees.
+
+Usage:
+    python simulate_contracts.py                       # 1000 runs of each scenario
+    python simulate_contracts.py algo_vault smart_savings
+    python simulate_contracts.py --runs 5000 --seed 7
+"""
+
+import argparse
+import hashlib
+import random
+import sys
+import time
+
+import avm
+from build_contracts import CONTRACTS, contract_teal, fill_placeholders, template_placeholder
+
+NOW = 1_700_000_000
+DAY = 86400
+ALGO = 1_000_000
+
+# Global counters of the savings / vault apps
+CAMPUS_TOTALS = ["total_locked", "active_savers", "emergency_count", "total_penalties"]
+
+
+class ScenarioError(AssertionError):
+    """The contract allowed something it must refuse (or the other way round)"""
+
+
+# ==========================================
+# SANDBOX
+# ==========================================
+
+# Assembled programs per contract, compiled from PyTeal once per process
+_programs = {}
+
+
+def contract_programs(name):
+    if name not in _programs:
+        approval, clear = contract_teal(name)
+        spec = CONTRACTS[name]
+        placeholders = {}
+        
+        # Compile templated contracts once with their placeholders, the
+        # way build_contracts.py does, and patch values in per vault
+        if spec.get("templates"):
+            approval = fill_placeholders(approval, spec["templates"])
+            placeholders = {n: template_placeholder(n, k) for n, k in spec["templates"].items()}
+        
+        _programs[name] = (avm.assemble(approval), avm.assemble(clear), placeholders)
+    
+    return _programs[name]
+
+
+def instantiate(program, placeholders, values):
+    """Copy of program with template placeholders replaced by real values"""
+    replace = {}
+    for name, placeholder in placeholders.items():
+        value = values[name]
+        replace[placeholder] = avm.to_address(value) if len(placeholder) == 32 else value.to_bytes(8, "big")
+    
+    instructions = [
+        avm.Instruction(i.op, tuple(replace.get(a, a) if isinstance(a, bytes) else a for a in i.args), i.line)
+        for i in program.instructions
+    ]
+    return avm.Program(instructions, program.labels, program.version, program.source)
+
+
+class Sandbox:
+    """A fresh ledger plus helpers to deploy contracts and send groups"""
+    
+    def __init__(self, rng):
+        self.rng = rng
+        self.ledger = avm.Ledger(timestamp=NOW)
+        self.accounts = 0
+        self.steps = 0
+    
+    def account(self, algos=100):
+        self.accounts += 1
+        address = hashlib.sha256(f"account{self.accounts}".encode()).digest()
+        self.ledger.fund(address, algos * ALGO)
+        return address
+    
+    def deploy(self, name, creator, template_values=None, args=()):
+        approval, clear, placeholders = contract_programs(name)
+        if placeholders:
+            approval = instantiate(approval, placeholders, template_values)
+        
+        schema = CONTRACTS[name]["interface"]["schema"]
+        result = self.expect(True, "create app", [avm.app_create(
+            creator, approval, clear,
+            global_schema=(schema["global"]["num_uints"], schema["global"]["num_byte_slices"]),
+            local_schema=(schema["local"]["num_uints"], schema["local"]["num_byte_slices"]),
+            args=args
+        )])
+        return result.results[0].app_id
+    
+    def expect(self, approved, what, group):
+        """Send a group and check it was approved (or refused)"""
+        before = sum(self.ledger.balances.values())
+        result = self.ledger.send(group)
+        self.steps += 1
+        
+        if result.approved != approved:
+            outcome = f"refused: {result.error}" if not result.approved else "approved"
+            raise ScenarioError(f"{what}: expected {'approval' if approved else 'refusal'}, got {outcome}")
+        
+        # ALGO only leaves the ledger as fees
+        fees = sum(t["Fee"] for t in group + result.inner_txns) if approved else 0
+        if sum(self.ledger.balances.values()) != before - fees:
+            raise ScenarioError(f"{what}: ALGO created or destroyed")
+        
+        return result
+    
+    def local(self, app_id, account, key):
+        return self.ledger.apps[app_id].local_state[account].get(key)
+    
+    def locals(self, app_id, key):
+        """`key` of every account opted in to the app"""
+        return [state.get(key, 0) for state in self.ledger.apps[app_id].local_state.values()]
+    
+    def check_totals(self, app_id, amounts, emergencies=0, penalties=0):
+        """The app's campus totals agree with every saver's own amount"""
+        state = self.ledger.apps[app_id].global_state
+        totals = {key: state.get(key.encode(), 0) for key in CAMPUS_TOTALS}
+        expected = {
+            "total_locked": sum(amounts),
+            "active_savers": sum(1 for amount in amounts if amount > 0),
+            "emergency_count": emergencies,
+            "total_penalties": penalties
+        }
+        for key in CAMPUS_TOTALS:
+            if totals[key] != expected[key]:
+                raise ScenarioError(f"{key} is {totals[key]}, expected {expected[key]}")
+    
+    def check(self, condition, message):
+        if not condition:
+            raise ScenarioError(message)
+
+
+# ==========================================
+# SCENARIOS
+# ==========================================
+
+def simple_vault(box):
+    rng = box.rng
+    student = box.account()
+    stranger = box.account()
+    other = box.account()
+    app = box.deploy("simple_vault", box.account())
+    
+    box.expect(True, "opt in", [avm.app_call(student, app, on_complete=1)])
+    box.expect(True, "opt in (other)", [avm.app_call(other, app, on_complete=1)])
+    box.expect(True, "deposit (other)", [avm.app_call(other, app, "deposit", rng.randint(1, 10**9), NOW + DAY)])
+    
+    amount = rng.randint(1, 10**9)
+    unlock = NOW + rng.randint(60, 365 * DAY)
+    box.expect(True, "deposit", [avm.app_call(student, app, "deposit", amount, unlock)])
+    box.check(box.local(app, student, b"amount") == amount, "deposit not recorded")
+    
+    # A new deposit replaces the old amount
+    amount = rng.randint(1, 10**9)
+    box.expect(True, "deposit again", [avm.app_call(student, app, "deposit", amount, unlock)])
+    box.check_totals(app, box.locals(app, b"amount"))
+    
+    box.expect(False, "withdraw before unlock", [avm.app_call(student, app, "withdraw")])
+    box.expect(False, "withdraw by a stranger", [avm.app_call(stranger, app, "withdraw")])
+    
+    box.ledger.set_time(unlock + rng.randint(0, DAY))
+    box.expect(True, "withdraw after unlock", [avm.app_call(student, app, "withdraw")])
+    box.check(box.local(app, student, b"amount") == 0, "withdraw did not reset the vault")
+    box.check_totals(app, box.locals(app, b"amount"))
+    
+    # Leaving with a locked amount takes it out of the totals
+    box.expect(True, "clear state (other)", [avm.app_call(other, app, on_complete=3)])
+    box.check_totals(app, box.locals(app, b"amount"))
+
+
+def smart_savings(box):
+    rng = box.rng
+    student = box.account()
+    other = box.account()
+    app = box.deploy("smart_savings", box.account())
+    
+    box.expect(True, "opt in", [avm.app_call(student, app, on_complete=1)])
+    
+    # Another saver keeps money in the app throughout
+    box.expect(True, "opt in (other)", [avm.app_call(other, app, on_complete=1)])
+    box.expect(True, "create savings (other)", [avm.app_call(other, app, "create", 10**6, NOW + DAY, "books", "pw")])
+    box.expect(True, "deposit (other)", [avm.app_call(other, app, "deposit", rng.randint(1, 10**5))])
+    
+    password = f"pw-{rng.random()}"
+    unlock = NOW + rng.randint(DAY, 90 * DAY)
+    box.expect(True, "create savings", [
+        avm.app_call(student, app, "create", rng.randint(1, 10**6), unlock, "laptop", password)
+    ])
+    
+    total = 0
+    for _ in range(rng.randint(1, 5)):
+        amount = rng.randint(1, 10**5)
+        total += amount
+        box.ledger.advance(rng.randint(1, DAY))
+        box.expect(True, "deposit", [avm.app_call(student, app, "deposit", amount)])
+    box.check(box.local(app, student, b"total") == total, "deposits not summed")
+    box.check_totals(app, box.locals(app, b"total"))
+    
+    emergencies = 0
+    if rng.random() < 0.5:
+        if box.ledger.timestamp < unlock:
+            box.expect(False, "withdraw before unlock", [avm.app_call(student, app, "withdraw")])
+        box.ledger.set_time(max(unlock, box.ledger.timestamp))
+        box.expect(True, "withdraw after unlock", [avm.app_call(student, app, "withdraw")])
+    else:
+        created = box.local(app, student, b"created_at")
+        if box.ledger.timestamp < created + 7 * DAY:
+            box.expect(False, "emergency within 7 days", [avm.app_call(student, app, "emergency", password)])
+        box.ledger.set_time(max(created + 7 * DAY, box.ledger.timestamp))
+        box.expect(False, "emergency with a wrong password", [avm.app_call(student, app, "emergency", "guess")])
+        box.expect(True, "emergency withdrawal", [avm.app_call(student, app, "emergency", password)])
+        emergencies = 1
+    
+    box.check(box.local(app, student, b"total") == 0, "withdrawal did not reset the savings")
+    box.check_totals(app, box.locals(app, b"total"), emergencies, emergencies * (total // 50))
+    
+    box.expect(True, "clear state (other)", [avm.app_call(other, app, on_complete=3)])
+    box.check_totals(app, box.locals(app, b"total"), emergencies, emergencies * (total // 50))
+
+
+def simple_vault_abi(box):
+    rng = box.rng
+    student = box.account()
+    stranger = box.account()
+    other = box.account()
+    app = box.deploy("simple_vault_abi", box.account())
+    
+    def call(account, signature, *args, **fields):
+        return avm.method_call(account, app, signature, *args, **fields)
+    
+    box.expect(True, "opt in + deposit (other)", [
+        call(other, "deposit(uint64,uint64)uint64", rng.randint(1, 10**9), NOW + DAY, on_complete=1)
+    ])
+    
+    # The first deposit doubles as the opt-in
+    amount = rng.randint(1, 10**9)
+    unlock = NOW + rng.randint(60, 365 * DAY)
+    result = box.expect(True, "opt in + deposit", [
+        call(student, "deposit(uint64,uint64)uint64", amount, unlock, on_complete=1)
+    ])
+    box.check(avm.method_return("deposit(uint64,uint64)uint64", result.results[0].logs) == amount,
+              "deposit returned the wrong amount")
+    
+    result = box.expect(True, "status", [call(student, "status()(uint64,uint64)")])
+    box.check(avm.method_return("status()(uint64,uint64)", result.results[0].logs) == [amount, unlock],
+              "status does not match the deposit")
+    box.check_totals(app, box.locals(app, b"amount"))
+    
+    box.expect(False, "unknown method", [call(student, "withdraw()void")])
+    box.expect(False, "withdraw before unlock", [call(student, "withdraw()uint64")])
+    box.expect(False, "withdraw by a stranger", [call(stranger, "withdraw()uint64")])
+    
+    box.ledger.set_time(unlock + rng.randint(0, DAY))
+    result = box.expect(True, "withdraw after unlock", [call(student, "withdraw()uint64")])
+    box.check(avm.method_return("withdraw()uint64", result.results[0].logs) == amount,
+              "withdraw returned the wrong amount")
+    box.check(box.local(app, student, b"amount") == 0, "withdraw did not reset the vault")
+    box.check_totals(app, box.locals(app, b"amount"))
+    
+    # Closing out with a locked amount takes it out of the totals
+    box.expect(True, "close out (other)", [avm.app_call(other, app, on_complete=2)])
+    box.check_totals(app, box.locals(app, b"amount"))
+
+
+def smart_savings_abi(box):
+    rng = box.rng
+    student = box.account()
+    other = box.account()
+    app = box.deploy("smart_savings_abi", box.account())
+    
+    def call(signature, *args, account=student, **fields):
+        return avm.method_call(account, app, signature, *args, **fields)
+    
+    # Another saver keeps money in the app throughout
+    box.expect(True, "opt in + create savings (other)", [call(
+        "create(uint64,uint64,string,string)void", 10**6, NOW + DAY, "books", "pw",
+        account=other, on_complete=1
+    )])
+    box.expect(True, "deposit (other)", [call("deposit(uint64)uint64", rng.randint(1, 10**5), account=other)])
+    
+    # Opt in and create in one call
+    password = f"pw-{rng.random()}"
+    unlock = NOW + rng.randint(DAY, 90 * DAY)
+    box.expect(True, "opt in + create savings", [call(
+        "create(uint64,uint64,string,string)void",
+        rng.randint(1, 10**6), unlock, "laptop", password, on_complete=1
+    )])
+    box.check(box.local(app, student, b"cause") == b"laptop", "cause not stored")
+    
+    total = 0
+    for _ in range(rng.randint(1, 5)):
+        amount = rng.randint(1, 10**5)
+        total += amount
+        box.ledger.advance(rng.randint(1, DAY))
+        result = box.expect(True, "deposit", [call("deposit(uint64)uint64", amount)])
+        box.check(avm.method_return("deposit(uint64)uint64", result.results[0].logs) == total,
+                  "deposit did not return the new total")
+    box.check_totals(app, box.locals(app, b"total"))
+    
+    emergencies = 0
+    if rng.random() < 0.5:
+        if box.ledger.timestamp < unlock:
+            box.expect(False, "withdraw before unlock", [call("withdraw()uint64")])
+        box.ledger.set_time(max(unlock, box.ledger.timestamp))
+        result = box.expect(True, "withdraw after unlock", [call("withdraw()uint64")])
+        released = avm.method_return("withdraw()uint64", result.results[0].logs)
+        box.check(released == total, "withdraw released the wrong amount")
+    else:
+        created = box.local(app, student, b"created_at")
+        if box.ledger.timestamp < created + 7 * DAY:
+            box.expect(False, "emergency within 7 days", [call("emergency(string)uint64", password)])
+        box.ledger.set_time(max(created + 7 * DAY, box.ledger.timestamp))
+        box.expect(False, "emergency with a wrong password", [call("emergency(string)uint64", "guess")])
+        result = box.expect(True, "emergency withdrawal", [call("emergency(string)uint64", password)])
+        released = avm.method_return("emergency(string)uint64", result.results[0].logs)
+        box.check(released == total - total // 50, "emergency did not take the 2% penalty")
+        emergencies = 1
+    
+    box.check(box.local(app, student, b"total") == 0, "withdrawal did not reset the savings")
+    box.check_totals(app, box.locals(app, b"total"), emergencies, emergencies * (total // 50))
+    
+    box.expect(True, "clear state (other)", [avm.app_call(other, app, on_complete=3)])
+    box.check_totals(app, box.locals(app, b"total"), emergencies, emergencies * (total // 50))
+
+
+def smart_savings_box(box):
+    rng = box.rng
+    student = box.account()
+    stranger = box.account()
+    app = box.deploy("smart_savings_box", box.account())
+    app_address = avm.application_address(app)
+    box.expect(True, "fund the app", [avm.payment(stranger, app_address, ALGO // 10)])
+    
+    cause = rng.choice(["laptop", "books", "semester fees abroad"])
+    box_mbr = 2500 + 400 * (32 + 72 + len(cause))
+    password = f"pw-{rng.random()}"
+    unlock = NOW + rng.randint(DAY, 90 * DAY)
+    
+    def create(payment, account=student):
+        return [
+            avm.payment(account, app_address, payment),
+            avm.app_call(account, app, "create", rng.randint(1, 10**6), unlock, cause, password)
+        ]
+    
+    def amounts():
+        return [int.from_bytes(record[0:8], "big") for record in box.ledger.apps[app].boxes.values()]
+    
+    # Another saver keeps money in the app throughout
+    box.expect(True, "create savings (stranger)", create(box_mbr, stranger))
+    box.expect(True, "deposit (stranger)", [avm.app_call(stranger, app, "deposit", rng.randint(1, 10**5))])
+    
+    # No opt-in: the box payment and the call are one group
+    box.expect(False, "create with too small a box payment", create(box_mbr - 1))
+    box.expect(False, "deposit without savings", [avm.app_call(student, app, "deposit", 1)])
+    box.expect(True, "create savings", create(box_mbr))
+    box.expect(False, "create twice", create(box_mbr))
+    
+    total = 0
+    for _ in range(rng.randint(1, 5)):
+        amount = rng.randint(1, 10**5)
+        total += amount
+        box.ledger.advance(rng.randint(1, DAY))
+        box.expect(True, "deposit", [avm.app_call(student, app, "deposit", amount)])
+    record = box.ledger.apps[app].boxes[student]
+    box.check(int.from_bytes(record[0:8], "big") == total, "deposits not summed")
+    box.check_totals(app, amounts())
+    box.expect(False, "close with savings left", [avm.app_call(student, app, "close", Fee=2000)])
+    
+    emergencies = 0
+    if rng.random() < 0.5:
+        if box.ledger.timestamp < unlock:
+            box.expect(False, "withdraw before unlock", [avm.app_call(student, app, "withdraw")])
+        box.ledger.set_time(max(unlock, box.ledger.timestamp))
+        box.expect(True, "withdraw after unlock", [avm.app_call(student, app, "withdraw")])
+    else:
+        created = int.from_bytes(record[24:32], "big")
+        if box.ledger.timestamp < created + 7 * DAY:
+            box.expect(False, "emergency within 7 days", [avm.app_call(student, app, "emergency", password)])
+        box.ledger.set_time(max(created + 7 * DAY, box.ledger.timestamp))
+        box.expect(False, "emergency with a wrong password", [avm.app_call(student, app, "emergency", "guess")])
+        box.expect(True, "emergency withdrawal", [avm.app_call(student, app, "emergency", password)])
+        emergencies = 1
+    
+    record = box.ledger.apps[app].boxes[student]
+    box.check(int.from_bytes(record[0:8], "big") == 0, "withdrawal did not reset the savings")
+    box.check_totals(app, amounts(), emergencies, emergencies * (total // 50))
+    
+    # Closing hands the box deposit back
+    before = box.ledger.balance(student)
+    box.expect(True, "close", [avm.app_call(student, app, "close", Fee=2000)])
+    box.check(box.ledger.balance(student) - before + 2000 == box_mbr, "box deposit not refunded")
+    box.check(student not in box.ledger.apps[app].boxes, "box not deleted")
+
+
+def _vault(box, name, asset):
+    rng = box.rng
+    creator = box.account()
+    student = box.account()
+    stranger = box.account()
+    
+    unlock = NOW + rng.choice([60, rng.randint(60, 365 * DAY)])
+    values = {"TMPL_UNLOCK_TIME": unlock, "TMPL_BENEFICIARY": student}
+    
+    if asset:
+        cinr = box.ledger.create_asset(creator, 10**12)
+        box.ledger.opt_in_asset(student, cinr)
+        values["TMPL_ASSET_ID"] = cinr
+    
+    app = box.deploy(name, creator, values)
+    app_address = avm.application_address(app)
+    box.expect(True, "fund the app", [avm.payment(creator, app_address, ALGO)])
+    
+    amount = rng.randint(1, 50 * ALGO)
+    if asset:
+        # Only the app can opt its escrow in (inner 0-amount transfer to itself)
+        transfer = avm.asset_transfer(creator, app_address, cinr, amount)
+        box.expect(False, "deposit before the escrow opts in", [avm.app_call(creator, app, "deposit"), transfer])
+        box.expect(True, "escrow opt in", [
+            avm.app_call(creator, app, "opt_in_asset", Assets=[cinr], Fee=2 * avm.MIN_TXN_FEE)
+        ])
+        box.expect(False, "deposit of another asset", [
+            avm.app_call(creator, app, "deposit"),
+            avm.asset_transfer(creator, app_address, cinr + 1, amount)
+        ])
+    else:
+        transfer = avm.payment(creator, app_address, amount)
+    
+    box.expect(True, "deposit", [avm.app_call(creator, app, "deposit"), transfer])
+    
+    withdraw = avm.app_call(student, app, "withdraw", Assets=[cinr] if asset else [])
+    box.expect(False, "withdraw before unlock", [withdraw])
+    
+    box.ledger.set_time(unlock)
+    box.expect(False, "withdraw by a stranger", [avm.app_call(stranger, app, "withdraw")])
+    
+    before = box.ledger.asset_balance(student, cinr) if asset else box.ledger.balance(student)
+    box.expect(True, "withdraw at unlock", [withdraw])
+    
+    if asset:
+        received = box.ledger.asset_balance(student, cinr) - before
+    else:
+        received = box.ledger.balance(student) - before + withdraw["Fee"]
+    box.check(received == amount, f"beneficiary received {received}, deposited {amount}")
+
+
+def student_vault(box):
+    _vault(box, "student_vault", asset=True)
+
+
+def algo_vault(box):
+    _vault(box, "algo_vault", asset=False)
+
+
+def vault_factory(box):
+    rng = box.rng
+    creator = box.account()
+    stranger = box.account()
+    cinr = box.ledger.create_asset(creator, 10**12)
+    
+    app = box.deploy("vault_factory", creator)
+    app_address = avm.application_address(app)
+    box.expect(True, "fund the app", [avm.payment(creator, app_address, ALGO // 10)])
+    
+    vault_mbr = 2500 + 400 * (8 + 88)
+    vaults = {}
+    
+    # Many vaults, one app: each is a payment + create call
+    for _ in range(rng.randint(1, 6)):
+        owner = box.account()
+        beneficiary = rng.choice([owner, box.account()])
+        asset = rng.choice([0, cinr])
+        unlock = NOW + rng.choice([60, rng.randint(60, 365 * DAY)])
+        first_of_asset = asset and box.ledger.asset_balance(app_address, cinr) is None
+        payment = vault_mbr + (100_000 if first_of_asset else 0)
+        
+        def create(amount):
+            return [
+                avm.payment(owner, app_address, amount),
+                avm.app_call(owner, app, "create", beneficiary, asset, unlock,
+                             Assets=[asset] if asset else [], Fee=2000)
+            ]
+        
+        box.expect(False, "create with too small a box payment", create(payment - 1))
+        result = box.expect(True, "create vault", create(payment))
+        vault_id = int.from_bytes(result.results[1].logs[0], "big")
+        box.check(vault_id == len(vaults) + 1, f"vault id {vault_id}, expected {len(vaults) + 1}")
+        
+        if asset:
+            box.ledger.opt_in_asset(beneficiary, cinr)
+            box.ledger.opt_in_asset(owner, cinr)
+            box.expect(True, "give the owner CINR", [avm.asset_transfer(creator, owner, cinr, 10**9)])
+        
+        vaults[vault_id] = {"owner": owner, "beneficiary": beneficiary, "asset": asset,
+                            "unlock": unlock, "amount": 0}
+    
+    # One payment must never count twice: credited to a vault and also
+    # paying for the next vault's box, or credited to two vaults
+    algo_vault = next((i for i, v in vaults.items() if not v["asset"]), None)
+    if algo_vault:
+        owner = vaults[algo_vault]["owner"]
+        payment = avm.payment(owner, app_address, vault_mbr + rng.randint(0, ALGO))
+        box.expect(False, "deposit whose payment also pays for a new vault", [
+            avm.app_call(owner, app, "deposit", algo_vault),
+            payment,
+            avm.app_call(owner, app, "create", owner, 0, NOW, Fee=2000)
+        ])
+        box.expect(False, "two deposits of one payment", [
+            avm.app_call(owner, app, "deposit", algo_vault),
+            payment,
+            avm.app_call(owner, app, "deposit", algo_vault, Note=b"again")
+        ])
+    
+    for vault_id, vault in vaults.items():
+        for _ in range(rng.randint(0, 3)):
+            amount = rng.randint(1, 10**6)
+            if vault["asset"]:
+                transfer = avm.asset_transfer(vault["owner"], app_address, cinr, amount)
+                wrong = avm.payment(vault["owner"], app_address, amount)
+            else:
+                transfer = avm.payment(vault["owner"], app_address, amount)
+                wrong = avm.asset_transfer(creator, app_address, cinr, amount)
+            
+            box.expect(False, "deposit of the wrong asset", [avm.app_call(vault["owner"], app, "deposit", vault_id), wrong])
+            box.expect(True, "deposit", [avm.app_call(vault["owner"], app, "deposit", vault_id), transfer])
+            vault["amount"] += amount
+    
+    box.ledger.set_time(max(v["unlock"] for v in vaults.values()) - rng.randint(0, 60))
+    
+    for vault_id, vault in vaults.items():
+        asset = vault["asset"]
+        withdraw = avm.app_call(vault["beneficiary"], app, "withdraw", vault_id,
+                                Assets=[asset] if asset else [], Fee=3000)
+        
+        if box.ledger.timestamp < vault["unlock"]:
+            box.expect(False, "withdraw before unlock", [withdraw])
+            continue
+        
+        box.expect(False, "withdraw by a stranger", [avm.app_call(stranger, app, "withdraw", vault_id, Fee=3000)])
+        
+        owner, beneficiary = vault["owner"], vault["beneficiary"]
+        algos = {owner: box.ledger.balance(owner), beneficiary: box.ledger.balance(beneficiary)}
+        tokens = box.ledger.asset_balance(beneficiary, cinr)
+        box.expect(True, "withdraw at unlock", [withdraw])
+        
+        # ALGO payouts and the box deposit refund (owner), less the call's fee
+        expected = {owner: 0, beneficiary: 0}
+        expected[beneficiary] += (0 if asset else vault["amount"]) - withdraw["Fee"]
+        expected[owner] += vault_mbr
+        for account, change in expected.items():
+            received = box.ledger.balance(account) - algos[account]
+            box.check(received == change, f"vault {vault_id}: ALGO balance moved {received}, expected {change}")
+        if asset:
+            received = box.ledger.asset_balance(beneficiary, cinr) - tokens
+            box.check(received == vault["amount"], f"vault {vault_id}: paid {received}, deposited {vault['amount']}")
+        
+        box.check(vault_id.to_bytes(8, "big") not in box.ledger.apps[app].boxes, "vault box not deleted")
+        box.expect(False, "withdraw twice", [withdraw])
+
+
+def crowdfunding(box):
+    rng = box.rng
+    creator = box.account()
+    cinr = box.ledger.create_asset(creator, 10**12)
+    
+    goal = rng.randint(10**4, 10**6)
+    deadline = NOW + rng.randint(DAY, 30 * DAY)
+    app = box.deploy("crowdfunding", creator, args=(creator, goal, deadline, cinr))
+    app_address = avm.application_address(app)
+    box.expect(True, "fund the app", [avm.payment(creator, app_address, ALGO)])
+    box.expect(True, "escrow opt in", [
+        avm.app_call(creator, app, "opt_in_asset", Assets=[cinr], Fee=2 * avm.MIN_TXN_FEE)
+    ])
+    
+    donated = {}
+    for _ in range(rng.randint(1, 8)):
+        donor = box.account()
+        amount = rng.randint(1, goal // 2)
+        box.ledger.opt_in_asset(donor, cinr)
+        box.expect(True, "give the donor CINR", [avm.asset_transfer(creator, donor, cinr, amount)])
+        box.expect(True, "donor opt in", [avm.app_call(donor, app, on_complete=1)])
+        box.expect(True, "donate", [
+            avm.app_call(donor, app, "donate"),
+            avm.asset_transfer(donor, app_address, cinr, amount)
+        ])
+        donated[donor] = amount
+    
+    donors = list(donated)
+    
+    # A donor who left CINR cannot be paid; the refund skips them
+    closed = rng.choice(donors) if rng.random() < 0.5 else None
+    if closed:
+        box.expect(True, "donor closes out of CINR", [
+            avm.asset_transfer(closed, creator, cinr, 0, AssetCloseTo=creator)
+        ])
+    
+    box.expect(False, "refund before the deadline", [
+        avm.app_call(creator, app, "refund", Accounts=donors[:4], Assets=[cinr], Fee=5000)
+    ])
+    
+    box.ledger.set_time(deadline)
+    failed = sum(donated.values()) < goal
+    
+    # Refund in calls of 4 donors, grouped like RefundService does
+    calls = [
+        avm.app_call(creator, app, "refund", Accounts=donors[i:i + 4], Assets=[cinr],
+                     Fee=avm.MIN_TXN_FEE * (1 + len(donors[i:i + 4])))
+        for i in range(0, len(donors), 4)
+    ]
+    box.expect(failed, "refund after the deadline", calls)
+    
+    if failed:
+        for donor, amount in donated.items():
+            if donor == closed:
+                box.check(box.ledger.asset_balance(donor, cinr) is None, "closed donor paid")
+                box.check(box.ledger.apps[app].local_state[avm.to_address(donor)][b"donated"] == amount,
+                          "closed donor's balance dropped")
+            else:
+                box.check(box.ledger.asset_balance(donor, cinr) == amount, "donor not refunded")
+        owed = donated[closed] if closed else 0
+        box.check(box.ledger.asset_balance(app_address, cinr) == owed, "escrow not emptied")
+
+
+SCENARIOS = {
+    "simple_vault": simple_vault,
+    "smart_savings": smart_savings,
+    "simple_vault_abi": simple_vault_abi,
+    "smart_savings_abi": smart_savings_abi,
+    "smart_savings_box": smart_savings_box,
+    "student_vault": student_vault,
+    "algo_vault": algo_vault,
+    "vault_factory": vault_factory,
+    "crowdfunding": crowdfunding,
+}
+
+# ==========================================
+# RUN
+# ==========================================
+
+def simulate(names=None, runs=1000, seed=None):
+    """
+    Run every scenario `runs` times
+    
+    Returns:
+        Number of failed runs
+    """
+    names = names or list(SCENARIOS)
+    seed = random.randrange(2**32) if seed is None else seed
+    failures = 0
+    
+    print(f"\n🧪 Simulating {runs} run(s) per scenario (seed {seed})\n")
+    
+    for name in names:
+        contract_programs(name)    # compile outside of the timing
+        rng = random.Random(f"{seed}:{name}")
+        errors = []
+        steps = 0
+        
+        started = time.perf_counter()
+        for run in range(runs):
+            box = Sandbox(rng)
+            try:
+                SCENARIOS[name](box)
+            except ScenarioError as e:
+                errors.append(f"run {run}: {e}")
+            steps += box.steps
+        seconds = time.perf_counter() - started
+        
+        icon = "❌" if errors else "✅"
+        print(f"   {icon} {name}: {runs} runs, {steps} groups in {seconds:.2f}s ({runs / seconds:,.0f} runs/s)")
+        for error in errors[:5]:
+            print(f"      ⚠️  {error}")
+        
+        failures += len(errors)
+    
+    if failures:
+        print(f"\n❌ {failures} failed run(s) - reproduce with --seed {seed}\n")
+    else:
+        print("\n✅ All scenarios passed\n")
+    
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate CampusMint contracts on the local AVM")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--runs", type=int, default=1000, help="runs per scenario (default: 1000)")
+    parser.add_argument("--seed", type=int, help="random seed, to replay a failing run")
+    args = parser.parse_args()
+    
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    
+    sys.exit(1 if simulate(args.scenarios, runs=args.runs, seed=args.seed) else 0)
@@ -1,5 +1,5 @@
 from algosdk.v2client import algod
-from algosdk import transaction
+from algosdk import encoding, transaction
 from algosdk.transaction import ApplicationCallTxn, PaymentTxn, wait_for_confirmation
 import base64
 import json
@@ -37,7 +37,8 @@ def check_vault_state():
         if value['type'] == 1:
             if key == "beneficiary":
                 addr_bytes = base64.b64decode(value['bytes'])
-                addr = addr_bytes.decode('utf-8')
+                # Raw 32-byte address since vaults are templated; older vaults stored the string
+                addr = encoding.encode_address(addr_bytes) if len(addr_bytes) == 32 else addr_bytes.decode('utf-8')
                 print(f"  {key}: {addr}")
             else:
                 print(f"  {key}: (set)")
@@ -1,8 +1,7 @@
-from pyteal import *
 from algosdk.v2client import algod
 from algosdk import account, transaction
-from algosdk.transaction import ApplicationCreateTxn, StateSchema, OnComplete, wait_for_confirmation
-import base64
+from algosdk.transaction import ApplicationCreateTxn, OnComplete, wait_for_confirmation
+from contract_artifacts import load_contract
 import time
 import json
 
@@ -19,73 +18,23 @@ student_address = wallet["address"]
 
 algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
 
-# ===== PURE ALGO VAULT - NO ASSETS =====
-def vault_approval_program():
-    owner_key = Bytes("owner")
-    unlock_time_key = Bytes("unlock_time")
-    amount_key = Bytes("amount")
-    beneficiary_key = Bytes("beneficiary")
-    
-    on_creation = Seq([
-        App.globalPut(owner_key, Txn.sender()),
-        App.globalPut(unlock_time_key, Btoi(Txn.application_args[0])),
-        App.globalPut(beneficiary_key, Txn.application_args[1]),
-        App.globalPut(amount_key, Int(0)),
-        Approve()
-    ])
-    
-    on_deposit = Seq([
-        Assert(Global.group_size() == Int(2)),
-        Assert(Gtxn[1].type_enum() == TxnType.Payment),
-        Assert(Gtxn[1].receiver() == Global.current_application_address()),
-        App.globalPut(amount_key, App.globalGet(amount_key) + Gtxn[1].amount()),
-        Approve()
-    ])
-    
-    on_withdraw = Seq([
-        Assert(Txn.sender() == App.globalGet(beneficiary_key)),
-        Assert(Global.latest_timestamp() >= App.globalGet(unlock_time_key)),
-        InnerTxnBuilder.Begin(),
-        InnerTxnBuilder.SetFields({
-            TxnField.type_enum: TxnType.Payment,
-            TxnField.receiver: App.globalGet(beneficiary_key),
-            TxnField.amount: App.globalGet(amount_key),
-        }),
-        InnerTxnBuilder.Submit(),
-        App.globalPut(amount_key, Int(0)),
-        Approve()
-    ])
-    
-    program = Cond(
-        [Txn.application_id() == Int(0), on_creation],
-        [Txn.application_args[0] == Bytes("deposit"), on_deposit],
-        [Txn.application_args[0] == Bytes("withdraw"), on_withdraw]
-    )
-    
-    return program
-
-def vault_clear_program():
-    return Approve()
-
-# Compile
-approval_program_compiled = compileTeal(vault_approval_program(), mode=Mode.Application, version=6)
-clear_program_compiled = compileTeal(vault_clear_program(), mode=Mode.Application, version=6)
-
-# Compile using algod
-approval_result = algod_client.compile(approval_program_compiled)
-clear_result = algod_client.compile(clear_program_compiled)
-
-approval_program = base64.b64decode(approval_result['result'])
-clear_program = base64.b64decode(clear_result['result'])
-
-# State schema - 2 uints (amount, unlock_time), 2 byte slices (owner, beneficiary)
-global_schema = StateSchema(num_uints=2, num_byte_slices=2)
-local_schema = StateSchema(num_uints=0, num_byte_slices=0)
-
 # Deploy with 1 minute lock
 unlock_time = int(time.time()) + 60
 beneficiary = student_address
 
+# ALGO VAULT - built once by build_contracts.py (vault_contract.py);
+# this vault's constants are patched into the bytecode, nothing is compiled
+vault = load_contract("algo_vault", {
+    "TMPL_UNLOCK_TIME": unlock_time,
+    "TMPL_BENEFICIARY": beneficiary
+})
+approval_program = vault["approval_program"]
+clear_program = vault["clear_program"]
+
+# State schema
+global_schema = vault["global_schema"]
+local_schema = vault["local_schema"]
+
 params = algod_client.suggested_params()
 
 txn = ApplicationCreateTxn(
@@ -95,11 +44,7 @@ txn = ApplicationCreateTxn(
     approval_program=approval_program,
     clear_program=clear_program,
     global_schema=global_schema,
-    local_schema=local_schema,
-    app_args=[
-        unlock_time.to_bytes(8, 'big'),
-        beneficiary
-    ]
+    local_schema=local_schema
 )
 
 signed_txn = txn.sign(PRIVATE_KEY)
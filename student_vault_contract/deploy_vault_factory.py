@@ -0,0 +1,63 @@
+from algosdk.v2client import algod
+from algosdk import transaction
+from algosdk.transaction import ApplicationCreateTxn, OnComplete, PaymentTxn, wait_for_confirmation
+from contract_artifacts import load_contract
+import json
+
+# Testnet connection
+ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
+ALGOD_TOKEN = ""
+
+# ===== LOAD PYTHON WALLET =====
+with open("python_wallet.json", "r") as f:
+    wallet = json.load(f)
+
+PRIVATE_KEY = wallet["private_key"]
+student_address = wallet["address"]
+
+algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+
+# VAULT FACTORY - deployed ONCE; every vault after this is a box in it
+# (factory_vault.py creates them), no more app per vault to clean up
+factory = load_contract("vault_factory")
+
+params = algod_client.suggested_params()
+
+txn = ApplicationCreateTxn(
+    sender=student_address,
+    sp=params,
+    on_complete=OnComplete.NoOpOC,
+    approval_program=factory["approval_program"],
+    clear_program=factory["clear_program"],
+    global_schema=factory["global_schema"],
+    local_schema=factory["local_schema"]
+)
+
+signed_txn = txn.sign(PRIVATE_KEY)
+txid = algod_client.send_transaction(signed_txn)
+print(f"Transaction ID: {txid}")
+
+wait_for_confirmation(algod_client, txid, 4)
+txn_info = algod_client.pending_transaction_info(txid)
+app_id = txn_info['application-index']
+app_address = transaction.logic.get_application_address(app_id)
+
+# The factory account's own minimum balance (vault creators pay for their boxes)
+fund_txn = PaymentTxn(
+    sender=student_address,
+    sp=algod_client.suggested_params(),
+    receiver=app_address,
+    amt=100_000
+)
+txid = algod_client.send_transaction(fund_txn.sign(PRIVATE_KEY))
+wait_for_confirmation(algod_client, txid, 4)
+
+print(f"\n✅ Vault Factory Deployed!")
+print(f"App ID: {app_id}")
+print(f"View: https://testnet.algoexplorer.io/application/{app_id}")
+print(f"App Address: {app_address}")
+
+print("\n⚠️ SAVE THESE:")
+print(f"VAULT_FACTORY_APP_ID = {app_id}")
+print(f"VAULT_FACTORY_APP_ADDRESS = {app_address}")
+print("(backend: set VAULT_FACTORY_APP_ID in .env to index vaults by owner)")
\ No newline at end of file
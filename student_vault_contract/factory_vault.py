@@ -0,0 +1,167 @@
+"""
+Factory vaults
+
+Time-locked vaults hosted by the vault factory app (vault_factory_contract.py,
+deployed once with deploy_vault_factory.py). Creating a vault is one
+payment + app call group instead of a deploy, a fund and an opt-in, and
+withdrawing deletes its box, so nothing is left for cleanup.py.
+
+Usage:
+    python factory_vault.py          # 1-minute ALGO vault demo
+"""
+
+from algosdk.v2client import algod
+from algosdk import account, encoding, transaction
+from algosdk.transaction import (
+    ApplicationNoOpTxn,
+    AssetTransferTxn,
+    PaymentTxn,
+    assign_group_id,
+    wait_for_confirmation
+)
+import base64
+import json
+import time
+
+ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
+ALGOD_TOKEN = ""
+
+VAULT_FACTORY_APP_ID = 0  # from deploy_vault_factory.py
+
+# Box deposit per vault: 2500 + 400 * (8 + 88) microAlgos
+VAULT_MBR = 40_900
+
+# Paid once per asset by the factory's first vault of that asset
+ASSET_MBR = 100_000
+
+
+def vault_box(app_id, vault_id):
+    return [(app_id, vault_id.to_bytes(8, "big"))]
+
+
+def create_vault(client, private_key, app_id, beneficiary, unlock_time, asset_id=0):
+    """
+    Open a vault in the factory
+    
+    Returns:
+        The new vault's ID (logged by the create call)
+    """
+    sender = account.address_from_private_key(private_key)
+    app_address = transaction.logic.get_application_address(app_id)
+    params = client.suggested_params()
+    
+    deposit = VAULT_MBR
+    if asset_id:
+        held = [a["asset-id"] for a in client.account_info(app_address).get("assets", [])]
+        if asset_id not in held:
+            deposit += ASSET_MBR
+    
+    pay_txn = PaymentTxn(sender=sender, sp=params, receiver=app_address, amt=deposit)
+    
+    # Covers the factory's asset opt-in (an inner transaction) if needed
+    params.flat_fee = True
+    params.fee = 2 * params.min_fee
+    
+    call_txn = ApplicationNoOpTxn(
+        sender=sender,
+        sp=params,
+        index=app_id,
+        app_args=[
+            b"create",
+            encoding.decode_address(beneficiary),
+            asset_id.to_bytes(8, "big"),
+            unlock_time.to_bytes(8, "big")
+        ],
+        foreign_assets=[asset_id] if asset_id else None,
+        # The next vault's box; the contract numbers vaults 1, 2, 3...
+        boxes=vault_box(app_id, next_vault_id(client, app_id))
+    )
+    
+    assign_group_id([pay_txn, call_txn])
+    txid = client.send_transactions([pay_txn.sign(private_key), call_txn.sign(private_key)])
+    wait_for_confirmation(client, txid, 4)
+    
+    info = client.pending_transaction_info(call_txn.get_txid())
+    return int.from_bytes(base64.b64decode(info["logs"][0]), "big")
+
+
+def next_vault_id(client, app_id):
+    state = client.application_info(app_id)["params"].get("global-state", [])
+    count = next(
+        (kv["value"]["uint"] for kv in state if base64.b64decode(kv["key"]) == b"vault_count"),
+        0
+    )
+    return count + 1
+
+
+def deposit_vault(client, private_key, app_id, vault_id, amount, asset_id=0):
+    """Add ALGO (microAlgos) or asset units to a vault"""
+    sender = account.address_from_private_key(private_key)
+    app_address = transaction.logic.get_application_address(app_id)
+    params = client.suggested_params()
+    
+    call_txn = ApplicationNoOpTxn(
+        sender=sender,
+        sp=params,
+        index=app_id,
+        app_args=[b"deposit", vault_id.to_bytes(8, "big")],
+        boxes=vault_box(app_id, vault_id)
+    )
+    
+    if asset_id:
+        transfer = AssetTransferTxn(sender=sender, sp=params, receiver=app_address, amt=amount, index=asset_id)
+    else:
+        transfer = PaymentTxn(sender=sender, sp=params, receiver=app_address, amt=amount)
+    
+    assign_group_id([call_txn, transfer])
+    txid = client.send_transactions([call_txn.sign(private_key), transfer.sign(private_key)])
+    wait_for_confirmation(client, txid, 4)
+    return txid
+
+
+def withdraw_vault(client, private_key, app_id, vault_id, owner, asset_id=0):
+    """Pay a vault out to its beneficiary (the sender) after unlock_time"""
+    sender = account.address_from_private_key(private_key)
+    params = client.suggested_params()
+    
+    # Payout + box deposit refund are inner transactions
+    params.flat_fee = True
+    params.fee = 3 * params.min_fee
+    
+    txn = ApplicationNoOpTxn(
+        sender=sender,
+        sp=params,
+        index=app_id,
+        app_args=[b"withdraw", vault_id.to_bytes(8, "big")],
+        accounts=[owner] if owner != sender else None,
+        foreign_assets=[asset_id] if asset_id else None,
+        boxes=vault_box(app_id, vault_id)
+    )
+    
+    txid = client.send_transaction(txn.sign(private_key))
+    wait_for_confirmation(client, txid, 4)
+    return txid
+
+
+if __name__ == "__main__":
+    with open("python_wallet.json", "r") as f:
+        wallet = json.load(f)
+    
+    PRIVATE_KEY = wallet["private_key"]
+    student_address = wallet["address"]
+    
+    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+    
+    unlock_time = int(time.time()) + 60  # 1 minute from now
+    
+    vault_id = create_vault(algod_client, PRIVATE_KEY, VAULT_FACTORY_APP_ID, student_address, unlock_time)
+    print(f"✅ Vault {vault_id} created in factory {VAULT_FACTORY_APP_ID}")
+    
+    deposit_vault(algod_client, PRIVATE_KEY, VAULT_FACTORY_APP_ID, vault_id, 100_000)
+    print("✅ Deposited 0.1 ALGO")
+    
+    print("⏳ Waiting for unlock...")
+    time.sleep(max(0, unlock_time - int(time.time())) + 5)
+    
+    withdraw_vault(algod_client, PRIVATE_KEY, VAULT_FACTORY_APP_ID, vault_id, student_address)
+    print(f"✅ Vault {vault_id} withdrawn (box deleted, deposit refunded)")
\ No newline at end of file
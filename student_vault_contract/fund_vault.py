@@ -1,6 +1,6 @@
 from algosdk.v2client import algod
 from algosdk import transaction
-from algosdk.transaction import PaymentTxn, AssetTransferTxn, wait_for_confirmation
+from algosdk.transaction import ApplicationNoOpTxn, PaymentTxn, wait_for_confirmation
 import json
 
 # Testnet connection
@@ -47,33 +47,23 @@ for asset in app_account_info.get('assets', []):
         break
 
 if not asset_opted_in:
-    # Need to opt-in the vault to the asset
-    print("⚠️ Vault not opted into asset. You need to opt-in first.")
-    print("\nRun this command to opt-in:")
-    print("\n```python")
-    print("from algosdk.v2client import algod")
-    print("from algosdk import transaction")
-    print("import json")
-    print("\nalgod_client = algod.AlgodClient('', 'https://testnet-api.algonode.cloud')")
-    print("with open('python_wallet.json', 'r') as f:")
-    print("    wallet = json.load(f)")
-    print("PRIVATE_KEY = wallet['private_key']")
-    print("student_address = wallet['address']")
-    print("APP_ADDRESS = 'XNYOP7SKZTKZPFTFUV5PNOQVBSKADARFSBYJ2KRB42H4YEACGUGOTU5ET4'")
-    print("ASSET_ID = 10458941")
-    print("\nparams = algod_client.suggested_params()")
-    print("optin_txn = transaction.AssetTransferTxn(")
-    print("    sender=student_address,")
-    print("    sp=params,")
-    print("    receiver=APP_ADDRESS,")
-    print("    amt=0,")
-    print("    index=ASSET_ID")
-    print(")")
-    print("signed_optin = optin_txn.sign(PRIVATE_KEY)")
-    print("txid = algod_client.send_transaction(signed_optin)")
-    print("transaction.wait_for_confirmation(algod_client, txid, 4)")
-    print("print('✅ Vault opted into asset')")
-    print("```")
+    # Only the vault can opt itself in: its opt_in_asset call sends a
+    # 0-amount transfer to its own address (an inner transaction, so the
+    # call pays both fees)
+    params = algod_client.suggested_params()
+    params.flat_fee = True
+    params.fee = 2 * params.min_fee
+
+    optin_txn = ApplicationNoOpTxn(
+        sender=student_address,
+        sp=params,
+        index=APP_ID,
+        app_args=[b"opt_in_asset"],
+        foreign_assets=[ASSET_ID]
+    )
+    txid = algod_client.send_transaction(optin_txn.sign(PRIVATE_KEY))
+    wait_for_confirmation(algod_client, txid, 4)
+    print("✅ Vault opted into asset")
 else:
     print("✅ Vault already opted into asset")
 
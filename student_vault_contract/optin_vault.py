@@ -7,16 +7,20 @@ with open('python_wallet.json', 'r') as f:
     wallet = json.load(f)
 PRIVATE_KEY = wallet['private_key']
 student_address = wallet['address']
-APP_ADDRESS = 'XNYOP7SKZTKZPFTFUV5PNOQVBSKADARFSBYJ2KRB42H4YEACGUGOTU5ET4'
+APP_ID = 755414328
 ASSET_ID = 10458941
 
+# The vault opts itself in with an inner 0-amount transfer to its own
+# address; this call's fee covers the inner transaction
 params = algod_client.suggested_params()
-optin_txn = transaction.AssetTransferTxn(
+params.flat_fee = True
+params.fee = 2 * params.min_fee
+optin_txn = transaction.ApplicationNoOpTxn(
     sender=student_address,
     sp=params,
-    receiver=APP_ADDRESS,
-    amt=0,
-    index=ASSET_ID
+    index=APP_ID,
+    app_args=[b'opt_in_asset'],
+    foreign_assets=[ASSET_ID]
 )
 signed_optin = optin_txn.sign(PRIVATE_KEY)
 txid = algod_client.send_transaction(signed_optin)
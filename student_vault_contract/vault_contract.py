@@ -0,0 +1,126 @@
+"""
+Student Vault Contracts
+Lock funds in the app escrow until unlock_time, then pay them out to
+the beneficiary with an inner transaction.
+
+- asa_vault_approval_program: locks an ASA (artifact "student_vault");
+  after funding, an "opt_in_asset" call opts the escrow into the asset
+  (inner 0-amount transfer to itself, fee pooled into the call's fee)
+- algo_vault_approval_program: locks ALGO (artifact "algo_vault")
+
+Per-vault constants are template variables, compiled once by
+build_contracts.py. Deploy scripts patch the values straight into the
+bytecode (contract_artifacts.load_contract), so a new vault never
+needs a compile. Integers are templated as 8 fixed bytes + btoi and
+addresses as 32 bytes, so patching never moves any branch offsets.
+"""
+
+from pyteal import *
+
+
+def template_uint(name):
+    """uint64 template constant (8 bytes in the program)"""
+    return Btoi(Tmpl.Bytes(name))
+
+
+UNLOCK_TIME = template_uint("TMPL_UNLOCK_TIME")
+ASSET_ID = template_uint("TMPL_ASSET_ID")
+BENEFICIARY = Tmpl.Addr("TMPL_BENEFICIARY")
+
+
+def vault_approval_program(deposit_checks, deposit_amount, payout_fields, constants,
+                           escrow_opt_in=None):
+    owner_key = Bytes("owner")
+    unlock_time_key = Bytes("unlock_time")
+    amount_key = Bytes("amount")
+    beneficiary_key = Bytes("beneficiary")
+    
+    # The constants are also written to global state so dashboards and
+    # demo scripts can read them like before
+    on_creation = Seq([
+        App.globalPut(owner_key, Txn.sender()),
+        App.globalPut(unlock_time_key, UNLOCK_TIME),
+        App.globalPut(beneficiary_key, BENEFICIARY),
+        *[App.globalPut(Bytes(key), value) for key, value in constants],
+        App.globalPut(amount_key, Int(0)),
+        Approve()
+    ])
+    
+    on_deposit = Seq([
+        Assert(Global.group_size() == Int(2)),
+        *[Assert(check) for check in deposit_checks],
+        App.globalPut(amount_key, App.globalGet(amount_key) + deposit_amount),
+        Approve()
+    ])
+    
+    on_withdraw = Seq([
+        Assert(Txn.sender() == BENEFICIARY),
+        Assert(Global.latest_timestamp() >= UNLOCK_TIME),
+        InnerTxnBuilder.Begin(),
+        InnerTxnBuilder.SetFields(payout_fields(App.globalGet(amount_key))),
+        InnerTxnBuilder.Submit(),
+        App.globalPut(amount_key, Int(0)),
+        Approve()
+    ])
+    
+    branches = [
+        [Txn.application_id() == Int(0), on_creation],
+        [Txn.application_args[0] == Bytes("deposit"), on_deposit],
+        [Txn.application_args[0] == Bytes("withdraw"), on_withdraw]
+    ]
+    
+    # Only the app itself can opt its account in to an asset
+    if escrow_opt_in is not None:
+        branches.append([Txn.application_args[0] == Bytes("opt_in_asset"), Seq([
+            InnerTxnBuilder.Execute(escrow_opt_in),
+            Approve()
+        ])])
+    
+    program = Cond(*branches)
+    
+    return program
+
+
+def asa_vault_approval_program():
+    return vault_approval_program(
+        deposit_checks=[
+            Gtxn[1].type_enum() == TxnType.AssetTransfer,
+            Gtxn[1].xfer_asset() == ASSET_ID,
+            Gtxn[1].asset_receiver() == Global.current_application_address()
+        ],
+        deposit_amount=Gtxn[1].asset_amount(),
+        payout_fields=lambda amount: {
+            TxnField.type_enum: TxnType.AssetTransfer,
+            TxnField.asset_receiver: BENEFICIARY,
+            TxnField.asset_amount: amount,
+            TxnField.xfer_asset: ASSET_ID,
+        },
+        constants=[("asset_id", ASSET_ID)],
+        escrow_opt_in={
+            TxnField.type_enum: TxnType.AssetTransfer,
+            TxnField.xfer_asset: ASSET_ID,
+            TxnField.asset_receiver: Global.current_application_address(),
+            TxnField.asset_amount: Int(0),
+            TxnField.fee: Int(0)
+        }
+    )
+
+
+def algo_vault_approval_program():
+    return vault_approval_program(
+        deposit_checks=[
+            Gtxn[1].type_enum() == TxnType.Payment,
+            Gtxn[1].receiver() == Global.current_application_address()
+        ],
+        deposit_amount=Gtxn[1].amount(),
+        payout_fields=lambda amount: {
+            TxnField.type_enum: TxnType.Payment,
+            TxnField.receiver: BENEFICIARY,
+            TxnField.amount: amount,
+        },
+        constants=[]
+    )
+
+
+def vault_clear_program():
+    return Approve()
@@ -0,0 +1,183 @@
+"""
+Student Vault Factory Contract
+One application hosting many independent time-locked vaults, each in
+its own box, instead of one application per vault (vault_contract.py).
+
+- create:   [pay box deposit, appl "create"] opens vault N for a
+            beneficiary, asset (0 = ALGO) and unlock_time; logs N
+- deposit:  [appl "deposit" N, pay/axfer to the app] adds to vault N
+
+create and deposit only accept exactly these 2-transaction groups, so
+one payment can never be counted by two calls (e.g. credited to a vault
+and also paying for the next vault's box).
+- withdraw: [appl "withdraw" N] after unlock_time pays vault N out to
+            its beneficiary, deletes its box and refunds the box
+            deposit to the owner (2 inner transactions, fees pooled)
+
+Box layout (name = itob(vault id)):
+    0   owner        32 bytes
+    32  beneficiary  32 bytes
+    64  asset_id     uint64 (0 = ALGO)
+    72  unlock_time  uint64
+    80  amount       uint64
+"""
+
+from pyteal import *
+
+OWNER = 0
+BENEFICIARY = 32
+ASSET_ID = 64
+UNLOCK_TIME = 72
+AMOUNT = 80
+VAULT_SIZE = 88
+
+# 2500 + 400 * (8 byte name + 88 byte box) microAlgos
+VAULT_MBR = 2500 + 400 * (8 + VAULT_SIZE)
+
+# Minimum balance of one asset holding, paid by the first vault of an asset
+ASSET_MBR = 100_000
+
+
+def vault_factory_approval_program():
+    vault_count_key = Bytes("vault_count")
+    
+    vault = Txn.application_args[1]
+    
+    def get(offset):
+        return Btoi(App.box_extract(vault, Int(offset), Int(8)))
+    
+    def field(offset, length=32):
+        return App.box_extract(vault, Int(offset), Int(length))
+    
+    # ---------- create ----------
+    
+    vault_id = ScratchVar(TealType.uint64)
+    asset_id = Btoi(Txn.application_args[2])
+    holding = AssetHolding.balance(Global.current_application_address(), asset_id)
+    needs_opt_in = ScratchVar(TealType.uint64)
+    box_payment = Gtxn[0]
+    
+    on_create = Seq([
+        Assert(Len(Txn.application_args[1]) == Int(32)),
+        Assert(Len(Txn.application_args[2]) == Int(8)),
+        Assert(Len(Txn.application_args[3]) == Int(8)),
+        
+        # The app account holds the asset once, paid for by its first vault
+        If(asset_id == Int(0), needs_opt_in.store(Int(0)), Seq([
+            holding,
+            needs_opt_in.store(Not(holding.hasValue()))
+        ])),
+        
+        Assert(Global.group_size() == Int(2)),
+        Assert(Txn.group_index() == Int(1)),
+        Assert(box_payment.type_enum() == TxnType.Payment),
+        Assert(box_payment.sender() == Txn.sender()),
+        Assert(box_payment.receiver() == Global.current_application_address()),
+        Assert(box_payment.amount() >= Int(VAULT_MBR) + needs_opt_in.load() * Int(ASSET_MBR)),
+        
+        If(needs_opt_in.load(), InnerTxnBuilder.Execute({
+            TxnField.type_enum: TxnType.AssetTransfer,
+            TxnField.xfer_asset: asset_id,
+            TxnField.asset_receiver: Global.current_application_address(),
+            TxnField.asset_amount: Int(0),
+            TxnField.fee: Int(0)
+        })),
+        
+        vault_id.store(App.globalGet(vault_count_key) + Int(1)),
+        App.globalPut(vault_count_key, vault_id.load()),
+        
+        # amount starts at 0
+        Assert(App.box_create(Itob(vault_id.load()), Int(VAULT_SIZE))),
+        App.box_replace(Itob(vault_id.load()), Int(OWNER), Txn.sender()),
+        App.box_replace(Itob(vault_id.load()), Int(BENEFICIARY), Txn.application_args[1]),
+        App.box_replace(Itob(vault_id.load()), Int(ASSET_ID), Txn.application_args[2]),
+        App.box_replace(Itob(vault_id.load()), Int(UNLOCK_TIME), Txn.application_args[3]),
+        
+        # Clients read the new vault's id from the call's logs
+        Log(Itob(vault_id.load())),
+        Approve()
+    ])
+    
+    # ---------- deposit ----------
+    
+    transfer = Gtxn[1]
+    
+    on_deposit = Seq([
+        Assert(Global.group_size() == Int(2)),
+        Assert(Txn.group_index() == Int(0)),
+        If(
+            get(ASSET_ID) == Int(0),
+            Seq([
+                Assert(transfer.type_enum() == TxnType.Payment),
+                Assert(transfer.receiver() == Global.current_application_address()),
+                App.box_replace(vault, Int(AMOUNT), Itob(get(AMOUNT) + transfer.amount()))
+            ]),
+            Seq([
+                Assert(transfer.type_enum() == TxnType.AssetTransfer),
+                Assert(transfer.xfer_asset() == get(ASSET_ID)),
+                Assert(transfer.asset_receiver() == Global.current_application_address()),
+                App.box_replace(vault, Int(AMOUNT), Itob(get(AMOUNT) + transfer.asset_amount()))
+            ])
+        ),
+        Approve()
+    ])
+    
+    # ---------- withdraw ----------
+    
+    beneficiary = ScratchVar(TealType.bytes)
+    owner = ScratchVar(TealType.bytes)
+    
+    on_withdraw = Seq([
+        beneficiary.store(field(BENEFICIARY)),
+        owner.store(field(OWNER)),
+        Assert(Txn.sender() == beneficiary.load()),
+        Assert(Global.latest_timestamp() >= get(UNLOCK_TIME)),
+        
+        InnerTxnBuilder.Begin(),
+        If(
+            get(ASSET_ID) == Int(0),
+            InnerTxnBuilder.SetFields({
+                TxnField.type_enum: TxnType.Payment,
+                TxnField.receiver: beneficiary.load(),
+                TxnField.amount: get(AMOUNT),
+                TxnField.fee: Int(0)
+            }),
+            InnerTxnBuilder.SetFields({
+                TxnField.type_enum: TxnType.AssetTransfer,
+                TxnField.asset_receiver: beneficiary.load(),
+                TxnField.asset_amount: get(AMOUNT),
+                TxnField.xfer_asset: get(ASSET_ID),
+                TxnField.fee: Int(0)
+            })
+        ),
+        
+        # The vault is finished: its box deposit goes back to the owner
+        InnerTxnBuilder.Next(),
+        InnerTxnBuilder.SetFields({
+            TxnField.type_enum: TxnType.Payment,
+            TxnField.receiver: owner.load(),
+            TxnField.amount: Int(VAULT_MBR),
+            TxnField.fee: Int(0)
+        }),
+        InnerTxnBuilder.Submit(),
+        
+        Assert(App.box_delete(vault)),
+        Approve()
+    ])
+    
+    program = Cond(
+        [Txn.application_id() == Int(0), Seq([
+            App.globalPut(vault_count_key, Int(0)),
+            Approve()
+        ])],
+        [Txn.on_completion() != OnComplete.NoOp, Reject()],
+        [Txn.application_args[0] == Bytes("create"), on_create],
+        [Txn.application_args[0] == Bytes("deposit"), on_deposit],
+        [Txn.application_args[0] == Bytes("withdraw"), on_withdraw]
+    )
+    
+    return program
+
+
+def vault_factory_clear_program():
+    return Approve()